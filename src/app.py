@@ -6,32 +6,87 @@ from src.bot.bot import create_bot, create_dispatcher
 from src.bot.keyboards.main_menu import set_main_menu
 from src.core.context import AppContext
 from src.core.logger import get_logger
+from src.core.metrics_server import start_metrics_server
+from src.core.settings import settings
+from src.core.tracing import tracer
+from src.db.migrations import apply_migrations, check_schema_drift
+from src.db.profiler import query_profiler
+from src.db.session import async_engine
+from src.jobs import (
+    run_answer_stats_reconciler,
+    run_publication_sweep,
+    run_scheduler,
+    run_telegram_files_gc,
+)
 
 
 async def main() -> None:
     """
     Основная точка входа приложения.
 
+    - Применяет миграции БД (DB_MIGRATE_ON_STARTUP)
     - Создаёт AppContext (подключения/сервисы)
     - Запускает polling бота
     - Гарантированно закрывает ресурсы на выходе
     """
     logger = get_logger("app")
 
+    if settings.db_migrate_on_startup:
+        await apply_migrations(async_engine)
+        drift = await check_schema_drift(async_engine)
+        for line in drift.lines():
+            logger.warning("Расхождение схемы БД с моделями: %s", line)
+
     ctx = await AppContext.create()
 
     # Загружаем заблокированных пользователей в Redis
     await ctx.user_locks_storage.load_all_banned_users()
 
-    bot = create_bot()
+    bot = create_bot(redis=ctx.redis)
     await set_main_menu(bot)
     dp = create_dispatcher(ctx)
 
+    metrics_runner = None
+    if settings.metrics_port:
+        metrics_runner = await start_metrics_server(
+            settings.metrics_host, settings.metrics_port
+        )
+        logger.info("Метрики доступны на порту %s", settings.metrics_port)
+
+    background_tasks: list[asyncio.Task] = []
+    if settings.answer_stats_reconcile_interval_s:
+        background_tasks.append(
+            asyncio.create_task(
+                run_answer_stats_reconciler(settings.answer_stats_reconcile_interval_s)
+            )
+        )
+    if settings.telegram_files_gc_interval_s:
+        background_tasks.append(
+            asyncio.create_task(
+                run_telegram_files_gc(settings.telegram_files_gc_interval_s)
+            )
+        )
+    if settings.scheduler_enabled:
+        background_tasks.append(asyncio.create_task(run_scheduler(bot)))
+    if settings.publication_sweep_interval_s:
+        background_tasks.append(
+            asyncio.create_task(
+                run_publication_sweep(bot, settings.publication_sweep_interval_s)
+            )
+        )
+
     try:
         logger.info("Старт бота")
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
         logger.info("Остановка бота")
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        query_profiler.dump(limit=50)
+        await tracer.close()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
         await ctx.close()
         await bot.session.close()
 
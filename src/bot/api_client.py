@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import ssl
+from typing import Any, Mapping, Optional
+
+import certifi
+from aiogram import Bot, __version__
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import PRODUCTION, TelegramAPIServer
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiohttp import ClientSession, TCPConnector
+
+from src.core.settings import settings
+
+# Таймауты (сек) по методам Bot API: интерактивные вызовы не должны ждать
+# общий таймаут сессии; отправка файлов — дольше. Переопределяются
+# настройкой telegram_method_timeouts_s.
+DEFAULT_METHOD_TIMEOUTS: dict[str, float] = {
+    "answerCallbackQuery": 5,
+    "sendMessage": 10,
+    "editMessageText": 10,
+    "editMessageReplyMarkup": 10,
+    "deleteMessage": 10,
+    "editMessageMedia": 30,
+    "sendPhoto": 30,
+    "sendDocument": 60,
+    "sendVideo": 60,
+}
+
+
+class BotAPISession(AiohttpSession):
+    """
+    HTTP-клиент Bot API: пул соединений, кэш DNS, keep-alive и таймауты
+    по методам поверх AiohttpSession.
+
+    - Явный request_timeout вызова (например, long polling getUpdates)
+      важнее таймаута метода
+    - Время запросов по методам пишет TelegramMetricsMiddleware
+      (telegram_api_duration_seconds)
+    - ClientSession с нужным коннектором создаётся здесь же
+      (create_session/close), внутреннее состояние AiohttpSession
+      не используется
+    """
+
+    def __init__(
+        self,
+        *,
+        api: TelegramAPIServer = PRODUCTION,
+        pool_size: int = 100,
+        dns_ttl_s: int = 300,
+        keepalive_s: float = 30,
+        timeout: float = 60,
+        method_timeouts: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        super().__init__(api=api, timeout=timeout)
+        self.connector_options: dict[str, Any] = dict(
+            limit=pool_size,
+            # Все запросы идут на один хост: лимит на хост — весь пул
+            limit_per_host=pool_size,
+            use_dns_cache=True,
+            ttl_dns_cache=dns_ttl_s,
+            keepalive_timeout=keepalive_s,
+        )
+        self.method_timeouts = {**DEFAULT_METHOD_TIMEOUTS, **(method_timeouts or {})}
+        self._client: Optional[ClientSession] = None
+
+    async def create_session(self) -> ClientSession:
+        if self._client is None or self._client.closed:
+            self._client = ClientSession(
+                connector=TCPConnector(
+                    ssl=ssl.create_default_context(cafile=certifi.where()),
+                    **self.connector_options,
+                ),
+                headers={"User-Agent": f"aiogram/{__version__}"},
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+            # Даём закрыться SSL-соединениям (graceful shutdown aiohttp)
+            await asyncio.sleep(0.25)
+
+    def timeout_for(self, method: TelegramMethod[Any]) -> float:
+        return self.method_timeouts.get(method.__api_method__, self.timeout)
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: Optional[int] = None,
+    ) -> TelegramType:
+        if timeout is None:
+            timeout = self.timeout_for(method)
+        return await super().make_request(bot, method, timeout=timeout)
+
+
+def telegram_api_server(
+    base_url: Optional[str] = None, *, is_local: bool = False
+) -> TelegramAPIServer:
+    """
+    Сервер Bot API: api.telegram.org или собственный telegram-bot-api
+    (base_url вида http://telegram-bot-api:8081). В режиме --local сервер
+    отдаёт файлы больше 20 МБ путями на диске (is_local=True).
+    """
+    if not base_url:
+        return PRODUCTION
+    return TelegramAPIServer.from_base(base_url, is_local=is_local)
+
+
+def create_bot_session(**overrides: Any) -> BotAPISession:
+    """Сессия Bot API по настройкам (overrides — для тестов)."""
+    options: dict[str, Any] = dict(
+        api=telegram_api_server(
+            settings.telegram_api_url, is_local=settings.telegram_api_local
+        ),
+        pool_size=settings.telegram_pool_size,
+        dns_ttl_s=settings.telegram_dns_ttl_s,
+        keepalive_s=settings.telegram_keepalive_s,
+        timeout=settings.telegram_timeout_s,
+        method_timeouts=settings.telegram_method_timeouts_s,
+    )
+    options.update(overrides)
+    return BotAPISession(**options)
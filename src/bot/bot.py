@@ -1,23 +1,70 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.base import BaseSession
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+from aiogram.fsm.storage.redis import DefaultKeyBuilder
 
+from src.bot.api_client import create_bot_session
 from src.bot.errors import error_router
 from src.bot.handlers import all_handlers_router
 from src.bot.middlewares.app_context import AppContextMiddleware
+from src.bot.middlewares.metrics import (
+    HandlerMetricsMiddleware,
+    TelegramMetricsMiddleware,
+)
+from src.bot.middlewares.pagination import PaginationCoalesceMiddleware
+from src.bot.middlewares.send_scheduler import SendSchedulerMiddleware
+from src.bot.middlewares.throttling import ThrottlingMiddleware
+from src.bot.middlewares.tracing import (
+    HandlerTracingMiddleware,
+    TelegramTracingMiddleware,
+    TracedMiddleware,
+    TracingMiddleware,
+)
+from src.bot.middlewares.update_dedup import UpdateDedupMiddleware
+from src.bot.middlewares.update_stats import (
+    HandlerBudgetMiddleware,
+    TelegramCallsCounterMiddleware,
+    UpdateStatsMiddleware,
+)
 from src.bot.middlewares.user_session import UserSessionMiddleware
+from src.bot.storage import TracedRedisStorage
 from src.core.context import AppContext
+from src.core.send_scheduler import SendScheduler
 from src.core.settings import settings
+from src.redis import RedisClient
 
 
-def create_bot() -> Bot:
-    return Bot(
+def create_bot(
+    session: Optional[BaseSession] = None, redis: Optional[RedisClient] = None
+) -> Bot:
+    """
+    Бот с middleware сессии. redis — общие для экземпляров лимиты отправки
+    (SendScheduler); без него лимиты считаются в памяти процесса.
+    """
+    bot = Bot(
         token=settings.bot_token,
+        session=session or create_bot_session(),
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
     )
+    bot.session.middleware(
+        SendSchedulerMiddleware(
+            SendScheduler(
+                global_rate=settings.send_global_rate,
+                chat_rate=settings.send_chat_rate,
+                chat_burst=settings.send_chat_burst,
+                redis_client=redis,
+            )
+        )
+    )
+    bot.session.middleware(TelegramCallsCounterMiddleware())
+    bot.session.middleware(TelegramMetricsMiddleware())
+    bot.session.middleware(TelegramTracingMiddleware())
+    return bot
 
 
 def create_dispatcher(ctx: AppContext) -> Dispatcher:
@@ -25,16 +72,38 @@ def create_dispatcher(ctx: AppContext) -> Dispatcher:
     if redis_conn is None:
         raise RuntimeError("Redis не инициализирован для FSM Storage")
 
-    storage = RedisStorage(
+    storage = TracedRedisStorage(
         redis=redis_conn,
         key_builder=DefaultKeyBuilder(with_bot_id=True),
     )
     dp = Dispatcher(storage=storage)
 
+    # Трассировка — самый внешний слой, чтобы в трассу попадало всё остальное.
+    dp.update.outer_middleware(TracingMiddleware())
+    # Счётчики SQL/Redis/Bot API на апдейт: внешний middleware охватывает всю обработку,
+    # внутренние — только узнают, какой хендлер сработал, и его бюджет.
+    dp.update.outer_middleware(UpdateStatsMiddleware())
+    # Повторно доставленный update_id отбрасывается до сессии и хендлеров.
+    dp.update.outer_middleware(
+        UpdateDedupMiddleware(ctx.redis, settings.update_dedup_ttl_s)
+    )
+    # Частота апдейтов пользователя: бюджет зависит от хендлера, поэтому inner.
+    if settings.throttle_enabled:
+        dp.message.middleware(ThrottlingMiddleware(ctx.redis))
+        dp.callback_query.middleware(ThrottlingMiddleware(ctx.redis))
+    dp.message.middleware(HandlerBudgetMiddleware())
+    dp.callback_query.middleware(HandlerBudgetMiddleware())
+    dp.message.middleware(HandlerMetricsMiddleware())
+    dp.callback_query.middleware(HandlerMetricsMiddleware())
+    dp.message.middleware(HandlerTracingMiddleware())
+    dp.callback_query.middleware(HandlerTracingMiddleware())
+    # Самый внутренний: рендер страницы отменяется, если пришла более новая.
+    dp.callback_query.middleware(PaginationCoalesceMiddleware())
+
     # Важно: оба middleware вешаем на update, чтобы работало и для Message и для CallbackQuery.
     # UserSessionMiddleware будет создавать session, используя ctx из data (если он есть).
-    dp.update.middleware(AppContextMiddleware(ctx))
-    dp.update.middleware(UserSessionMiddleware())
+    dp.update.middleware(TracedMiddleware(AppContextMiddleware(ctx)))
+    dp.update.middleware(TracedMiddleware(UserSessionMiddleware()))
 
     # Подключаем обработчик ошибок первым
     dp.include_router(error_router)
@@ -11,6 +11,7 @@ from aiogram.types import CallbackQuery, Message
 from src.bot.lexicon.texts import TextsRU
 from src.core.enums import UserRoleEnum
 from src.core.fsm_states import FullNameStates
+from src.core.tracing import traced
 from src.services import AdminStorage, RoleStorage, UserLocksStorage
 
 if TYPE_CHECKING:
@@ -18,6 +19,7 @@ if TYPE_CHECKING:
 
 
 class IsStudentFilter(BaseFilter):
+    @traced("filter:IsStudentFilter")
     async def __call__(
         self, event: Union[Message, CallbackQuery], role_storage: RoleStorage
     ) -> bool:
@@ -26,6 +28,7 @@ class IsStudentFilter(BaseFilter):
 
 
 class IsTeacherFilter(BaseFilter):
+    @traced("filter:IsTeacherFilter")
     async def __call__(
         self, event: Union[Message, CallbackQuery], role_storage: RoleStorage
     ) -> bool:
@@ -34,6 +37,7 @@ class IsTeacherFilter(BaseFilter):
 
 
 class IsAdminFilter(BaseFilter):
+    @traced("filter:IsAdminFilter")
     async def __call__(
         self, event: Union[Message, CallbackQuery], admin_storage: AdminStorage
     ) -> bool:
@@ -47,6 +51,7 @@ class HasRealFullNameFilter(BaseFilter):
     Если нет — отправляет подсказку и блокирует хендлер.
     """
 
+    @traced("filter:HasRealFullNameFilter")
     async def __call__(
         self,
         event: Union[Message, CallbackQuery],
@@ -70,6 +75,7 @@ class IsBannedFilter(BaseFilter):
     Используется для обработчика заблокированных пользователей.
     """
 
+    @traced("filter:IsBannedFilter")
     async def __call__(
         self, event: Union[Message, CallbackQuery], user_locks_storage: UserLocksStorage
     ) -> bool:
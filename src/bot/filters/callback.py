@@ -6,6 +6,7 @@ from aiogram.filters import BaseFilter
 from aiogram.types import CallbackQuery
 
 from src.core.schemas import CallbackSchemaBase
+from src.core.tracing import traced
 
 
 class CallbackFilter(BaseFilter):
@@ -22,6 +23,7 @@ class CallbackFilter(BaseFilter):
         self.schemas = schemas
         self.equals = equals
 
+    @traced("filter:CallbackFilter")
     async def __call__(self, callback: CallbackQuery) -> bool | dict[str, Any]:
         for schema in self.schemas:
             parsed = schema.parse(callback.data)
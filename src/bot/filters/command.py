@@ -4,6 +4,7 @@ from aiogram.types import Message
 
 from src.bot.lexicon.command_texts import COMMAND_DESCRIPTIONS_RU
 from src.core.enums import CommandsEnum
+from src.core.tracing import traced
 
 
 class CommandFilter(BaseFilter):
@@ -19,6 +20,7 @@ class CommandFilter(BaseFilter):
                 return True
         return False
 
+    @traced("filter:CommandFilter")
     async def __call__(self, message: Message, bot: Bot) -> bool:
         return bool(
             await Command(*self.commands)(message, bot)
@@ -37,7 +37,8 @@ async def student_homework_answer_start(
     await session.answer_callback_query()
 
     hw = await HomeworksService.get_by_id(callback_data.homework_id)
-    if not hw:
+    if not hw or not hw.is_published(datetime.now()):
+        # Неопубликованное задание не открывается и по устаревшей кнопке
         await session.answer(TextsRU.TRY_AGAIN)
         return
 
@@ -75,7 +76,7 @@ async def student_homework_answer_receive_text(
         return
 
     hw = await HomeworksService.get_by_id(int(homework_id))
-    if not hw:
+    if not hw or not hw.is_published(datetime.now()):
         await session.answer(TextsRU.TRY_AGAIN)
         return
 
@@ -18,12 +18,14 @@ from src.core.schemas import (
     PaginationCallbackSchema,
     PaginationStateSchema,
 )
+from src.core.throttling import throttle
 from src.db.services import AnswersService, StudentsService
 
 answers_router = Router()
 
 _PAGINATION_KEY = "student_answers"
 _PER_PAGE = 1
+_SCREEN = "student_answers"
 
 
 def _format_dt(dt: Optional[datetime]) -> str:
@@ -91,13 +93,13 @@ async def student_answers_review_handler(
         text=TextsRU.SELECT_ACTION,
     )
 
-    student = await StudentsService.get_by_user_id(session.user_id)
-    if not student:
+    student_id = await StudentsService.get_id_by_user_id(session.user_id)
+    if not student_id:
         await session.answer(TextsRU.TRY_AGAIN)
         return
 
     page_data = await AnswersService.get_answers_page_by_student_id(
-        student.student_id, page=1, per_page=_PER_PAGE
+        student_id, page=1, per_page=_PER_PAGE
     )
     if not page_data.items:
         await session.answer(TextsRU.STUDENT_ANSWERS_EMPTY)
@@ -116,23 +118,25 @@ async def student_answers_review_handler(
 @answers_router.callback_query(
     CallbackFilter(PaginationCallbackSchema, key=_PAGINATION_KEY)
 )
+@throttle(rate=1, burst=3, coalesce=True)
 async def student_answers_pagination_handler(
     _: CallbackQuery,
+    state: FSMContext,
     session: UserSession,
     callback_data: PaginationCallbackSchema,
 ) -> None:
     await session.answer_callback_query()
 
-    student = await StudentsService.get_by_user_id(session.user_id)
-    if not student:
+    student_id = await StudentsService.get_id_by_user_id(session.user_id)
+    if not student_id:
         await session.answer(TextsRU.TRY_AGAIN)
         return
 
     page_data = await AnswersService.get_answers_page_by_student_id(
-        student.student_id, page=callback_data.page, per_page=_PER_PAGE
+        student_id, page=callback_data.page, per_page=_PER_PAGE
     )
     if not page_data.items:
-        await session.edit_message(
+        await session.screen(state, _SCREEN).render(
             TextsRU.STUDENT_ANSWERS_EMPTY,
             message_id=session.message.message_id,
             reply_markup=None,
@@ -140,7 +144,7 @@ async def student_answers_pagination_handler(
         return
 
     ans = page_data.items[0]
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         _build_answer_text(ans),
         message_id=session.message.message_id,
         reply_markup=InlineKeyboardTypeEnum.STUDENT_ANSWERS_REVIEW,
@@ -17,8 +17,9 @@ from src.bot.filters import CommandFilter
 from src.bot.filters.callback import CallbackFilter
 from src.bot.lexicon.texts import TextsRU
 from src.bot.navigation import NavigationHelper
+from src.bot.screen import ScreenMedia
 from src.bot.session import UserSession
-from src.core.enums import CommandsEnum, HomeworkMediaTypeEnum, InlineKeyboardTypeEnum
+from src.core.enums import CommandsEnum, InlineKeyboardTypeEnum
 from src.core.schemas import (
     InlineButtonSchema,
     NoopCallbackSchema,
@@ -27,6 +28,7 @@ from src.core.schemas import (
     PaginationStateSchema,
     StudentHomeworkCallbackSchema,
 )
+from src.core.throttling import throttle
 from src.db.services import HomeworkFilesService, HomeworksService, StudentsService
 
 homeworks_router = Router()
@@ -34,7 +36,7 @@ homeworks_router = Router()
 
 _PAGINATION_KEY = "student_homeworks"
 _PER_PAGE = 1
-_STATE_PHOTO_MSG_IDS_KEY = "student_homeworks_photo_message_ids"
+_SCREEN = "student_homeworks"
 _STATE_GROUP_ID_KEY = "student_homeworks_group_id"
 
 
@@ -48,17 +50,7 @@ def _format_dt(dt: Optional[datetime]) -> str:
 
 
 async def _delete_previous_photos(state: FSMContext, session: UserSession) -> None:
-    data = await state.get_data()
-    msg_ids = data.get(_STATE_PHOTO_MSG_IDS_KEY) or []
-    if not isinstance(msg_ids, list) or not msg_ids:
-        return
-    for mid in msg_ids:
-        try:
-            await session.delete_message(int(mid))
-        except Exception:
-            # не критично (сообщение могло быть уже удалено)
-            pass
-    await state.update_data({_STATE_PHOTO_MSG_IDS_KEY: []})
+    await session.screen(state, _SCREEN).sync_media([])
 
 
 async def _send_homework_photos(
@@ -66,32 +58,13 @@ async def _send_homework_photos(
     state: FSMContext,
     session: UserSession,
     homework_id: int,
+    reuse: bool = True,
 ) -> None:
-    await _delete_previous_photos(state, session)
-
+    # Сообщения файлов предыдущего задания переиспользуются (editMessageMedia)
     files = await HomeworkFilesService.get_files_by_homework_id(homework_id)
-    media_ids: list[int] = []
-    for f in files:
-        tf = f.telegram_file
-        if not tf:
-            continue
-        try:
-            if tf.file_type == HomeworkMediaTypeEnum.PHOTO.value:
-                msg = await session.message.answer_photo(photo=tf.file_id)
-                media_ids.append(msg.message_id)
-            elif tf.file_type == HomeworkMediaTypeEnum.DOCUMENT.value:
-                msg = await session.message.answer_document(
-                    document=tf.file_id, caption=tf.caption
-                )
-                media_ids.append(msg.message_id)
-            elif tf.file_type == HomeworkMediaTypeEnum.VIDEO.value:
-                msg = await session.message.answer_video(
-                    video=tf.file_id, caption=tf.caption
-                )
-                media_ids.append(msg.message_id)
-        except Exception:
-            continue
-    await state.update_data({_STATE_PHOTO_MSG_IDS_KEY: media_ids})
+    await session.screen(state, _SCREEN).sync_media(
+        ScreenMedia.from_files(files), reuse=reuse
+    )
 
 
 def _build_homework_text(homework) -> str:
@@ -172,14 +145,14 @@ async def student_homeworks_review_handler(
         return
     await state.update_data({_STATE_GROUP_ID_KEY: group.group_id})
 
-    student = await StudentsService.get_by_user_id(session.user_id)
-    if not student:
+    student_id = await StudentsService.get_id_by_user_id(session.user_id)
+    if not student_id:
         await session.answer(TextsRU.TRY_AGAIN)
         return
 
     page_data = await HomeworksService.get_pending_homeworks_page_for_student(
         group_id=group.group_id,
-        student_id=student.student_id,
+        student_id=student_id,
         page=1,
         per_page=_PER_PAGE,
     )
@@ -190,7 +163,7 @@ async def student_homeworks_review_handler(
     hw = page_data.items[0]
     allow_answer = bool(hw.end_at and hw.end_at > datetime.now())
     await _send_homework_photos(
-        state=state, session=session, homework_id=hw.homework_id
+        state=state, session=session, homework_id=hw.homework_id, reuse=False
     )
 
     await session.answer(
@@ -212,6 +185,7 @@ async def student_homeworks_review_handler(
         key=_PAGINATION_KEY,
     )
 )
+@throttle(rate=1, burst=3, coalesce=True)
 async def student_homeworks_pagination_handler(
     _: CallbackQuery,
     state: FSMContext,
@@ -229,19 +203,19 @@ async def student_homeworks_pagination_handler(
         group_id = group.group_id
         await state.update_data({_STATE_GROUP_ID_KEY: group_id})
 
-    student = await StudentsService.get_by_user_id(session.user_id)
-    if not student:
+    student_id = await StudentsService.get_id_by_user_id(session.user_id)
+    if not student_id:
         await session.answer(TextsRU.TRY_AGAIN)
         return
 
     page_data = await HomeworksService.get_pending_homeworks_page_for_student(
         group_id=int(group_id),
-        student_id=student.student_id,
+        student_id=student_id,
         page=callback_data.page,
         per_page=_PER_PAGE,
     )
     if not page_data.items:
-        await session.edit_message(
+        await session.screen(state, _SCREEN).render(
             TextsRU.STUDENT_HOMEWORKS_EMPTY,
             message_id=session.message.message_id,
             reply_markup=None,
@@ -255,7 +229,7 @@ async def student_homeworks_pagination_handler(
         state=state, session=session, homework_id=hw.homework_id
     )
 
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         _build_homework_text(hw),
         message_id=session.message.message_id,
         reply_markup=InlineKeyboardTypeEnum.STUDENT_HOMEWORK_REVIEW,
@@ -12,9 +12,12 @@ from src.bot.navigation import NavigationHelper
 from src.bot.session import UserSession
 from src.core.enums import CommandsEnum, ReplyKeyboardTypeEnum
 from src.core.schemas import PaginationCallbackSchema
+from src.core.throttling import throttle
 
 teacher_groups_review_router = Router()
 
+_SCREEN = "teacher_groups"
+
 
 @teacher_groups_review_router.message(CommandFilter(CommandsEnum.TEACHER_GROUPS))
 async def teacher_groups_review_handler(
@@ -58,8 +61,10 @@ async def teacher_groups_review_handler(
         key=TeacherManager.GROUPS_PAGINATION_KEY,
     )
 )
+@throttle(rate=1, burst=3, coalesce=True)
 async def teacher_groups_pagination_handler(
     _: CallbackQuery,
+    state: FSMContext,
     session: UserSession,
     callback_data: PaginationCallbackSchema,
 ) -> None:
@@ -72,7 +77,7 @@ async def teacher_groups_pagination_handler(
         await session.answer(TextsRU.TEACHER_NOT_FOUND)
         return
 
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         view.text,
         message_id=session.message.message_id,
         reply_markup=view.keyboard_type,
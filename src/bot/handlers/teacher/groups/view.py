@@ -10,6 +10,7 @@ from src.bot.navigation import NavigationHelper
 from src.bot.session import UserSession
 from src.core.enums import CommandsEnum, ReplyKeyboardTypeEnum
 from src.core.schemas import PaginationCallbackSchema, TeacherGroupCallbackSchema
+from src.core.throttling import throttle
 
 teacher_group_view_router = Router()
 
@@ -75,6 +76,7 @@ async def teacher_group_view_handler(
         key=lambda k: isinstance(k, str) and k.startswith("teacher_group_students:"),
     )
 )
+@throttle(rate=1, burst=3, coalesce=True)
 async def teacher_group_students_pagination_handler(
     _: CallbackQuery,
     session: UserSession,
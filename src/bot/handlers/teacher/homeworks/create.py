@@ -33,9 +33,9 @@ from src.db.services import (
     HomeworkFilesService,
     HomeworkGroupsService,
     HomeworksService,
-    StudentsService,
     TeachersService,
 )
+from src.jobs import publish_homework
 
 teacher_homework_create_router = Router()
 logger = get_logger(__name__)
@@ -44,15 +44,15 @@ _TMP_FILES_KEY = "teacher_homework_tmp_files"
 _TMP_GROUP_IDS_KEY = "teacher_homework_tmp_group_ids"
 
 
-def _parse_deadline(raw: str) -> Optional[datetime]:
+def _parse_datetime(raw: str, *, day_end: bool = True) -> Optional[datetime]:
     raw = (raw or "").strip()
     if not raw:
         return None
-    # ожидаем: "ДД.ММ.ГГГГ ЧЧ:ММ"
+    # ожидаем: "ДД.ММ.ГГГГ ЧЧ:ММ"; дата без времени — конец (или начало) дня
     for fmt in ("%d.%m.%Y %H:%M", "%d.%m.%Y"):
         try:
             dt = datetime.strptime(raw, fmt)
-            if fmt == "%d.%m.%Y":
+            if fmt == "%d.%m.%Y" and day_end:
                 dt = dt.replace(hour=23, minute=59)
             return dt
         except Exception:
@@ -160,7 +160,7 @@ async def teacher_homework_create_text(
 async def teacher_homework_create_deadline(
     message: Message, state: FSMContext, session: UserSession
 ) -> None:
-    dt = _parse_deadline(message.text or "")
+    dt = _parse_datetime(message.text or "")
     if not dt:
         await session.answer(TextsRU.TEACHER_HOMEWORK_CREATE_DEADLINE_INVALID)
         return
@@ -168,6 +168,36 @@ async def teacher_homework_create_deadline(
         await session.answer(TextsRU.TEACHER_HOMEWORK_CREATE_DEADLINE_PAST)
         return
     await state.update_data(end_at=dt.isoformat())
+    await state.set_state(TeacherHomeworkCreateStates.waiting_for_start_at)
+    await session.answer(TextsRU.TEACHER_HOMEWORK_CREATE_START_AT_PROMPT)
+
+
+@teacher_homework_create_router.message(
+    TeacherHomeworkCreateStates.waiting_for_start_at
+)
+async def teacher_homework_create_start_at(
+    message: Message, state: FSMContext, session: UserSession
+) -> None:
+    """
+    Время публикации: /now — сразу, иначе дата в будущем, раньше срока сдачи.
+    """
+    raw = (message.text or "").strip()
+    start_at = None
+    if raw != "/now":
+        start_at = _parse_datetime(raw, day_end=False)
+        if not start_at:
+            await session.answer(TextsRU.TEACHER_HOMEWORK_CREATE_START_AT_INVALID)
+            return
+        if start_at <= datetime.now():
+            await session.answer(TextsRU.TEACHER_HOMEWORK_CREATE_START_AT_PAST)
+            return
+        end_at = datetime.fromisoformat(await state.get_value("end_at"))
+        if start_at >= end_at:
+            await session.answer(
+                TextsRU.TEACHER_HOMEWORK_CREATE_START_AT_AFTER_DEADLINE
+            )
+            return
+    await state.update_data(start_at=start_at.isoformat() if start_at else None)
     await state.set_state(TeacherHomeworkCreateStates.waiting_for_files)
     await session.answer(TextsRU.TEACHER_HOMEWORK_CREATE_FILES_PROMPT)
 
@@ -182,13 +212,11 @@ async def teacher_homework_create_files(
     # allow finish via command text
     if (message.text or "").strip() == "/done":
         await state.set_state(TeacherHomeworkCreateStates.selecting_groups)
-        teacher = await TeachersService.get_by_user_id(session.user_id)
-        if not teacher:
+        teacher_id = await TeachersService.get_id_by_user_id(session.user_id)
+        if not teacher_id:
             await session.answer(TextsRU.TEACHER_NOT_FOUND)
             return
-        groups = await AssignedGroupsService.get_all_groups_by_teacher_id(
-            teacher.teacher_id
-        )
+        groups = await AssignedGroupsService.get_all_groups_by_teacher_id(teacher_id)
         selected = set(await state.get_value(_TMP_GROUP_IDS_KEY, []) or [])
         await session.answer(
             TextsRU.TEACHER_HOMEWORK_CREATE_GROUPS_PROMPT,
@@ -262,12 +290,10 @@ async def teacher_homework_create_toggle_group(
         selected.add(gid)
     await state.update_data({_TMP_GROUP_IDS_KEY: list(sorted(selected))})
 
-    teacher = await TeachersService.get_by_user_id(session.user_id)
-    if not teacher:
+    teacher_id = await TeachersService.get_id_by_user_id(session.user_id)
+    if not teacher_id:
         return
-    groups = await AssignedGroupsService.get_all_groups_by_teacher_id(
-        teacher.teacher_id
-    )
+    groups = await AssignedGroupsService.get_all_groups_by_teacher_id(teacher_id)
     await session.edit_message(
         TextsRU.TEACHER_HOMEWORK_CREATE_GROUPS_PROMPT,
         message_id=session.message.message_id,
@@ -295,11 +321,17 @@ async def teacher_homework_create_groups_done(
     title = data.get("title", "")
     text = data.get("text", "")
     end_at = datetime.fromisoformat(data.get("end_at"))
+    start_at = data.get("start_at")
     await session.edit_message(
         TextsRU.TEACHER_HOMEWORK_PREVIEW.format(
             title=title,
             text=text,
             end_at=end_at.strftime("%d.%m.%Y %H:%M"),
+            start_at=(
+                datetime.fromisoformat(start_at).strftime("%d.%m.%Y %H:%M")
+                if start_at
+                else TextsRU.TEACHER_HOMEWORK_START_AT_NOW
+            ),
             groups_count=len(selected),
         ),
         message_id=session.message.message_id,
@@ -340,6 +372,8 @@ async def teacher_homework_create_confirm(
     title = data.get("title", "")
     text = data.get("text", "")
     end_at = datetime.fromisoformat(data.get("end_at"))
+    start_at = data.get("start_at")
+    start_at = datetime.fromisoformat(start_at) if start_at else None
     files_raw = data.get(_TMP_FILES_KEY, []) or []
     group_ids = data.get(_TMP_GROUP_IDS_KEY, []) or []
 
@@ -348,7 +382,7 @@ async def teacher_homework_create_confirm(
             teacher_id=teacher.teacher_id,
             title=title,
             text=text,
-            start_at=datetime.now(),
+            start_at=start_at or datetime.now(),
             end_at=end_at,
             created_at=datetime.now(),
         )
@@ -361,34 +395,19 @@ async def teacher_homework_create_confirm(
         telegram_files=[TelegramFileCreateSchema.model_validate(x) for x in files_raw],
     )
 
-    # Отправляем уведомления всем студентам выбранных групп
-    for group_id in group_ids:
-        students = await StudentsService.get_all_by_group_id(int(group_id))
-        for student in students:
-            try:
-                await session.bot.send_message(
-                    chat_id=student.user_id,
-                    text=TextsRU.TEACHER_HOMEWORK_NEW_NOTIFICATION.format(
-                        title=title,
-                        end_at=end_at.strftime("%d.%m.%Y %H:%M"),
-                        teacher_full_name=teacher.user.real_full_name,
-                        text=text,
-                    ),
-                )
-            except Exception as ex:
-                logger.error(
-                    f"Не удалось отправить уведомление одному студенту: {student.user_id}",
-                    exc_info=ex,
-                )
-
-                # Не критично, если не удалось отправить уведомление одному студенту
-                # (например, студент заблокировал бота)
-                pass
+    if start_at is None:
+        # Публикация сразу; отложенную разошлёт планировщик (таймер PUBLISH)
+        await publish_homework(session.bot, homework_id)
+        success_text = TextsRU.TEACHER_HOMEWORK_CREATE_SUCCESS
+    else:
+        success_text = TextsRU.TEACHER_HOMEWORK_CREATE_SCHEDULED.format(
+            start_at=start_at.strftime("%d.%m.%Y %H:%M")
+        )
 
     nav_manager = NavigationManager(state)
     await nav_manager.clear_cancel_target()
     await nav_manager.clear_state_and_data_keep_navigation()
-    await session.answer(TextsRU.TEACHER_HOMEWORK_CREATE_SUCCESS)
+    await session.answer(success_text)
 
     # Возвращаемся к списку заданий
     previous_step = await nav_manager.pop_previous(
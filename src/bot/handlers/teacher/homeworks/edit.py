@@ -20,13 +20,14 @@ from src.core.schemas import (
     TelegramFileCreateSchema,
 )
 from src.db.services import (
-    AnswersService,
     AssignedGroupsService,
+    HomeworkCardView,
     HomeworkFilesService,
     HomeworkGroupsService,
     HomeworksService,
     TeachersService,
 )
+from src.jobs import publish_homework
 
 teacher_homework_edit_router = Router()
 
@@ -78,14 +79,13 @@ async def _refresh_homework_card(
     homework_id: int,
     message_id: int,
 ) -> None:
-    hw = await HomeworksService.get_by_id(homework_id)
-    if not hw:
+    card = await HomeworkCardView.get(homework_id)
+    if not card:
         return
-    groups = await HomeworkGroupsService.get_groups_by_homework_id(homework_id)
-    answers_count = await AnswersService.count_by_homework_id(homework_id)
+    hw = card.homework
     groups_txt = (
-        ", ".join([g.name for g in groups])
-        if groups
+        ", ".join(card.group_names)
+        if card.group_names
         else TextsRU.TEACHER_HOMEWORK_GROUPS_EMPTY
     )
     text = TextsRU.TEACHER_HOMEWORK_VIEW.format(
@@ -94,7 +94,7 @@ async def _refresh_homework_card(
         start_at=_format_dt(hw.start_at),
         text=hw.text,
         groups=groups_txt,
-        answers_count=answers_count,
+        answers_count=card.stats.answers_count,
     )
     page = int(await state.get_value("teacher_homeworks_current_page", 1) or 1)
     total_pages = int(await state.get_value("teacher_homeworks_total_pages", 1) or 1)
@@ -244,8 +244,7 @@ async def teacher_homework_edit_files_collect(
         if not homework_id:
             await session.answer(TextsRU.TRY_AGAIN)
             return
-        await HomeworkFilesService.delete_by_homework_id(int(homework_id))
-        await HomeworkFilesService.attach_telegram_files(
+        await HomeworkFilesService.set_files_for_homework(
             homework_id=int(homework_id),
             telegram_files=[
                 TelegramFileCreateSchema.model_validate(x) for x in files_raw
@@ -347,8 +346,8 @@ async def teacher_homework_edit_groups_start(
     callback_data: TeacherHomeworkCallbackSchema,
 ) -> None:
     await session.answer_callback_query()
-    teacher = await TeachersService.get_by_user_id(session.user_id)
-    if not teacher:
+    teacher_id = await TeachersService.get_id_by_user_id(session.user_id)
+    if not teacher_id:
         await session.answer(TextsRU.TEACHER_NOT_FOUND)
         return
     current_groups = await HomeworkGroupsService.get_groups_by_homework_id(
@@ -363,9 +362,7 @@ async def teacher_homework_edit_groups_start(
         }
     )
     await state.set_state(TeacherHomeworkEditStates.selecting_groups)
-    groups = await AssignedGroupsService.get_all_groups_by_teacher_id(
-        teacher.teacher_id
-    )
+    groups = await AssignedGroupsService.get_all_groups_by_teacher_id(teacher_id)
     await session.edit_message(
         session.message.text or "",
         message_id=session.message.message_id,
@@ -387,8 +384,8 @@ async def teacher_homework_edit_groups_toggle(
     callback_data: TeacherHomeworkCallbackSchema,
 ) -> None:
     await session.answer_callback_query()
-    teacher = await TeachersService.get_by_user_id(session.user_id)
-    if not teacher:
+    teacher_id = await TeachersService.get_id_by_user_id(session.user_id)
+    if not teacher_id:
         return
     gid = int(callback_data.homework_id)
     selected = set(await state.get_value(_EDIT_TMP_GROUP_IDS_KEY, []) or [])
@@ -397,9 +394,7 @@ async def teacher_homework_edit_groups_toggle(
     else:
         selected.add(gid)
     await state.update_data({_EDIT_TMP_GROUP_IDS_KEY: list(sorted(selected))})
-    groups = await AssignedGroupsService.get_all_groups_by_teacher_id(
-        teacher.teacher_id
-    )
+    groups = await AssignedGroupsService.get_all_groups_by_teacher_id(teacher_id)
     await session.edit_message(
         session.message.text or "",
         message_id=session.message.message_id,
@@ -430,9 +425,13 @@ async def teacher_homework_edit_groups_done(
     if not selected:
         await session.answer(TextsRU.TEACHER_HOMEWORK_EDIT_GROUPS_EMPTY)
         return
-    await HomeworkGroupsService.set_groups_for_homework(
+    added = await HomeworkGroupsService.set_groups_for_homework(
         homework_id=int(homework_id), group_ids=[int(x) for x in selected]
     )
+    hw = await HomeworksService.get_by_id(int(homework_id)) if added else None
+    if hw and hw.is_published(datetime.now()):
+        # Уже опубликованное задание рассылается только добавленным группам
+        await publish_homework(session.bot, int(homework_id))
     nav_manager = NavigationManager(state)
     await nav_manager.clear_cancel_target()
     await nav_manager.clear_state_and_data_keep_navigation()
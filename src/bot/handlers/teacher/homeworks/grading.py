@@ -4,6 +4,7 @@
 Функциональность:
 - Просмотр непроверенных ответов с пагинацией
 - Просмотр проверенных ответов с пагинацией
+- Очередь проверки по всем заданиям преподавателя (ответ арендуется проверяющим)
 - Выставление оценки (0-100 баллов)
 - Добавление комментария
 - Отправка оценки студенту
@@ -19,13 +20,15 @@ from aiogram import Bot, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 
+from src.bot.filters import CommandFilter
 from src.bot.filters.callback import CallbackFilter
 from src.bot.lexicon.texts import TextsRU
 from src.bot.navigation import NavigationManager
+from src.bot.screen import ScreenMedia
 from src.bot.session import UserSession
 from src.core.enums import (
     AnswersStatusEnum,
-    HomeworkMediaTypeEnum,
+    CommandsEnum,
     InlineKeyboardTypeEnum,
     ReplyKeyboardTypeEnum,
 )
@@ -39,7 +42,14 @@ from src.core.schemas import (
     TeacherGradingCallbackSchema,
     TeacherGradingListCallbackSchema,
 )
-from src.db.services import AnswerFilesService, AnswersService, HomeworksService
+from src.core.send_scheduler import SendPriority, send_priority
+from src.core.throttling import throttle
+from src.core.update_stats import query_budget
+from src.db.services import (
+    AnswerFilesService,
+    AnswersService,
+    TeachersService,
+)
 
 teacher_grading_router = Router()
 logger = get_logger(__name__)
@@ -57,8 +67,17 @@ _STATE_TOTAL_PAGES = "grading_total_pages"
 _STATE_TEMP_GRADE = "grading_temp_grade"
 _STATE_TEMP_COMMENT = "grading_temp_comment"
 _STATE_IS_SENT = "grading_is_sent"
-_STATE_MODE = "grading_mode"  # "check" или "reviewed"
-_STATE_PHOTO_MSG_IDS = "grading_photo_message_ids"
+_STATE_MODE = "grading_mode"  # "check", "queue" или "reviewed"
+# Экран проверки: сообщение с ответом и файлы под ним (ScreenRenderer)
+_SCREEN = "grading"
+
+# Тексты ошибок оценивания по AnswerGradeResultSchema.error_code
+_GRADE_ERROR_TEXTS = {
+    "answer_not_found": TextsRU.TEACHER_GRADING_ANSWER_NOT_FOUND,
+    "forbidden": TextsRU.TEACHER_GRADING_FORBIDDEN,
+    "claimed": TextsRU.TEACHER_GRADING_CLAIMED,
+    "conflict": TextsRU.TEACHER_GRADING_CONFLICT,
+}
 
 
 def _format_dt(dt: Optional[datetime]) -> str:
@@ -72,17 +91,8 @@ def _format_dt(dt: Optional[datetime]) -> str:
 
 
 async def _delete_previous_photos(state: FSMContext, session: UserSession) -> None:
-    """Удаление предыдущих фото из чата"""
-    data = await state.get_data()
-    msg_ids = data.get(_STATE_PHOTO_MSG_IDS) or []
-    if not isinstance(msg_ids, list) or not msg_ids:
-        return
-    for mid in msg_ids:
-        try:
-            await session.delete_message(int(mid))
-        except Exception:
-            pass
-    await state.update_data({_STATE_PHOTO_MSG_IDS: []})
+    """Удаление файлов ответа под экраном проверки"""
+    await session.screen(state, _SCREEN).sync_media([])
 
 
 async def _send_answer_files(
@@ -90,33 +100,16 @@ async def _send_answer_files(
     state: FSMContext,
     session: UserSession,
     answer_id: int,
+    reuse: bool = True,
 ) -> None:
-    """Отправка файлов, прикрепленных к ответу"""
-    await _delete_previous_photos(state, session)
-
+    """
+    Показ файлов ответа: сообщения файлов предыдущего ответа переиспользуются
+    (reuse=False — при открытии экрана, старые файлы удаляются)
+    """
     files = await AnswerFilesService.get_files_by_answer_id(answer_id)
-    media_ids: list[int] = []
-    for f in files:
-        tf = f.telegram_file
-        if not tf:
-            continue
-        try:
-            if tf.file_type == HomeworkMediaTypeEnum.PHOTO.value:
-                msg = await session.message.answer_photo(photo=tf.file_id)
-                media_ids.append(msg.message_id)
-            elif tf.file_type == HomeworkMediaTypeEnum.DOCUMENT.value:
-                msg = await session.message.answer_document(
-                    document=tf.file_id, caption=tf.caption
-                )
-                media_ids.append(msg.message_id)
-            elif tf.file_type == HomeworkMediaTypeEnum.VIDEO.value:
-                msg = await session.message.answer_video(
-                    video=tf.file_id, caption=tf.caption
-                )
-                media_ids.append(msg.message_id)
-        except Exception:
-            continue
-    await state.update_data({_STATE_PHOTO_MSG_IDS: media_ids})
+    await session.screen(state, _SCREEN).sync_media(
+        ScreenMedia.from_files(files), reuse=reuse
+    )
 
 
 def _build_answer_text(
@@ -199,8 +192,12 @@ def _build_grading_keyboard(
     has_grade: bool = False,
     has_comment: bool = False,
     is_sent: bool = False,
+    queue: bool = False,
 ) -> dict:
-    """Клавиатура для проверки ответа с визуальной индикацией"""
+    """
+    Клавиатура для проверки ответа с визуальной индикацией
+    (queue=True — очередь проверки: вместо пагинации кнопка следующего ответа)
+    """
     extra_buttons = []
 
     # Кнопка установки оценки (с галочкой если есть)
@@ -267,6 +264,21 @@ def _build_grading_keyboard(
         )
     )
 
+    if queue:
+        extra_buttons.append(
+            InlineButtonSchema(
+                text=TextsRU.TEACHER_GRADING_SKIP_BUTTON,
+                callback_data=TeacherGradingCallbackSchema(
+                    action="skip",
+                    homework_id=homework_id,
+                    answer_id=answer_id,
+                ).pack(),
+            )
+        )
+        return PaginatedListKeyboardSchema(
+            items=[], extra_buttons=extra_buttons
+        ).model_dump()
+
     return PaginatedListKeyboardSchema(
         items=[],
         extra_buttons=extra_buttons,
@@ -337,9 +349,6 @@ async def show_answers_to_check_handler(
     nav_manager = NavigationManager(state)
     await nav_manager.set_cancel_target(await nav_manager.get_previous())
 
-    # Сначала удаляем все предыдущие фото/файлы (от задания)
-    await _delete_previous_photos(state, session)
-
     # Получаем ответы со статусом SENT
     page_data = await AnswersService.get_answers_page_by_homework_id(
         homework_id=callback_data.homework_id,
@@ -349,11 +358,13 @@ async def show_answers_to_check_handler(
     )
 
     if not page_data.items:
-        await session.edit_message(
+        await session.screen(state, _SCREEN).render(
             TextsRU.TEACHER_GRADING_NO_ANSWERS_TO_CHECK,
             message_id=session.message.message_id,
             reply_markup=None,
+            force=True,
         )
+        await _delete_previous_photos(state, session)
         return
 
     answer = page_data.items[0]
@@ -374,10 +385,12 @@ async def show_answers_to_check_handler(
     )
 
     # Отправляем файлы ответа
-    await _send_answer_files(state=state, session=session, answer_id=answer.answer_id)
+    await _send_answer_files(
+        state=state, session=session, answer_id=answer.answer_id, reuse=False
+    )
 
     # Отправляем сообщение с ответом
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         _build_answer_text(answer, temp_grade=None, temp_comment=None),
         message_id=session.message.message_id,
         reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_CHECK,
@@ -390,6 +403,7 @@ async def show_answers_to_check_handler(
             has_comment=False,
             is_sent=False,
         ),
+        force=True,
     )
 
 
@@ -409,9 +423,6 @@ async def show_reviewed_answers_handler(
     nav_manager = NavigationManager(state)
     await nav_manager.set_cancel_target(await nav_manager.get_previous())
 
-    # Сначала удаляем все предыдущие фото/файлы (от задания)
-    await _delete_previous_photos(state, session)
-
     # Получаем ответы со статусом REVIEWED
     page_data = await AnswersService.get_answers_page_by_homework_id(
         homework_id=callback_data.homework_id,
@@ -421,11 +432,13 @@ async def show_reviewed_answers_handler(
     )
 
     if not page_data.items:
-        await session.edit_message(
+        await session.screen(state, _SCREEN).render(
             TextsRU.TEACHER_GRADING_NO_REVIEWED_ANSWERS,
             message_id=session.message.message_id,
             reply_markup=None,
+            force=True,
         )
+        await _delete_previous_photos(state, session)
         return
 
     answer = page_data.items[0]
@@ -443,10 +456,12 @@ async def show_reviewed_answers_handler(
     )
 
     # Отправляем файлы ответа
-    await _send_answer_files(state=state, session=session, answer_id=answer.answer_id)
+    await _send_answer_files(
+        state=state, session=session, answer_id=answer.answer_id, reuse=False
+    )
 
     # Отправляем сообщение с проверенным ответом
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         _build_reviewed_answer_text(answer),
         message_id=session.message.message_id,
         reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_REVIEWED,
@@ -456,6 +471,7 @@ async def show_reviewed_answers_handler(
             page=page_data.page,
             total_pages=page_data.total_pages,
         ),
+        force=True,
     )
 
 
@@ -465,6 +481,8 @@ async def show_reviewed_answers_handler(
 @teacher_grading_router.callback_query(
     CallbackFilter(PaginationCallbackSchema, key=_PAGINATION_KEY_CHECK)
 )
+@query_budget(sql=3, telegram=12)
+@throttle(rate=1, burst=3, coalesce=True)
 async def grading_check_pagination_handler(
     _: CallbackQuery,
     state: FSMContext,
@@ -490,7 +508,7 @@ async def grading_check_pagination_handler(
     )
 
     if not page_data.items:
-        await session.edit_message(
+        await session.screen(state, _SCREEN).render(
             TextsRU.TEACHER_GRADING_NO_ANSWERS_TO_CHECK,
             message_id=editing_message_id,
             reply_markup=None,
@@ -517,7 +535,7 @@ async def grading_check_pagination_handler(
     await _send_answer_files(state=state, session=session, answer_id=answer.answer_id)
 
     # Обновляем сообщение (сбрасываем временные данные для нового ответа)
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         _build_answer_text(answer, temp_grade=None, temp_comment=None),
         message_id=editing_message_id,
         reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_CHECK,
@@ -536,6 +554,8 @@ async def grading_check_pagination_handler(
 @teacher_grading_router.callback_query(
     CallbackFilter(PaginationCallbackSchema, key=_PAGINATION_KEY_REVIEWED)
 )
+@query_budget(sql=3, telegram=12)
+@throttle(rate=1, burst=3, coalesce=True)
 async def grading_reviewed_pagination_handler(
     _: CallbackQuery,
     state: FSMContext,
@@ -561,7 +581,7 @@ async def grading_reviewed_pagination_handler(
     )
 
     if not page_data.items:
-        await session.edit_message(
+        await session.screen(state, _SCREEN).render(
             TextsRU.TEACHER_GRADING_NO_REVIEWED_ANSWERS,
             message_id=editing_message_id,
             reply_markup=None,
@@ -585,7 +605,7 @@ async def grading_reviewed_pagination_handler(
     await _send_answer_files(state=state, session=session, answer_id=answer.answer_id)
 
     # Обновляем сообщение
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         _build_reviewed_answer_text(answer),
         message_id=editing_message_id,
         reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_REVIEWED,
@@ -664,7 +684,7 @@ async def set_grade_process_handler(
         return
 
     # Обновляем существующее сообщение (НЕ отправляем файлы заново)
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         _build_answer_text(answer, temp_grade=grade, temp_comment=temp_comment),
         message_id=editing_message_id,
         reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_CHECK,
@@ -676,6 +696,7 @@ async def set_grade_process_handler(
             has_grade=True,
             has_comment=bool(temp_comment),
             is_sent=is_sent,
+            queue=data.get(_STATE_MODE) == "queue",
         ),
     )
 
@@ -747,7 +768,7 @@ async def set_comment_process_handler(
         return
 
     # Обновляем существующее сообщение (НЕ отправляем файлы заново)
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         _build_answer_text(answer, temp_grade=temp_grade, temp_comment=comment),
         message_id=editing_message_id,
         reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_CHECK,
@@ -759,6 +780,7 @@ async def set_comment_process_handler(
             has_grade=temp_grade is not None,
             has_comment=bool(comment),
             is_sent=is_sent,
+            queue=data.get(_STATE_MODE) == "queue",
         ),
     )
 
@@ -812,37 +834,37 @@ async def send_grade_handler(
         )
         return
 
-    # Получаем ответ и задание
-    answer = await AnswersService.get_by_id(callback_data.answer_id)
-    if not answer:
-        await session.answer(TextsRU.TRY_AGAIN)
-        return
-
-    homework = await HomeworksService.get_by_id(callback_data.homework_id)
-    if not homework:
-        await session.answer(TextsRU.TRY_AGAIN)
-        return
-
-    # Сохраняем оценку в БД
-    await AnswersService.grade(
+    # Сохраняем оценку в БД: ответ должен быть ещё не проверен (оптимистичная
+    # блокировка). Владельца, отсутствие ответа и конфликт сообщает сам UPDATE
+    result = await session.teacher_manager().grade_answer(
         answer_id=callback_data.answer_id,
         grade=temp_grade,
         teacher_comment=temp_comment,
         status=AnswersStatusEnum.REVIEWED,
         checked_at=datetime.now(),
+        expected_status=AnswersStatusEnum.SENT,
+        expected_checked_at=None,
     )
+    if not result.ok:
+        await session.answer_callback_query(
+            _GRADE_ERROR_TEXTS[result.error_code], show_alert=True
+        )
+        return
 
-    # Отправляем уведомление студенту
+    # Отправляем уведомление студенту: ответ (со студентом и заданием)
+    # читается только после успешной оценки
+    answer = await AnswersService.get_by_id(callback_data.answer_id)
     comment_text = temp_comment or TextsRU.TEACHER_GRADING_NO_COMMENT
     try:
-        await bot.send_message(
-            chat_id=answer.student.user_id,
-            text=TextsRU.TEACHER_GRADING_STUDENT_NOTIFICATION.format(
-                homework_title=homework.title,
-                grade=temp_grade,
-                comment=comment_text,
-            ),
-        )
+        with send_priority(SendPriority.TRANSACTIONAL):
+            await bot.send_message(
+                chat_id=answer.student.user_id,
+                text=TextsRU.TEACHER_GRADING_STUDENT_NOTIFICATION.format(
+                    homework_title=answer.homework.title,
+                    grade=temp_grade,
+                    comment=comment_text,
+                ),
+            )
     except Exception:
         pass  # Не критично, если не удалось отправить уведомление
 
@@ -850,6 +872,13 @@ async def send_grade_handler(
         TextsRU.TEACHER_GRADING_SEND_SUCCESS, show_alert=True
     )
 
+    if data.get(_STATE_MODE) == "queue":
+        teacher_id = await TeachersService.get_id_by_user_id(session.user_id)
+        await _show_next_queue_answer(
+            state, session, teacher_id, message_id=editing_message_id
+        )
+        return
+
     # Проверяем, есть ли еще непроверенные ответы
     next_page_data = await AnswersService.get_answers_page_by_homework_id(
         homework_id=callback_data.homework_id,
@@ -882,7 +911,7 @@ async def send_grade_handler(
         )
 
         # Обновляем сообщение следующим ответом
-        await session.edit_message(
+        await session.screen(state, _SCREEN).render(
             _build_answer_text(next_answer, temp_grade=None, temp_comment=None),
             message_id=editing_message_id,
             reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_CHECK,
@@ -898,25 +927,146 @@ async def send_grade_handler(
         )
     else:
         # Нет больше непроверенных ответов - показываем уведомление
-        await _delete_previous_photos(state, session)
+        await _finish_grading(state, session, TextsRU.TEACHER_GRADING_ALL_CHECKED)
+
+
+async def _finish_grading(state: FSMContext, session: UserSession, text: str) -> None:
+    """Все ответы проверены: закрываем экран и возвращаемся на предыдущий шаг"""
+    await _delete_previous_photos(state, session)
+    await session.answer(text, reply_markup=None)
+    await session.remove()
+    # Очищаем состояние и данные, но сохраняем навигацию
+    nav_manager = NavigationManager(state)
+    await nav_manager.clear_cancel_target()
+    await nav_manager.clear_state_and_data_keep_navigation()
+    previous_step = await nav_manager.pop_previous(
+        default_keyboard=ReplyKeyboardTypeEnum.TEACHER,
+        default_text=TextsRU.SELECT_ACTION,
+    )
+    if previous_step:
         await session.answer(
-            TextsRU.TEACHER_GRADING_ALL_CHECKED,
-            reply_markup=None,
+            previous_step.text or TextsRU.SELECT_ACTION,
+            reply_markup=previous_step.keyboard,
         )
-        await session.remove()
-        # Очищаем состояние и данные, но сохраняем навигацию
-        nav_manager = NavigationManager(state)
-        await nav_manager.clear_cancel_target()
-        await nav_manager.clear_state_and_data_keep_navigation()
-        previous_step = await nav_manager.pop_previous(
-            default_keyboard=ReplyKeyboardTypeEnum.TEACHER,
-            default_text=TextsRU.SELECT_ACTION,
-        )
-        if previous_step:
+
+
+# ==================== Очередь проверки ====================
+
+
+async def _show_next_queue_answer(
+    state: FSMContext,
+    session: UserSession,
+    teacher_id: int,
+    *,
+    message_id: Optional[int],
+    after: Optional[tuple[datetime, int]] = None,
+) -> None:
+    """
+    Берёт в аренду следующий ответ очереди проверки (claim_next_for_review)
+    и показывает его на экране message_id (None — новым сообщением).
+    Пустая очередь завершает проверку.
+    """
+    answer = await AnswersService.claim_next_for_review(teacher_id, after=after)
+    if answer is None and after is not None:
+        # Дальше пропущенного ответа пусто: очередь просматривается с начала
+        answer = await AnswersService.claim_next_for_review(teacher_id)
+    if answer is None:
+        if message_id is None:
+            await session.answer(TextsRU.TEACHER_GRADING_NO_ANSWERS_TO_CHECK)
+        else:
+            await _finish_grading(
+                state, session, TextsRU.TEACHER_GRADING_QUEUE_ALL_CHECKED
+            )
+        return
+
+    text = _build_answer_text(answer, temp_grade=None, temp_comment=None)
+    keyboard_data = _build_grading_keyboard(
+        homework_id=answer.homework_id,
+        answer_id=answer.answer_id,
+        page=1,
+        total_pages=1,
+        queue=True,
+    )
+    opened = message_id is None
+    if opened:
+        message_id = (
             await session.answer(
-                previous_step.text or TextsRU.SELECT_ACTION,
-                reply_markup=previous_step.keyboard,
+                text,
+                reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_CHECK,
+                keyboard_data=keyboard_data,
             )
+        )[0]
+    else:
+        await session.screen(state, _SCREEN).render(
+            text,
+            message_id=message_id,
+            reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_CHECK,
+            keyboard_data=keyboard_data,
+        )
+
+    await state.update_data(
+        {
+            _STATE_EDITING_MESSAGE_ID: message_id,
+            _STATE_CURRENT_ANSWER_ID: answer.answer_id,
+            _STATE_CURRENT_HOMEWORK_ID: answer.homework_id,
+            _STATE_CURRENT_PAGE: 1,
+            _STATE_TOTAL_PAGES: 1,
+            _STATE_MODE: "queue",
+            _STATE_IS_SENT: False,
+            _STATE_TEMP_GRADE: None,
+            _STATE_TEMP_COMMENT: None,
+        }
+    )
+    await _send_answer_files(
+        state=state, session=session, answer_id=answer.answer_id, reuse=not opened
+    )
+
+
+@teacher_grading_router.message(CommandFilter(CommandsEnum.TEACHER_REVIEW_QUEUE))
+async def review_queue_handler(
+    _: Message, state: FSMContext, session: UserSession
+) -> None:
+    """Очередь проверки: первый свободный ответ по всем заданиям преподавателя"""
+    teacher_id = await TeachersService.get_id_by_user_id(session.user_id)
+    if not teacher_id:
+        await session.answer(TextsRU.TEACHER_NOT_FOUND)
+        return
+
+    # Устанавливаем cancel_target для возврата к меню заданий
+    nav_manager = NavigationManager(state)
+    await nav_manager.set_cancel_target(await nav_manager.get_previous())
+
+    await _show_next_queue_answer(state, session, teacher_id, message_id=None)
+
+
+@teacher_grading_router.callback_query(
+    CallbackFilter(TeacherGradingCallbackSchema, action="skip")
+)
+async def skip_queue_answer_handler(
+    _: CallbackQuery,
+    state: FSMContext,
+    session: UserSession,
+    callback_data: TeacherGradingCallbackSchema,
+) -> None:
+    """Возврат ответа в очередь (снятие аренды) и переход к следующему"""
+    await session.answer_callback_query()
+
+    data = await state.get_data()
+    editing_message_id = data.get(_STATE_EDITING_MESSAGE_ID, session.message.message_id)
+    teacher_id = await TeachersService.get_id_by_user_id(session.user_id)
+    if not teacher_id:
+        await session.answer(TextsRU.TEACHER_NOT_FOUND)
+        return
+
+    await AnswersService.release_claim(callback_data.answer_id, teacher_id)
+    answer = await AnswersService.get_by_id(callback_data.answer_id)
+    await _show_next_queue_answer(
+        state,
+        session,
+        teacher_id,
+        message_id=editing_message_id,
+        after=(answer.sent_at, answer.answer_id) if answer else None,
+    )
 
 
 # ==================== Редактирование оценки ====================
@@ -984,41 +1134,43 @@ async def edit_grade_process_handler(
         await nav_manager.clear_state_and_data_keep_navigation()
         return
 
-    # Получаем ответ и задание
+    # Текущий ответ (с заданием и студентом): второе поле остаётся прежним,
+    # (status, checked_at) — для оптимистичной блокировки
     answer = await AnswersService.get_by_id(int(answer_id))
     if not answer:
-        await session.answer(TextsRU.TRY_AGAIN)
-        await nav_manager.clear_cancel_target()
-        await nav_manager.clear_state_and_data_keep_navigation()
-        return
-
-    homework = await HomeworksService.get_by_id(int(homework_id))
-    if not homework:
-        await session.answer(TextsRU.TRY_AGAIN)
+        await session.answer(_GRADE_ERROR_TEXTS["answer_not_found"])
         await nav_manager.clear_cancel_target()
         await nav_manager.clear_state_and_data_keep_navigation()
         return
 
     # Сохраняем новую оценку (комментарий оставляем прежним)
-    await AnswersService.grade(
+    result = await session.teacher_manager().grade_answer(
         answer_id=int(answer_id),
         grade=grade,
         teacher_comment=answer.teacher_comment,
         status=AnswersStatusEnum.REVIEWED,
         checked_at=datetime.now(),
+        expected_status=answer.status,
+        expected_checked_at=answer.checked_at,
     )
+    if not result.ok:
+        await session.answer(_GRADE_ERROR_TEXTS[result.error_code])
+        await nav_manager.clear_cancel_target()
+        await nav_manager.clear_state_and_data_keep_navigation()
+        return
 
     # Отправляем уведомление студенту об изменении
     comment_text = answer.teacher_comment or TextsRU.TEACHER_GRADING_NO_COMMENT
     try:
-        await bot.send_message(
-            chat_id=answer.student.user_id,
-            text=TextsRU.TEACHER_GRADING_EDIT_NOTIFICATION.format(
-                homework_title=homework.title,
-                grade=grade,
-                comment=comment_text,
-            ),
-        )
+        with send_priority(SendPriority.TRANSACTIONAL):
+            await bot.send_message(
+                chat_id=answer.student.user_id,
+                text=TextsRU.TEACHER_GRADING_EDIT_NOTIFICATION.format(
+                    homework_title=answer.homework.title,
+                    grade=grade,
+                    comment=comment_text,
+                ),
+            )
     except Exception:
         pass
 
@@ -1069,7 +1221,7 @@ async def edit_grade_process_handler(
     )
 
     # Редактируем существующее сообщение с обновленными данными
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         _build_reviewed_answer_text(updated_answer),
         message_id=editing_message_id,
         reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_REVIEWED,
@@ -1149,41 +1301,43 @@ async def edit_comment_process_handler(
         await nav_manager.clear_state_and_data_keep_navigation()
         return
 
-    # Получаем ответ и задание
+    # Текущий ответ (с заданием и студентом): второе поле остаётся прежним,
+    # (status, checked_at) — для оптимистичной блокировки
     answer = await AnswersService.get_by_id(int(answer_id))
     if not answer:
-        await session.answer(TextsRU.TRY_AGAIN)
-        await nav_manager.clear_cancel_target()
-        await nav_manager.clear_state_and_data_keep_navigation()
-        return
-
-    homework = await HomeworksService.get_by_id(int(homework_id))
-    if not homework:
-        await session.answer(TextsRU.TRY_AGAIN)
+        await session.answer(_GRADE_ERROR_TEXTS["answer_not_found"])
         await nav_manager.clear_cancel_target()
         await nav_manager.clear_state_and_data_keep_navigation()
         return
 
     # Сохраняем новый комментарий (оценку оставляем прежней)
-    await AnswersService.grade(
+    result = await session.teacher_manager().grade_answer(
         answer_id=int(answer_id),
         grade=answer.grade,
         teacher_comment=comment,
         status=AnswersStatusEnum.REVIEWED,
         checked_at=datetime.now(),
+        expected_status=answer.status,
+        expected_checked_at=answer.checked_at,
     )
+    if not result.ok:
+        await session.answer(_GRADE_ERROR_TEXTS[result.error_code])
+        await nav_manager.clear_cancel_target()
+        await nav_manager.clear_state_and_data_keep_navigation()
+        return
 
     # Отправляем уведомление студенту об изменении
     comment_text = comment or TextsRU.TEACHER_GRADING_NO_COMMENT
     try:
-        await bot.send_message(
-            chat_id=answer.student.user_id,
-            text=TextsRU.TEACHER_GRADING_COMMENT_EDIT_NOTIFICATION.format(
-                homework_title=homework.title,
-                grade=answer.grade,
-                comment=comment_text,
-            ),
-        )
+        with send_priority(SendPriority.TRANSACTIONAL):
+            await bot.send_message(
+                chat_id=answer.student.user_id,
+                text=TextsRU.TEACHER_GRADING_COMMENT_EDIT_NOTIFICATION.format(
+                    homework_title=answer.homework.title,
+                    grade=answer.grade,
+                    comment=comment_text,
+                ),
+            )
     except Exception:
         pass
 
@@ -1199,7 +1353,7 @@ async def edit_comment_process_handler(
         await _delete_previous_photos(state, session)
         await nav_manager.clear_cancel_target()
         await nav_manager.clear_state_and_data_keep_navigation()
-        await session.edit_message(
+        await session.screen(state, _SCREEN).render(
             TextsRU.TEACHER_GRADING_NO_REVIEWED_ANSWERS,
             message_id=editing_message_id,
             reply_markup=None,
@@ -1230,7 +1384,7 @@ async def edit_comment_process_handler(
     )
 
     # Редактируем существующее сообщение с обновленными данными
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         _build_reviewed_answer_text(updated_answer),
         message_id=editing_message_id,
         reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_REVIEWED,
@@ -1265,7 +1419,7 @@ async def clear_grade_handler(
     editing_message_id = data.get(_STATE_EDITING_MESSAGE_ID, session.message.message_id)
 
     # Проверяем, что мы в режиме проверки
-    if data.get(_STATE_MODE) != "check":
+    if data.get(_STATE_MODE) not in ("check", "queue"):
         return
 
     # Проверяем, что это правильный ответ
@@ -1285,14 +1439,14 @@ async def clear_grade_handler(
     # Получаем ответ для обновления
     answer = await AnswersService.get_by_id(callback_data.answer_id)
     if not answer:
-        await session.edit_message(
+        await session.screen(state, _SCREEN).render(
             TextsRU.TEACHER_GRADING_ANSWER_NOT_FOUND,
             message_id=editing_message_id,
         )
         return
 
     # Обновляем сообщение
-    await session.edit_message(
+    await session.screen(state, _SCREEN).render(
         _build_answer_text(answer, temp_grade=None, temp_comment=None),
         message_id=editing_message_id,
         reply_markup=InlineKeyboardTypeEnum.TEACHER_GRADING_CHECK,
@@ -1304,6 +1458,7 @@ async def clear_grade_handler(
             has_grade=False,
             has_comment=False,
             is_sent=False,
+            queue=data.get(_STATE_MODE) == "queue",
         ),
     )
 
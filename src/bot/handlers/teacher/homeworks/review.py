@@ -11,15 +11,16 @@ from src.bot.filters import CommandFilter
 from src.bot.filters.callback import CallbackFilter
 from src.bot.lexicon.texts import TextsRU
 from src.bot.navigation import NavigationHelper
+from src.bot.screen import ScreenMedia
 from src.bot.session import UserSession
 from src.core.enums import (
     AnswersStatusEnum,
     CommandsEnum,
-    HomeworkMediaTypeEnum,
     InlineKeyboardTypeEnum,
     ReplyKeyboardTypeEnum,
 )
 from src.core.schemas import (
+    HomeworkAnswerStatsSchema,
     InlineButtonSchema,
     PaginatedListKeyboardSchema,
     PaginationCallbackSchema,
@@ -27,19 +28,15 @@ from src.core.schemas import (
     TeacherGradingListCallbackSchema,
     TeacherHomeworkCallbackSchema,
 )
-from src.db.services import (
-    AnswersService,
-    HomeworkFilesService,
-    HomeworkGroupsService,
-    HomeworksService,
-    TeachersService,
-)
+from src.core.throttling import throttle
+from src.db.services import HomeworkCardView, HomeworkFilesService, TeachersService
 
 teacher_homeworks_review_router = Router()
 
 _PAGINATION_KEY = "teacher_homeworks"
 _PER_PAGE = 1
-_STATE_PHOTO_MSG_IDS_KEY = "teacher_homeworks_photo_message_ids"
+# Экран списка заданий: файлы задания под карточкой (ScreenRenderer)
+_SCREEN = "teacher_homeworks"
 _STATE_CURRENT_PAGE_KEY = "teacher_homeworks_current_page"
 _STATE_TOTAL_PAGES_KEY = "teacher_homeworks_total_pages"
 
@@ -54,16 +51,7 @@ def _format_dt(dt: Optional[datetime]) -> str:
 
 
 async def _delete_previous_photos(state: FSMContext, session: UserSession) -> None:
-    data = await state.get_data()
-    msg_ids = data.get(_STATE_PHOTO_MSG_IDS_KEY) or []
-    if not isinstance(msg_ids, list) or not msg_ids:
-        return
-    for mid in msg_ids:
-        try:
-            await session.delete_message(int(mid))
-        except Exception:
-            pass
-    await state.update_data({_STATE_PHOTO_MSG_IDS_KEY: []})
+    await session.screen(state, _SCREEN).sync_media([])
 
 
 async def _send_homework_photos(
@@ -71,31 +59,14 @@ async def _send_homework_photos(
     state: FSMContext,
     session: UserSession,
     homework_id: int,
+    reuse: bool = True,
 ) -> None:
-    await _delete_previous_photos(state, session)
+    # Сообщения файлов предыдущего задания переиспользуются (editMessageMedia);
+    # отменённый рендер оставляет в состоянии экрана только дошедшие сообщения
     files = await HomeworkFilesService.get_files_by_homework_id(homework_id)
-    media_ids: list[int] = []
-    for f in files:
-        tf = f.telegram_file
-        if not tf:
-            continue
-        try:
-            if tf.file_type == HomeworkMediaTypeEnum.PHOTO.value:
-                msg = await session.message.answer_photo(photo=tf.file_id)
-                media_ids.append(msg.message_id)
-            elif tf.file_type == HomeworkMediaTypeEnum.DOCUMENT.value:
-                msg = await session.message.answer_document(
-                    document=tf.file_id, caption=tf.caption
-                )
-                media_ids.append(msg.message_id)
-            elif tf.file_type == HomeworkMediaTypeEnum.VIDEO.value:
-                msg = await session.message.answer_video(
-                    video=tf.file_id, caption=tf.caption
-                )
-                media_ids.append(msg.message_id)
-        except Exception:
-            continue
-    await state.update_data({_STATE_PHOTO_MSG_IDS_KEY: media_ids})
+    await session.screen(state, _SCREEN).sync_media(
+        ScreenMedia.from_files(files), reuse=reuse
+    )
 
 
 async def _build_homework_view_text(
@@ -117,16 +88,16 @@ async def _build_homework_view_text(
 
 
 async def _build_homework_view_keyboard(
-    *, page: int, total_pages: int, homework_id: int
+    *,
+    page: int,
+    total_pages: int,
+    homework_id: int,
+    stats: HomeworkAnswerStatsSchema,
 ) -> dict:
 
     # Проверяем наличие ответов для проверки и проверенных ответов
-    sent_count = await AnswersService.count_by_homework_id_and_status(
-        homework_id, AnswersStatusEnum.SENT
-    )
-    reviewed_count = await AnswersService.count_by_homework_id_and_status(
-        homework_id, AnswersStatusEnum.REVIEWED
-    )
+    sent_count = stats.count(AnswersStatusEnum.SENT)
+    reviewed_count = stats.count(AnswersStatusEnum.REVIEWED)
 
     extra_buttons = []
 
@@ -192,8 +163,8 @@ async def teacher_homeworks_review_handler(
         TextsRU.SELECT_ACTION,
     )
 
-    teacher = await TeachersService.get_by_user_id(session.user_id)
-    if not teacher:
+    teacher_id = await TeachersService.get_id_by_user_id(session.user_id)
+    if not teacher_id:
         await session.answer(TextsRU.TEACHER_NOT_FOUND)
         return
 
@@ -202,8 +173,8 @@ async def teacher_homeworks_review_handler(
         TextsRU.SELECT_ACTION, reply_markup=ReplyKeyboardTypeEnum.TEACHER_HOMEWORKS
     )
 
-    page_data = await HomeworksService.get_homeworks_page_by_teacher_id(
-        teacher.teacher_id, page=1, per_page=_PER_PAGE
+    page_data = await HomeworkCardView.get_page_by_teacher_id(
+        teacher_id, page=1, per_page=_PER_PAGE
     )
     if not page_data.items:
         await session.answer(
@@ -218,24 +189,24 @@ async def teacher_homeworks_review_handler(
         }
     )
 
-    hw = page_data.items[0]
-    groups = await HomeworkGroupsService.get_groups_by_homework_id(hw.homework_id)
-    answers_count = await AnswersService.count_by_homework_id(hw.homework_id)
+    card = page_data.items[0]
+    hw, stats = card.homework, card.stats
 
     await _send_homework_photos(
-        state=state, session=session, homework_id=hw.homework_id
+        state=state, session=session, homework_id=hw.homework_id, reuse=False
     )
     await session.answer(
         await _build_homework_view_text(
             homework=hw,
-            groups_names=[g.name for g in groups],
-            answers_count=answers_count,
+            groups_names=card.group_names,
+            answers_count=stats.answers_count,
         ),
         reply_markup=InlineKeyboardTypeEnum.TEACHER_HOMEWORK_REVIEW,
         keyboard_data=await _build_homework_view_keyboard(
             page=page_data.page,
             total_pages=page_data.total_pages,
             homework_id=hw.homework_id,
+            stats=stats,
         ),
     )
 
@@ -243,6 +214,7 @@ async def teacher_homeworks_review_handler(
 @teacher_homeworks_review_router.callback_query(
     CallbackFilter(PaginationCallbackSchema, key=_PAGINATION_KEY)
 )
+@throttle(rate=1, burst=3, coalesce=True)
 async def teacher_homeworks_pagination_handler(
     _: CallbackQuery,
     state: FSMContext,
@@ -251,13 +223,13 @@ async def teacher_homeworks_pagination_handler(
 ) -> None:
     await session.answer_callback_query()
 
-    teacher = await TeachersService.get_by_user_id(session.user_id)
-    if not teacher:
+    teacher_id = await TeachersService.get_id_by_user_id(session.user_id)
+    if not teacher_id:
         await session.answer(TextsRU.TEACHER_NOT_FOUND)
         return
 
-    page_data = await HomeworksService.get_homeworks_page_by_teacher_id(
-        teacher.teacher_id, page=callback_data.page, per_page=_PER_PAGE
+    page_data = await HomeworkCardView.get_page_by_teacher_id(
+        teacher_id, page=callback_data.page, per_page=_PER_PAGE
     )
     if not page_data.items:
         await session.edit_message(
@@ -274,9 +246,8 @@ async def teacher_homeworks_pagination_handler(
         }
     )
 
-    hw = page_data.items[0]
-    groups = await HomeworkGroupsService.get_groups_by_homework_id(hw.homework_id)
-    answers_count = await AnswersService.count_by_homework_id(hw.homework_id)
+    card = page_data.items[0]
+    hw, stats = card.homework, card.stats
 
     await _send_homework_photos(
         state=state, session=session, homework_id=hw.homework_id
@@ -284,8 +255,8 @@ async def teacher_homeworks_pagination_handler(
     await session.edit_message(
         await _build_homework_view_text(
             homework=hw,
-            groups_names=[g.name for g in groups],
-            answers_count=answers_count,
+            groups_names=card.group_names,
+            answers_count=stats.answers_count,
         ),
         message_id=session.message.message_id,
         reply_markup=InlineKeyboardTypeEnum.TEACHER_HOMEWORK_REVIEW,
@@ -293,5 +264,6 @@ async def teacher_homeworks_pagination_handler(
             page=page_data.page,
             total_pages=page_data.total_pages,
             homework_id=hw.homework_id,
+            stats=stats,
         ),
     )
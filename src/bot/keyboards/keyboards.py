@@ -53,7 +53,10 @@ REPLY_KEYBOARDS: Dict[ReplyKeyboardTypeEnum, List[List[str]]] = {
         [COMMAND_DESCRIPTIONS_RU[CommandsEnum.TEACHER_GROUP_CREATE]],
     ],
     ReplyKeyboardTypeEnum.TEACHER_HOMEWORKS: [
-        [COMMAND_DESCRIPTIONS_RU[CommandsEnum.TEACHER_HOMEWORK_CREATE]],
+        [
+            COMMAND_DESCRIPTIONS_RU[CommandsEnum.TEACHER_HOMEWORK_CREATE],
+            COMMAND_DESCRIPTIONS_RU[CommandsEnum.TEACHER_REVIEW_QUEUE],
+        ],
     ],
     ReplyKeyboardTypeEnum.TEACHER_GROUP_VIEW: [
         [
@@ -14,6 +14,7 @@ COMMAND_DESCRIPTIONS_RU: dict[CommandsEnum, str] = {
     CommandsEnum.TEACHER_ROLE: "Преподаватель",
     CommandsEnum.TEACHER_HOMEWORKS: "Посмотреть задания",
     CommandsEnum.TEACHER_HOMEWORK_CREATE: "Создать задание",
+    CommandsEnum.TEACHER_REVIEW_QUEUE: "Очередь проверки",
     CommandsEnum.TEACHER_GROUPS: "Посмотреть группы",
     CommandsEnum.TEACHER_GROUP_CREATE: "Создать группу",
     CommandsEnum.TEACHER_GROUP_EDIT: "Редактировать",
@@ -165,6 +165,7 @@ class TextsRU(StrEnum):
     CANCEL = "❌ Отмена"
 
     TRY_AGAIN = "🔄 Попробуйте ещё раз"
+    THROTTLED = "⏳ Слишком много запросов, подождите пару секунд"
 
     # --- Teacher: groups ---
     TEACHER_GROUPS_TITLE = "👥 <b>Ваши группы</b>"
@@ -272,6 +273,7 @@ class TextsRU(StrEnum):
     TEACHER_GRADING_SEND_BUTTON = "📤 Отправить студенту"
     TEACHER_GRADING_SENT_BUTTON = "✅ Отправлено"
     TEACHER_GRADING_CLEAR_BUTTON = "🗑️ Очистить"
+    TEACHER_GRADING_SKIP_BUTTON = "⏭️ Следующий ответ"
     TEACHER_GRADING_EDIT_GRADE_BUTTON = "✏️ Изменить оценку"
     TEACHER_GRADING_EDIT_COMMENT_BUTTON = "💬 Изменить комментарий"
     TEACHER_GRADING_ENTER_GRADE = "⭐ Введите оценку от 0 до 100 баллов:"
@@ -297,9 +299,20 @@ class TextsRU(StrEnum):
     TEACHER_GRADING_ALREADY_SENT = "ℹ️ Оценка уже отправлена. Для изменения используйте кнопку редактирования проверенных ответов."
     TEACHER_GRADING_CLEARED = "🗑️ Оценка и комментарий очищены"
     TEACHER_GRADING_ANSWER_NOT_FOUND = "❌ Ответ не найден"
+    TEACHER_GRADING_FORBIDDEN = (
+        "⛔ Этот ответ относится к заданию другого преподавателя"
+    )
+    TEACHER_GRADING_CONFLICT = (
+        "⚠️ Ответ уже был изменён другим преподавателем. "
+        "Откройте его заново, чтобы увидеть актуальную оценку."
+    )
+    TEACHER_GRADING_CLAIMED = (
+        "🔒 Этот ответ сейчас проверяет другой преподаватель. Попробуйте позже."
+    )
     TEACHER_GRADING_NO_ANSWERS_TO_CHECK = "📭 Нет ответов для проверки"
     TEACHER_GRADING_NO_REVIEWED_ANSWERS = "📭 Нет проверенных ответов"
     TEACHER_GRADING_ALL_CHECKED = "🎉 Отлично! Все ответы на это задание проверены!"
+    TEACHER_GRADING_QUEUE_ALL_CHECKED = "🎉 Отлично! Очередь проверки пуста!"
     TEACHER_GRADING_STUDENT_NOTIFICATION = (
         "🎓 <b>Ваш ответ проверен!</b>\n\n"
         "📚 <b>Задание:</b> {homework_title}\n\n"
@@ -359,6 +372,12 @@ class TextsRU(StrEnum):
         "⚠️ Пожалуйста, отправьте ответ текстовым сообщением."
     )
     STUDENT_HOMEWORK_ANSWER_EMPTY = "⚠️ Ответ пустой. Введите текст."
+    STUDENT_HOMEWORK_DEADLINE_REMINDER = (
+        "⏰ <b>Напоминание о сроке сдачи</b>\n\n"
+        "📝 <b>Тема:</b> {title}\n"
+        "⏰ <b>Срок сдачи:</b> {end_at}\n\n"
+        "Ответ ещё не отправлен — до окончания срока осталось около {hours_left} ч."
+    )
     STUDENT_HOMEWORK_ANSWER_SENT = "✅ Отлично! Ваш ответ отправлен на проверку."
     STUDENT_HOMEWORK_ANSWER_DEADLINE_PASSED = (
         "⏰ К сожалению, срок сдачи истёк. Ответить уже нельзя."
@@ -456,6 +475,19 @@ class TextsRU(StrEnum):
         "⚠️ Некорректный формат даты. Попробуйте ещё раз."
     )
     TEACHER_HOMEWORK_CREATE_DEADLINE_PAST = "⚠️ Срок сдачи должен быть в будущем."
+    TEACHER_HOMEWORK_CREATE_START_AT_PROMPT = (
+        "📣 <b>Публикация</b>\n\n"
+        "Когда отправить задание студентам?\n"
+        "Введите дату и время в формате <b>ДД.ММ.ГГГГ ЧЧ:ММ</b>\n"
+        "или /now — опубликовать сразу после создания."
+    )
+    TEACHER_HOMEWORK_CREATE_START_AT_INVALID = (
+        "⚠️ Некорректный формат даты. Введите дату или /now."
+    )
+    TEACHER_HOMEWORK_CREATE_START_AT_PAST = "⚠️ Время публикации уже прошло."
+    TEACHER_HOMEWORK_CREATE_START_AT_AFTER_DEADLINE = (
+        "⚠️ Публикация должна быть раньше срока сдачи."
+    )
     TEACHER_HOMEWORK_CREATE_FILES_PROMPT = (
         "📎 <b>Добавление файлов</b>\n\n"
         "Отправьте фото и/или документы к заданию.\n"
@@ -480,6 +512,7 @@ class TextsRU(StrEnum):
         "👀 <b>Предпросмотр задания</b>\n\n"
         "📝 <b>Тема:</b> {title}\n"
         "⏰ <b>Срок сдачи:</b> {end_at}\n"
+        "📣 <b>Публикация:</b> {start_at}\n"
         "👥 <b>Групп:</b> {groups_count}\n\n"
         "📖 <b>Описание:</b>\n{text}\n\n"
         "❓ Всё правильно? Подтвердите создание."
@@ -489,6 +522,10 @@ class TextsRU(StrEnum):
     TEACHER_HOMEWORK_CREATE_SUCCESS = (
         "🎉 Отлично! Задание создано и отправлено студентам."
     )
+    TEACHER_HOMEWORK_CREATE_SCHEDULED = (
+        "🗓 Задание создано. Студенты получат его {start_at}."
+    )
+    TEACHER_HOMEWORK_START_AT_NOW = "сразу"
     TEACHER_HOMEWORK_NEW_NOTIFICATION = (
         "📚 <b>Новое задание!</b>\n\n"
         "📝 <b>Тема:</b> {title}\n"
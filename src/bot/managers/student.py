@@ -13,7 +13,11 @@ from src.core.schemas import (
     TeacherSchema,
     TelegramFileCreateSchema,
 )
-from src.db.services import AssignedGroupsService, StudentsService
+from src.db.services import (
+    AssignedGroupsService,
+    StudentsService,
+    UserIdentitiesService,
+)
 from src.db.use_cases.assignments import AssignmentsUseCase
 
 if TYPE_CHECKING:
@@ -40,13 +44,13 @@ class StudentManager(BaseUserManager):
         """
         Инициализируем студента, создаем запись, сохраняем роль
         """
-        student = await self.students.get_by_user_id(self.session.user_id)
-        if not student:
-            student = await self.students.create(
+        identity = await UserIdentitiesService.get_by_user_id(self.session.user_id)
+        if not identity.student_id:
+            await self.students.create(
                 StudentCreateSchema(user_id=self.session.user_id, group_id=group_id)
             )
-        elif group_id and student.group_id != group_id:
-            await self.students.set_group(student, group_id=group_id)
+        elif group_id and identity.group_id != group_id:
+            await self.students.set_group_by_user_id(self.session.user_id, group_id)
         await self.session.set_role(UserRoleEnum.STUDENT)
 
     @ensure_telegram_user_decorator
@@ -107,8 +111,8 @@ class StudentManager(BaseUserManager):
         """
         Создать ответ от текущего пользователя. Требует, чтобы студент уже существовал в БД.
         """
-        student = await self.students.get_by_user_id(self.session.user_id)
-        if not student:
+        student_id = await self.students.get_id_by_user_id(self.session.user_id)
+        if not student_id:
             raise ValueError(
                 "Student record not found for this user_id. Register student first."
             )
@@ -117,7 +121,7 @@ class StudentManager(BaseUserManager):
         answer_id = await self.assignments.submit_answer(
             AnswerCreateSchema(
                 homework_id=homework_id,
-                student_id=student.student_id,
+                student_id=student_id,
                 student_answer=text,
                 sent_at=sent_at,
             ),
@@ -8,6 +8,7 @@ from src.bot.lexicon.texts import TextsRU
 from src.bot.managers.base import BaseUserManager, ensure_telegram_user_decorator
 from src.core.enums import AnswersStatusEnum, InlineKeyboardTypeEnum, UserRoleEnum
 from src.core.schemas import (
+    AnswerGradeResultSchema,
     PaginatedListItemSchema,
     PaginatedListKeyboardSchema,
     PaginationStateSchema,
@@ -53,9 +54,9 @@ class TeacherManager(BaseUserManager):
         """
         Инициализируем студента, создаем запись, сохраняем роль
         """
-        teacher = await self.teachers.get_by_user_id(self.session.user_id)
-        if not teacher:
-            teacher = await self.teachers.create(
+        teacher_id = await self.teachers.get_id_by_user_id(self.session.user_id)
+        if not teacher_id:
+            await self.teachers.create(
                 TeacherCreateSchema(user_id=self.session.user_id)
             )
         await self.session.set_role(UserRoleEnum.TEACHER)
@@ -72,13 +73,13 @@ class TeacherManager(BaseUserManager):
 
         Возвращает None, если запись преподавателя в БД не найдена.
         """
-        teacher = await self.teachers.get_by_user_id(self.session.user_id)
-        if not teacher:
+        teacher_id = await self.teachers.get_id_by_user_id(self.session.user_id)
+        if not teacher_id:
             return None
 
         per_page = per_page or self.GROUPS_PER_PAGE
         page_data = await AssignedGroupsService.get_groups_page_by_teacher_id(
-            teacher.teacher_id, page=page, per_page=per_page
+            teacher_id, page=page, per_page=per_page
         )
 
         keyboard_data = PaginatedListKeyboardSchema(
@@ -260,21 +261,28 @@ class TeacherManager(BaseUserManager):
         teacher_comment: Optional[str] = None,
         status: AnswersStatusEnum = AnswersStatusEnum.REVIEWED,
         checked_at: Optional[datetime] = None,
-    ) -> bool:
+        expected_status: Optional[AnswersStatusEnum] = None,
+        expected_checked_at: Optional[datetime] = None,
+    ) -> AnswerGradeResultSchema:
         """
         Оценить ответ. Требует, чтобы преподаватель уже существовал в БД.
+
+        expected_status/expected_checked_at — состояние ответа, которое видел
+        преподаватель; если ответ успели изменить, вернётся error_code="conflict".
         """
-        teacher = await self.teachers.get_by_user_id(self.session.user_id)
-        if not teacher:
+        teacher_id = await self.teachers.get_id_by_user_id(self.session.user_id)
+        if not teacher_id:
             raise ValueError(
                 "Teacher record not found for this user_id. Register teacher first."
             )
 
         return await self.assignments.grade_answer(
-            teacher_id=teacher.teacher_id,
+            teacher_id=teacher_id,
             answer_id=answer_id,
             grade=grade,
             teacher_comment=teacher_comment,
             status=status,
             checked_at=checked_at,
+            expected_status=expected_status,
+            expected_checked_at=expected_checked_at,
         )
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from src.core.metrics import handler_latency, telegram_latency
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Внутренний middleware на dp.message/dp.callback_query: время работы хендлера.
+    Роутеры в проекте безымянные, поэтому router — это модуль хендлера.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any],
+    ) -> Any:
+        handler_object = data.get("handler")
+        if not isinstance(handler_object, HandlerObject):
+            return await handler(event, data)
+
+        callback = handler_object.callback
+        start = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            handler_latency.observe(
+                time.perf_counter() - start,
+                callback.__module__,
+                callback.__qualname__,
+            )
+
+
+class TelegramMetricsMiddleware(BaseRequestMiddleware):
+    """Request-middleware сессии бота: время запросов к Bot API по методам."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        start = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        finally:
+            telegram_latency.observe(time.perf_counter() - start, method.__api_method__)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
+
+from src.bot.logger import bot_logger
+from src.core.metrics import pagination_superseded
+from src.core.schemas import PaginationCallbackSchema
+
+logger = bot_logger.get_logger("pagination")
+
+
+class PaginationCoalesceMiddleware(BaseMiddleware):
+    """
+    Внутренний middleware на dp.callback_query: из параллельных колбэков
+    пагинации одного пользователя по одному ключу (PaginationCallbackSchema.key)
+    рендерится только последний.
+
+    - Рендер страницы выполняется отдельной задачей; новый колбэк с тем же
+      (user_id, key) отменяет ещё не завершённый рендер предыдущего
+    - Отменённый рендер сохраняет в FSM фактическое состояние экрана
+      (см. ScreenRenderer.sync_media): отправленные им файлы не теряются,
+      следующий рендер переиспользует или удаляет их
+    - Колбэки, отличные от пагинации, проходят без изменений
+    Отмена работает в пределах одного процесса бота.
+    """
+
+    def __init__(self) -> None:
+        self._renders: dict[tuple[int, str], asyncio.Task] = {}
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any],
+    ) -> Any:
+        callback_data = data.get("callback_data")
+        user = data.get("event_from_user")
+        if user is None or not isinstance(callback_data, PaginationCallbackSchema):
+            return await handler(event, data)
+
+        key = (user.id, callback_data.key)
+        previous = self._renders.get(key)
+        render = asyncio.create_task(handler(event, data))
+        self._renders[key] = render
+        if previous is not None and not previous.done():
+            previous.cancel()
+
+        try:
+            return await render
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if current is not None and current.cancelling():
+                raise
+            # Отменён более новым колбэком: страницу покажет он
+            pagination_superseded.inc(_route(data))
+            try:
+                await event.answer()
+            except Exception as e:
+                logger.debug("Колбэк отменённого рендера уже отвечен: %s", e)
+            return None
+        finally:
+            if self._renders.get(key) is render:
+                del self._renders[key]
+
+
+def _route(data: Dict[str, Any]) -> str:
+    handler_object = data.get("handler")
+    if not isinstance(handler_object, HandlerObject):
+        return "unknown"
+    callback = handler_object.callback
+    return f"{callback.__module__}:{callback.__qualname__}"
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from src.bot.logger import bot_logger
+from src.core.send_scheduler import SendScheduler
+
+logger = bot_logger.get_logger("send_scheduler")
+
+# Методы, которые отправляют новое сообщение в чат и расходуют лимиты Bot API
+SCHEDULED_METHODS = frozenset(
+    {
+        "sendMessage",
+        "sendPhoto",
+        "sendDocument",
+        "sendVideo",
+        "sendAnimation",
+        "sendAudio",
+        "sendVoice",
+        "sendSticker",
+        "sendMediaGroup",
+        "copyMessage",
+        "forwardMessage",
+    }
+)
+
+
+class SendSchedulerMiddleware(BaseRequestMiddleware):
+    """
+    Request-middleware сессии бота: отправка сообщения ждёт разрешения
+    SendScheduler (приоритет — из send_priority() контекста вызова).
+
+    Ответ 429 приостанавливает раздачу разрешений на retry_after секунд,
+    после чего запрос повторяется один раз — из головы очереди чата, чтобы
+    не нарушить порядок сообщений. Регистрируется первым, чтобы
+    время в очереди не попадало в telegram_api_duration_seconds.
+    """
+
+    def __init__(self, scheduler: SendScheduler) -> None:
+        self.scheduler = scheduler
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        if method.__api_method__ not in SCHEDULED_METHODS or chat_id is None:
+            return await make_request(bot, method)
+
+        await self.scheduler.acquire(chat_id)
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter as e:
+            logger.warning(
+                "Bot API: 429 на %s, пауза отправок %s с",
+                method.__api_method__,
+                e.retry_after,
+            )
+            self.scheduler.pause(e.retry_after)
+            await self.scheduler.acquire(chat_id, retry=True)
+            return await make_request(bot, method)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import CallbackQuery, Message
+
+from src.bot.lexicon.texts import TextsRU
+from src.bot.logger import bot_logger
+from src.core.metrics import updates_throttled
+from src.core.throttling import USER_BUDGET, ThrottleBudget, get_handler_throttle
+from src.redis import RedisClient, RedisThrottleClient
+
+logger = bot_logger.get_logger("throttling")
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Внутренний middleware на dp.message/dp.callback_query: ограничивает частоту
+    апдейтов пользователя token bucket'ами в Redis (общий бюджет и бюджет
+    хендлера, см. src/core/throttling.py) — один EVAL на апдейт.
+
+    Апдейт сверх бюджета:
+    - колбэк маршрута с coalesce=True ждёт токен; если за это время пришёл
+      более новый колбэк того же пользователя и маршрута, старый отбрасывается
+      (выполняется только последняя страница серии)
+    - остальные апдейты ждут токен не дольше MAX_WAIT_S, затем отбрасываются
+      с сообщением THROTTLED
+    Ожидание — в памяти процесса, поэтому объединяются колбэки одного экземпляра.
+    Если Redis недоступен, апдейт пропускается.
+    """
+
+    MAX_WAIT_S = 5.0
+
+    def __init__(
+        self, redis_client: RedisClient, user_budget: ThrottleBudget = USER_BUDGET
+    ) -> None:
+        self.throttle_client = RedisThrottleClient(redis_client)
+        self.user_budget = user_budget
+        # (user_id, маршрут) -> номер последнего колбэка серии
+        self._latest: dict[tuple[int, str], int] = {}
+        self._tickets = itertools.count(1)
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        handler_object = data.get("handler")
+        if user is None or not isinstance(handler_object, HandlerObject):
+            return await handler(event, data)
+
+        callback = handler_object.callback
+        route = f"{callback.__module__}:{callback.__qualname__}"
+        budget = get_handler_throttle(callback)
+        coalesce = budget.coalesce and isinstance(event, CallbackQuery)
+        key = (user.id, route)
+        ticket = next(self._tickets)
+        if coalesce:
+            self._latest[key] = ticket
+
+        try:
+            deadline = time.monotonic() + self.MAX_WAIT_S
+            while True:
+                wait = await self._take(user.id, route, budget)
+                if wait <= 0:
+                    return await handler(event, data)
+                if not coalesce and time.monotonic() + wait > deadline:
+                    updates_throttled.inc(route, "dropped")
+                    await self._reject(event)
+                    return None
+                updates_throttled.inc(route, "delayed")
+                await asyncio.sleep(wait)
+                if coalesce and self._latest.get(key) != ticket:
+                    updates_throttled.inc(route, "superseded")
+                    # Убираем «часики» на кнопке: страницу покажет более новый колбэк
+                    await event.answer()
+                    return None
+        finally:
+            if coalesce and self._latest.get(key) == ticket:
+                del self._latest[key]
+
+    async def _take(self, user_id: int, route: str, budget: ThrottleBudget) -> float:
+        try:
+            return await self.throttle_client.take(
+                user_id,
+                route,
+                time.time(),
+                (
+                    (self.user_budget.rate, self.user_budget.burst),
+                    (budget.rate, budget.burst),
+                ),
+            )
+        except Exception as e:
+            logger.warning("Redis недоступен, апдейт без ограничения частоты: %s", e)
+            return 0
+
+    @staticmethod
+    async def _reject(event: Any) -> None:
+        try:
+            if isinstance(event, CallbackQuery):
+                await event.answer(TextsRU.THROTTLED)
+            elif isinstance(event, Message):
+                await event.answer(TextsRU.THROTTLED)
+        except Exception as e:
+            logger.warning("Не удалось ответить на отброшенный апдейт: %s", e)
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import Update
+
+from src.core.tracing import span, start_span, tracer
+
+
+class TracingMiddleware(BaseMiddleware):
+    """
+    Самый внешний middleware на dp.update: открывает трассу на апдейт.
+    Экспортируются только медленные апдейты и апдейты с ошибкой (tail sampling).
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any],
+    ) -> Any:
+        if not isinstance(event, Update):
+            return await handler(event, data)
+        with tracer.trace(
+            "update", update_id=event.update_id, event_type=event.event_type
+        ) as trace:
+            if trace is not None:
+                user = data.get("event_from_user")
+                if user is not None:
+                    trace.root.set_attribute("user_id", user.id)
+            return await handler(event, data)
+
+
+class TracedMiddleware(BaseMiddleware):
+    """
+    Обёртка над middleware: спан покрывает только его собственную работу
+    (до передачи управления дальше по цепочке), а не весь хендлер.
+    """
+
+    def __init__(self, middleware: BaseMiddleware) -> None:
+        self._middleware = middleware
+        self._name = f"middleware:{middleware.__class__.__name__}"
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any],
+    ) -> Any:
+        sp = start_span(self._name)
+        if sp is None:
+            return await self._middleware(handler, event, data)
+
+        async def _next(next_event: Any, next_data: Dict[str, Any]) -> Any:
+            sp.end()
+            return await handler(next_event, next_data)
+
+        try:
+            return await self._middleware(_next, event, data)
+        finally:
+            sp.end()
+
+
+class HandlerTracingMiddleware(BaseMiddleware):
+    """Внутренний middleware на dp.message/dp.callback_query: спан хендлера."""
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any],
+    ) -> Any:
+        handler_object = data.get("handler")
+        if not isinstance(handler_object, HandlerObject):
+            return await handler(event, data)
+        callback = handler_object.callback
+        with span(f"handler:{callback.__module__}:{callback.__qualname__}"):
+            return await handler(event, data)
+
+
+class TelegramTracingMiddleware(BaseRequestMiddleware):
+    """Request-middleware сессии бота: спан на каждый запрос к Bot API."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        with span(f"telegram:{method.__api_method__}"):
+            return await make_request(bot, method)
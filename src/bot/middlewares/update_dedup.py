@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+from src.bot.logger import bot_logger
+from src.core.metrics import updates_duplicate
+from src.redis import RedisClient, RedisUpdateDedupClient
+
+logger = bot_logger.get_logger("update_dedup")
+
+
+class UpdateDedupMiddleware(BaseMiddleware):
+    """
+    Внешний middleware на dp.update: обрабатывает каждый update_id не больше
+    одного раза за окно ttl_seconds (повторная доставка после перезапуска
+    polling или повтор вебхука).
+
+    - Отметка ставится одним SET NX EX до UserSessionMiddleware и хендлеров;
+      повтор отбрасывается без обращений к БД
+    - Отметка не снимается и при ошибке хендлера: at-most-once важнее
+      повторной попытки (уведомления студентам не дублируются)
+    - Если Redis недоступен, апдейт обрабатывается как обычно
+    """
+
+    def __init__(self, redis_client: RedisClient, ttl_seconds: int) -> None:
+        self.dedup_client = RedisUpdateDedupClient(redis_client)
+        self.ttl_seconds = ttl_seconds
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any],
+    ) -> Any:
+        bot = data.get("bot")
+        if not isinstance(event, Update) or bot is None or self.ttl_seconds <= 0:
+            return await handler(event, data)
+
+        try:
+            first = await self.dedup_client.mark_seen(
+                bot.id, event.update_id, ttl_seconds=self.ttl_seconds
+            )
+        except Exception as e:
+            logger.warning("Redis недоступен, апдейт без дедупликации: %s", e)
+            first = True
+        if first:
+            return await handler(event, data)
+
+        try:
+            event_type = event.event_type
+        except Exception:
+            event_type = "unknown"
+        updates_duplicate.inc(event_type)
+        logger.info("Повторный апдейт %s отброшен", event.update_id)
+        return None
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import Update
+
+from src.bot.logger import bot_logger
+from src.core.update_stats import (
+    count_telegram,
+    current_update_stats,
+    get_handler_budget,
+    track_update_stats,
+)
+
+logger = bot_logger.get_logger("update_stats")
+
+
+class UpdateStatsMiddleware(BaseMiddleware):
+    """
+    Внешний middleware на dp.update: заводит счётчики SQL/Redis/Bot API на апдейт
+    и пишет в лог апдейты, превысившие бюджет хендлера.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any],
+    ) -> Any:
+        with track_update_stats() as stats:
+            try:
+                return await handler(event, data)
+            finally:
+                exceeded = stats.exceeded()
+                if exceeded:
+                    update_id = event.update_id if isinstance(event, Update) else None
+                    logger.warning(
+                        "Update %s over budget in %s: %s (sql=%s, redis=%s, telegram=%s)",
+                        update_id,
+                        stats.handler,
+                        ", ".join(
+                            f"{name} {value}>{limit}"
+                            for name, (value, limit) in exceeded.items()
+                        ),
+                        stats.sql,
+                        stats.redis,
+                        stats.telegram,
+                    )
+
+
+class HandlerBudgetMiddleware(BaseMiddleware):
+    """
+    Внутренний middleware на dp.message/dp.callback_query: запоминает,
+    какой хендлер обрабатывает апдейт, и его бюджет (@query_budget).
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[Any, Dict[str, Any]], Awaitable[Any]],
+        event: Any,
+        data: Dict[str, Any],
+    ) -> Any:
+        stats = current_update_stats()
+        handler_object = data.get("handler")
+        if stats is not None and isinstance(handler_object, HandlerObject):
+            callback = handler_object.callback
+            stats.handler = f"{callback.__module__}:{callback.__qualname__}"
+            stats.budget = get_handler_budget(callback)
+        return await handler(event, data)
+
+
+class TelegramCallsCounterMiddleware(BaseRequestMiddleware):
+    """Request-middleware сессии бота: считает вызовы Bot API в текущем апдейте."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        count_telegram()
+        return await make_request(bot, method)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Sequence, Union
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.fsm.context import FSMContext
+from aiogram.types import (
+    InlineKeyboardMarkup,
+    InputMediaDocument,
+    InputMediaPhoto,
+    InputMediaVideo,
+    Message,
+)
+
+from src.bot.logger import bot_logger
+from src.core.enums import HomeworkMediaTypeEnum, InlineKeyboardTypeEnum
+from src.core.metrics import screen_updates
+
+if TYPE_CHECKING:
+    from src.bot.session import UserSession
+
+logger = bot_logger.get_logger("screen")
+
+
+def _fingerprint(value: str) -> str:
+    return hashlib.sha1(value.encode()).hexdigest()[:16]
+
+
+def _is_not_modified(e: TelegramBadRequest) -> bool:
+    return "message is not modified" in str(e).lower()
+
+
+@dataclass(frozen=True, slots=True)
+class ScreenMedia:
+    """Файл, показываемый отдельным сообщением под экраном."""
+
+    file_type: str
+    file_id: str
+    caption: Optional[str] = None
+
+    @classmethod
+    def from_files(cls, files: Iterable[Any]) -> list[ScreenMedia]:
+        """Файлы задания/ответа (объекты с telegram_file) в порядке отправки."""
+        media = []
+        for f in files:
+            tf = f.telegram_file
+            if not tf or tf.file_type not in set(HomeworkMediaTypeEnum):
+                continue
+            # Фото всегда отправлялись без подписи
+            is_photo = tf.file_type == HomeworkMediaTypeEnum.PHOTO
+            caption = None if is_photo else tf.caption
+            media.append(cls(tf.file_type, tf.file_id, caption))
+        return media
+
+    @property
+    def fingerprint(self) -> str:
+        return _fingerprint(f"{self.file_type}:{self.file_id}:{self.caption or ''}")
+
+    def input_media(
+        self,
+    ) -> Union[InputMediaPhoto, InputMediaDocument, InputMediaVideo]:
+        if self.file_type == HomeworkMediaTypeEnum.PHOTO:
+            return InputMediaPhoto(media=self.file_id)
+        if self.file_type == HomeworkMediaTypeEnum.DOCUMENT:
+            return InputMediaDocument(media=self.file_id, caption=self.caption)
+        return InputMediaVideo(media=self.file_id, caption=self.caption)
+
+    async def send(self, message: Message) -> Message:
+        if self.file_type == HomeworkMediaTypeEnum.PHOTO:
+            return await message.answer_photo(photo=self.file_id)
+        if self.file_type == HomeworkMediaTypeEnum.DOCUMENT:
+            return await message.answer_document(
+                document=self.file_id, caption=self.caption
+            )
+        return await message.answer_video(video=self.file_id, caption=self.caption)
+
+
+class ScreenRenderer:
+    """
+    Экран — сообщение, которое перерисовывается на месте при переходах
+    (пагинация, смена ответа), и файлы под ним.
+
+    - В FSM (ключ screen:{name}) хранится id сообщения экрана, отпечатки
+      текста и клавиатуры и [message_id, отпечаток] каждого файла
+    - render() сравнивает отпечатки и делает не больше одного вызова:
+      editMessageText (изменился текст), editMessageReplyMarkup (только
+      клавиатура) или ничего
+    - sync_media() заменяет файлы через editMessageMedia в тех же
+      сообщениях; отправляются и удаляются только лишние/недостающие
+    - Отменённая перерисовка (см. PaginationCoalesceMiddleware) сохраняет
+      фактическое состояние сообщений, следующая досинхронизирует его
+    """
+
+    def __init__(self, session: UserSession, state: FSMContext, name: str) -> None:
+        self.session = session
+        self.state = state
+        self.state_key = f"screen:{name}"
+
+    async def _load(self) -> Dict[str, Any]:
+        screen = await self.state.get_value(self.state_key)
+        return dict(screen) if isinstance(screen, dict) else {}
+
+    async def _save(self, screen: Dict[str, Any]) -> None:
+        await self.state.update_data({self.state_key: screen})
+
+    async def render(
+        self,
+        text: str,
+        *,
+        message_id: int,
+        reply_markup: Optional[
+            Union[InlineKeyboardMarkup, InlineKeyboardTypeEnum]
+        ] = None,
+        keyboard_data: Union[str, Dict[str, str]] = "",
+        force: bool = False,
+    ) -> None:
+        """
+        Перерисовывает сообщение экрана message_id одним вызовом Bot API.
+        force=True — экран открывается на сообщении, которое до этого
+        редактировалось в обход ScreenRenderer: отпечаткам верить нельзя.
+        """
+        markup = self.session.build_reply_markup(reply_markup, keyboard_data)
+        text_fp = _fingerprint(text)
+        markup_fp = _fingerprint(
+            markup.model_dump_json(exclude_none=True) if markup else ""
+        )
+        screen = await self._load()
+        same_message = not force and screen.get("message_id") == message_id
+
+        if same_message and screen.get("text") == text_fp:
+            if screen.get("markup") == markup_fp:
+                screen_updates.inc("skipped")
+                return
+            kind = "markup"
+        else:
+            kind = "text"
+
+        try:
+            if kind == "markup":
+                await self.session.bot.edit_message_reply_markup(
+                    chat_id=self.session.chat_id,
+                    message_id=message_id,
+                    reply_markup=markup,
+                )
+            else:
+                await self.session.edit_message(
+                    text, message_id=message_id, reply_markup=markup
+                )
+        except TelegramBadRequest as e:
+            if not _is_not_modified(e):
+                raise
+        screen_updates.inc(kind)
+        screen.update(message_id=message_id, text=text_fp, markup=markup_fp)
+        await self._save(screen)
+
+    async def sync_media(
+        self, media: Sequence[ScreenMedia], *, reuse: bool = True
+    ) -> None:
+        """
+        Приводит файлы под экраном к media, переиспользуя их сообщения.
+        reuse=False — экран открыт заново: старые файлы удаляются, новые
+        отправляются под ним.
+        """
+        screen = await self._load()
+        old = [tuple(slot) for slot in screen.get("media") or []]
+        slots: list[list] = []
+        done = 0
+        try:
+            if not reuse:
+                for message_id, _ in old:
+                    await self._delete(message_id)
+                old = []
+            for item in media:
+                previous = old[done] if done < len(old) else None
+                slot = await self._sync_slot(item, previous)
+                done += 1
+                if slot is not None:
+                    slots.append(slot)
+            for message_id, _ in old[len(media) :]:
+                await self._delete(message_id)
+        except asyncio.CancelledError:
+            # Сообщения, до которых не дошли, остаются в состоянии; прерванное
+            # редактирование — с пустым отпечатком, чтобы его повторили
+            rest = old[done:]
+            slots += [[message_id, ""] for message_id, _ in rest[:1]]
+            slots += [list(slot) for slot in rest[1:]]
+            raise
+        finally:
+            screen["media"] = slots
+            await self._save(screen)
+
+    async def _sync_slot(
+        self, item: ScreenMedia, old: Optional[tuple[int, str]]
+    ) -> Optional[list]:
+        fingerprint = item.fingerprint
+        if old is not None:
+            message_id, old_fingerprint = old
+            if old_fingerprint == fingerprint:
+                screen_updates.inc("skipped")
+                return [message_id, fingerprint]
+            try:
+                await self.session.bot.edit_message_media(
+                    chat_id=self.session.chat_id,
+                    message_id=message_id,
+                    media=item.input_media(),
+                )
+                screen_updates.inc("media")
+                return [message_id, fingerprint]
+            except TelegramBadRequest as e:
+                if _is_not_modified(e):
+                    return [message_id, fingerprint]
+                # Сообщение удалено или файл нельзя подставить — отправляем заново
+                logger.debug("editMessageMedia не удался: %s", e)
+                await self._delete(message_id)
+        try:
+            message = await item.send(self.session.message)
+        except Exception as e:
+            logger.warning("Не удалось отправить файл экрана: %s", e)
+            return None
+        screen_updates.inc("sent")
+        return [message.message_id, fingerprint]
+
+    async def _delete(self, message_id: int) -> None:
+        try:
+            await self.session.delete_message(int(message_id))
+        except Exception:
+            # не критично (сообщение могло быть уже удалено)
+            pass
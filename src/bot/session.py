@@ -18,6 +18,7 @@ from src.bot.logger import bot_logger
 from src.bot.managers import StudentManager, TeacherManager
 from src.bot.managers.base import BaseUserManager
 from src.bot.navigation import NavigationManager
+from src.bot.screen import ScreenRenderer
 from src.core.enums import InlineKeyboardTypeEnum, ReplyKeyboardTypeEnum, UserRoleEnum
 from src.redis import RedisTelegramUsersClient
 from src.services import AdminStorage, RoleStorage, UserLocksStorage
@@ -112,17 +113,36 @@ class UserSession:
         ] = None,
         keyboard_data: Union[str, Dict[str, str]] = "",
     ) -> None:
-        if isinstance(reply_markup, ReplyKeyboardTypeEnum):
-            reply_markup = KeyboardFactory.get_reply(reply_markup)
-        elif isinstance(reply_markup, InlineKeyboardTypeEnum):
-            reply_markup = KeyboardFactory.get_inline(reply_markup, keyboard_data)
         await self.message.bot.edit_message_text(
             text=text,
             chat_id=self.chat_id,
             message_id=message_id,
-            reply_markup=reply_markup,
+            reply_markup=self.build_reply_markup(reply_markup, keyboard_data),
         )
 
+    @staticmethod
+    def build_reply_markup(
+        reply_markup: Optional[
+            Union[
+                ReplyKeyboardMarkup,
+                InlineKeyboardMarkup,
+                ReplyKeyboardTypeEnum,
+                InlineKeyboardTypeEnum,
+            ]
+        ],
+        keyboard_data: Union[str, Dict[str, str]] = "",
+    ) -> Optional[Union[ReplyKeyboardMarkup, InlineKeyboardMarkup]]:
+        """Клавиатура по типу из KeyboardFactory (готовая возвращается как есть)."""
+        if isinstance(reply_markup, ReplyKeyboardTypeEnum):
+            return KeyboardFactory.get_reply(reply_markup)
+        if isinstance(reply_markup, InlineKeyboardTypeEnum):
+            return KeyboardFactory.get_inline(reply_markup, keyboard_data)
+        return reply_markup
+
+    def screen(self, state: FSMContext, name: str) -> ScreenRenderer:
+        """Экран name, перерисовываемый на месте (см. ScreenRenderer)."""
+        return ScreenRenderer(self, state, name)
+
     async def answer(
         self,
         text: Optional[str] = None,
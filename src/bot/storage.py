@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+
+from src.core.tracing import span
+
+
+class TracedRedisStorage(RedisStorage):
+    """
+    RedisStorage для FSM со спанами трассировки на чтение/запись состояния и данных.
+    Через него идут все обращения NavigationManager и хендлеров к FSMContext.
+    """
+
+    async def set_state(
+        self, key: StorageKey, state: State | str | None = None
+    ) -> None:
+        with span("fsm:set_state"):
+            await super().set_state(key, state)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        with span("fsm:get_state"):
+            return await super().get_state(key)
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        with span("fsm:set_data"):
+            await super().set_data(key, data)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        with span("fsm:get_data"):
+            return await super().get_data(key)
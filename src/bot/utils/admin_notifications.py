@@ -7,6 +7,7 @@ from typing import Optional
 from aiogram import Bot
 
 from src.core.logger import get_logger
+from src.core.send_scheduler import SendPriority, send_priority
 from src.services import AdminStorage
 
 logger = get_logger(__name__)
@@ -49,14 +50,15 @@ async def notify_admins_about_error(
 
         # Отправляем уведомления всем админам
         success_count = 0
-        for admin_id in admin_ids:
-            try:
-                await bot.send_message(chat_id=admin_id, text=notification_text)
-                success_count += 1
-            except Exception as send_error:
-                logger.error(
-                    f"Не удалось отправить уведомление администратору {admin_id}: {send_error}"
-                )
+        with send_priority(SendPriority.TRANSACTIONAL):
+            for admin_id in admin_ids:
+                try:
+                    await bot.send_message(chat_id=admin_id, text=notification_text)
+                    success_count += 1
+                except Exception as send_error:
+                    logger.error(
+                        f"Не удалось отправить уведомление администратору {admin_id}: {send_error}"
+                    )
 
         logger.info(
             f"Уведомления о критической ошибке отправлены "
@@ -110,11 +112,12 @@ async def notify_admins_service_restored(
             f"Бот работает в штатном режиме."
         )
 
-        for admin_id in admin_ids:
-            try:
-                await bot.send_message(chat_id=admin_id, text=notification_text)
-            except Exception:
-                pass  # Игнорируем ошибки при отправке "хороших" новостей
+        with send_priority(SendPriority.TRANSACTIONAL):
+            for admin_id in admin_ids:
+                try:
+                    await bot.send_message(chat_id=admin_id, text=notification_text)
+                except Exception:
+                    pass  # Игнорируем ошибки при отправке "хороших" новостей
 
         logger.info(
             f"Уведомления о восстановлении {service_name} отправлены администраторам"
@@ -6,7 +6,16 @@ from dataclasses import dataclass
 from src.core.logger import get_logger
 from src.core.settings import settings
 from src.redis import RedisClient, RedisTelegramUsersClient
-from src.services import AdminStorage, RoleStorage, UserLocksStorage
+from src.services import (
+    AdminStorage,
+    RoleStorage,
+    UserLocksStorage,
+    answer_dedup,
+    homework_cache,
+    homework_card_cache,
+    homework_scheduler,
+    identity_cache,
+)
 
 # Константы для переподключения Redis
 REDIS_MAX_RETRIES = 5
@@ -34,6 +43,12 @@ class AppContext:
     async def create(cls) -> "AppContext":
         redis = RedisClient(settings.actual_redis_url)
         await cls._connect_redis_with_retry(redis)
+        # Кэши и планировщик используются сервисным слоем напрямую, без injection
+        answer_dedup.bind(redis)
+        homework_cache.bind(redis)
+        homework_card_cache.bind(redis)
+        identity_cache.bind(redis)
+        homework_scheduler.bind(redis)
         return cls(
             redis=redis,
             users_client=RedisTelegramUsersClient(redis),
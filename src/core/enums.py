@@ -16,6 +16,17 @@ class AnswersStatusEnum(StrEnum):
     ACCEPTED = "accepted"
 
 
+class ScheduledTimerKindEnum(StrEnum):
+    """Виды таймеров планировщика (src/services/scheduler.py)
+
+    DEADLINE_REMINDER - напоминание студентам без ответа за N часов до срока
+    PUBLISH - отложенная публикация задания (рассылка студентам в start_at)
+    """
+
+    DEADLINE_REMINDER = "deadline_reminder"
+    PUBLISH = "publish"
+
+
 class MediaEnum(StrEnum):
     PHOTO = "photo"
     DOCUMENT = "document"
@@ -72,6 +83,7 @@ class CommandsEnum(StrEnum):
     TEACHER_ROLE = "teacher_role"
     TEACHER_HOMEWORKS = "teacher_homeworks"
     TEACHER_HOMEWORK_CREATE = "teacher_homework_create"
+    TEACHER_REVIEW_QUEUE = "teacher_review_queue"
 
     TEACHER_GROUPS = "teacher_groups"
     TEACHER_GROUP_CREATE = "teacher_group_create"
@@ -25,6 +25,7 @@ class TeacherHomeworkCreateStates(StatesGroup):
     waiting_for_title = State()
     waiting_for_text = State()
     waiting_for_deadline = State()
+    waiting_for_start_at = State()
     waiting_for_files = State()
     selecting_groups = State()
     confirming = State()
@@ -2,7 +2,12 @@
 Лёгкий инструмент логирования.
 
 • Файл журнала создаётся один раз при первом импорте модуля: logs/YYYYMMDD_HHMMSS.log
-• Никаких env-параметров и чтения argv.
+• Запись в файлы и консоль выполняется в отдельном потоке (QueueHandler → QueueListener),
+  event loop только кладёт запись в ограниченную очередь.
+• При переполнении очереди записи отбрасываются, а не блокируют вызывающий код;
+  количество отброшенных записей доступно через get_dropped_records().
+• Сообщение (msg % args) форматируется при вызове, в поток записи уходит строка.
+• Уровень и семплирование берутся из Settings (LOG_LEVEL, LOG_SAMPLING, LOG_QUEUE_SIZE).
 • Поддерживает:
     get_logger(name)          – любой произвольный логгер
     get_function_logger(func) – логгер функции/метода
@@ -11,14 +16,22 @@
 
 from __future__ import annotations
 
+import atexit
 import contextvars
+import copy
 import logging
-import os
+import queue
+import random
+import threading
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Optional, Union
 
 from concurrent_log_handler import ConcurrentRotatingFileHandler
 
+from src.core.settings import settings
+
 # ──────────────────────────────
 # Параметры по умолчанию
 # ──────────────────────────────
@@ -27,7 +40,7 @@ _LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 _LOG_FILE_NAME = "app.log"
 
-_LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+_LOG_LEVEL = settings.log_level
 _LOG_FMT = "[%(asctime)s] [%(name)s] [%(levelname)s] %(message)s"
 
 _current_name: contextvars.ContextVar[str] = contextvars.ContextVar(
@@ -35,17 +48,144 @@ _current_name: contextvars.ContextVar[str] = contextvars.ContextVar(
 )
 
 _cache: dict[str, logging.Logger] = {}  # кэш созданных логгеров
+_file_handlers: dict[Path, logging.Handler] = {}  # один файловый хендлер на файл
 
 
 def get_log_file(name: Union[str, Path]) -> Path:
     return (_LOG_DIR / name).with_suffix(".log")
 
 
+# ──────────────────────────────
+# Очередь и поток записи
+# ──────────────────────────────
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler, который никогда не блокирует вызывающий поток.
+
+    Если очередь заполнена, запись отбрасывается, а счётчик отброшенных
+    записей для соответствующего логгера увеличивается.
+    Сообщение форматируется в потоке записи: в очередь уходят msg и args,
+    поэтому аргументы, которые меняются после вызова, нужно передавать
+    значениями. Трейсбек рендерится сразу (exc_text) — ссылки на кадры
+    стека в очередь не уходят.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped: Counter[str] = Counter()
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not record.exc_info:
+            return record
+        record = copy.copy(record)
+        if not record.exc_text:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped[record.name] += 1
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Пропускает только долю *rate* записей уровня ниже WARNING.
+    Предупреждения и ошибки проходят всегда.
+    """
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class _RoutingHandler(logging.Handler):
+    """
+    Хендлер потока записи: отправляет запись в хендлеры того логгера,
+    от которого она пришла (у каждого логгера свой файл).
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.routes: dict[str, list[logging.Handler]] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        for handler in self.routes.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+_queue_handler = DroppingQueueHandler(_queue)
+_router = _RoutingHandler()
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(logging.Formatter(_LOG_FMT))
+
+
+def _ensure_listener() -> None:
+    """Лениво запускает поток записи при создании первого логгера."""
+    global _listener
+    if _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = QueueListener(_queue, _router)
+            _listener.start()
+            atexit.register(stop_log_listener)
+
+
+def stop_log_listener() -> None:
+    """Дописывает всё, что осталось в очереди, и останавливает поток записи."""
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is None:
+        return
+    # QueueListener.stop() кладёт sentinel через put_nowait — при заполненной
+    # очереди это упадёт, поэтому кладём его сами с ожиданием.
+    _queue.put(listener._sentinel)
+    if listener._thread is not None:
+        listener._thread.join()
+        listener._thread = None
+
+
+def get_dropped_records() -> dict[str, int]:
+    """Количество отброшенных из-за переполнения очереди записей по логгерам."""
+    with _queue_handler._dropped_lock:
+        return dict(_queue_handler.dropped)
+
+
 # ──────────────────────────────
 # Внутренние функции
 # ──────────────────────────────
 
 
+def _get_file_handler(log_file: Path) -> logging.Handler:
+    handler = _file_handlers.get(log_file)
+    if handler is None:
+        handler = ConcurrentRotatingFileHandler(
+            log_file, maxBytes=5 * 1024 * 1024, backupCount=15, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter(_LOG_FMT))
+        _file_handlers[log_file] = handler
+    return handler
+
+
 def _build_logger(
     name: str, log_file_name: Optional[Union[str, Path]]
 ) -> logging.Logger:
@@ -62,17 +202,14 @@ def _build_logger(
     logger.setLevel(_LOG_LEVEL)
     logger.propagate = False  # не дублируем записи в root-logger
 
-    file_handler = ConcurrentRotatingFileHandler(
-        log_file, maxBytes=5 * 1024 * 1024, backupCount=15, encoding="utf-8"
-    )
-    stream_handler = logging.StreamHandler()
+    _router.routes[name] = [_get_file_handler(log_file), _stream_handler]
 
-    formatter = logging.Formatter(_LOG_FMT)
-    file_handler.setFormatter(formatter)
-    stream_handler.setFormatter(formatter)
+    rate = settings.log_sampling.get(name)
+    if rate is not None:
+        logger.addFilter(SamplingFilter(rate))
 
-    logger.addHandler(file_handler)
-    logger.addHandler(stream_handler)
+    logger.addHandler(_queue_handler)
+    _ensure_listener()
 
     return logger
 
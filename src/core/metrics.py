@@ -0,0 +1,332 @@
+"""
+Реестр метрик в формате Prometheus (text exposition 0.0.4).
+
+• Counter / Gauge / Histogram с метками; запись — это инкремент в словаре,
+  сериализация выполняется только при запросе /metrics.
+• Gauge может вычисляться callback-функцией в момент сбора (например, состояние пула БД).
+• Все метрики приложения объявлены внизу модуля, чтобы их было видно в одном месте.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional, Sequence
+
+# Бакеты для задержек в секундах: от 1 мс до 10 с
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, label_values: Sequence[str]) -> tuple[str, ...]:
+        if len(label_values) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name}: ожидались метки {self.labelnames}, получено {label_values}"
+            )
+        return tuple(str(v) for v in label_values)
+
+    def _header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    def collect(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Монотонно растущий счётчик."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(self._key(label_values), 0)
+
+    def collect(self) -> list[str]:
+        lines = self._header()
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    Текущее значение. Либо выставляется через set(), либо
+    вычисляется callback-функцией при сборе (только для метрик без меток).
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+        self.callback = callback
+
+    def set(self, value: float, *label_values: str) -> None:
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, callback: Callable[[], float]) -> None:
+        self.callback = callback
+
+    def value(self, *label_values: str) -> float:
+        if self.callback is not None and not self.labelnames:
+            return self.callback()
+        return self._values.get(self._key(label_values), 0)
+
+    def collect(self) -> list[str]:
+        lines = self._header()
+        if self.callback is not None and not self.labelnames:
+            lines.append(f"{self.name} {_format_value(self.callback())}")
+            return lines
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными бакетами (кумулятивные счётчики считаются при сборе)."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # на каждую комбинацию меток: [счётчики по бакетам + «+Inf»], сумма
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        key = self._key(label_values)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def count(self, *label_values: str) -> int:
+        entry = self._values.get(self._key(label_values))
+        return sum(entry[0]) if entry else 0
+
+    def collect(self) -> list[str]:
+        lines = self._header()
+        with self._lock:
+            items = [(k, (list(c), s[0])) for k, (c, s) in self._values.items()]
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(
+                    self.labelnames + ("le",), key + (_format_value(bound),)
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Набор метрик, отдаваемых одним эндпоинтом."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Метрика {metric.name} уже зарегистрирована")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labels: Sequence[str] = ()
+    ) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, labels, callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+# ──────────────────────────────
+# Метрики приложения
+# ──────────────────────────────
+registry = MetricsRegistry()
+
+handler_latency = registry.histogram(
+    "bot_handler_duration_seconds",
+    "Время работы хендлера aiogram",
+    labels=("router", "handler"),
+)
+db_latency = registry.histogram(
+    "db_repository_duration_seconds",
+    "Время выполнения метода репозитория",
+    labels=("method",),
+)
+redis_latency = registry.histogram(
+    "redis_command_duration_seconds",
+    "Время выполнения команды Redis",
+    labels=("command",),
+)
+telegram_latency = registry.histogram(
+    "telegram_api_duration_seconds",
+    "Время запроса к Bot API",
+    labels=("method",),
+)
+cache_requests = registry.counter(
+    "cache_requests_total",
+    "Обращения к кэшу хранилищ (result: hit | miss)",
+    labels=("cache", "result"),
+)
+db_pool_checked_out = registry.gauge(
+    "db_pool_checked_out", "Соединения, выданные из пула БД"
+)
+db_pool_overflow = registry.gauge(
+    "db_pool_overflow", "Соединения сверх pool_size (отрицательное — свободные слоты)"
+)
+db_pool_wait = registry.histogram(
+    "db_pool_wait_seconds",
+    "Время получения соединения из пула БД (ожидание и открытие нового)",
+)
+scheduler_timers = registry.counter(
+    "scheduler_timers_total",
+    "Сработавшие таймеры планировщика (result: ok | error)",
+    labels=("kind", "result"),
+)
+notifications_sent = registry.counter(
+    "notifications_sent_total",
+    "Рассылки студентам (result: ok | error)",
+    labels=("kind", "result"),
+)
+answer_submissions = registry.counter(
+    "answer_submissions_total",
+    "Отправки ответов (result: created | duplicate_redis | duplicate_db)",
+    labels=("result",),
+)
+updates_duplicate = registry.counter(
+    "updates_duplicate_total",
+    "Повторно доставленные апдейты, отброшенные без обработки",
+    labels=("event_type",),
+)
+updates_throttled = registry.counter(
+    "updates_throttled_total",
+    "Апдейты сверх бюджета частоты (result: delayed | superseded | dropped)",
+    labels=("route", "result"),
+)
+pagination_superseded = registry.counter(
+    "pagination_superseded_total",
+    "Рендеры страниц, отменённые более новым колбэком пагинации",
+    labels=("route",),
+)
+screen_updates = registry.counter(
+    "screen_updates_total",
+    "Перерисовки экранов (kind: text | markup | media | sent | skipped)",
+    labels=("kind",),
+)
+send_queue_depth = registry.gauge(
+    "send_queue_depth",
+    "Исходящие сообщения, ждущие разрешения планировщика отправки",
+    labels=("priority",),
+)
+send_wait = registry.histogram(
+    "send_wait_seconds",
+    "Ожидание в очереди планировщика отправки",
+    labels=("priority",),
+)
+singleflight_calls = registry.counter(
+    "singleflight_calls_total",
+    "Загрузки через SingleFlight (result: leader | shared — ждал чужую загрузку)",
+    labels=("name", "result"),
+)
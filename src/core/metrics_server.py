@@ -0,0 +1,34 @@
+"""
+HTTP-эндпоинт /metrics для Prometheus.
+
+Поднимается рядом с polling на отдельном порту (METRICS_PORT); между
+запросами не делает никакой работы — реестр сериализуется только при scrape.
+"""
+
+from __future__ import annotations
+
+from aiohttp import web
+
+from src.core.metrics import MetricsRegistry, registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def create_metrics_app(metrics_registry: MetricsRegistry = registry) -> web.Application:
+    async def metrics_handler(_: web.Request) -> web.Response:
+        return web.Response(
+            body=metrics_registry.render().encode("utf-8"),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics_handler)
+    return app
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """Запускает эндпоинт и возвращает runner; остановка — await runner.cleanup()."""
+    runner = web.AppRunner(create_metrics_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
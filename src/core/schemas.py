@@ -10,6 +10,7 @@ from src.core.enums import (
     CommandsEnum,
     InlineKeyboardTypeEnum,
     ReplyKeyboardTypeEnum,
+    ScheduledTimerKindEnum,
 )
 
 # region: Схемы таблиц базы данных
@@ -40,6 +41,7 @@ class TelegramFileSchema(BaseModel):
     owner_user_id: int
     caption: Optional[str] = None
     mime_type: Optional[str] = None
+    ref_count: int = 0
     # Relationships
     owner_user: Optional["TelegramUserSchema"] = None
 
@@ -249,6 +251,17 @@ class StudentSchema(BaseModel):
         return f"tg://openmessage?user_id={self.user_id}"
 
 
+class UserIdentitySchema(BaseModel):
+    """Роли пользователя в БД: идентификаторы преподавателя и студента"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    user_id: int
+    teacher_id: Optional[int] = None
+    student_id: Optional[int] = None
+    group_id: Optional[int] = None
+
+
 class HomeworkCreateSchema(BaseModel):
     """Схема для создания задания"""
 
@@ -276,6 +289,10 @@ class HomeworkSchema(BaseModel):
     # Relationships
     teacher: Optional["TeacherSchema"] = None
 
+    def is_published(self, now: datetime) -> bool:
+        """Задание опубликовано: start_at наступил (NULL — опубликовано сразу)."""
+        return self.start_at is None or self.start_at <= now
+
 
 class AnswerCreateSchema(BaseModel):
     """Схема для создания ответа"""
@@ -287,6 +304,8 @@ class AnswerCreateSchema(BaseModel):
     student_answer: Optional[str] = None
     status: AnswersStatusEnum = Field(default=AnswersStatusEnum.SENT)
     sent_at: datetime
+    # Ключ идемпотентности (AnswerDedup.submission_key)
+    submission_key: Optional[str] = None
 
 
 class AnswerSchema(BaseModel):
@@ -303,11 +322,40 @@ class AnswerSchema(BaseModel):
     teacher_comment: Optional[str] = None
     sent_at: datetime
     checked_at: Optional[datetime] = None
+    claimed_by: Optional[int] = None
+    claimed_until: Optional[datetime] = None
     # Relationships
     homework: Optional["HomeworkSchema"] = None
     student: Optional["StudentSchema"] = None
 
 
+class HomeworkAnswerStatsSchema(BaseModel):
+    """Схема счётчиков ответов на задание"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    homework_id: int
+    answers_count: int = 0
+    sent_count: int = 0
+    reviewed_count: int = 0
+    rejected_count: int = 0
+    accepted_count: int = 0
+
+    def count(self, status: AnswersStatusEnum) -> int:
+        """Количество ответов в статусе status."""
+        return getattr(self, f"{status.value}_count")
+
+
+class HomeworkCardSchema(BaseModel):
+    """Схема карточки задания преподавателя: задание, группы и счётчики ответов"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    homework: HomeworkSchema
+    group_names: list[str] = []
+    stats: HomeworkAnswerStatsSchema
+
+
 class AdminSchema(BaseModel):
     """Схема для чтения администратора"""
 
@@ -320,6 +368,29 @@ class AdminSchema(BaseModel):
 # region: Смешанные схемы данных
 
 
+# --- Планировщик ---
+
+
+class ScheduledTimerSchema(BaseModel):
+    """
+    Таймер планировщика: вид, задание и параметр (например, часы до срока).
+    В Redis хранится строкой member вида "kind:homework_id:param".
+    """
+
+    kind: ScheduledTimerKindEnum
+    homework_id: int
+    param: int = 0
+
+    @property
+    def member(self) -> str:
+        return f"{self.kind.value}:{self.homework_id}:{self.param}"
+
+    @classmethod
+    def from_member(cls, member: str) -> Self:
+        kind, homework_id, param = member.split(":")
+        return cls(kind=kind, homework_id=int(homework_id), param=int(param))
+
+
 # --- Навигация бота ---
 
 
@@ -472,7 +543,7 @@ class TeacherGradingCallbackSchema(CallbackSchemaBase):
     Формат: tg:<action>:<homework_id>:<answer_id>
     """
 
-    action: str  # set_grade, set_comment, send_grade, edit_grade
+    action: str  # set_grade, set_comment, send_grade, edit_grade, skip
     homework_id: int
     answer_id: int
 
@@ -583,6 +654,18 @@ class TeacherCreateGroupResultSchema(BaseModel):
     )
 
 
+class AnswerGradeResultSchema(BaseModel):
+    """
+    Результат оценивания ответа преподавателем (уровень сервиса/use-case).
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    ok: bool
+    # "answer_not_found" | "forbidden" | "claimed" | "conflict"
+    error_code: Optional[str] = None
+
+
 class TeacherGroupMutationResultSchema(BaseModel):
     """
     Результат операций rename/delete группы (уровень менеджера/use-case).
@@ -0,0 +1,303 @@
+"""
+Планировщик исходящих сообщений бота (SendSchedulerMiddleware).
+
+• Отправки ждут очереди с приоритетом: INTERACTIVE (ответы на апдейты) >
+  TRANSACTIONAL (уведомления об оценке, алерты админам) > BULK (рассылки).
+• Глобальное ведро токенов (~30 сообщений/с) и ведро на чат (~1/с с
+  небольшим запасом) держат бота ниже лимитов Bot API. Вёдра лежат в Redis
+  (RedisSendRateClient) и общие для всех экземпляров бота: лимиты Bot API
+  считаются на токен бота, а не на процесс.
+• В пределах чата сообщения уходят строго по порядку постановки (FIFO):
+  части длинного сообщения (split_telegram_html_message) не перемешиваются.
+• Приоритет задаётся контекстом: with send_priority(SendPriority.BULK): ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import itertools
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Iterator, Optional
+
+from src.core.logger import get_logger
+from src.core.metrics import send_queue_depth, send_wait
+from src.redis import RedisClient, RedisSendRateClient
+
+logger = get_logger("send_scheduler")
+
+
+class SendPriority(IntEnum):
+    INTERACTIVE = 0
+    TRANSACTIONAL = 1
+    BULK = 2
+
+
+_current_priority: contextvars.ContextVar[SendPriority] = contextvars.ContextVar(
+    "send_priority", default=SendPriority.INTERACTIVE
+)
+
+
+def current_send_priority() -> SendPriority:
+    return _current_priority.get()
+
+
+@contextmanager
+def send_priority(priority: SendPriority) -> Iterator[None]:
+    """Приоритет отправок внутри блока (и задач, созданных в нём)."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    """rate токенов в секунду, не больше burst подряд."""
+
+    rate: float
+    burst: float
+    tokens: float = field(init=False)
+    updated_at: float = field(init=False, default=0.0)
+
+    def __post_init__(self) -> None:
+        self.tokens = self.burst
+
+    def _refill(self, now: float) -> None:
+        if self.updated_at:
+            elapsed = max(0.0, now - self.updated_at)
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        """Через сколько секунд появится токен (0 — уже есть)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.burst
+
+
+@dataclass(slots=True)
+class _Waiter:
+    priority: SendPriority
+    seq: int
+    chat_id: int
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class SendScheduler:
+    """
+    Выдаёт разрешения на отправку в порядке приоритета, соблюдая глобальный
+    лимит и лимит на чат.
+
+    - Очередь чата — FIFO: разрешение получает только голова очереди, а из
+      готовых голов — с наивысшим приоритетом (при равном — пришедшая раньше)
+    - Раздачей занимается одна фоновая задача; она запускается при первой
+      отправке и завершается, когда очередь пуста
+    - Токены списываются из вёдер в Redis (одна EVAL на разрешение), поэтому
+      лимиты общие для всех экземпляров; без Redis (redis_client=None) или
+      при его недоступности — из вёдер в памяти процесса
+    - pause(seconds) — ответ Bot API 429 (retry_after): раздача
+      приостанавливается для всех чатов
+    """
+
+    def __init__(
+        self,
+        *,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        chat_burst: float = 3,
+        redis_client: Optional[RedisClient] = None,
+    ) -> None:
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.rate_client = (
+            RedisSendRateClient(redis_client) if redis_client is not None else None
+        )
+        self._chat_buckets: dict[int, TokenBucket] = {}
+        # Когда ведро снова даст токен (по последнему ответу вёдер)
+        self._global_ready_at = 0.0
+        self._chat_ready_at: dict[int, float] = {}
+        self._queues: dict[int, deque[_Waiter]] = {}
+        self._depth = {priority: 0 for priority in SendPriority}
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        return sum(self._depth.values())
+
+    async def acquire(
+        self,
+        chat_id: int,
+        priority: Optional[SendPriority] = None,
+        *,
+        retry: bool = False,
+    ) -> None:
+        """
+        Ждёт разрешения на одно сообщение в chat_id.
+
+        retry=True — повтор уже получившей разрешение отправки (после 429):
+        встаёт в голову очереди чата, чтобы не обогнали следующие сообщения.
+        """
+        priority = current_send_priority() if priority is None else priority
+        waiter = _Waiter(
+            priority,
+            next(self._seq),
+            chat_id,
+            asyncio.get_running_loop().create_future(),
+            time.monotonic(),
+        )
+        queue = self._queues.setdefault(chat_id, deque())
+        if retry:
+            queue.appendleft(waiter)
+        else:
+            queue.append(waiter)
+        self._set_depth(priority, +1)
+        self._wakeup.set()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            self._discard(waiter)
+            raise
+        send_wait.observe(time.monotonic() - waiter.enqueued_at, priority.name.lower())
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._wakeup.set()
+
+    def _set_depth(self, priority: SendPriority, delta: int) -> None:
+        self._depth[priority] += delta
+        send_queue_depth.set(self._depth[priority], priority.name.lower())
+
+    def _discard(self, waiter: _Waiter) -> None:
+        queue = self._queues.get(waiter.chat_id)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            self._set_depth(waiter.priority, -1)
+            if not queue:
+                del self._queues[waiter.chat_id]
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(
+                self.chat_rate, self.chat_burst
+            )
+        return bucket
+
+    async def _take(self, chat_id: int) -> tuple[float, float]:
+        """
+        Списывает токен из глобального ведра и ведра чата. Возвращает
+        (ожидание глобального, ожидание чата); (0, 0) — токен списан.
+        """
+        if self.rate_client is not None:
+            try:
+                return await self.rate_client.take(
+                    chat_id,
+                    time.time(),
+                    (
+                        (self.global_bucket.rate, self.global_bucket.burst),
+                        (self.chat_rate, self.chat_burst),
+                    ),
+                )
+            except Exception as e:
+                logger.warning("Redis недоступен, лимиты отправки в памяти: %s", e)
+        now = time.monotonic()
+        global_wait = self.global_bucket.wait_time(now)
+        chat_bucket = self._chat_bucket(chat_id)
+        chat_wait = chat_bucket.wait_time(now)
+        if not global_wait and not chat_wait:
+            self.global_bucket.take(now)
+            chat_bucket.take(now)
+        return global_wait, chat_wait
+
+    def _next_ready(self, now: float) -> tuple[Optional[_Waiter], float]:
+        """Готовая голова очереди с наивысшим приоритетом или время ожидания."""
+        best: Optional[_Waiter] = None
+        wait = float("inf")
+        for chat_id, queue in self._queues.items():
+            chat_wait = self._chat_ready_at.get(chat_id, 0.0) - now
+            if chat_wait > 0:
+                wait = min(wait, chat_wait)
+                continue
+            head = queue[0]
+            if best is None or (head.priority, head.seq) < (best.priority, best.seq):
+                best = head
+        return best, wait
+
+    def _prune_buckets(self, now: float) -> None:
+        for chat_id in [
+            chat_id
+            for chat_id, bucket in self._chat_buckets.items()
+            if chat_id not in self._queues and bucket.is_full(now)
+        ]:
+            del self._chat_buckets[chat_id]
+        for chat_id in [
+            chat_id
+            for chat_id, ready_at in self._chat_ready_at.items()
+            if chat_id not in self._queues and ready_at <= now
+        ]:
+            del self._chat_ready_at[chat_id]
+
+    async def _sleep(self, seconds: float) -> None:
+        """Пауза, которую прерывает новая отправка или pause()."""
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self) -> None:
+        while self._queues:
+            now = time.monotonic()
+            wait = max(self._paused_until - now, self._global_ready_at - now)
+            if wait > 0:
+                await self._sleep(wait)
+                continue
+
+            waiter, wait = self._next_ready(now)
+            if waiter is None:
+                await self._sleep(wait)
+                continue
+
+            global_wait, chat_wait = await self._take(waiter.chat_id)
+            now = time.monotonic()
+            if global_wait > 0:
+                self._global_ready_at = now + global_wait
+                continue
+            if chat_wait > 0:
+                self._chat_ready_at[waiter.chat_id] = now + chat_wait
+                continue
+
+            # Пока списывался токен, голова могла смениться (отмена или повтор
+            # после 429): разрешение получает текущая голова очереди чата
+            queue = self._queues.get(waiter.chat_id)
+            if not queue:
+                continue
+            waiter = queue[0]
+            self._discard(waiter)
+            if waiter.future.done():
+                # Отправитель отменён, пока ждал в очереди
+                continue
+            waiter.future.set_result(None)
+            # Отдаём управление: получивший разрешение начинает отправку
+            await asyncio.sleep(0)
+        self._prune_buckets(time.monotonic())
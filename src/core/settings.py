@@ -6,6 +6,27 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     bot_token: str
+    # Окно (сек), в котором повторно доставленный update_id отбрасывается; 0 — выкл.
+    update_dedup_ttl_s: int = 10 * 60
+    # Ограничение частоты апдейтов пользователя (src/core/throttling.py).
+    throttle_enabled: bool = True
+
+    # Bot API (src/bot/api_client.py). Пустой URL — api.telegram.org; иначе
+    # собственный telegram-bot-api, например http://telegram-bot-api:8081
+    telegram_api_url: Optional[str] = None
+    # Сервер запущен с --local: файлы без лимита 20 МБ, отдаются путями на диске
+    telegram_api_local: bool = False
+    telegram_pool_size: int = 100
+    telegram_dns_ttl_s: int = 300
+    telegram_keepalive_s: float = 30
+    # Общий таймаут запроса (сек) и переопределения по методам: {"sendVideo": 120}
+    telegram_timeout_s: float = 60
+    telegram_method_timeouts_s: dict[str, float] = {}
+    # Планировщик отправки (src/core/send_scheduler.py): сообщений в секунду
+    # всего и в один чат (с запасом chat_burst подряд)
+    send_global_rate: float = 30
+    send_chat_rate: float = 1
+    send_chat_burst: int = 3
     # Redis можно задать либо одной строкой REDIS_URL, либо компонентами ниже.
     redis_url: Optional[str] = None
     redis_host: Optional[str] = None
@@ -22,8 +43,39 @@ class Settings(BaseSettings):
     db_pool_size: Optional[int] = 5
     db_max_overflow: Optional[int] = 10
     db_pool_timeout: Optional[int] = 30
+    # Порог медленного запроса (мс); пусто — журнал медленных запросов отключён
+    db_slow_query_ms: Optional[float] = 200
+    # Снимать план EXPLAIN для медленных запросов
+    db_explain_slow_queries: bool = True
+    # Применять миграции src/db/migrations при старте бота (иначе — вручную через CLI)
+    db_migrate_on_startup: bool = False
+    # Период сверки счётчиков homework_answer_stats с answers (сек); 0 — не запускать
+    answer_stats_reconcile_interval_s: int = 6 * 60 * 60
+    # Период сборки мусора в telegram_files (сек); 0 — не запускать
+    telegram_files_gc_interval_s: int = 24 * 60 * 60
+
+    # Планировщик таймеров (напоминания о сроке); работает на экземпляре-лидере
+    scheduler_enabled: bool = True
+    # За сколько часов до срока напоминать студентам без ответа
+    deadline_reminder_offsets_h: list[int] = [24, 1]
+    # Период досылки отложенных публикаций без таймера (сек); 0 — не запускать
+    publication_sweep_interval_s: int = 60
+
+    # Эндпоинт /metrics для Prometheus; если порт не задан — не запускается
+    metrics_host: str = "0.0.0.0"
+    metrics_port: Optional[int] = None
+
+    # Трассировка апдейтов: сохраняются только апдейты дольше порога (мс) или с ошибкой
+    trace_enabled: bool = True
+    trace_slow_ms: float = 1000
+    # OTLP/HTTP коллектор (например, http://collector:4318/v1/traces); пусто — JSONL в logs/traces
+    trace_otlp_endpoint: Optional[str] = None
 
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
+    # Максимальный размер очереди логов; при переполнении записи отбрасываются.
+    log_queue_size: int = 10000
+    # Доля записей ниже WARNING, которые пишутся для логгера: {"db_performance": 0.1}
+    log_sampling: dict[str, float] = {}
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
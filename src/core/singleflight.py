@@ -0,0 +1,51 @@
+"""
+Объединение одновременных загрузок одного ключа (singleflight).
+
+• Первый вызов do(key, loader) запускает loader отдельной задачей; вызовы с
+  тем же ключом, пришедшие до её завершения, ждут ту же задачу и получают
+  тот же результат (или то же исключение).
+• Отмена вызывающего (например, PaginationCoalesceMiddleware) не отменяет
+  загрузку для остальных: каждый ждёт задачу через asyncio.shield.
+• Результат не кэшируется: после завершения задачи следующий вызов снова
+  идёт в loader. Кэш — забота вызывающего (HomeworkCache, Redis).
+• Результат общий для всех ждущих: изменяемые значения (списки) вызывающий
+  копирует сам.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from src.core.metrics import singleflight_calls
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Загрузки в полёте по ключу; name — метка в singleflight_calls_total."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._flights: dict[Hashable, asyncio.Task[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        task = self._flights.get(key)
+        if task is None:
+            singleflight_calls.inc(self.name, "leader")
+            task = asyncio.ensure_future(loader())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            singleflight_calls.inc(self.name, "shared")
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Все ждущие могли быть отменены: исключение считается полученным
+            task.exception()
@@ -0,0 +1,54 @@
+"""
+Бюджеты частоты апдейтов для ThrottlingMiddleware (token bucket в Redis).
+
+• У каждого пользователя два ведра: общее (USER_BUDGET) и на маршрут —
+  хендлер, который обрабатывает апдейт; апдейт проходит, только если токен
+  есть в обоих.
+• Хендлер может объявить собственный бюджет маршрута декоратором
+  @throttle(...), иначе применяется DEFAULT_THROTTLE.
+• coalesce=True — для пагинации: из серии колбэков сверх бюджета выполняется
+  только последний, остальные отбрасываются.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+_THROTTLE_ATTR = "__throttle__"
+
+
+@dataclass(frozen=True, slots=True)
+class ThrottleBudget:
+    """Token bucket: rate токенов в секунду, не больше burst подряд."""
+
+    rate: float
+    burst: int
+    coalesce: bool = False
+
+
+USER_BUDGET = ThrottleBudget(rate=3, burst=15)
+DEFAULT_THROTTLE = ThrottleBudget(rate=1, burst=5)
+
+
+def throttle(rate: float, burst: int, *, coalesce: bool = False) -> Callable[[F], F]:
+    """
+    Объявляет бюджет маршрута. Ставится под декоратором роутера:
+
+        @router.callback_query(...)
+        @throttle(rate=1, burst=3, coalesce=True)
+        async def handler(...): ...
+    """
+    budget = ThrottleBudget(rate=rate, burst=burst, coalesce=coalesce)
+
+    def decorator(func: F) -> F:
+        setattr(func, _THROTTLE_ATTR, budget)
+        return func
+
+    return decorator
+
+
+def get_handler_throttle(func: Callable) -> ThrottleBudget:
+    return getattr(func, _THROTTLE_ATTR, DEFAULT_THROTTLE)
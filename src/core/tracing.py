@@ -0,0 +1,364 @@
+"""
+Лёгкая трассировка апдейтов.
+
+• На каждый апдейт заводится трасса (trace_id) в context-переменной; спаны создаются
+  через span(...) / @traced(...) и автоматически вкладываются в текущий спан.
+• Вне трассы span() ничего не записывает и почти ничего не стоит.
+• Tail-based sampling: трасса экспортируется только если апдейт длился дольше
+  TRACE_SLOW_MS или завершился ошибкой; быстрые трассы отбрасываются целиком.
+• Экспорт: JSONL-файл logs/traces/traces.jsonl (по умолчанию, запись в отдельном
+  потоке) либо OTLP/HTTP JSON на TRACE_OTLP_ENDPOINT.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import inspect
+import json
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Protocol
+
+import aiohttp
+
+from src.core.logger import get_log_file, get_logger
+from src.core.settings import settings
+
+_MAX_SPANS_PER_TRACE = 500  # защита от разрастания трассы в длинных апдейтах
+
+logger = get_logger("tracing")
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    duration_ms: Optional[float] = None
+    _start: float = field(default_factory=time.perf_counter)
+
+    def end(self) -> None:
+        """Завершает спан (повторный вызов ничего не меняет)."""
+        if self.duration_ms is None:
+            self.duration_ms = (time.perf_counter() - self._start) * 1000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms or 0.0, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+@dataclass(slots=True)
+class Trace:
+    trace_id: str
+    root: Span
+    spans: list[Span] = field(default_factory=list)
+    dropped_spans: int = 0
+
+
+class SpanExporter(Protocol):
+    def export(self, trace: Trace) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def start_span(name: str, **attributes: Any) -> Optional[Span]:
+    """
+    Создаёт спан в текущей трассе, не делая его текущим.
+    Нужен там, где конец спана не совпадает с выходом из блока (middleware).
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    if len(trace.spans) >= _MAX_SPANS_PER_TRACE:
+        trace.dropped_spans += 1
+        return None
+    parent = _current_span.get()
+    sp = Span(
+        name=name,
+        trace_id=trace.trace_id,
+        span_id=_new_id(8),
+        parent_id=parent.span_id if parent else trace.root.span_id,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+    )
+    trace.spans.append(sp)
+    return sp
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Спан на время блока; вложенные спаны становятся его дочерними."""
+    sp = start_span(name, **attributes)
+    if sp is None:
+        yield None
+        return
+    token = _current_span.set(sp)
+    try:
+        yield sp
+    except BaseException as e:
+        sp.status = "error"
+        sp.set_attribute("error", repr(e))
+        raise
+    finally:
+        sp.end()
+        _current_span.reset(token)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Декоратор асинхронной функции: каждый вызов — отдельный спан.
+
+    Обёртка сохраняет сигнатуру функции (__wrapped__ и __signature__):
+    aiogram по ней решает, какие данные передать фильтру или хендлеру, и без
+    неё отдал бы в **kwargs всё содержимое data.
+    """
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return await func(*args, **kwargs)
+            with span(span_name):
+                return await func(*args, **kwargs)
+
+        wrapper.__signature__ = inspect.signature(func)
+        return wrapper
+
+    return decorator
+
+
+# ──────────────────────────────
+# Экспорт
+# ──────────────────────────────
+
+
+class JsonlSpanExporter:
+    """
+    Пишет спаны построчно в JSONL-файл из отдельного потока.
+    Очередь ограничена: при переполнении трассы отбрасываются.
+    """
+
+    def __init__(self, path: Path, max_queue: int = 1000) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self, trace: Trace) -> None:
+        if self._thread is None:
+            # поток поднимаем лениво — большинство процессов (тесты, CLI) трасс не пишут
+            self._thread = threading.Thread(
+                target=self._run, name="trace-writer", daemon=True
+            )
+            self._thread.start()
+        lines = [
+            json.dumps(sp.as_dict(), ensure_ascii=False, default=str)
+            for sp in [trace.root, *trace.spans]
+        ]
+        try:
+            self._queue.put_nowait(lines)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            lines = self._queue.get()
+            if lines is None:
+                return
+            try:
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+            except OSError as e:
+                logger.error("Не удалось записать трассу: %s", e)
+
+    async def close(self) -> None:
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        await asyncio.to_thread(self._thread.join, 5)
+        self._thread = None
+
+
+class OtlpHttpSpanExporter:
+    """
+    Отправляет трассы в коллектор в формате OTLP/HTTP JSON (POST /v1/traces).
+    Отправка идёт фоновыми задачами и не задерживает обработку апдейта.
+    """
+
+    def __init__(self, endpoint: str, service_name: str = "telegram-bot") -> None:
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _attributes(values: dict[str, Any]) -> list[dict[str, Any]]:
+        return [{"key": k, "value": {"stringValue": str(v)}} for k, v in values.items()]
+
+    def _otlp_span(self, sp: Span) -> dict[str, Any]:
+        end_ns = sp.start_ns + int((sp.duration_ms or 0.0) * 1_000_000)
+        data = {
+            "traceId": sp.trace_id,
+            "spanId": sp.span_id,
+            "name": sp.name,
+            "kind": 1,
+            "startTimeUnixNano": str(sp.start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": self._attributes(sp.attributes),
+            "status": {"code": 2 if sp.status == "error" else 1},
+        }
+        if sp.parent_id:
+            data["parentSpanId"] = sp.parent_id
+        return data
+
+    def to_payload(self, trace: Trace) -> dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": self._attributes(
+                            {"service.name": self.service_name}
+                        )
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "src.core.tracing"},
+                            "spans": [
+                                self._otlp_span(sp) for sp in [trace.root, *trace.spans]
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def export(self, trace: Trace) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._post(self.to_payload(trace)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _post(self, payload: dict[str, Any]) -> None:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=5)
+            )
+        try:
+            async with self._session.post(self.endpoint, json=payload) as response:
+                if response.status >= 400:
+                    logger.warning("OTLP коллектор ответил %s", response.status)
+        except Exception as e:
+            logger.warning("Не удалось отправить трассу: %s", e)
+
+    async def close(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+            self._session: Optional[aiohttp.ClientSession] = None
+
+
+class Tracer:
+    """Создаёт трассы апдейтов и решает, какие из них экспортировать."""
+
+    def __init__(self, slow_ms: float, exporter: Optional[SpanExporter] = None) -> None:
+        self.slow_ms = slow_ms
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def trace(self, name: str, **attributes: Any) -> Iterator[Optional[Trace]]:
+        """Трасса на время блока (обычно — обработка одного апдейта)."""
+        if not self.enabled:
+            yield None
+            return
+        trace_id = _new_id(16)
+        root = Span(
+            name=name,
+            trace_id=trace_id,
+            span_id=_new_id(8),
+            parent_id=None,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        trace = Trace(trace_id=trace_id, root=root)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(root)
+        try:
+            yield trace
+        except BaseException as e:
+            root.status = "error"
+            root.set_attribute("error", repr(e))
+            raise
+        finally:
+            root.end()
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            if trace.dropped_spans:
+                root.set_attribute("dropped_spans", trace.dropped_spans)
+            if root.status == "error" or root.duration_ms >= self.slow_ms:
+                self.exporter.export(trace)
+
+    async def close(self) -> None:
+        if self.exporter is not None:
+            await self.exporter.close()
+
+
+def _create_exporter() -> Optional[SpanExporter]:
+    if not settings.trace_enabled:
+        return None
+    if settings.trace_otlp_endpoint:
+        return OtlpHttpSpanExporter(settings.trace_otlp_endpoint)
+    return JsonlSpanExporter(
+        get_log_file(Path("traces") / "traces").with_suffix(".jsonl")
+    )
+
+
+tracer = Tracer(slow_ms=settings.trace_slow_ms, exporter=_create_exporter())
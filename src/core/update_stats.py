@@ -0,0 +1,126 @@
+"""
+Счётчики обращений к внешним системам в рамках одного апдейта.
+
+• На каждый апдейт заводится UpdateStats в context-переменной; SQL, Redis и
+  Bot API увеличивают счётчики через count_sql()/count_redis()/count_telegram().
+• Вне апдейта (фоновые задачи, тесты без track_update_stats) счётчики не ведутся.
+• Хендлер может объявить собственный бюджет декоратором @query_budget(...),
+  иначе применяется DEFAULT_BUDGET.
+"""
+
+from __future__ import annotations
+
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+_BUDGET_ATTR = "__query_budget__"
+
+
+@dataclass(frozen=True, slots=True)
+class QueryBudget:
+    """Верхние границы числа обращений за один апдейт (None — без ограничения)."""
+
+    sql: Optional[int] = None
+    redis: Optional[int] = None
+    telegram: Optional[int] = None
+
+
+DEFAULT_BUDGET = QueryBudget(sql=10, redis=20, telegram=6)
+
+
+@dataclass(slots=True)
+class UpdateStats:
+    """Счётчики одного апдейта."""
+
+    sql: int = 0
+    redis: int = 0
+    telegram: int = 0
+    handler: Optional[str] = None
+    budget: QueryBudget = DEFAULT_BUDGET
+
+    def exceeded(
+        self, budget: Optional[QueryBudget] = None
+    ) -> dict[str, tuple[int, int]]:
+        """Возвращает превышенные счётчики: {имя: (факт, лимит)}."""
+        budget = budget or self.budget
+        result = {}
+        for name in ("sql", "redis", "telegram"):
+            limit = getattr(budget, name)
+            value = getattr(self, name)
+            if limit is not None and value > limit:
+                result[name] = (value, limit)
+        return result
+
+
+_current_stats: contextvars.ContextVar[Optional[UpdateStats]] = contextvars.ContextVar(
+    "update_stats", default=None
+)
+
+
+def current_update_stats() -> Optional[UpdateStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_update_stats() -> Iterator[UpdateStats]:
+    """Включает подсчёт обращений для текущего контекста (апдейта или теста)."""
+    stats = UpdateStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def count_sql() -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.sql += 1
+
+
+def count_redis() -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.redis += 1
+
+
+def count_telegram() -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.telegram += 1
+
+
+def count_sql_statement(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    """Обработчик события before_cursor_execute для подсчёта SQL-запросов."""
+    count_sql()
+
+
+def query_budget(
+    sql: Optional[int] = None,
+    redis: Optional[int] = None,
+    telegram: Optional[int] = None,
+) -> Callable[[F], F]:
+    """
+    Объявляет бюджет хендлера. Ставится под декоратором роутера:
+
+        @router.callback_query(...)
+        @query_budget(sql=3)
+        async def handler(...): ...
+    """
+    budget = QueryBudget(sql=sql, redis=redis, telegram=telegram)
+
+    def decorator(func: F) -> F:
+        setattr(func, _BUDGET_ATTR, budget)
+        return func
+
+    return decorator
+
+
+def get_handler_budget(func: Callable) -> QueryBudget:
+    return getattr(func, _BUDGET_ATTR, DEFAULT_BUDGET)
@@ -1,3 +1,3 @@
-from .logger import database_logger
+from .logger import database_logger, slow_query_logger
 
-__all__ = ["database_logger"]
+__all__ = ["database_logger", "slow_query_logger"]
@@ -0,0 +1,3 @@
+"""
+Ручные бенчмарки схемы БД (запускаются как модули, в тестах не участвуют)
+"""
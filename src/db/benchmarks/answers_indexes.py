@@ -0,0 +1,221 @@
+"""
+Бенчмарк схемы answers до и после миграции 0001 (ENUM-статус + покрывающие индексы).
+
+Создаёт в текущей БД две временные таблицы bench_answers_before / bench_answers_after,
+заполняет одинаковыми сгенерированными данными и замеряет запросы страниц ответов
+в том виде, в каком их строит AnswersService:
+
+    python -m src.db.benchmarks.answers_indexes --rows 1000000
+
+Только для MySQL; боевые таблицы не затрагиваются, временные удаляются (кроме --keep).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from src.core.settings import settings
+
+BEFORE = "bench_answers_before"
+AFTER = "bench_answers_after"
+
+_COLUMNS = """
+  `answer_id` int NOT NULL AUTO_INCREMENT,
+  `homework_id` int NOT NULL,
+  `student_id` int NOT NULL,
+  `student_answer` text,
+  {status},
+  `grade` tinyint DEFAULT NULL,
+  `teacher_comment` text,
+  `sent_at` datetime NOT NULL,
+  `checked_at` datetime DEFAULT NULL,
+  PRIMARY KEY (`answer_id`)
+"""
+
+CREATE_BEFORE = f"""
+CREATE TABLE `{BEFORE}` ({_COLUMNS.format(status="`status` text NOT NULL")},
+  KEY `student_id` (`student_id`),
+  KEY `homework_id` (`homework_id`,`student_id`)
+) ENGINE=InnoDB
+"""
+
+_STATUS_ENUM = "`status` enum('sent','reviewed','rejected','accepted') NOT NULL"
+
+CREATE_AFTER = f"""
+CREATE TABLE `{AFTER}` ({_COLUMNS.format(status=_STATUS_ENUM)},
+  KEY `homework_id` (`homework_id`,`student_id`),
+  KEY `ix_answers_homework_status` (`homework_id`,`status`,`answer_id`),
+  KEY `ix_answers_student_sent` (`student_id`,`sent_at`,`answer_id`)
+) ENGINE=InnoDB
+"""
+
+# До 10^7 строк из декартова произведения цифр; распределение статусов близко
+# к реальному: большинство ответов проверены, «отправленных» около 10%
+FILL_BEFORE = f"""
+INSERT INTO `{BEFORE}` (homework_id, student_id, student_answer, status, sent_at)
+WITH digits AS (
+  SELECT 0 AS d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3
+  UNION ALL SELECT 4 UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7
+  UNION ALL SELECT 8 UNION ALL SELECT 9
+), seq AS (
+  SELECT a.d + b.d * 10 + c.d * 100 + e.d * 1000 + f.d * 10000 + g.d * 100000
+    + h.d * 1000000 AS n
+  FROM digits a, digits b, digits c, digits e, digits f, digits g, digits h
+)
+SELECT
+  n % :homeworks + 1,
+  (n * 7919) % :students + 1,
+  'ответ',
+  ELT(1 + (n * 31) % 10,
+      'sent', 'reviewed', 'rejected', 'accepted', 'accepted',
+      'accepted', 'accepted', 'reviewed', 'accepted', 'accepted'),
+  NOW() - INTERVAL (n % 7776000) SECOND
+FROM seq
+WHERE n < :rows
+"""
+
+FILL_AFTER = f"INSERT INTO `{AFTER}` SELECT * FROM `{BEFORE}`"
+
+QUERIES = {
+    "homework page": (
+        "SELECT * FROM `{table}` WHERE homework_id = :homework_id "
+        "AND status = 'sent' ORDER BY answer_id LIMIT 1 OFFSET :offset"
+    ),
+    "homework count": (
+        "SELECT COUNT(*) FROM `{table}` WHERE homework_id = :homework_id "
+        "AND status = 'sent'"
+    ),
+    "student page": (
+        "SELECT * FROM `{table}` WHERE student_id = :student_id "
+        "ORDER BY sent_at DESC, answer_id DESC LIMIT 1 OFFSET :offset"
+    ),
+    "student count": ("SELECT COUNT(*) FROM `{table}` WHERE student_id = :student_id"),
+}
+
+
+async def _prepare(conn: AsyncConnection, args: argparse.Namespace) -> None:
+    await _drop(conn)
+    await conn.execute(text(CREATE_BEFORE))
+    await conn.execute(text(CREATE_AFTER))
+
+    start = time.perf_counter()
+    await conn.execute(
+        text(FILL_BEFORE),
+        {"rows": args.rows, "homeworks": args.homeworks, "students": args.students},
+    )
+    await conn.execute(text(FILL_AFTER))
+    await conn.commit()
+    for table in (BEFORE, AFTER):
+        await conn.execute(text(f"ANALYZE TABLE `{table}`"))
+    print(f"Сгенерировано {args.rows} строк за {time.perf_counter() - start:.1f}s")
+
+
+async def _drop(conn: AsyncConnection) -> None:
+    for table in (BEFORE, AFTER):
+        await conn.execute(text(f"DROP TABLE IF EXISTS `{table}`"))
+
+
+async def _sizes(conn: AsyncConnection) -> dict[str, tuple[int, int]]:
+    rows = await conn.execute(
+        text(
+            "SELECT table_name, data_length, index_length "
+            "FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name IN (:before, :after)"
+        ),
+        {"before": BEFORE, "after": AFTER},
+    )
+    return {name: (data, index) for name, data, index in rows}
+
+
+async def _measure(
+    conn: AsyncConnection, table: str, sql: str, params: list[dict]
+) -> tuple[list[float], str]:
+    stmt = text(sql.format(table=table))
+    plan = (await conn.execute(text("EXPLAIN " + stmt.text), params[0])).mappings()
+    row = plan.first()
+    plan_info = f"key={row['key']} rows={row['rows']} extra={row['Extra'] or ''}"
+
+    timings = []
+    for p in params:
+        start = time.perf_counter()
+        (await conn.execute(stmt, p)).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, plan_info
+
+
+def _params(args: argparse.Namespace) -> list[dict]:
+    rnd = random.Random(42)
+    # Страницы «в глубине» списка — именно там без индекса растёт filesort
+    return [
+        {
+            "homework_id": rnd.randint(1, args.homeworks),
+            "student_id": rnd.randint(1, args.students),
+            "offset": rnd.randint(0, 40),
+        }
+        for _ in range(args.repeat)
+    ]
+
+
+def _p95(values: list[float]) -> float:
+    return statistics.quantiles(values, n=20)[-1]
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(settings.actual_database_url)
+    if engine.dialect.name != "mysql":
+        raise SystemExit("Бенчмарк рассчитан на MySQL")
+
+    params = _params(args)
+    try:
+        async with engine.connect() as conn:
+            if not args.skip_fill:
+                await _prepare(conn, args)
+
+            sizes = await _sizes(conn)
+            for table in (BEFORE, AFTER):
+                data, index = sizes.get(table, (0, 0))
+                print(
+                    f"{table}: данные {data / 2**20:.1f} MiB, "
+                    f"индексы {index / 2**20:.1f} MiB"
+                )
+
+            print(
+                f"\n{'запрос':<16}{'схема':<8}{'median, ms':>12}{'p95, ms':>10}  план"
+            )
+            for name, sql in QUERIES.items():
+                for label, table in (("before", BEFORE), ("after", AFTER)):
+                    timings, plan = await _measure(conn, table, sql, params)
+                    print(
+                        f"{name:<16}{label:<8}{statistics.median(timings):>12.2f}"
+                        f"{_p95(timings):>10.2f}  {plan}"
+                    )
+
+            if not args.keep:
+                await _drop(conn)
+                await conn.commit()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--homeworks", type=int, default=2_000)
+    parser.add_argument("--students", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument(
+        "--skip-fill", action="store_true", help="использовать уже заполненные таблицы"
+    )
+    parser.add_argument("--keep", action="store_true", help="не удалять таблицы")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
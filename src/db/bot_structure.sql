@@ -50,11 +50,14 @@ CREATE TABLE `answers` (
   `homework_id` int NOT NULL,
   `student_id` int NOT NULL,
   `student_answer` text CHARACTER SET utf8mb4 COLLATE utf8mb4_0900_ai_ci COMMENT 'Ответ студента',
-  `status` enum('sent','reviewed','rejected','accepted') NOT NULL COMMENT 'Статусы проверки преподавателя',
+  `status` enum('sent','reviewed','rejected','accepted') NOT NULL DEFAULT 'sent' COMMENT 'Статусы проверки преподавателя',
   `grade` tinyint DEFAULT NULL COMMENT 'Оценка преподавателя',
   `teacher_comment` text,
   `sent_at` datetime NOT NULL COMMENT 'Время отправки ответа',
-  `checked_at` datetime DEFAULT NULL COMMENT 'Время проверки ответа'
+  `checked_at` datetime DEFAULT NULL COMMENT 'Время проверки ответа',
+  `claimed_by` int DEFAULT NULL COMMENT 'Преподаватель, взявший ответ из очереди проверки',
+  `claimed_until` datetime DEFAULT NULL COMMENT 'До какого времени ответ закреплён за claimed_by',
+  `submission_key` varchar(64) CHARACTER SET ascii COLLATE ascii_bin DEFAULT NULL COMMENT 'sha256 содержимого ответа, ожидающего проверки; ключ идемпотентности'
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='Ответы студентов на задания с оценкой преподователя';
 
 --
@@ -63,6 +66,8 @@ CREATE TABLE `answers` (
 --       `homeworks` -> `homework_id`
 --   `student_id`
 --       `students` -> `student_id`
+--   `claimed_by`
+--       `teachers` -> `teacher_id`
 --
 
 -- --------------------------------------------------------
@@ -146,6 +151,27 @@ CREATE TABLE `homeworks` (
 
 -- --------------------------------------------------------
 
+--
+-- Структура таблицы `homework_answer_stats`
+--
+
+CREATE TABLE `homework_answer_stats` (
+  `homework_id` int NOT NULL,
+  `answers_count` int NOT NULL DEFAULT '0',
+  `sent_count` int NOT NULL DEFAULT '0',
+  `reviewed_count` int NOT NULL DEFAULT '0',
+  `rejected_count` int NOT NULL DEFAULT '0',
+  `accepted_count` int NOT NULL DEFAULT '0'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='Счётчики ответов на задание по статусам';
+
+--
+-- ССЫЛКИ ТАБЛИЦЫ `homework_answer_stats`:
+--   `homework_id`
+--       `homeworks` -> `homework_id`
+--
+
+-- --------------------------------------------------------
+
 --
 -- Структура таблицы `homework_files`
 --
@@ -160,7 +186,7 @@ CREATE TABLE `homework_files` (
 -- ССЫЛКИ ТАБЛИЦЫ `homework_files`:
 --   `homework_id`
 --       `homeworks` -> `homework_id`
---   `homeworks_file_id`
+--   `telegram_file_id`
 --       `telegram_files` -> `telegram_file_id`
 --
 
@@ -188,6 +214,32 @@ CREATE TABLE `homework_groups` (
 
 -- --------------------------------------------------------
 
+--
+-- Структура таблицы `schema_migrations`
+--
+
+CREATE TABLE `schema_migrations` (
+  `version` varchar(32) NOT NULL,
+  `name` varchar(255) NOT NULL,
+  `checksum` varchar(64) NOT NULL COMMENT 'sha256 файла миграции',
+  `execution_ms` int DEFAULT NULL,
+  `applied_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='Журнал применённых миграций (src/db/migrations)';
+
+--
+-- Дамп данных таблицы `schema_migrations`
+-- (эта схема уже включает перечисленные миграции)
+--
+
+INSERT INTO `schema_migrations` (`version`, `name`, `checksum`) VALUES
+('0001', 'answers_status_and_indexes', '7e2b4d44587daf7a86b6d0a253b36cd8eb3a64945e39d5838f90d9fcc0237b2e'),
+('0002', 'deferred_publication', 'e55b720cc4f4208a82e991d08b226f4237f919e638d79f6978ee4f4482e20a50'),
+('0003', 'telegram_files_dedup', 'b70abd4134084840d5af259ee17eb24b9fb4fa05cc4fb23c887a1ffcbf80547c'),
+('0004', 'answers_review_queue', '6ef99788adc6161e2ad56427233b46e1bce7b42be86e30df6190af9e3cade6ee'),
+('0005', 'answers_submission_key', 'a7573007134abd2168d56625b081bbe873c340888082d957f6da56091b8928a6');
+
+-- --------------------------------------------------------
+
 --
 -- Структура таблицы `students`
 --
@@ -236,10 +288,12 @@ CREATE TABLE `telegram_files` (
   `telegram_file_id` int NOT NULL,
   `file_id` text NOT NULL COMMENT 'Текущий file_id для отправки файла (может меняться!)',
   `unique_file_id` text NOT NULL COMMENT 'Стабильный уникальный идентификатор файла',
+  `unique_file_hash` varchar(64) CHARACTER SET ascii COLLATE ascii_bin NOT NULL COMMENT 'sha256(unique_file_id), ключ дедупликации',
   `file_type` text NOT NULL COMMENT 'Тип файла',
   `owner_user_id` bigint NOT NULL COMMENT 'От кого был переслан файл',
   `caption` text COMMENT 'Описание для файла',
   `mime_type` text COMMENT 'Тип содержимого',
+  `ref_count` int NOT NULL DEFAULT '0' COMMENT 'Число ссылок из homework_files и answer_files',
   `created_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP,
   `updated_at` datetime NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci COMMENT='Файлы из телеграмм';
@@ -301,8 +355,11 @@ ALTER TABLE `admins`
 --
 ALTER TABLE `answers`
   ADD PRIMARY KEY (`answer_id`),
-  ADD KEY `student_id` (`student_id`),
-  ADD KEY `homework_id` (`homework_id`,`student_id`);
+  ADD UNIQUE KEY `ux_answers_submission` (`homework_id`,`student_id`,`submission_key`),
+  ADD KEY `ix_answers_homework_status` (`homework_id`,`status`,`answer_id`),
+  ADD KEY `ix_answers_student_sent` (`student_id`,`sent_at`,`answer_id`),
+  ADD KEY `ix_answers_status_sent` (`status`,`sent_at`,`answer_id`),
+  ADD KEY `claimed_by` (`claimed_by`);
 
 --
 -- Индексы таблицы `answer_files`
@@ -333,22 +390,36 @@ ALTER TABLE `groups`
 --
 ALTER TABLE `homeworks`
   ADD PRIMARY KEY (`homework_id`),
-  ADD KEY `teacher_id` (`teacher_id`);
+  ADD KEY `teacher_id` (`teacher_id`),
+  ADD KEY `ix_homeworks_start_at` (`start_at`);
+
+--
+-- Индексы таблицы `homework_answer_stats`
+--
+ALTER TABLE `homework_answer_stats`
+  ADD PRIMARY KEY (`homework_id`);
 
 --
 -- Индексы таблицы `homework_files`
 --
 ALTER TABLE `homework_files`
   ADD PRIMARY KEY (`homeworks_file_id`),
-  ADD KEY `homework_id` (`homework_id`);
+  ADD KEY `homework_id` (`homework_id`),
+  ADD KEY `telegram_file_id` (`telegram_file_id`);
 
 --
 -- Индексы таблицы `homework_groups`
 --
 ALTER TABLE `homework_groups`
   ADD PRIMARY KEY (`homework_group_id`),
-  ADD KEY `group_id` (`group_id`),
-  ADD KEY `homework_id` (`homework_id`,`group_id`);
+  ADD KEY `homework_id` (`homework_id`,`group_id`),
+  ADD KEY `ix_homework_groups_group_homework` (`group_id`,`homework_id`);
+
+--
+-- Индексы таблицы `schema_migrations`
+--
+ALTER TABLE `schema_migrations`
+  ADD PRIMARY KEY (`version`);
 
 --
 -- Индексы таблицы `students`
@@ -372,6 +443,7 @@ ALTER TABLE `teachers`
 --
 ALTER TABLE `telegram_files`
   ADD PRIMARY KEY (`telegram_file_id`),
+  ADD UNIQUE KEY `ux_telegram_files_unique_file_hash` (`unique_file_hash`),
   ADD KEY `owner_user_id` (`owner_user_id`);
 
 --
@@ -467,7 +539,8 @@ ALTER TABLE `admins`
 --
 ALTER TABLE `answers`
   ADD CONSTRAINT `answers_ibfk_1` FOREIGN KEY (`homework_id`) REFERENCES `homeworks` (`homework_id`) ON DELETE CASCADE ON UPDATE CASCADE,
-  ADD CONSTRAINT `answers_ibfk_2` FOREIGN KEY (`student_id`) REFERENCES `students` (`student_id`) ON DELETE CASCADE ON UPDATE CASCADE;
+  ADD CONSTRAINT `answers_ibfk_2` FOREIGN KEY (`student_id`) REFERENCES `students` (`student_id`) ON DELETE CASCADE ON UPDATE CASCADE,
+  ADD CONSTRAINT `answers_ibfk_3` FOREIGN KEY (`claimed_by`) REFERENCES `teachers` (`teacher_id`) ON DELETE SET NULL ON UPDATE CASCADE;
 
 --
 -- Ограничения внешнего ключа таблицы `answer_files`
@@ -489,12 +562,18 @@ ALTER TABLE `assigned_groups`
 ALTER TABLE `homeworks`
   ADD CONSTRAINT `homeworks_ibfk_1` FOREIGN KEY (`teacher_id`) REFERENCES `teachers` (`teacher_id`) ON DELETE CASCADE ON UPDATE CASCADE;
 
+--
+-- Ограничения внешнего ключа таблицы `homework_answer_stats`
+--
+ALTER TABLE `homework_answer_stats`
+  ADD CONSTRAINT `homework_answer_stats_ibfk_1` FOREIGN KEY (`homework_id`) REFERENCES `homeworks` (`homework_id`) ON DELETE CASCADE ON UPDATE CASCADE;
+
 --
 -- Ограничения внешнего ключа таблицы `homework_files`
 --
 ALTER TABLE `homework_files`
   ADD CONSTRAINT `homework_files_ibfk_1` FOREIGN KEY (`homework_id`) REFERENCES `homeworks` (`homework_id`) ON DELETE CASCADE ON UPDATE CASCADE,
-  ADD CONSTRAINT `homework_files_ibfk_2` FOREIGN KEY (`homeworks_file_id`) REFERENCES `telegram_files` (`telegram_file_id`) ON DELETE CASCADE ON UPDATE CASCADE;
+  ADD CONSTRAINT `homework_files_ibfk_2` FOREIGN KEY (`telegram_file_id`) REFERENCES `telegram_files` (`telegram_file_id`) ON DELETE CASCADE ON UPDATE CASCADE;
 
 --
 -- Ограничения внешнего ключа таблицы `homework_groups`
@@ -0,0 +1,40 @@
+"""
+Запросы, синтаксис которых зависит от диалекта БД.
+
+Рабочая БД — MySQL; SQLite используется в тестах. Ветвление по диалекту
+собрано здесь, чтобы сервисы строили запросы одинаково для обеих БД.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from sqlalchemy import ColumnElement
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+OnConflict = Callable[[object], dict]
+
+
+def upsert(
+    session: AsyncSession,
+    model,
+    values: dict | list[dict],
+    key: Iterable[ColumnElement],
+    on_conflict: OnConflict,
+):
+    """
+    INSERT ... ON DUPLICATE KEY UPDATE (MySQL) / ON CONFLICT DO UPDATE (SQLite).
+
+    key — столбцы уникального ключа (MySQL определяет его сам),
+    on_conflict(new) — значения для существующей строки; new — столбцы
+    вставляемой строки (inserted / excluded).
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        stmt = sqlite_insert(model).values(values)
+        return stmt.on_conflict_do_update(
+            index_elements=list(key), set_=on_conflict(stmt.excluded)
+        )
+    stmt = mysql_insert(model).values(values)
+    return stmt.on_duplicate_key_update(on_conflict(stmt.inserted))
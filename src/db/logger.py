@@ -1,3 +1,4 @@
 from src.core.logger import ModulLogger
 
 database_logger = ModulLogger("database")
+slow_query_logger = ModulLogger("slow_queries")
@@ -0,0 +1,20 @@
+-- Значение статуса по умолчанию и покрывающие индексы для страниц ответов.
+--
+-- • status: колонка уже ENUM в базовой схеме; миграция только задаёт
+--   DEFAULT 'sent' — это изменение метаданных, таблица не перестраивается
+-- • ix_answers_homework_status: WHERE homework_id = ? AND status = ? ORDER BY answer_id
+-- • ix_answers_student_sent: WHERE student_id = ? ORDER BY sent_at DESC, answer_id DESC
+-- • Одиночный индекс student_id перекрывается префиксом ix_answers_student_sent
+
+ALTER TABLE `answers`
+  ALTER COLUMN `status` SET DEFAULT 'sent',
+  ALGORITHM=INSTANT;
+
+ALTER TABLE `answers`
+  ADD KEY `ix_answers_homework_status` (`homework_id`,`status`,`answer_id`),
+  ADD KEY `ix_answers_student_sent` (`student_id`,`sent_at`,`answer_id`),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE `answers`
+  DROP KEY `student_id`,
+  ALGORITHM=INPLACE, LOCK=NONE;
@@ -0,0 +1,21 @@
+-- Отложенная публикация заданий.
+--
+-- • ix_homeworks_start_at: фильтр опубликованных заданий start_at <= NOW()
+-- • ix_homework_groups_group_homework: задания группы без чтения строк homework_groups;
+--   одиночный индекс group_id перекрывается его префиксом
+-- • homework_groups.sent_at теперь отмечает рассылку уведомления группе.
+--   Старые задания рассылались при создании — помечаем их отправленными
+
+ALTER TABLE `homeworks`
+  ADD KEY `ix_homeworks_start_at` (`start_at`),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE `homework_groups`
+  ADD KEY `ix_homework_groups_group_homework` (`group_id`,`homework_id`),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+ALTER TABLE `homework_groups`
+  DROP KEY `group_id`,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+UPDATE `homework_groups` SET `sent_at` = `created_at` WHERE `sent_at` IS NULL;
@@ -0,0 +1,67 @@
+-- Реестр файлов Telegram без дублей: одна строка на unique_file_id.
+--
+-- • unique_file_hash = SHA2(unique_file_id, 256) под уникальным индексом
+--   (по TEXT-колонке уникальный индекс в MySQL не построить)
+-- • ref_count — число ссылок из homework_files и answer_files
+-- • Дубли сливаются в строку с минимальным telegram_file_id, ссылки переносятся
+-- • Внешний ключ homework_files_ibfk_2 указывал на homeworks_file_id вместо
+--   telegram_file_id: удаление файла каскадом удаляло чужую связь. Исправляем
+-- • Ключ добавляется при foreign_key_checks=0: так MySQL строит его INPLACE,
+--   без копирования таблицы; связи на несуществующие файлы удалены выше
+
+ALTER TABLE `homework_files`
+  DROP FOREIGN KEY `homework_files_ibfk_2`;
+
+ALTER TABLE `telegram_files`
+  ADD COLUMN `unique_file_hash` varchar(64) CHARACTER SET ascii COLLATE ascii_bin DEFAULT NULL COMMENT 'sha256(unique_file_id), ключ дедупликации' AFTER `unique_file_id`,
+  ADD COLUMN `ref_count` int NOT NULL DEFAULT '0' COMMENT 'Число ссылок из homework_files и answer_files' AFTER `mime_type`;
+
+UPDATE `telegram_files` SET `unique_file_hash` = SHA2(`unique_file_id`, 256);
+
+UPDATE `homework_files` hf
+  JOIN `telegram_files` tf ON tf.`telegram_file_id` = hf.`telegram_file_id`
+  JOIN (
+    SELECT `unique_file_hash`, MIN(`telegram_file_id`) AS `keep_id`
+    FROM `telegram_files` GROUP BY `unique_file_hash`
+  ) k ON k.`unique_file_hash` = tf.`unique_file_hash`
+  SET hf.`telegram_file_id` = k.`keep_id`
+  WHERE hf.`telegram_file_id` <> k.`keep_id`;
+
+UPDATE `answer_files` af
+  JOIN `telegram_files` tf ON tf.`telegram_file_id` = af.`telegram_file_id`
+  JOIN (
+    SELECT `unique_file_hash`, MIN(`telegram_file_id`) AS `keep_id`
+    FROM `telegram_files` GROUP BY `unique_file_hash`
+  ) k ON k.`unique_file_hash` = tf.`unique_file_hash`
+  SET af.`telegram_file_id` = k.`keep_id`
+  WHERE af.`telegram_file_id` <> k.`keep_id`;
+
+DELETE tf FROM `telegram_files` tf
+  JOIN (
+    SELECT `unique_file_hash`, MIN(`telegram_file_id`) AS `keep_id`
+    FROM `telegram_files` GROUP BY `unique_file_hash`
+  ) k ON k.`unique_file_hash` = tf.`unique_file_hash`
+  WHERE tf.`telegram_file_id` <> k.`keep_id`;
+
+-- Связи на несуществующие файлы (остались из-за неверного внешнего ключа)
+DELETE hf FROM `homework_files` hf
+  LEFT JOIN `telegram_files` tf ON tf.`telegram_file_id` = hf.`telegram_file_id`
+  WHERE tf.`telegram_file_id` IS NULL;
+
+UPDATE `telegram_files` tf
+  SET tf.`ref_count` =
+    (SELECT COUNT(*) FROM `homework_files` hf WHERE hf.`telegram_file_id` = tf.`telegram_file_id`)
+    + (SELECT COUNT(*) FROM `answer_files` af WHERE af.`telegram_file_id` = tf.`telegram_file_id`);
+
+ALTER TABLE `telegram_files`
+  MODIFY `unique_file_hash` varchar(64) CHARACTER SET ascii COLLATE ascii_bin NOT NULL COMMENT 'sha256(unique_file_id), ключ дедупликации',
+  ADD UNIQUE KEY `ux_telegram_files_unique_file_hash` (`unique_file_hash`);
+
+SET foreign_key_checks = 0;
+
+ALTER TABLE `homework_files`
+  ADD KEY `telegram_file_id` (`telegram_file_id`),
+  ADD CONSTRAINT `homework_files_ibfk_2` FOREIGN KEY (`telegram_file_id`) REFERENCES `telegram_files` (`telegram_file_id`) ON DELETE CASCADE ON UPDATE CASCADE,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+SET foreign_key_checks = 1;
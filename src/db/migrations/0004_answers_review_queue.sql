@@ -0,0 +1,26 @@
+-- Общая очередь проверки преподавателя по всем его заданиям.
+--
+-- • ix_answers_status_sent: WHERE status = 'sent' ORDER BY sent_at, answer_id
+--   (FIFO по времени отправки, keyset-пагинация по (sent_at, answer_id))
+-- • claimed_by / claimed_until: аренда ответа, чтобы несколько проверяющих
+--   разбирали очередь параллельно без столкновений
+-- • answers_ibfk_3 добавляется при foreign_key_checks=0, чтобы MySQL построил
+--   его INPLACE без копирования answers (claimed_by только что добавлен и пуст)
+
+ALTER TABLE `answers`
+  ADD COLUMN `claimed_by` int DEFAULT NULL COMMENT 'Преподаватель, взявший ответ из очереди проверки',
+  ADD COLUMN `claimed_until` datetime DEFAULT NULL COMMENT 'До какого времени ответ закреплён за claimed_by',
+  ALGORITHM=INSTANT;
+
+ALTER TABLE `answers`
+  ADD KEY `ix_answers_status_sent` (`status`,`sent_at`,`answer_id`),
+  ADD KEY `claimed_by` (`claimed_by`),
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+SET foreign_key_checks = 0;
+
+ALTER TABLE `answers`
+  ADD CONSTRAINT `answers_ibfk_3` FOREIGN KEY (`claimed_by`) REFERENCES `teachers` (`teacher_id`) ON DELETE SET NULL ON UPDATE CASCADE,
+  ALGORITHM=INPLACE, LOCK=NONE;
+
+SET foreign_key_checks = 1;
@@ -0,0 +1,19 @@
+-- Идемпотентная отправка ответов.
+--
+-- • submission_key: sha256 содержимого ответа (текст и файлы). Повтор той же
+--   отправки (двойное нажатие, повторная доставка апдейта), пока ответ ждёт
+--   проверки, находит уже созданный ответ вместо новой строки. Ключ
+--   обнуляется при оценке и правке ответа: тот же ответ можно отправить снова.
+--   У старых ответов ключ NULL.
+-- • ux_answers_submission (homework_id, student_id, submission_key) заменяет
+--   KEY `homework_id` (homework_id, student_id): его префикс покрывает те же
+--   запросы и внешний ключ answers_ibfk_1
+
+ALTER TABLE `answers`
+  ADD COLUMN `submission_key` varchar(64) CHARACTER SET ascii COLLATE ascii_bin DEFAULT NULL COMMENT 'sha256 содержимого ответа, ожидающего проверки; ключ идемпотентности',
+  ALGORITHM=INSTANT;
+
+ALTER TABLE `answers`
+  ADD UNIQUE KEY `ux_answers_submission` (`homework_id`,`student_id`,`submission_key`),
+  DROP KEY `homework_id`,
+  ALGORITHM=INPLACE, LOCK=NONE;
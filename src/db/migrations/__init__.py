@@ -0,0 +1,31 @@
+"""
+Версионные миграции схемы БД.
+
+- Файлы NNNN_name.sql в этом каталоге применяются по возрастанию версии
+- Журнал schema_migrations хранит версию и sha256 каждого применённого файла
+- Построение индексов в MySQL выполняется онлайн (ALGORITHM=INPLACE, LOCK=NONE)
+- Запуск: при старте бота (DB_MIGRATE_ON_STARTUP) или python -m src.db.migrations
+"""
+
+from .drift import SchemaDrift, check_schema_drift
+from .runner import (
+    MIGRATIONS_DIR,
+    Migration,
+    apply_migrations,
+    load_migrations,
+    online_index_ddl,
+    pending_migrations,
+    split_statements,
+)
+
+__all__ = [
+    "MIGRATIONS_DIR",
+    "Migration",
+    "SchemaDrift",
+    "apply_migrations",
+    "check_schema_drift",
+    "load_migrations",
+    "online_index_ddl",
+    "pending_migrations",
+    "split_statements",
+]
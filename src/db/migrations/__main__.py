@@ -0,0 +1,65 @@
+"""
+CLI миграций:
+
+    python -m src.db.migrations status   # применённые и ожидающие миграции
+    python -m src.db.migrations apply    # применить ожидающие (--target NNNN)
+    python -m src.db.migrations check    # расхождения models.py и живой схемы
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+
+from src.db.session import async_engine
+
+from . import apply_migrations, check_schema_drift, load_migrations, pending_migrations
+
+
+async def _status() -> int:
+    pending = {m.version for m in await pending_migrations(async_engine)}
+    for migration in load_migrations():
+        mark = "ожидает " if migration.version in pending else "применена"
+        print(f"{mark}  {migration.version}_{migration.name}")
+    return 0
+
+
+async def _apply(target: str | None) -> int:
+    applied = await apply_migrations(async_engine, target=target)
+    for migration in applied:
+        print(f"применена  {migration.version}_{migration.name}")
+    if not applied:
+        print("Новых миграций нет")
+    return 0
+
+
+async def _check() -> int:
+    drift = await check_schema_drift(async_engine)
+    for line in drift.lines():
+        print(line)
+    if drift.ok:
+        print("Схема совпадает с моделями")
+    return 0 if drift.ok else 1
+
+
+async def _main(args: argparse.Namespace) -> int:
+    try:
+        if args.command == "status":
+            return await _status()
+        if args.command == "apply":
+            return await _apply(args.target)
+        return await _check()
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.db.migrations")
+    parser.add_argument("command", choices=["status", "apply", "check"])
+    parser.add_argument("--target", help="применить миграции до версии включительно")
+    sys.exit(asyncio.run(_main(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
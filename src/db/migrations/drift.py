@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import Index, MetaData, Table, UniqueConstraint, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.db.models import Base
+
+# (колонки, уникальный ли) — имена индексов в дампе и в моделях различаются
+IndexKey = tuple[tuple[str, ...], bool]
+
+
+@dataclass
+class SchemaDrift:
+    """Расхождения между src/db/models.py и живой схемой БД."""
+
+    missing_tables: list[str] = field(default_factory=list)
+    missing_columns: list[str] = field(default_factory=list)
+    missing_indexes: list[str] = field(default_factory=list)
+    unexpected_indexes: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (
+            self.missing_tables
+            or self.missing_columns
+            or self.missing_indexes
+            or self.unexpected_indexes
+        )
+
+    def lines(self) -> list[str]:
+        return (
+            [f"нет таблицы: {name}" for name in self.missing_tables]
+            + [f"нет колонки: {name}" for name in self.missing_columns]
+            + [f"нет индекса: {name}" for name in self.missing_indexes]
+            + [f"лишний индекс: {name}" for name in self.unexpected_indexes]
+        )
+
+
+def _format(table: str, key: IndexKey) -> str:
+    columns, unique = key
+    return f"{table}({', '.join(columns)}){' UNIQUE' if unique else ''}"
+
+
+def _model_indexes(table: Table) -> set[IndexKey]:
+    keys = set()
+    for item in (*table.indexes, *table.constraints):
+        if isinstance(item, (Index, UniqueConstraint)):
+            columns = tuple(column.name for column in item.columns)
+            unique = isinstance(item, UniqueConstraint) or bool(item.unique)
+            keys.add((columns, unique))
+    return keys
+
+
+def _live_indexes(inspector, table: str) -> set[IndexKey]:
+    keys = {
+        (tuple(index["column_names"]), bool(index["unique"]))
+        for index in inspector.get_indexes(table)
+    }
+    # SQLite не показывает автоиндексы UNIQUE в get_indexes
+    keys |= {
+        (tuple(constraint["column_names"]), True)
+        for constraint in inspector.get_unique_constraints(table)
+    }
+    return keys
+
+
+def _covers(index: tuple[str, ...], columns: tuple[str, ...]) -> bool:
+    return index[: len(columns)] == columns
+
+
+def _compare(connection: Connection, metadata: MetaData) -> SchemaDrift:
+    inspector = inspect(connection)
+    drift = SchemaDrift()
+    live_tables = set(inspector.get_table_names())
+
+    for table in metadata.sorted_tables:
+        if table.name not in live_tables:
+            drift.missing_tables.append(table.name)
+            continue
+
+        live_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        drift.missing_columns += [
+            f"{table.name}.{column.name}"
+            for column in table.columns
+            if column.name not in live_columns
+        ]
+
+        expected = _model_indexes(table)
+        live = _live_indexes(inspector, table.name)
+        for columns, unique in sorted(expected - live):
+            # Неуникальный индекс модели покрыт более широким живым индексом
+            if not unique and any(_covers(index, columns) for index, _ in live):
+                continue
+            drift.missing_indexes.append(_format(table.name, (columns, unique)))
+
+        foreign_keys = [
+            tuple(fk.parent.name for fk in constraint.elements)
+            for constraint in table.foreign_key_constraints
+        ]
+        primary_key = tuple(column.name for column in table.primary_key.columns)
+        for columns, unique in sorted(live - expected):
+            # Индексы под внешние ключи MySQL создаёт сам, индекс PK — тоже ожидаем
+            if columns == primary_key or columns in foreign_keys:
+                continue
+            # Широкий индекс, покрывающий индекс модели, не считается лишним
+            if any(_covers(columns, index) for index, _ in expected):
+                continue
+            drift.unexpected_indexes.append(_format(table.name, (columns, unique)))
+    return drift
+
+
+async def check_schema_drift(
+    engine: AsyncEngine, metadata: MetaData = Base.metadata
+) -> SchemaDrift:
+    """Сравнивает таблицы, колонки и индексы моделей с живой схемой."""
+    async with engine.connect() as conn:
+        return await conn.run_sync(_compare, metadata)
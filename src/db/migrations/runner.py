@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.db import database_logger
+from src.db.models import SchemaMigrationsModel
+
+MIGRATIONS_DIR = Path(__file__).parent
+# Одновременный старт нескольких экземпляров бота: миграции применяет один
+LOCK_NAME = "schema_migrations"
+LOCK_TIMEOUT_S = 60
+
+_FILE_RE = re.compile(r"^(?P<version>\d{4,})_(?P<name>\w+)\.sql$")
+_ONLINE_CLAUSE_RE = re.compile(
+    r"^(ADD\s+(UNIQUE\s+)?(KEY|INDEX)|DROP\s+(KEY|INDEX)|RENAME\s+(KEY|INDEX))\b",
+    re.IGNORECASE,
+)
+
+logger = database_logger.get_logger("migrations")
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Файл миграции NNNN_name.sql: версия, имя и текст."""
+
+    version: str
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+    @property
+    def statements(self) -> list[str]:
+        return split_statements(self.sql)
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    """Миграции каталога по возрастанию версии."""
+    migrations = []
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILE_RE.match(path.name)
+        if match is None:
+            raise RuntimeError(f"Некорректное имя файла миграции: {path.name}")
+        sql = path.read_text(encoding="utf-8").replace("\r\n", "\n")
+        migrations.append(Migration(match["version"], match["name"], sql))
+
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Повторяющиеся версии миграций: {versions}")
+    return migrations
+
+
+def split_statements(sql: str) -> list[str]:
+    """
+    Делит текст миграции на запросы по «;» в конце строки.
+    Строки-комментарии (--) отбрасываются; «;» внутри строковых литералов
+    в конце строки не поддерживается.
+    """
+    statements, current = [], []
+    for line in sql.splitlines():
+        if line.lstrip().startswith("--"):
+            continue
+        current.append(line)
+        if line.rstrip().endswith(";"):
+            statement = "\n".join(current).strip().rstrip(";").strip()
+            if statement:
+                statements.append(statement)
+            current = []
+    tail = "\n".join(current).strip()
+    if tail:
+        statements.append(tail)
+    return statements
+
+
+def _split_clauses(body: str) -> list[str]:
+    """Делит список действий ALTER TABLE по запятым верхнего уровня."""
+    clauses, depth, start = [], 0, 0
+    for i, char in enumerate(body):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            clauses.append(body[start:i].strip())
+            start = i + 1
+    clauses.append(body[start:].strip())
+    return clauses
+
+
+def online_index_ddl(statement: str) -> str:
+    """
+    Добавляет ALGORITHM=INPLACE, LOCK=NONE к построению индексов (MySQL),
+    если алгоритм не указан явно: таблица остаётся доступной на запись.
+    ALTER TABLE с другими действиями (MODIFY, ADD COLUMN ...) не меняется.
+    """
+    if re.search(r"\bALGORITHM\s*=", statement, re.IGNORECASE):
+        return statement
+    if re.match(r"^CREATE\s+(UNIQUE\s+)?INDEX\b", statement, re.IGNORECASE):
+        return f"{statement} ALGORITHM=INPLACE LOCK=NONE"
+
+    match = re.match(r"^ALTER\s+TABLE\s+\S+\s+", statement, re.IGNORECASE)
+    if match is None:
+        return statement
+    clauses = _split_clauses(statement[match.end() :])
+    if all(_ONLINE_CLAUSE_RE.match(clause) for clause in clauses):
+        return f"{statement},\n  ALGORITHM=INPLACE, LOCK=NONE"
+    return statement
+
+
+async def _applied(conn: AsyncConnection) -> dict[str, str]:
+    rows = await conn.execute(
+        select(SchemaMigrationsModel.version, SchemaMigrationsModel.checksum)
+    )
+    return {version: checksum for version, checksum in rows}
+
+
+async def _acquire_lock(conn: AsyncConnection) -> None:
+    if conn.dialect.name != "mysql":
+        return
+    acquired = await conn.scalar(
+        text("SELECT GET_LOCK(:name, :timeout)"),
+        {"name": LOCK_NAME, "timeout": LOCK_TIMEOUT_S},
+    )
+    if acquired != 1:
+        raise RuntimeError("Не удалось получить блокировку миграций")
+
+
+async def _release_lock(conn: AsyncConnection) -> None:
+    if conn.dialect.name == "mysql":
+        await conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+
+
+async def _reset_session(conn: AsyncConnection) -> None:
+    """
+    Возвращает переменные сессии, которые меняют миграции (foreign_key_checks),
+    после ошибки: соединение уходит обратно в пул. Если сбросить не удалось,
+    соединение закрывается вместо возврата в пул.
+    """
+    if conn.dialect.name != "mysql":
+        return
+    try:
+        await conn.exec_driver_sql("SET foreign_key_checks = 1")
+    except Exception:
+        await conn.invalidate()
+
+
+async def pending_migrations(
+    engine: AsyncEngine, directory: Path = MIGRATIONS_DIR
+) -> list[Migration]:
+    """Ещё не применённые миграции; расхождение контрольных сумм — ошибка."""
+    async with engine.connect() as conn:
+        await conn.run_sync(SchemaMigrationsModel.__table__.create, checkfirst=True)
+        await conn.commit()
+        return _verify(load_migrations(directory), await _applied(conn))
+
+
+def _verify(migrations: list[Migration], applied: dict[str, str]) -> list[Migration]:
+    known = {m.version for m in migrations}
+    unknown = sorted(set(applied) - known)
+    if unknown:
+        logger.warning("В журнале есть миграции без файлов: %s", unknown)
+
+    pending = []
+    for migration in migrations:
+        checksum = applied.get(migration.version)
+        if checksum is None:
+            pending.append(migration)
+        elif checksum != migration.checksum:
+            raise RuntimeError(
+                f"Миграция {migration.version}_{migration.name} изменена "
+                "после применения (контрольная сумма не совпадает)"
+            )
+    return pending
+
+
+async def apply_migrations(
+    engine: AsyncEngine,
+    directory: Path = MIGRATIONS_DIR,
+    *,
+    target: Optional[str] = None,
+) -> list[Migration]:
+    """
+    Применяет новые миграции по порядку (до версии target включительно)
+    и записывает их в schema_migrations. Возвращает применённые миграции.
+
+    DDL в MySQL не транзакционен: миграция, упавшая на середине, не попадает
+    в журнал и требует ручного исправления перед повторным запуском.
+    """
+    applied_now: list[Migration] = []
+    async with engine.connect() as conn:
+        await conn.run_sync(SchemaMigrationsModel.__table__.create, checkfirst=True)
+        await conn.commit()
+        await _acquire_lock(conn)
+        try:
+            # Журнал читается под блокировкой: другой экземпляр мог успеть раньше
+            pending = _verify(load_migrations(directory), await _applied(conn))
+            await conn.commit()
+            for migration in pending:
+                if target is not None and migration.version > target:
+                    break
+                await _apply_one(conn, migration)
+                applied_now.append(migration)
+        finally:
+            # Закрытое соединение (_reset_session) снимает GET_LOCK само
+            if not conn.invalidated:
+                await _release_lock(conn)
+                await conn.commit()
+    return applied_now
+
+
+async def _apply_one(conn: AsyncConnection, migration: Migration) -> None:
+    logger.info("Применяется миграция %s_%s", migration.version, migration.name)
+    start = time.perf_counter()
+    try:
+        for statement in migration.statements:
+            if conn.dialect.name == "mysql":
+                statement = online_index_ddl(statement)
+            await conn.exec_driver_sql(statement)
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+        await conn.execute(
+            insert(SchemaMigrationsModel).values(
+                version=migration.version,
+                name=migration.name,
+                checksum=migration.checksum,
+                execution_ms=elapsed_ms,
+            )
+        )
+        await conn.commit()
+    except Exception as e:
+        await conn.rollback()
+        await _reset_session(conn)
+        logger.error(
+            "Миграция %s_%s завершилась ошибкой: %s",
+            migration.version,
+            migration.name,
+            e,
+        )
+        raise
+    logger.info(
+        "Миграция %s_%s применена за %sms",
+        migration.version,
+        migration.name,
+        elapsed_ms,
+    )
@@ -1,7 +1,16 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import TEXT, VARCHAR, BigInteger, DateTime, ForeignKey, func
+from sqlalchemy import (
+    TEXT,
+    VARCHAR,
+    BigInteger,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    func,
+)
 from sqlalchemy.orm import DeclarativeBase as BaseModel
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -114,6 +123,10 @@ class StudentsModel(Base):
 
 class HomeworksModel(Base):
     __tablename__ = "homeworks"
+    __table_args__ = (
+        # Фильтр опубликованных заданий: start_at <= NOW() (NULL — опубликовано сразу)
+        Index("ix_homeworks_start_at", "start_at"),
+    )
 
     homework_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     teacher_id: Mapped[int] = mapped_column(
@@ -141,6 +154,22 @@ class HomeworksModel(Base):
 
 class AnswersModel(Base):
     __tablename__ = "answers"
+    __table_args__ = (
+        # Страница ответов на задание: WHERE homework_id, status ORDER BY answer_id
+        Index("ix_answers_homework_status", "homework_id", "status", "answer_id"),
+        # Страница ответов студента: WHERE student_id ORDER BY sent_at, answer_id
+        Index("ix_answers_student_sent", "student_id", "sent_at", "answer_id"),
+        # Очередь проверки: WHERE status = 'sent' ORDER BY sent_at, answer_id
+        Index("ix_answers_status_sent", "status", "sent_at", "answer_id"),
+        # Повтор ответа, ожидающего проверки (NULL у остальных ответов не мешает)
+        Index(
+            "ux_answers_submission",
+            "homework_id",
+            "student_id",
+            "submission_key",
+            unique=True,
+        ),
+    )
 
     answer_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     homework_id: Mapped[int] = mapped_column(
@@ -149,16 +178,29 @@ class AnswersModel(Base):
     )
     student_id: Mapped[int] = mapped_column(
         ForeignKey(StudentsModel.student_id, ondelete="CASCADE", onupdate="CASCADE"),
-        index=True,
     )
     student_answer: Mapped[Optional[str]] = mapped_column(TEXT, default=None)
+    # ENUM в MySQL — 1 байт на строку вместо TEXT, значение можно класть в индекс
     status: Mapped[AnswersStatusEnum] = mapped_column(
-        TEXT, server_default=AnswersStatusEnum.SENT.value
+        Enum(
+            AnswersStatusEnum,
+            name="answers_status",
+            values_callable=lambda enum: [member.value for member in enum],
+        ),
+        server_default=AnswersStatusEnum.SENT.value,
     )
     grade: Mapped[Optional[int]] = mapped_column(default=None)
     teacher_comment: Mapped[Optional[str]] = mapped_column(TEXT, default=None)
     sent_at: Mapped[datetime] = mapped_column(DateTime)
     checked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None)
+    # Аренда ответа в очереди проверки: кто взял и до какого времени
+    claimed_by: Mapped[Optional[int]] = mapped_column(
+        ForeignKey(TeachersModel.teacher_id, ondelete="SET NULL", onupdate="CASCADE"),
+        default=None,
+    )
+    claimed_until: Mapped[Optional[datetime]] = mapped_column(DateTime, default=None)
+    # sha256 содержимого (AnswerDedup.submission_key); обнуляется при оценке и правке
+    submission_key: Mapped[Optional[str]] = mapped_column(VARCHAR(64), default=None)
 
     # Relationships
     homework: Mapped[HomeworksModel] = relationship(
@@ -169,12 +211,37 @@ class AnswersModel(Base):
     )
 
 
+class HomeworkAnswerStatsModel(Base):
+    """
+    Счётчики ответов на задание по статусам.
+    Обновляются в той же транзакции, что и ответы; сверяются с answers фоновой задачей.
+    """
+
+    __tablename__ = "homework_answer_stats"
+
+    homework_id: Mapped[int] = mapped_column(
+        ForeignKey(HomeworksModel.homework_id, ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+    )
+    answers_count: Mapped[int] = mapped_column(server_default="0", default=0)
+    sent_count: Mapped[int] = mapped_column(server_default="0", default=0)
+    reviewed_count: Mapped[int] = mapped_column(server_default="0", default=0)
+    rejected_count: Mapped[int] = mapped_column(server_default="0", default=0)
+    accepted_count: Mapped[int] = mapped_column(server_default="0", default=0)
+
+
 class TelegramFilesModel(Base):
+    """
+    Реестр файлов Telegram: одна строка на файл (unique_file_hash — sha256
+    от unique_file_id). ref_count — число ссылок из homework_files и answer_files.
+    """
+
     __tablename__ = "telegram_files"
 
     telegram_file_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     file_id: Mapped[str] = mapped_column(TEXT)
     unique_file_id: Mapped[str] = mapped_column(TEXT)
+    unique_file_hash: Mapped[str] = mapped_column(VARCHAR(64), unique=True)
     file_type: Mapped[str] = mapped_column(TEXT)
     owner_user_id: Mapped[int] = mapped_column(
         ForeignKey(TelegramUsersModel.user_id, ondelete="CASCADE", onupdate="CASCADE"),
@@ -182,6 +249,7 @@ class TelegramFilesModel(Base):
     )
     caption: Mapped[Optional[str]] = mapped_column(TEXT, default=None)
     mime_type: Mapped[Optional[str]] = mapped_column(TEXT, default=None)
+    ref_count: Mapped[int] = mapped_column(server_default="0", default=0)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.current_timestamp()
     )
@@ -244,6 +312,10 @@ class AssignedGroupsModel(Base):
 
 class HomeworkGroupsModel(Base):
     __tablename__ = "homework_groups"
+    __table_args__ = (
+        # Задания группы: WHERE group_id = ? -> homework_id без чтения строки
+        Index("ix_homework_groups_group_homework", "group_id", "homework_id"),
+    )
 
     homework_group_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     homework_id: Mapped[int] = mapped_column(
@@ -252,7 +324,6 @@ class HomeworkGroupsModel(Base):
     )
     group_id: Mapped[int] = mapped_column(
         ForeignKey(GroupsModel.group_id, ondelete="CASCADE", onupdate="CASCADE"),
-        index=True,
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.current_timestamp()
@@ -279,3 +350,18 @@ class HomeworkFilesModel(Base):
     telegram_file: Mapped[TelegramFilesModel] = relationship(
         "TelegramFilesModel", foreign_keys=[telegram_file_id], lazy="select"
     )
+
+
+class SchemaMigrationsModel(Base):
+    """Журнал применённых миграций (см. src/db/migrations)."""
+
+    __tablename__ = "schema_migrations"
+
+    version: Mapped[str] = mapped_column(VARCHAR(32), primary_key=True)
+    name: Mapped[str] = mapped_column(VARCHAR(255))
+    # sha256 текста миграции: изменение уже применённого файла — ошибка
+    checksum: Mapped[str] = mapped_column(VARCHAR(64))
+    execution_ms: Mapped[Optional[int]] = mapped_column(default=None)
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.current_timestamp()
+    )
@@ -29,13 +29,15 @@ class Page(Generic[T]):
         )
 
 
-def _calc_total_pages(total_items: int, per_page: int) -> int:
+def calc_total_pages(total_items: int, per_page: int) -> int:
+    """Число страниц (не меньше одной, даже для пустого списка)."""
     if per_page <= 0 or total_items <= 0:
         return 1
     return max(1, int(ceil(total_items / per_page)))
 
 
-def _normalize_page(page: int, total_pages: int) -> int:
+def normalize_page(page: int, total_pages: int) -> int:
+    """Номер страницы в пределах 1..total_pages."""
     page = max(1, int(page))
     if page > total_pages:
         page = total_pages
@@ -60,8 +62,8 @@ async def paginate_select(
         count_stmt = select(func.count()).select_from(subq)
 
     total_items = int((await session.scalar(count_stmt)) or 0)
-    total_pages = _calc_total_pages(total_items, per_page)
-    page = _normalize_page(page, total_pages)
+    total_pages = calc_total_pages(total_items, per_page)
+    page = normalize_page(page, total_pages)
 
     offset = (page - 1) * per_page
     res = await session.execute(stmt.limit(per_page).offset(offset))
@@ -0,0 +1,241 @@
+"""
+Профилировщик SQL-запросов на событиях SQLAlchemy.
+
+• Для каждого запроса фиксируются отпечаток (fingerprint), параметры,
+  количество строк и длительность по монотонным часам (time.perf_counter).
+• Запросы дольше порога DB_SLOW_QUERY_MS пишутся в отдельный журнал
+  logs/slow_queries/slow_queries.log вместе с планом EXPLAIN.
+• По каждому отпечатку копится статистика (count, p50, p95, max),
+  которую можно выгрузить по запросу: query_profiler.dump().
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.settings import settings
+from src.db.logger import slow_query_logger
+
+# Атрибут ExecutionContext с моментом начала запроса: контекст живёт ровно
+# один запрос, поэтому упавший запрос ничего не оставляет на соединении
+_START_ATTR = "_query_profiler_start"
+_MAX_SAMPLES = 1024  # окно длительностей на отпечаток для перцентилей
+_MAX_PARAMS_REPR = 500
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%\(\w+\)s|%s|\?|:\w+")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_SPACES_RE = re.compile(r"\s+")
+
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Нормализует SQL: литералы и плейсхолдеры заменяются на «?»,
+    списки IN (...) сворачиваются, пробелы схлопываются.
+    """
+    sql = _STRING_RE.sub("?", statement)
+    sql = _PLACEHOLDER_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (?+)", sql)
+    return _SPACES_RE.sub(" ", sql).strip()
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Перцентиль методом ближайшего ранга по отсортированной выборке."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Накопленная статистика по одному отпечатку запроса."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    samples: deque[float] = field(default_factory=lambda: deque(maxlen=_MAX_SAMPLES))
+
+    def add(self, duration_ms: float, rows: Optional[int]) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.rows += rows or 0
+        self.samples.append(duration_ms)
+
+    def as_dict(self) -> dict[str, float]:
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "p50_ms": round(_percentile(ordered, 0.50), 3),
+            "p95_ms": round(_percentile(ordered, 0.95), 3),
+            "max_ms": round(self.max_ms, 3),
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "rows": self.rows,
+        }
+
+
+class QueryProfiler:
+    """
+    Подписывается на before/after_cursor_execute движка и собирает статистику.
+
+    Для использования:
+    - query_profiler.install(async_engine)
+    - query_profiler.snapshot() / query_profiler.dump()
+    """
+
+    def __init__(
+        self, slow_threshold_ms: Optional[float] = None, explain: bool = True
+    ) -> None:
+        self.slow_threshold_ms = slow_threshold_ms
+        self.explain = explain
+        self.stats: dict[str, QueryStats] = {}
+        self._logger = slow_query_logger.get_logger("slow_queries")
+        self._engines: list[Engine] = []
+
+    # ──────────────────────────────
+    # Подключение к движку
+    # ──────────────────────────────
+
+    def install(self, engine: Union[AsyncEngine, Engine]) -> None:
+        """Подписывает профилировщик на события движка."""
+        sync_engine = getattr(engine, "sync_engine", engine)
+        if sync_engine in self._engines:
+            return
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+        self._engines.append(sync_engine)
+
+    def uninstall(self) -> None:
+        """Отписывает профилировщик от всех движков."""
+        for sync_engine in self._engines:
+            event.remove(sync_engine, "before_cursor_execute", self._before_execute)
+            event.remove(sync_engine, "after_cursor_execute", self._after_execute)
+        self._engines.clear()
+
+    # ──────────────────────────────
+    # Обработчики событий
+    # ──────────────────────────────
+
+    def _before_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        if context is not None:
+            setattr(context, _START_ATTR, time.perf_counter())
+
+    def _after_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        started = getattr(context, _START_ATTR, None)
+        if started is None:
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        rows = getattr(cursor, "rowcount", None)
+        rows = rows if rows is not None and rows >= 0 else None
+
+        key = fingerprint(statement)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = QueryStats()
+        stats.add(duration_ms, rows)
+
+        if self.slow_threshold_ms is not None and duration_ms >= self.slow_threshold_ms:
+            plan = None
+            if self.explain and not executemany:
+                plan = self._explain(conn, statement, parameters)
+            self._log_slow(key, statement, parameters, rows, duration_ms, plan)
+
+    # ──────────────────────────────
+    # Медленные запросы
+    # ──────────────────────────────
+
+    def _explain(self, conn, statement: str, parameters: Any) -> Optional[list]:
+        """
+        Снимает план запроса на том же соединении через «сырой» DBAPI-курсор,
+        чтобы EXPLAIN не попадал в профилировщик сам.
+        """
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return [tuple(row) for row in cursor.fetchall()]
+        except Exception as e:
+            self._logger.warning("EXPLAIN failed: %s | %s", e, statement)
+            return None
+        finally:
+            cursor.close()
+
+    def _log_slow(
+        self,
+        key: str,
+        statement: str,
+        parameters: Any,
+        rows: Optional[int],
+        duration_ms: float,
+        plan: Optional[list],
+    ) -> None:
+        params_repr = repr(parameters)
+        if len(params_repr) > _MAX_PARAMS_REPR:
+            params_repr = params_repr[:_MAX_PARAMS_REPR] + "..."
+        self._logger.warning(
+            "Slow query: %.2fms | rows=%s | fingerprint=%s | params=%s | plan=%s",
+            duration_ms,
+            rows,
+            key,
+            params_repr,
+            plan,
+        )
+
+    # ──────────────────────────────
+    # Агрегаты
+    # ──────────────────────────────
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Агрегаты по отпечаткам, отсортированные по суммарному времени."""
+        ordered = sorted(
+            self.stats.items(), key=lambda item: item[1].total_ms, reverse=True
+        )
+        return {key: stats.as_dict() for key, stats in ordered}
+
+    def dump(self, limit: Optional[int] = None) -> dict[str, dict[str, float]]:
+        """Пишет агрегаты в журнал медленных запросов и возвращает их."""
+        snapshot = self.snapshot()
+        for index, (key, row) in enumerate(snapshot.items()):
+            if limit is not None and index >= limit:
+                break
+            self._logger.info(
+                "Query stats: count=%s p50=%sms p95=%sms max=%sms rows=%s | %s",
+                row["count"],
+                row["p50_ms"],
+                row["p95_ms"],
+                row["max_ms"],
+                row["rows"],
+                key,
+            )
+        return snapshot
+
+    def reset(self) -> None:
+        """Сбрасывает накопленную статистику."""
+        self.stats.clear()
+
+
+query_profiler = QueryProfiler(
+    slow_threshold_ms=settings.db_slow_query_ms,
+    explain=settings.db_explain_slow_queries,
+)
@@ -5,6 +5,8 @@
 from .answer_files import AnswerFilesService
 from .answers import AnswersService
 from .assigned_groups import AssignedGroupsService
+from .homework_answer_stats import HomeworkAnswerStatsService
+from .homework_cards import HomeworkCardView
 from .homework_files import HomeworkFilesService
 from .homework_groups import HomeworkGroupsService
 from .homeworks import HomeworksService
@@ -12,11 +14,14 @@ from .students import StudentsService
 from .teachers import TeachersService
 from .telegram_files import TelegramFilesService
 from .telegram_users import TelegramUsersService
+from .user_identities import UserIdentitiesService
 
 __all__ = [
     "AnswerFilesService",
     "AnswersService",
     "HomeworksService",
+    "HomeworkAnswerStatsService",
+    "HomeworkCardView",
     "HomeworkFilesService",
     "HomeworkGroupsService",
     "AssignedGroupsService",
@@ -24,4 +29,5 @@ __all__ = [
     "TeachersService",
     "TelegramFilesService",
     "TelegramUsersService",
+    "UserIdentitiesService",
 ]
@@ -1,9 +1,12 @@
-from typing import List
+from typing import Iterable, List
 
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.schemas import AnswerFileCreateSchema, AnswerFileSchema
+from src.db.models import AnswersFilesModel
 from src.db.repositories import AnswersFilesRepository
+from src.db.services.telegram_files import TelegramFilesService
 from src.db.session import with_session
 
 
@@ -19,7 +22,33 @@ class AnswerFilesService:
     async def attach_file(
         cls, schema: AnswerFileCreateSchema, session: AsyncSession = None
     ) -> int:
-        return await cls.answers_files_repository.create(schema, session=session)
+        answer_file_id = await cls.answers_files_repository.create(
+            schema, session=session
+        )
+        await TelegramFilesService.add_refs([schema.telegram_file_id], session=session)
+        return answer_file_id
+
+    @classmethod
+    @with_session
+    async def attach_files(
+        cls,
+        answer_id: int,
+        telegram_file_ids: Iterable[int],
+        session: AsyncSession = None,
+    ) -> None:
+        """Прикрепляет к ответу уже зарегистрированные файлы одним INSERT."""
+        telegram_file_ids = list(telegram_file_ids)
+        if not telegram_file_ids:
+            return
+        await session.execute(
+            insert(AnswersFilesModel).values(
+                [
+                    {"answer_id": answer_id, "telegram_file_id": telegram_file_id}
+                    for telegram_file_id in telegram_file_ids
+                ]
+            )
+        )
+        await TelegramFilesService.add_refs(telegram_file_ids, session=session)
 
     @classmethod
     @with_session
@@ -1,18 +1,52 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from src.core.enums import AnswersStatusEnum
-from src.core.schemas import AnswerCreateSchema, AnswerSchema
+from src.core.schemas import (
+    AnswerCreateSchema,
+    AnswerGradeResultSchema,
+    AnswerSchema,
+)
 from src.db.models import AnswersModel, HomeworksModel, StudentsModel, TeachersModel
 from src.db.pagination import Page, paginate_select
 from src.db.repositories import AnswersRepository
+from src.db.services.homework_answer_stats import HomeworkAnswerStatsService
 from src.db.session import with_session
 
 
+def _claimable(reviewer_id: int, now: datetime):
+    """Ответ свободен: аренды нет, она истекла или принадлежит reviewer_id."""
+    return or_(
+        AnswersModel.claimed_until.is_(None),
+        AnswersModel.claimed_until < now,
+        AnswersModel.claimed_by == reviewer_id,
+    )
+
+
+def _leased_by_other(row, reviewer_id: Optional[int], now: datetime) -> bool:
+    """Ответ арендован не reviewer_id, и аренда ещё не истекла."""
+    return (
+        row.claimed_until is not None
+        and row.claimed_until >= now
+        and row.claimed_by != reviewer_id
+    )
+
+
+def _after_cursor(after: Optional[tuple[datetime, int]]):
+    """Keyset-условие «после (sent_at, answer_id)»."""
+    if after is None:
+        return True
+    sent_at, answer_id = after
+    return or_(
+        AnswersModel.sent_at > sent_at,
+        and_(AnswersModel.sent_at == sent_at, AnswersModel.answer_id > answer_id),
+    )
+
+
 class AnswersService:
     """
     Сервис для работы с ответами.
@@ -20,12 +54,44 @@ class AnswersService:
 
     answers_repository: AnswersRepository = AnswersRepository
 
+    # Сколько ответ остаётся за проверяющим после claim_next_for_review (сек)
+    REVIEW_LEASE_S = 10 * 60
+
     @classmethod
     @with_session
     async def create(
         cls, schema: AnswerCreateSchema, session: AsyncSession = None
     ) -> int:
-        return await cls.answers_repository.create(schema, session=session)
+        answer_id = await cls.answers_repository.create(schema, session=session)
+        await HomeworkAnswerStatsService.increment(
+            schema.homework_id, schema.status, session=session
+        )
+        return answer_id
+
+    @classmethod
+    @with_session
+    async def get_id_by_submission_key(
+        cls,
+        student_id: int,
+        homework_id: int,
+        submission_key: str,
+        *,
+        for_update: bool = False,
+        session: AsyncSession = None,
+    ) -> Optional[int]:
+        """
+        answer_id ожидающего проверки ответа с тем же ключом (ux_answers_submission).
+        for_update читает последнюю закоммиченную версию — после ошибки
+        уникальности из-за конкурентной вставки.
+        """
+        stmt = select(AnswersModel.answer_id).where(
+            AnswersModel.homework_id == homework_id,
+            AnswersModel.student_id == student_id,
+            AnswersModel.submission_key == submission_key,
+        )
+        if for_update:
+            stmt = stmt.with_for_update()
+        return await session.scalar(stmt)
 
     @classmethod
     @with_session
@@ -39,7 +105,32 @@ class AnswersService:
     @classmethod
     @with_session
     async def delete_by_id(cls, answer_id: int, session: AsyncSession = None) -> bool:
-        return await cls.answers_repository.delete_by_id(answer_id, session=session)
+        row = await cls._lock_status(answer_id, session=session)
+        deleted = await cls.answers_repository.delete_by_id(answer_id, session=session)
+        if deleted and row is not None:
+            await HomeworkAnswerStatsService.decrement(
+                row.homework_id, row.status, session=session
+            )
+        return deleted
+
+    @classmethod
+    async def _lock_status(cls, answer_id: int, session: AsyncSession):
+        """
+        (homework_id, status, claimed_by, claimed_until) ответа
+        с блокировкой строки до конца транзакции.
+        """
+        return (
+            await session.execute(
+                select(
+                    AnswersModel.homework_id,
+                    AnswersModel.status,
+                    AnswersModel.claimed_by,
+                    AnswersModel.claimed_until,
+                )
+                .where(AnswersModel.answer_id == answer_id)
+                .with_for_update()
+            )
+        ).first()
 
     @classmethod
     @with_session
@@ -51,7 +142,8 @@ class AnswersService:
     ) -> bool:
         return await cls.answers_repository.update_values_by_id(
             answer_id,
-            values={"student_answer": student_answer},
+            # Ключ считался по прежнему тексту
+            values={"student_answer": student_answer, "submission_key": None},
             session=session,
         )
 
@@ -64,31 +156,125 @@ class AnswersService:
         teacher_comment: Optional[str] = None,
         status: AnswersStatusEnum = AnswersStatusEnum.REVIEWED,
         checked_at: Optional[datetime] = None,
+        reviewer_id: Optional[int] = None,
         session: AsyncSession = None,
     ) -> bool:
+        """
+        Оценивает ответ. Ответ, арендованный из очереди проверки другим
+        проверяющим (не reviewer_id), не меняется до истечения аренды.
+        """
         checked_at = checked_at or datetime.now()
-        return await cls.answers_repository.update_values_by_id(
+        row = await cls._lock_status(answer_id, session=session)
+        if row is None or _leased_by_other(row, reviewer_id, datetime.now()):
+            return False
+        updated = await cls.answers_repository.update_values_by_id(
             answer_id,
             values={
                 "grade": grade,
                 "teacher_comment": teacher_comment,
                 "status": status,
                 "checked_at": checked_at,
+                "claimed_by": None,
+                "claimed_until": None,
+                "submission_key": None,
             },
             session=session,
         )
+        if updated:
+            await HomeworkAnswerStatsService.move_by_answer_id(
+                answer_id, row.status, status, session=session
+            )
+        return updated
 
     @classmethod
     @with_session
-    async def count_by_homework_id(
-        cls, homework_id: int, session: AsyncSession = None
-    ) -> int:
+    async def grade_by_teacher(
+        cls,
+        answer_id: int,
+        teacher_id: int,
+        *,
+        grade: Optional[int] = None,
+        teacher_comment: Optional[str] = None,
+        status: AnswersStatusEnum = AnswersStatusEnum.REVIEWED,
+        checked_at: Optional[datetime] = None,
+        expected_status: Optional[AnswersStatusEnum] = None,
+        expected_checked_at: Optional[datetime] = None,
+        session: AsyncSession = None,
+    ) -> AnswerGradeResultSchema:
+        """
+        Оценивает ответ одним UPDATE ... JOIN homeworks с проверкой владельца задания.
+
+        Если передан expected_status, запись обновляется только при совпадении
+        (status, checked_at) с тем, что видел преподаватель (оптимистичная блокировка):
+        так два преподавателя не перезапишут оценки друг друга молча.
+
+        Ответ, арендованный из очереди проверки другим преподавателем,
+        не оценивается до истечения аренды; оценивание снимает аренду.
+
+        При rowcount = 0 один дополнительный запрос определяет причину:
+        "answer_not_found" | "forbidden" | "claimed" | "conflict".
+
+        Счётчики homework_answer_stats сдвигаются вторым UPDATE при смене статуса.
+        Без expected_status прежний статус читается с блокировкой строки.
+        """
+        now = datetime.now()
+        checked_at = checked_at or now
+        old_status = expected_status
+        if old_status is None:
+            row = await cls._lock_status(answer_id, session=session)
+            if row is None:
+                return AnswerGradeResultSchema(ok=False, error_code="answer_not_found")
+            old_status = row.status
         stmt = (
-            select(func.count())
-            .select_from(AnswersModel)
-            .where(AnswersModel.homework_id == homework_id)
+            update(AnswersModel)
+            .where(AnswersModel.answer_id == answer_id)
+            .where(AnswersModel.homework_id == HomeworksModel.homework_id)
+            .where(HomeworksModel.teacher_id == teacher_id)
+            .where(_claimable(teacher_id, now))
+            .values(
+                grade=grade,
+                teacher_comment=teacher_comment,
+                status=status,
+                checked_at=checked_at,
+                claimed_by=None,
+                claimed_until=None,
+                submission_key=None,
+            )
+            .execution_options(synchronize_session=False)
         )
-        return int((await session.scalar(stmt)) or 0)
+        if expected_status is not None:
+            stmt = stmt.where(AnswersModel.status == expected_status).where(
+                AnswersModel.checked_at.is_not_distinct_from(expected_checked_at)
+            )
+
+        res = await session.execute(stmt)
+        if res.rowcount:
+            await HomeworkAnswerStatsService.move_by_answer_id(
+                answer_id, old_status, status, session=session
+            )
+            return AnswerGradeResultSchema(ok=True)
+
+        row = (
+            await session.execute(
+                select(
+                    HomeworksModel.teacher_id,
+                    AnswersModel.claimed_by,
+                    AnswersModel.claimed_until,
+                )
+                .join(
+                    AnswersModel,
+                    AnswersModel.homework_id == HomeworksModel.homework_id,
+                )
+                .where(AnswersModel.answer_id == answer_id)
+            )
+        ).first()
+        if row is None:
+            return AnswerGradeResultSchema(ok=False, error_code="answer_not_found")
+        if row.teacher_id != teacher_id:
+            return AnswerGradeResultSchema(ok=False, error_code="forbidden")
+        if _leased_by_other(row, teacher_id, now):
+            return AnswerGradeResultSchema(ok=False, error_code="claimed")
+        return AnswerGradeResultSchema(ok=False, error_code="conflict")
 
     @classmethod
     @with_session
@@ -182,17 +368,134 @@ class AnswersService:
         )
         return page_models.map(AnswerSchema.model_validate)
 
+    # ──────────────────────────────
+    # Очередь проверки преподавателя
+    # ──────────────────────────────
+
+    @classmethod
+    def _review_queue_stmt(
+        cls,
+        teacher_id: int,
+        reviewer_id: int,
+        now: datetime,
+        after: Optional[tuple[datetime, int]],
+    ):
+        """
+        Непроверенные ответы на все задания преподавателя в порядке отправки
+        (ix_answers_status_sent), без ответов, арендованных другими.
+        """
+        return (
+            select(AnswersModel)
+            .join(
+                HomeworksModel, AnswersModel.homework_id == HomeworksModel.homework_id
+            )
+            .where(AnswersModel.status == AnswersStatusEnum.SENT)
+            .where(HomeworksModel.teacher_id == teacher_id)
+            .where(_claimable(reviewer_id, now))
+            .where(_after_cursor(after))
+            .order_by(AnswersModel.sent_at.asc(), AnswersModel.answer_id.asc())
+        )
+
+    @staticmethod
+    def _review_options() -> tuple:
+        return (
+            joinedload(AnswersModel.student).joinedload(StudentsModel.user),
+            joinedload(AnswersModel.student).joinedload(StudentsModel.group),
+            joinedload(AnswersModel.homework)
+            .joinedload(HomeworksModel.teacher)
+            .joinedload(TeachersModel.user),
+        )
+
     @classmethod
     @with_session
-    async def count_by_homework_id_and_status(
-        cls, homework_id: int, status: AnswersStatusEnum, session: AsyncSession = None
-    ) -> int:
-        """Подсчет ответов на задание по статусу"""
+    async def get_review_queue_page(
+        cls,
+        teacher_id: int,
+        *,
+        reviewer_id: Optional[int] = None,
+        after: Optional[tuple[datetime, int]] = None,
+        limit: int = 10,
+        session: AsyncSession = None,
+    ) -> list[AnswerSchema]:
+        """
+        Страница очереди проверки (FIFO по sent_at) по всем заданиям преподавателя.
+        Следующая страница: after=(sent_at, answer_id) последнего ответа.
+        """
         stmt = (
-            select(func.count())
-            .select_from(AnswersModel)
-            .where(
-                AnswersModel.homework_id == homework_id, AnswersModel.status == status
+            cls._review_queue_stmt(
+                teacher_id, reviewer_id or teacher_id, datetime.now(), after
             )
+            .options(*cls._review_options())
+            .limit(limit)
+            .execution_options(populate_existing=True)
+        )
+        rows = (await session.execute(stmt)).scalars().all()
+        return [AnswerSchema.model_validate(row) for row in rows]
+
+    @classmethod
+    @with_session
+    async def claim_next_for_review(
+        cls,
+        teacher_id: int,
+        *,
+        reviewer_id: Optional[int] = None,
+        after: Optional[tuple[datetime, int]] = None,
+        lease_s: Optional[int] = None,
+        batch_size: int = 20,
+        session: AsyncSession = None,
+    ) -> Optional[AnswerSchema]:
+        """
+        Берёт первый свободный ответ очереди в аренду на lease_s секунд.
+
+        Аренда ставится условным UPDATE (ответ всё ещё «sent» и свободен),
+        поэтому два проверяющих не получат один ответ: проигравший переходит
+        к следующему кандидату. Повторный вызов тем же проверяющим продлевает
+        его аренду. Оценивание снимает аренду; чужой арендованный ответ
+        grade / grade_by_teacher не меняют до её истечения.
+        """
+        reviewer_id = reviewer_id or teacher_id
+        while True:
+            now = datetime.now()
+            candidates = (
+                await session.execute(
+                    cls._review_queue_stmt(teacher_id, reviewer_id, now, after)
+                    .with_only_columns(AnswersModel.answer_id, AnswersModel.sent_at)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not candidates:
+                return None
+            claimed_until = now + timedelta(seconds=lease_s or cls.REVIEW_LEASE_S)
+            for answer_id, sent_at in candidates:
+                res = await session.execute(
+                    update(AnswersModel)
+                    .where(AnswersModel.answer_id == answer_id)
+                    .where(AnswersModel.status == AnswersStatusEnum.SENT)
+                    .where(_claimable(reviewer_id, now))
+                    .values(claimed_by=reviewer_id, claimed_until=claimed_until)
+                    .execution_options(synchronize_session=False)
+                )
+                if res.rowcount:
+                    row = await session.scalar(
+                        select(AnswersModel)
+                        .where(AnswersModel.answer_id == answer_id)
+                        .options(*cls._review_options())
+                        .execution_options(populate_existing=True)
+                    )
+                    return AnswerSchema.model_validate(row)
+            after = (candidates[-1].sent_at, candidates[-1].answer_id)
+
+    @classmethod
+    @with_session
+    async def release_claim(
+        cls, answer_id: int, reviewer_id: int, session: AsyncSession = None
+    ) -> bool:
+        """Возвращает ответ в очередь, если он арендован reviewer_id."""
+        res = await session.execute(
+            update(AnswersModel)
+            .where(AnswersModel.answer_id == answer_id)
+            .where(AnswersModel.claimed_by == reviewer_id)
+            .values(claimed_by=None, claimed_until=None)
+            .execution_options(synchronize_session=False)
         )
-        return int((await session.scalar(stmt)) or 0)
+        return bool(res.rowcount)
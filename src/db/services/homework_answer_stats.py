@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.enums import AnswersStatusEnum
+from src.core.schemas import HomeworkAnswerStatsSchema
+from src.db import database_logger
+from src.db.dialect import upsert
+from src.db.models import AnswersModel, HomeworkAnswerStatsModel, HomeworksModel
+from src.db.session import after_commit, with_session
+from src.services.homework_cache import homework_card_cache
+
+_COUNT_COLUMNS = ("answers_count",) + tuple(
+    f"{status.value}_count" for status in AnswersStatusEnum
+)
+
+
+def _status_column(status: AnswersStatusEnum) -> str:
+    return f"{AnswersStatusEnum(status).value}_count"
+
+
+class HomeworkAnswerStatsService:
+    """
+    Сервис счётчиков ответов на задания (таблица homework_answer_stats).
+
+    - Счётчики меняются в той же транзакции, что и сами ответы:
+      AnswersService.create / grade / grade_by_teacher / delete_by_id
+    - Каскадные удаления (студента, задания) счётчики не трогают —
+      расхождения исправляет reconcile() (фоновая задача и ручной backfill)
+    - Любое изменение счётчиков после коммита сбрасывает карточку задания
+      (homework_card_cache)
+    """
+
+    @classmethod
+    def _invalidate_card(cls, session: AsyncSession, homework_id: int) -> None:
+        after_commit(session, partial(homework_card_cache.invalidate, homework_id))
+
+    @classmethod
+    async def _invalidate_card_by_answer_id(cls, answer_id: int) -> None:
+        """
+        Сброс карточки по ответу: homework_id читается уже после коммита,
+        чтобы не добавлять запрос в транзакцию оценки.
+        """
+        if homework_card_cache.homework_client is None:
+            return
+        homework_id = await cls._get_homework_id_by_answer_id(answer_id)
+        if homework_id is not None:
+            await homework_card_cache.invalidate(homework_id)
+
+    @classmethod
+    @with_session
+    async def _get_homework_id_by_answer_id(
+        cls, answer_id: int, session: AsyncSession = None
+    ) -> Optional[int]:
+        return await session.scalar(
+            select(AnswersModel.homework_id).where(AnswersModel.answer_id == answer_id)
+        )
+
+    @classmethod
+    def _upsert(
+        cls, session: AsyncSession, homework_id: int, values: dict, on_conflict: dict
+    ):
+        """
+        INSERT ... ON DUPLICATE KEY UPDATE (MySQL) / ON CONFLICT DO UPDATE (SQLite).
+        values — значения новой строки, on_conflict — что записать в существующую.
+        """
+        return upsert(
+            session,
+            HomeworkAnswerStatsModel,
+            {"homework_id": homework_id, **values},
+            key=[HomeworkAnswerStatsModel.homework_id],
+            on_conflict=lambda _: on_conflict,
+        )
+
+    @classmethod
+    @with_session
+    async def increment(
+        cls,
+        homework_id: int,
+        status: AnswersStatusEnum = AnswersStatusEnum.SENT,
+        session: AsyncSession = None,
+    ) -> None:
+        """Новый ответ в статусе status."""
+        column = _status_column(status)
+        model = HomeworkAnswerStatsModel
+        cls._invalidate_card(session, homework_id)
+        await session.execute(
+            cls._upsert(
+                session,
+                homework_id,
+                {"answers_count": 1, column: 1},
+                {
+                    "answers_count": model.answers_count + 1,
+                    column: getattr(model, column) + 1,
+                },
+            )
+        )
+
+    @classmethod
+    @with_session
+    async def decrement(
+        cls,
+        homework_id: int,
+        status: AnswersStatusEnum,
+        session: AsyncSession = None,
+    ) -> None:
+        """Удалён ответ в статусе status."""
+        column = _status_column(status)
+        model = HomeworkAnswerStatsModel
+        cls._invalidate_card(session, homework_id)
+        await session.execute(
+            update(model)
+            .where(model.homework_id == homework_id)
+            .values(
+                {
+                    "answers_count": model.answers_count - 1,
+                    column: getattr(model, column) - 1,
+                }
+            )
+        )
+
+    @classmethod
+    @with_session
+    async def move_by_answer_id(
+        cls,
+        answer_id: int,
+        old_status: AnswersStatusEnum,
+        new_status: AnswersStatusEnum,
+        session: AsyncSession = None,
+    ) -> None:
+        """Ответ answer_id перешёл из old_status в new_status (один UPDATE)."""
+        if AnswersStatusEnum(old_status) == AnswersStatusEnum(new_status):
+            return
+        old_column = _status_column(old_status)
+        new_column = _status_column(new_status)
+        model = HomeworkAnswerStatsModel
+        after_commit(session, partial(cls._invalidate_card_by_answer_id, answer_id))
+        homework_id = (
+            select(AnswersModel.homework_id)
+            .where(AnswersModel.answer_id == answer_id)
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(model)
+            .where(model.homework_id == homework_id)
+            .values(
+                {
+                    old_column: getattr(model, old_column) - 1,
+                    new_column: getattr(model, new_column) + 1,
+                }
+            )
+        )
+
+    @classmethod
+    @with_session
+    async def get_by_homework_id(
+        cls, homework_id: int, session: AsyncSession = None
+    ) -> HomeworkAnswerStatsSchema:
+        stats = await cls.get_by_homework_ids([homework_id], session=session)
+        return stats[homework_id]
+
+    @classmethod
+    @with_session
+    async def get_by_homework_ids(
+        cls, homework_ids: Iterable[int], session: AsyncSession = None
+    ) -> dict[int, HomeworkAnswerStatsSchema]:
+        """Счётчики пачки заданий одним запросом (нет строки — нули)."""
+        homework_ids = list(homework_ids)
+        result = {
+            homework_id: HomeworkAnswerStatsSchema(homework_id=homework_id)
+            for homework_id in homework_ids
+        }
+        if not homework_ids:
+            return result
+        rows = (
+            await session.execute(
+                select(HomeworkAnswerStatsModel).where(
+                    HomeworkAnswerStatsModel.homework_id.in_(homework_ids)
+                )
+            )
+        ).scalars()
+        for row in rows:
+            result[row.homework_id] = HomeworkAnswerStatsSchema.model_validate(row)
+        return result
+
+    # ──────────────────────────────
+    # Backfill / сверка
+    # ──────────────────────────────
+
+    @classmethod
+    @with_session
+    async def _reconcile_batch(
+        cls, homework_ids: list[int], session: AsyncSession = None
+    ) -> int:
+        model = HomeworkAnswerStatsModel
+        # Сначала блокируем счётчики пачки, затем считаем ответы:
+        # конкурентный submit/grade дождётся коммита и применит свой инкремент поверх
+        stored = {
+            row.homework_id: row
+            for row in (
+                await session.execute(
+                    select(model)
+                    .where(model.homework_id.in_(homework_ids))
+                    .with_for_update()
+                )
+            ).scalars()
+        }
+        actual_stmt = (
+            select(
+                AnswersModel.homework_id,
+                func.count().label("answers_count"),
+                *(
+                    func.sum(case((AnswersModel.status == status, 1), else_=0)).label(
+                        _status_column(status)
+                    )
+                    for status in AnswersStatusEnum
+                ),
+            )
+            .where(AnswersModel.homework_id.in_(homework_ids))
+            .group_by(AnswersModel.homework_id)
+        )
+        actual = {
+            row.homework_id: {c: int(getattr(row, c) or 0) for c in _COUNT_COLUMNS}
+            for row in (await session.execute(actual_stmt))
+        }
+
+        fixed = 0
+        for homework_id in homework_ids:
+            expected = actual.get(homework_id, dict.fromkeys(_COUNT_COLUMNS, 0))
+            current = stored.get(homework_id)
+            if current is not None and all(
+                getattr(current, c) == expected[c] for c in _COUNT_COLUMNS
+            ):
+                continue
+            if current is None and not expected["answers_count"]:
+                continue
+            if current is not None:
+                database_logger.get_function_logger(cls.reconcile).warning(
+                    "Расхождение счётчиков задания %s: %s -> %s",
+                    homework_id,
+                    {c: getattr(current, c) for c in _COUNT_COLUMNS},
+                    expected,
+                )
+            await session.execute(cls._upsert(session, homework_id, expected, expected))
+            cls._invalidate_card(session, homework_id)
+            fixed += 1
+        return fixed
+
+    @classmethod
+    async def reconcile(
+        cls,
+        *,
+        batch_size: int = 500,
+        homework_ids: Optional[Iterable[int]] = None,
+        session: AsyncSession = None,
+    ) -> int:
+        """
+        Пересчитывает счётчики из answers пачками по batch_size заданий
+        (без внешней сессии каждая пачка — отдельная короткая транзакция).
+        Работает и как первичный backfill. Возвращает число исправленных строк.
+        """
+        fixed = 0
+        if homework_ids is not None:
+            ids = sorted(set(homework_ids))
+            for i in range(0, len(ids), batch_size):
+                fixed += await cls._reconcile_batch(
+                    ids[i : i + batch_size], session=session
+                )
+            return fixed
+
+        last_id = 0
+        while batch := await cls._next_homework_ids(
+            last_id, batch_size, session=session
+        ):
+            fixed += await cls._reconcile_batch(batch, session=session)
+            last_id = batch[-1]
+        return fixed
+
+    @classmethod
+    @with_session
+    async def _next_homework_ids(
+        cls, after_id: int, limit: int, session: AsyncSession = None
+    ) -> list[int]:
+        rows = await session.scalars(
+            select(HomeworksModel.homework_id)
+            .where(HomeworksModel.homework_id > after_id)
+            .order_by(HomeworksModel.homework_id.asc())
+            .limit(limit)
+        )
+        return list(rows)
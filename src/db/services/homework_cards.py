@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from functools import partial
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.enums import AnswersStatusEnum
+from src.core.schemas import (
+    HomeworkAnswerStatsSchema,
+    HomeworkCardSchema,
+    HomeworkSchema,
+)
+from src.db.models import (
+    GroupsModel,
+    HomeworkAnswerStatsModel,
+    HomeworkGroupsModel,
+    HomeworksModel,
+)
+from src.db.pagination import Page, calc_total_pages, normalize_page
+from src.db.session import with_session
+from src.services.homework_cache import homework_card_cache
+
+# Разделитель GROUP_CONCAT: в названиях групп не встречается
+_GROUP_NAMES_SEP = "\x1f"
+
+_HOMEWORK_COLUMNS = tuple(
+    getattr(HomeworksModel, name)
+    for name in HomeworkSchema.model_fields
+    if name != "teacher"
+)
+_STATS_COLUMNS = ("answers_count",) + tuple(
+    f"{status.value}_count" for status in AnswersStatusEnum
+)
+
+
+def _group_names():
+    """Коррелированный подзапрос: названия групп задания через GROUP_CONCAT."""
+    return (
+        select(func.aggregate_strings(GroupsModel.name, _GROUP_NAMES_SEP))
+        .select_from(HomeworkGroupsModel)
+        .join(GroupsModel, GroupsModel.group_id == HomeworkGroupsModel.group_id)
+        .where(HomeworkGroupsModel.homework_id == HomeworksModel.homework_id)
+        .scalar_subquery()
+        .label("group_names")
+    )
+
+
+def _card_select(*extra):
+    """Задание, названия групп и счётчики ответов по статусам одной строкой."""
+    return (
+        select(
+            *_HOMEWORK_COLUMNS,
+            _group_names(),
+            *(
+                func.coalesce(getattr(HomeworkAnswerStatsModel, column), 0).label(
+                    column
+                )
+                for column in _STATS_COLUMNS
+            ),
+            *extra,
+        )
+        .select_from(HomeworksModel)
+        .outerjoin(
+            HomeworkAnswerStatsModel,
+            HomeworkAnswerStatsModel.homework_id == HomeworksModel.homework_id,
+        )
+    )
+
+
+def _to_card(row) -> HomeworkCardSchema:
+    homework = HomeworkSchema.model_validate(
+        {column.key: getattr(row, column.key) for column in _HOMEWORK_COLUMNS}
+    )
+    names = row.group_names.split(_GROUP_NAMES_SEP) if row.group_names else []
+    return HomeworkCardSchema(
+        homework=homework,
+        group_names=sorted(names),
+        stats=HomeworkAnswerStatsSchema(
+            homework_id=homework.homework_id,
+            **{column: int(getattr(row, column)) for column in _STATS_COLUMNS},
+        ),
+    )
+
+
+class HomeworkCardView:
+    """
+    Карточка задания для экранов преподавателя (просмотр, редактирование).
+
+    - Задание, названия групп и счётчики ответов читаются одним запросом:
+      GROUP_CONCAT по homework_groups и LEFT JOIN homework_answer_stats
+      (счётчики по статусам уже агрегированы в этой таблице)
+    - get() читает через homework_card_cache: версия карточки растёт при
+      изменении задания, его групп, файлов и ответов
+    - Страница списка (get_page_by_teacher_id) — один запрос вместе с total
+    """
+
+    @classmethod
+    async def get(
+        cls, homework_id: int, session: AsyncSession = None
+    ) -> Optional[HomeworkCardSchema]:
+        """Карточка задания; вне внешней транзакции — через homework_card_cache."""
+        if session is not None:
+            return await cls._load(homework_id, session=session)
+        return await homework_card_cache.get(
+            homework_id, partial(cls._load, homework_id)
+        )
+
+    @classmethod
+    @with_session
+    async def _load(
+        cls, homework_id: int, session: AsyncSession = None
+    ) -> Optional[HomeworkCardSchema]:
+        row = (
+            await session.execute(
+                _card_select().where(HomeworksModel.homework_id == homework_id)
+            )
+        ).first()
+        return _to_card(row) if row is not None else None
+
+    @classmethod
+    @with_session
+    async def get_page_by_teacher_id(
+        cls,
+        teacher_id: int,
+        *,
+        page: int = 1,
+        per_page: int = 1,
+        session: AsyncSession = None,
+    ) -> Page[HomeworkCardSchema]:
+        """
+        Страница карточек заданий преподавателя (новые сначала).
+        Общее число заданий считается оконной функцией в том же запросе;
+        второй запрос нужен, только если страница вышла за конец списка.
+        """
+        per_page = max(1, int(per_page))
+        page = max(1, int(page))
+        stmt = (
+            _card_select(func.count().over().label("total_items"))
+            .where(HomeworksModel.teacher_id == teacher_id)
+            .order_by(
+                HomeworksModel.created_at.desc(), HomeworksModel.homework_id.desc()
+            )
+        )
+
+        rows = (
+            await session.execute(stmt.limit(per_page).offset((page - 1) * per_page))
+        ).all()
+        if rows:
+            total_items = int(rows[0].total_items)
+        else:
+            total_items = int(
+                await session.scalar(
+                    select(func.count())
+                    .select_from(HomeworksModel)
+                    .where(HomeworksModel.teacher_id == teacher_id)
+                )
+                or 0
+            )
+            last_page = normalize_page(page, calc_total_pages(total_items, per_page))
+            if total_items and last_page != page:
+                rows = (
+                    await session.execute(
+                        stmt.limit(per_page).offset((last_page - 1) * per_page)
+                    )
+                ).all()
+            page = last_page
+
+        return Page(
+            items=[_to_card(row) for row in rows],
+            page=page,
+            per_page=per_page,
+            total_items=total_items,
+            total_pages=calc_total_pages(total_items, per_page),
+        )
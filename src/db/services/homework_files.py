@@ -1,16 +1,16 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import Iterable, List, Optional
 
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.schemas import (
-    HomeworkFileCreateSchema,
-    HomeworkFileSchema,
-    TelegramFileCreateSchema,
-)
+from src.core.schemas import HomeworkFileSchema, TelegramFileCreateSchema
+from src.core.singleflight import SingleFlight
 from src.db.models import HomeworkFilesModel
 from src.db.repositories import HomeworkFilesRepository
+from src.db.services.homeworks import HomeworksService
 from src.db.services.telegram_files import TelegramFilesService
 from src.db.session import with_session
 
@@ -22,10 +22,28 @@ class HomeworkFilesService:
 
     homework_files_repository: HomeworkFilesRepository = HomeworkFilesRepository
 
+    # Одновременные чтения файлов одного задания (рассылка о публикации —
+    # десятки студентов открывают задание разом) идут в БД одним запросом
+    files_flight: SingleFlight[List[HomeworkFileSchema]] = SingleFlight(
+        "homework_files"
+    )
+
     @classmethod
-    @with_session
     async def get_files_by_homework_id(
         cls, homework_id: int, session: AsyncSession = None
+    ) -> List[HomeworkFileSchema]:
+        """Файлы задания; вне внешней транзакции — через files_flight."""
+        if session is not None:
+            return await cls._load_files(homework_id, session=session)
+        files = await cls.files_flight.do(
+            homework_id, partial(cls._load_files, homework_id)
+        )
+        return list(files)
+
+    @classmethod
+    @with_session
+    async def _load_files(
+        cls, homework_id: int, session: AsyncSession = None
     ) -> List[HomeworkFileSchema]:
         return await cls.homework_files_repository.get_all_where(
             where={HomeworkFilesModel.homework_id: homework_id},
@@ -38,10 +56,20 @@ class HomeworkFilesService:
     async def delete_by_homework_id(
         cls, homework_id: int, session: AsyncSession = None
     ) -> int:
-        return await cls.homework_files_repository.delete(
+        HomeworksService.invalidate_after_commit(homework_id, session)
+        telegram_file_ids = list(
+            await session.scalars(
+                select(HomeworkFilesModel.telegram_file_id).where(
+                    HomeworkFilesModel.homework_id == homework_id
+                )
+            )
+        )
+        deleted = await cls.homework_files_repository.delete(
             where={HomeworkFilesModel.homework_id: homework_id},
             session=session,
         )
+        await TelegramFilesService.add_refs(telegram_file_ids, -1, session=session)
+        return deleted
 
     @classmethod
     @with_session
@@ -52,13 +80,87 @@ class HomeworkFilesService:
         telegram_files: Optional[Iterable[TelegramFileCreateSchema]] = None,
         session: AsyncSession = None,
     ) -> None:
+        """
+        Прикрепляет файлы к заданию: уже известные файлы переиспользуются,
+        связи вставляются одним запросом.
+        """
         if not telegram_files:
             return
-        for tf in telegram_files:
-            telegram_file_id = await TelegramFilesService.create(tf, session=session)
-            await cls.homework_files_repository.create(
-                HomeworkFileCreateSchema(
-                    homework_id=homework_id, telegram_file_id=telegram_file_id
-                ),
-                session=session,
+        HomeworksService.invalidate_after_commit(homework_id, session)
+        telegram_file_ids = await TelegramFilesService.upsert_many(
+            telegram_files, session=session
+        )
+        await session.execute(
+            insert(HomeworkFilesModel).values(
+                [
+                    {"homework_id": homework_id, "telegram_file_id": telegram_file_id}
+                    for telegram_file_id in telegram_file_ids
+                ]
+            )
+        )
+        await TelegramFilesService.add_refs(telegram_file_ids, session=session)
+
+    @classmethod
+    @with_session
+    async def set_files_for_homework(
+        cls,
+        *,
+        homework_id: int,
+        telegram_files: Iterable[TelegramFileCreateSchema],
+        session: AsyncSession = None,
+    ) -> tuple[list[int], list[int]]:
+        """
+        Приводит файлы задания к telegram_files (повторы схлопываются):
+        связи файлов, которые остаются, не трогаются; лишние удаляются одним
+        DELETE, недостающие вставляются одним INSERT, ref_count меняется
+        только у разницы. Возвращает (добавленные, удалённые) telegram_file_id.
+        """
+        target = list(
+            dict.fromkeys(
+                await TelegramFilesService.upsert_many(telegram_files, session=session)
+            )
+        )
+        links = (
+            await session.execute(
+                select(
+                    HomeworkFilesModel.homeworks_file_id,
+                    HomeworkFilesModel.telegram_file_id,
+                )
+                .where(HomeworkFilesModel.homework_id == homework_id)
+                .order_by(HomeworkFilesModel.homeworks_file_id.asc())
+            )
+        ).all()
+
+        kept: set[int] = set()
+        removed_links: list[int] = []
+        removed: list[int] = []
+        for link_id, telegram_file_id in links:
+            # Лишними считаются и повторные связи с тем же файлом
+            if telegram_file_id in target and telegram_file_id not in kept:
+                kept.add(telegram_file_id)
+            else:
+                removed_links.append(link_id)
+                removed.append(telegram_file_id)
+        added = [file_id for file_id in target if file_id not in kept]
+        if not added and not removed_links:
+            return [], []
+
+        HomeworksService.invalidate_after_commit(homework_id, session)
+        if removed_links:
+            await session.execute(
+                delete(HomeworkFilesModel).where(
+                    HomeworkFilesModel.homeworks_file_id.in_(removed_links)
+                )
+            )
+            await TelegramFilesService.add_refs(removed, -1, session=session)
+        if added:
+            await session.execute(
+                insert(HomeworkFilesModel).values(
+                    [
+                        {"homework_id": homework_id, "telegram_file_id": file_id}
+                        for file_id in added
+                    ]
+                )
             )
+            await TelegramFilesService.add_refs(added, session=session)
+        return added, removed
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import List
 
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.schemas import GroupSchema, HomeworkGroupCreateSchema
-from src.db.models import GroupsModel, HomeworkGroupsModel
+from src.core.schemas import GroupSchema
+from src.db.models import GroupsModel, HomeworkGroupsModel, HomeworksModel
 from src.db.repositories import HomeworkGroupsRepository
+from src.db.services.homeworks import HomeworksService
 from src.db.session import with_session
 
 
@@ -44,15 +46,125 @@ class HomeworkGroupsService:
         homework_id: int,
         group_ids: list[int],
         session: AsyncSession = None,
-    ) -> None:
-        # удаляем старые привязки
-        await cls.homework_groups_repository.delete(
-            where={HomeworkGroupsModel.homework_id: homework_id},
-            session=session,
+    ) -> list[int]:
+        """
+        Приводит группы задания к group_ids: удаляет лишние связи и вставляет
+        недостающие (по одному запросу на каждую сторону разницы).
+        Связи оставшихся групп не пересоздаются и сохраняют sent_at.
+        Возвращает добавленные группы (им задание ещё не рассылалось).
+        """
+        target = {int(gid) for gid in group_ids}
+        current = set(
+            await session.scalars(
+                select(HomeworkGroupsModel.group_id).where(
+                    HomeworkGroupsModel.homework_id == homework_id
+                )
+            )
         )
-        # создаём новые
-        for gid in group_ids:
-            await cls.homework_groups_repository.create(
-                HomeworkGroupCreateSchema(homework_id=homework_id, group_id=int(gid)),
-                session=session,
+        removed = current - target
+        added = sorted(target - current)
+        if not removed and not added:
+            return []
+
+        HomeworksService.invalidate_after_commit(homework_id, session)
+        if removed:
+            await session.execute(
+                delete(HomeworkGroupsModel).where(
+                    HomeworkGroupsModel.homework_id == homework_id,
+                    HomeworkGroupsModel.group_id.in_(removed),
+                )
+            )
+        if added:
+            await session.execute(
+                insert(HomeworkGroupsModel).values(
+                    [{"homework_id": homework_id, "group_id": gid} for gid in added]
+                )
+            )
+        return added
+
+    @classmethod
+    @with_session
+    async def get_unsent_group_ids(
+        cls, homework_id: int, session: AsyncSession = None
+    ) -> list[int]:
+        """Группы задания, студентам которых ещё не отправлено уведомление."""
+        stmt = (
+            select(HomeworkGroupsModel.group_id)
+            .where(
+                HomeworkGroupsModel.homework_id == homework_id,
+                HomeworkGroupsModel.sent_at.is_(None),
             )
+            .order_by(HomeworkGroupsModel.group_id.asc())
+        )
+        return list(await session.scalars(stmt))
+
+    @classmethod
+    @with_session
+    async def get_due_unsent_homework_ids(
+        cls, now: datetime, limit: int = 100, session: AsyncSession = None
+    ) -> list[int]:
+        """
+        Задания с наступившим start_at, у которых остались группы без рассылки:
+        досылка, если таймер PUBLISH в Redis потерялся или планировщик выключен.
+        """
+        stmt = (
+            select(HomeworkGroupsModel.homework_id)
+            .join(
+                HomeworksModel,
+                HomeworksModel.homework_id == HomeworkGroupsModel.homework_id,
+            )
+            .where(
+                HomeworkGroupsModel.sent_at.is_(None),
+                HomeworksModel.start_at <= now,
+            )
+            .distinct()
+            .order_by(HomeworkGroupsModel.homework_id.asc())
+            .limit(limit)
+        )
+        return list(await session.scalars(stmt))
+
+    @classmethod
+    @with_session
+    async def claim_unsent(
+        cls,
+        homework_id: int,
+        group_id: int,
+        sent_at: datetime,
+        session: AsyncSession = None,
+    ) -> bool:
+        """
+        Забирает рассылку задания группе: UPDATE ... WHERE sent_at IS NULL.
+        True получает только один из конкурирующих вызовов (в т.ч. с разных
+        экземпляров бота).
+        """
+        res = await session.execute(
+            update(HomeworkGroupsModel)
+            .where(
+                HomeworkGroupsModel.homework_id == homework_id,
+                HomeworkGroupsModel.group_id == group_id,
+                HomeworkGroupsModel.sent_at.is_(None),
+            )
+            .values(sent_at=sent_at)
+        )
+        return res.rowcount == 1
+
+    @classmethod
+    @with_session
+    async def mark_sent(
+        cls,
+        homework_id: int,
+        group_ids: list[int],
+        sent_at: datetime,
+        session: AsyncSession = None,
+    ) -> None:
+        """Отмечает рассылку задания группам (homework_groups.sent_at)."""
+        if not group_ids:
+            return
+        await session.execute(
+            update(HomeworkGroupsModel)
+            .where(
+                HomeworkGroupsModel.homework_id == homework_id,
+                HomeworkGroupsModel.group_id.in_(group_ids),
+            )
+            .values(sent_at=sent_at)
+        )
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from datetime import datetime
+from functools import partial
 from typing import Optional
 
-from sqlalchemy import exists, func, select
+from sqlalchemy import exists, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -11,11 +13,29 @@ from src.db.models import (
     AnswersModel,
     HomeworkGroupsModel,
     HomeworksModel,
+    StudentsModel,
     TeachersModel,
 )
 from src.db.pagination import Page, paginate_select
 from src.db.repositories import HomeworksRepository
-from src.db.session import with_session
+from src.db.session import after_commit, with_session
+from src.services.homework_cache import homework_cache, homework_card_cache
+from src.services.scheduler import homework_scheduler
+
+
+def _published(now: datetime):
+    """Задание уже опубликовано: start_at наступил (NULL — опубликовано сразу)."""
+    return or_(HomeworksModel.start_at.is_(None), HomeworksModel.start_at <= now)
+
+
+def _answered_exists(homework_id, student_id):
+    """EXISTS: студент student_id уже отправил ответ на задание homework_id."""
+    return exists(
+        select(1).where(
+            AnswersModel.homework_id == homework_id,
+            AnswersModel.student_id == student_id,
+        )
+    )
 
 
 class HomeworksService:
@@ -30,20 +50,56 @@ class HomeworksService:
     async def create(
         cls, schema: HomeworkCreateSchema, session: AsyncSession = None
     ) -> int:
-        return await cls.homeworks_repository.create(schema, session=session)
+        homework_id = await cls.homeworks_repository.create(schema, session=session)
+        # Таймеры публикации и напоминаний ставятся только для закоммиченного задания
+        after_commit(
+            session,
+            partial(
+                homework_scheduler.schedule_homework,
+                homework_id,
+                schema.end_at,
+                schema.start_at,
+            ),
+        )
+        return homework_id
 
     @classmethod
-    @with_session
     async def get_by_id(
         cls, homework_id: int, session: AsyncSession = None
+    ) -> Optional[HomeworkSchema]:
+        """
+        Задание с teacher и teacher.user.
+        Вне внешней транзакции читается через homework_cache (Redis + L1).
+        """
+        if session is not None:
+            return await cls._load_by_id(homework_id, session=session)
+        return await homework_cache.get(
+            homework_id, partial(cls._load_by_id, homework_id)
+        )
+
+    @classmethod
+    @with_session
+    async def _load_by_id(
+        cls, homework_id: int, session: AsyncSession = None
     ) -> Optional[HomeworkSchema]:
         return await cls.homeworks_repository.get_by_id(
             homework_id, session=session, load_relationships=["teacher", "teacher.user"]
         )
 
+    @classmethod
+    def invalidate_after_commit(cls, homework_id: int, session: AsyncSession) -> None:
+        """
+        Сбросить кэш задания и его карточки, когда транзакция сессии будет
+        закоммичена.
+        """
+        after_commit(session, partial(homework_cache.invalidate, homework_id))
+        after_commit(session, partial(homework_card_cache.invalidate, homework_id))
+
     @classmethod
     @with_session
     async def delete_by_id(cls, homework_id: int, session: AsyncSession = None) -> bool:
+        cls.invalidate_after_commit(homework_id, session)
+        after_commit(session, partial(homework_scheduler.cancel_homework, homework_id))
         return await cls.homeworks_repository.delete_by_id(homework_id, session=session)
 
     @classmethod
@@ -51,6 +107,7 @@ class HomeworksService:
     async def update_title_by_id(
         cls, homework_id: int, *, title: str, session: AsyncSession = None
     ) -> bool:
+        cls.invalidate_after_commit(homework_id, session)
         return await cls.homeworks_repository.update_values_by_id(
             homework_id, values={"title": title}, session=session
         )
@@ -60,6 +117,7 @@ class HomeworksService:
     async def update_text_by_id(
         cls, homework_id: int, *, text: str, session: AsyncSession = None
     ) -> bool:
+        cls.invalidate_after_commit(homework_id, session)
         return await cls.homeworks_repository.update_values_by_id(
             homework_id, values={"text": text}, session=session
         )
@@ -75,8 +133,9 @@ class HomeworksService:
         session: AsyncSession = None,
     ) -> Page[HomeworkSchema]:
         """
-        Получить страницу заданий, доступных студенту по его группе.
+        Получить страницу опубликованных заданий, доступных студенту по его группе.
         """
+        published = _published(datetime.now())
         stmt = (
             select(HomeworksModel)
             .join(
@@ -84,6 +143,7 @@ class HomeworksService:
                 HomeworkGroupsModel.homework_id == HomeworksModel.homework_id,
             )
             .where(HomeworkGroupsModel.group_id == group_id)
+            .where(published)
             .options(joinedload(HomeworksModel.teacher).joinedload(TeachersModel.user))
             .order_by(HomeworksModel.end_at.desc(), HomeworksModel.homework_id.desc())
         )
@@ -91,7 +151,12 @@ class HomeworksService:
         count_stmt = (
             select(func.count())
             .select_from(HomeworkGroupsModel)
+            .join(
+                HomeworksModel,
+                HomeworkGroupsModel.homework_id == HomeworksModel.homework_id,
+            )
             .where(HomeworkGroupsModel.group_id == group_id)
+            .where(published)
         )
 
         page_models: Page = await paginate_select(
@@ -115,14 +180,11 @@ class HomeworksService:
         session: AsyncSession = None,
     ) -> Page[HomeworkSchema]:
         """
-        Получить страницу заданий для группы, исключая те, по которым студент уже отправил ответ.
+        Получить страницу опубликованных заданий для группы,
+        исключая те, по которым студент уже отправил ответ.
         """
-        answered_exists = exists(
-            select(1).where(
-                AnswersModel.homework_id == HomeworksModel.homework_id,
-                AnswersModel.student_id == student_id,
-            )
-        )
+        answered_exists = _answered_exists(HomeworksModel.homework_id, student_id)
+        published = _published(datetime.now())
 
         stmt = (
             select(HomeworksModel)
@@ -131,6 +193,7 @@ class HomeworksService:
                 HomeworkGroupsModel.homework_id == HomeworksModel.homework_id,
             )
             .where(HomeworkGroupsModel.group_id == group_id)
+            .where(published)
             .where(~answered_exists)
             .options(joinedload(HomeworksModel.teacher).joinedload(TeachersModel.user))
             .order_by(HomeworksModel.end_at.desc(), HomeworksModel.homework_id.desc())
@@ -144,6 +207,7 @@ class HomeworksService:
                 HomeworkGroupsModel.homework_id == HomeworksModel.homework_id,
             )
             .where(HomeworkGroupsModel.group_id == group_id)
+            .where(published)
             .where(~answered_exists)
         )
 
@@ -158,32 +222,31 @@ class HomeworksService:
 
     @classmethod
     @with_session
-    async def get_homeworks_page_by_teacher_id(
+    async def get_pending_recipients(
         cls,
-        teacher_id: int,
+        homework_id: int,
         *,
-        page: int = 1,
-        per_page: int = 1,
+        after_student_id: int = 0,
+        limit: int = 500,
         session: AsyncSession = None,
-    ) -> Page[HomeworkSchema]:
+    ) -> list[tuple[int, int]]:
+        """
+        Студенты групп задания, ещё не отправившие ответ: (student_id, user_id)
+        по возрастанию student_id. Пачки читаются по after_student_id (keyset).
+        """
         stmt = (
-            select(HomeworksModel)
-            .where(HomeworksModel.teacher_id == teacher_id)
-            .options(joinedload(HomeworksModel.teacher).joinedload(TeachersModel.user))
-            .order_by(
-                HomeworksModel.created_at.desc(), HomeworksModel.homework_id.desc()
+            select(StudentsModel.student_id, StudentsModel.user_id)
+            .join(
+                HomeworkGroupsModel,
+                HomeworkGroupsModel.group_id == StudentsModel.group_id,
             )
+            .where(
+                HomeworkGroupsModel.homework_id == homework_id,
+                StudentsModel.student_id > after_student_id,
+            )
+            .where(~_answered_exists(homework_id, StudentsModel.student_id))
+            .distinct()
+            .order_by(StudentsModel.student_id.asc())
+            .limit(limit)
         )
-        count_stmt = (
-            select(func.count())
-            .select_from(HomeworksModel)
-            .where(HomeworksModel.teacher_id == teacher_id)
-        )
-        page_models: Page = await paginate_select(
-            session,
-            stmt,
-            page=page,
-            per_page=per_page,
-            count_stmt=count_stmt,
-        )
-        return page_models.map(HomeworkSchema.model_validate)
+        return [(row.student_id, row.user_id) for row in await session.execute(stmt)]
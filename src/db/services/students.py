@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.schemas import GroupSchema, StudentCreateSchema, StudentSchema
 from src.db.models import StudentsModel
 from src.db.repositories import StudentsRepository
+from src.db.services.user_identities import UserIdentitiesService
 from src.db.session import with_session
 
 
@@ -20,6 +21,7 @@ class StudentsService:
     async def create(
         cls, schema: StudentCreateSchema, session: AsyncSession = None
     ) -> int:
+        UserIdentitiesService.invalidate_after_commit([schema.user_id], session)
         return await cls.students_repository.create(schema, session=session)
 
     @classmethod
@@ -43,9 +45,16 @@ class StudentsService:
         )
         return students[0] if students else None
 
+    @classmethod
+    async def get_id_by_user_id(cls, user_id: int) -> Optional[int]:
+        """student_id пользователя из кэша identity (без запроса к БД при попадании)."""
+        identity = await UserIdentitiesService.get_by_user_id(user_id)
+        return identity.student_id
+
     @classmethod
     @with_session
     async def update(cls, schema: StudentSchema, session: AsyncSession = None) -> None:
+        UserIdentitiesService.invalidate_after_commit([schema.user_id], session)
         data = schema.model_dump(exclude_unset=True, exclude={"user", "group"})
         return await cls.students_repository.update_values_by_id(
             schema.student_id, data, session=session
@@ -54,6 +63,7 @@ class StudentsService:
     @classmethod
     @with_session
     async def delete(cls, student: StudentSchema, session: AsyncSession = None) -> None:
+        UserIdentitiesService.invalidate_after_commit([student.user_id], session)
         return await cls.students_repository.delete(
             where={"student_id": student.student_id}, session=session
         )
@@ -66,6 +76,7 @@ class StudentsService:
         group_id: Optional[int],
         session: AsyncSession = None,
     ) -> None:
+        UserIdentitiesService.invalidate_after_commit([student.user_id], session)
         return await cls.students_repository.update_values_by_id(
             student.student_id, {"group_id": group_id}, session=session
         )
@@ -75,6 +86,7 @@ class StudentsService:
     async def set_group_by_user_id(
         cls, user_id: int, group_id: Optional[int], session: AsyncSession = None
     ) -> int:
+        UserIdentitiesService.invalidate_after_commit([user_id], session)
         return await cls.students_repository.update_values(
             where={"user_id": user_id},
             values={"group_id": group_id},
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.schemas import TeacherCreateSchema, TeacherSchema
 from src.db.models import TeachersModel
 from src.db.repositories import TeachersRepository
+from src.db.services.user_identities import UserIdentitiesService
 from src.db.session import with_session
 
 
@@ -20,6 +21,7 @@ class TeachersService:
     async def create(
         cls, schema: TeacherCreateSchema, session: AsyncSession = None
     ) -> int:
+        UserIdentitiesService.invalidate_after_commit([schema.user_id], session)
         return await cls.teachers_repository.create(schema, session=session)
 
     @classmethod
@@ -41,9 +43,16 @@ class TeachersService:
         )
         return teachers[0] if teachers else None
 
+    @classmethod
+    async def get_id_by_user_id(cls, user_id: int) -> Optional[int]:
+        """teacher_id пользователя из кэша identity (без запроса к БД при попадании)."""
+        identity = await UserIdentitiesService.get_by_user_id(user_id)
+        return identity.teacher_id
+
     @classmethod
     @with_session
     async def delete(cls, teacher: TeacherSchema, session: AsyncSession = None) -> None:
+        UserIdentitiesService.invalidate_after_commit([teacher.user_id], session)
         return await cls.teachers_repository.delete_by_id(
             teacher.teacher_id, session=session
         )
@@ -1,25 +1,142 @@
-from typing import Optional
+from __future__ import annotations
 
+import hashlib
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, exists, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.schemas import TelegramFileCreateSchema, TelegramFileSchema
+from src.db import database_logger
+from src.db.dialect import upsert
+from src.db.models import AnswersFilesModel, HomeworkFilesModel, TelegramFilesModel
 from src.db.repositories import TelegramFilesRepository
 from src.db.session import with_session
 
 
+def _links_count(telegram_file_id):
+    """Число ссылок на файл из homework_files и answer_files."""
+    return (
+        select(func.count())
+        .select_from(HomeworkFilesModel)
+        .where(HomeworkFilesModel.telegram_file_id == telegram_file_id)
+        .scalar_subquery()
+    ) + (
+        select(func.count())
+        .select_from(AnswersFilesModel)
+        .where(AnswersFilesModel.telegram_file_id == telegram_file_id)
+        .scalar_subquery()
+    )
+
+
+def _is_orphan(telegram_file_id):
+    return ~exists().where(
+        HomeworkFilesModel.telegram_file_id == telegram_file_id
+    ) & ~exists().where(AnswersFilesModel.telegram_file_id == telegram_file_id)
+
+
 class TelegramFilesService:
     """
     Сервис для работы с файлами Telegram.
+
+    - Один файл — одна строка: повторное прикрепление того же файла (по
+      unique_file_id) переиспользует строку и обновляет её file_id
+    - ref_count меняется вместе со связями homework_files / answer_files;
+      каскадные удаления его не трогают — расхождения и файлы без ссылок
+      обрабатывает collect_garbage()
     """
 
     telegram_files_repository: TelegramFilesRepository = TelegramFilesRepository
 
+    # Файл без ссылок удаляется не раньше, чем через GC_GRACE_S после последнего
+    # upsert: транзакция, которая его переиспользует, может ещё не закоммититься
+    GC_GRACE_S = 60 * 60
+
+    @staticmethod
+    def file_hash(unique_file_id: str) -> str:
+        """Ключ дедупликации: sha256(unique_file_id) в hex (64 символа)."""
+        return hashlib.sha256(unique_file_id.encode()).hexdigest()
+
+    @classmethod
+    def _upsert_stmt(cls, session: AsyncSession, rows: list[dict]):
+        """
+        INSERT ... ON DUPLICATE KEY UPDATE (MySQL) / ON CONFLICT DO UPDATE (SQLite):
+        у существующей строки обновляется file_id, подпись и mime_type
+        заполняются, только если были пустыми.
+        """
+        model = TelegramFilesModel
+        return upsert(
+            session,
+            model,
+            rows,
+            key=[model.unique_file_hash],
+            on_conflict=lambda new: {
+                "file_id": new.file_id,
+                "caption": func.coalesce(model.caption, new.caption),
+                "mime_type": func.coalesce(model.mime_type, new.mime_type),
+                "updated_at": func.current_timestamp(),
+            },
+        )
+
     @classmethod
     @with_session
-    async def create(
+    async def upsert_many(
+        cls,
+        schemas: Iterable[TelegramFileCreateSchema],
+        session: AsyncSession = None,
+    ) -> list[int]:
+        """
+        Регистрирует файлы одним INSERT и одним SELECT.
+        Возвращает telegram_file_id в порядке schemas (повторы дают тот же id).
+        """
+        schemas = list(schemas)
+        if not schemas:
+            return []
+        rows: dict[str, dict] = {}
+        for schema in schemas:
+            file_hash = cls.file_hash(schema.unique_file_id)
+            rows[file_hash] = {**schema.model_dump(), "unique_file_hash": file_hash}
+
+        await session.execute(cls._upsert_stmt(session, list(rows.values())))
+        ids = dict(
+            (
+                await session.execute(
+                    select(
+                        TelegramFilesModel.unique_file_hash,
+                        TelegramFilesModel.telegram_file_id,
+                    ).where(TelegramFilesModel.unique_file_hash.in_(rows))
+                )
+            ).all()
+        )
+        return [ids[cls.file_hash(schema.unique_file_id)] for schema in schemas]
+
+    @classmethod
+    @with_session
+    async def upsert(
         cls, schema: TelegramFileCreateSchema, session: AsyncSession = None
     ) -> int:
-        return await cls.telegram_files_repository.create(schema, session=session)
+        return (await cls.upsert_many([schema], session=session))[0]
+
+    @classmethod
+    @with_session
+    async def add_refs(
+        cls,
+        telegram_file_ids: Iterable[int],
+        delta: int = 1,
+        session: AsyncSession = None,
+    ) -> None:
+        """Меняет ref_count на delta за каждое вхождение id в telegram_file_ids."""
+        by_count: dict[int, list[int]] = {}
+        for telegram_file_id, count in Counter(telegram_file_ids).items():
+            by_count.setdefault(count * delta, []).append(telegram_file_id)
+        for change, ids in by_count.items():
+            await session.execute(
+                update(TelegramFilesModel)
+                .where(TelegramFilesModel.telegram_file_id.in_(ids))
+                .values(ref_count=TelegramFilesModel.ref_count + change)
+            )
 
     @classmethod
     @with_session
@@ -29,3 +146,82 @@ class TelegramFilesService:
         return await cls.telegram_files_repository.get_by_id(
             telegram_file_id, session=session, load_relationships=["owner_user"]
         )
+
+    # ──────────────────────────────
+    # Сборка мусора
+    # ──────────────────────────────
+
+    @classmethod
+    @with_session
+    async def _collect_batch(
+        cls,
+        after_id: int,
+        limit: int,
+        cutoff: datetime,
+        session: AsyncSession = None,
+    ) -> tuple[Optional[int], int]:
+        """
+        Пачка файлов после after_id: удаляет файлы без ссылок старше cutoff,
+        остальным исправляет ref_count. Возвращает (последний id, удалено).
+        """
+        model = TelegramFilesModel
+        links = _links_count(model.telegram_file_id)
+        rows = (
+            await session.execute(
+                select(model.telegram_file_id, model.ref_count, model.updated_at, links)
+                .where(model.telegram_file_id > after_id)
+                .order_by(model.telegram_file_id.asc())
+                .limit(limit)
+            )
+        ).all()
+        if not rows:
+            return None, 0
+
+        orphans = [row[0] for row in rows if row[3] == 0 and row[2] < cutoff]
+        deleted = 0
+        if orphans:
+            # Ссылки перепроверяются в самом DELETE: файл могли прикрепить заново
+            result = await session.execute(
+                delete(model)
+                .where(model.telegram_file_id.in_(orphans))
+                .where(model.updated_at < cutoff)
+                .where(_is_orphan(model.telegram_file_id))
+            )
+            deleted = result.rowcount or 0
+
+        drifted = [row[0] for row in rows if row[1] != row[3] and row[0] not in orphans]
+        if drifted:
+            database_logger.get_function_logger(cls.collect_garbage).warning(
+                "Расхождение ref_count у файлов: %s", drifted
+            )
+            await session.execute(
+                update(model)
+                .where(model.telegram_file_id.in_(drifted))
+                .values(ref_count=links)
+            )
+        return rows[-1][0], deleted
+
+    @classmethod
+    async def collect_garbage(
+        cls,
+        *,
+        batch_size: int = 500,
+        grace_s: Optional[int] = None,
+        session: AsyncSession = None,
+    ) -> int:
+        """
+        Удаляет файлы без ссылок пачками по batch_size (без внешней сессии каждая
+        пачка — отдельная короткая транзакция) и сверяет ref_count.
+        Возвращает число удалённых строк.
+        """
+        cutoff = datetime.now() - timedelta(
+            seconds=cls.GC_GRACE_S if grace_s is None else grace_s
+        )
+        deleted, last_id = 0, 0
+        while True:
+            last_id, batch_deleted = await cls._collect_batch(
+                last_id, batch_size, cutoff, session=session
+            )
+            if last_id is None:
+                return deleted
+            deleted += batch_deleted
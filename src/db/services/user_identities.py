@@ -0,0 +1,64 @@
+from functools import partial
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.schemas import UserIdentitySchema
+from src.db.models import StudentsModel, TeachersModel, TelegramUsersModel
+from src.db.session import after_commit, with_session
+from src.services.identity_cache import identity_cache
+
+
+class UserIdentitiesService:
+    """
+    Сервис разрешения user_id в teacher_id / student_id / group_id.
+    Вне внешней транзакции читается через identity_cache (Redis + L1).
+    """
+
+    @classmethod
+    async def get_by_user_id(
+        cls, user_id: int, session: AsyncSession = None
+    ) -> UserIdentitySchema:
+        if session is not None:
+            return await cls._load_by_user_id(user_id, session=session)
+        return await identity_cache.get(user_id, partial(cls._load_by_user_id, user_id))
+
+    @classmethod
+    @with_session
+    async def _load_by_user_id(
+        cls, user_id: int, session: AsyncSession = None
+    ) -> UserIdentitySchema:
+        stmt = (
+            select(
+                TeachersModel.teacher_id,
+                StudentsModel.student_id,
+                StudentsModel.group_id,
+            )
+            .select_from(TelegramUsersModel)
+            .outerjoin(
+                TeachersModel, TeachersModel.user_id == TelegramUsersModel.user_id
+            )
+            .outerjoin(
+                StudentsModel, StudentsModel.user_id == TelegramUsersModel.user_id
+            )
+            .where(TelegramUsersModel.user_id == user_id)
+            .limit(1)
+        )
+        row = (await session.execute(stmt)).first()
+        if row is None:
+            return UserIdentitySchema(user_id=user_id)
+        teacher_id, student_id, group_id = row
+        return UserIdentitySchema(
+            user_id=user_id,
+            teacher_id=teacher_id,
+            student_id=student_id,
+            group_id=group_id,
+        )
+
+    @classmethod
+    def invalidate_after_commit(
+        cls, user_ids: Iterable[int], session: AsyncSession
+    ) -> None:
+        """Сбросить кэш пользователей, когда транзакция сессии будет закоммичена."""
+        after_commit(session, partial(identity_cache.invalidate, list(user_ids)))
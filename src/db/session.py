@@ -1,17 +1,36 @@
+import time
 from contextlib import asynccontextmanager
-from datetime import datetime
 from functools import wraps
+from typing import Awaitable, Callable
 
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from src.core.metrics import db_pool_checked_out, db_pool_overflow, db_pool_wait
 from src.core.settings import settings
+from src.core.tracing import span
+from src.core.update_stats import count_sql_statement
 from src.db import database_logger
+from src.db.profiler import query_profiler
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, замеряющий время получения соединения (ожидание + открытие)."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait.observe(time.perf_counter() - start)
+
 
 # 1. Создаем асинхронный "движок" для подключения к базе данных.
 async_engine = create_async_engine(
     settings.actual_database_url,
     echo=False,
+    poolclass=InstrumentedQueuePool,
     pool_pre_ping=True,  # Проверка соединения перед использованием
     pool_recycle=600,  # Переподключение соединений каждые 10 минут (более агрессивно)
     pool_size=(settings.db_pool_size or 5),  # Увеличиваем размер пула
@@ -20,6 +39,11 @@ async_engine = create_async_engine(
     ),  # Разрешаем больше временных соединений
     pool_timeout=(settings.db_pool_timeout or 30),
 )
+query_profiler.install(async_engine)
+db_pool_checked_out.set_function(lambda: async_engine.pool.checkedout())
+db_pool_overflow.set_function(lambda: async_engine.pool.overflow())
+# Подсчёт SQL-запросов в рамках апдейта (см. src/core/update_stats.py)
+event.listen(async_engine.sync_engine, "before_cursor_execute", count_sql_statement)
 
 # 2. Создаем "фабрику сессий".
 # Этот объект будет создавать новые, изолированные сессии по запросу.
@@ -56,22 +80,51 @@ def set_wait_timeout(dbapi_connection, connection_record):
         cursor.close()
 
 
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def after_commit(
+    session: AsyncSession, callback: Callable[[], Awaitable[None]]
+) -> None:
+    """
+    Регистрирует корутину, которая выполнится после успешного коммита сессии.
+
+    Нужна для инвалидации кэшей: версия в Redis должна меняться только когда
+    новые данные уже видны другим соединениям. При откате колбэки отбрасываются.
+    """
+    session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+async def _run_after_commit(session: AsyncSession) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, []):
+        try:
+            await callback()
+        except Exception as e:
+            session_logger.error("After-commit callback failed: %s", e, exc_info=True)
+
+
+def _discard_after_commit(session: AsyncSession) -> None:
+    session.info.pop(_AFTER_COMMIT_KEY, None)
+
+
 @asynccontextmanager
 async def get_db_session():
     """
     Контекстный менеджер для получения сессии БД с отслеживанием производительности.
     """
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     session = async_session_factory()
     try:
         yield session
         await session.commit()
-        elapsed = (datetime.now() - start_time).total_seconds() * 1000
-        session_logger.info(f"DB Session duration: {elapsed:.2f}ms (committed)")
+        await _run_after_commit(session)
+        elapsed = (time.perf_counter() - start_time) * 1000
+        session_logger.info("DB Session duration: %.2fms (committed)", elapsed)
     except Exception as e:
         await session.rollback()
-        elapsed = (datetime.now() - start_time).total_seconds() * 1000
-        session_logger.error(f"DB Session error: {elapsed:.2f}ms | {str(e)}")
+        _discard_after_commit(session)
+        elapsed = (time.perf_counter() - start_time) * 1000
+        session_logger.error("DB Session error: %.2fms | %s", elapsed, e)
         raise
     finally:
         await session.close()
@@ -91,18 +144,21 @@ def with_session(func):
             return await func(*args, **kwargs)
 
         # Если сессии нет, создаем новую, используя нашу фабрику.
-        async with async_session_factory() as session:
-            try:
-                # Передаем новую сессию в декорируемую функцию.
-                kwargs["session"] = session
-                result = await func(*args, **kwargs)
-                # Коммитим транзакцию, если функция выполнилась успешно.
-                await session.commit()
-                return result
-            except Exception:
-                # В случае любой ошибки откатываем транзакцию.
-                await session.rollback()
-                # И пробрасываем исключение дальше.
-                raise
+        with span(f"db.session:{func.__qualname__}"):
+            async with async_session_factory() as session:
+                try:
+                    # Передаем новую сессию в декорируемую функцию.
+                    kwargs["session"] = session
+                    result = await func(*args, **kwargs)
+                    # Коммитим транзакцию, если функция выполнилась успешно.
+                    await session.commit()
+                    await _run_after_commit(session)
+                    return result
+                except Exception:
+                    # В случае любой ошибки откатываем транзакцию.
+                    await session.rollback()
+                    _discard_after_commit(session)
+                    # И пробрасываем исключение дальше.
+                    raise
 
     return wrapper
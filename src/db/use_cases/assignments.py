@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import partial
 from typing import Iterable, Optional
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.enums import AnswersStatusEnum
+from src.core.metrics import answer_submissions
 from src.core.schemas import (
     AnswerCreateSchema,
-    AnswerFileCreateSchema,
+    AnswerGradeResultSchema,
     TelegramFileCreateSchema,
 )
 from src.db import database_logger
@@ -18,7 +21,8 @@ from src.db.services import (
     HomeworksService,
     TelegramFilesService,
 )
-from src.db.session import with_session
+from src.db.session import after_commit, with_session
+from src.services.answer_dedup import answer_dedup
 
 
 class AssignmentsUseCase:
@@ -34,7 +38,6 @@ class AssignmentsUseCase:
     answer_files: AnswerFilesService = AnswerFilesService()
 
     @classmethod
-    @with_session
     async def submit_answer(
         cls,
         answer: AnswerCreateSchema,
@@ -43,23 +46,78 @@ class AssignmentsUseCase:
     ) -> int:
         """
         Атомарно создаёт ответ и (опционально) прикрепляет файлы.
+
+        Отправка идемпотентна по (student_id, homework_id, submission_key),
+        пока ответ ждёт проверки; без явного ключа им служит хэш содержимого
+        (AnswerDedup.submission_key). Повтор возвращает answer_id уже созданного
+        ответа: недавний — по ключу в Redis без обращения к БД, иначе (и при
+        гонке двух одновременных отправок) — по уникальному индексу.
         """
+        telegram_files = list(telegram_files or [])
+        if answer.submission_key is None:
+            answer = answer.model_copy(
+                update={
+                    "submission_key": answer_dedup.submission_key(
+                        answer.student_answer,
+                        [f.unique_file_id for f in telegram_files],
+                    )
+                }
+            )
+        answer_id = await answer_dedup.get(
+            answer.student_id, answer.homework_id, answer.submission_key
+        )
+        if answer_id is not None:
+            answer_submissions.inc("duplicate_redis")
+            return answer_id
+        return await cls._submit_answer(answer, telegram_files, session=session)
+
+    @classmethod
+    @with_session
+    async def _submit_answer(
+        cls,
+        answer: AnswerCreateSchema,
+        telegram_files: list[TelegramFileCreateSchema],
+        session: AsyncSession = None,
+    ) -> int:
         logger = database_logger.get_function_logger(AssignmentsUseCase.submit_answer)
         logger.info(f"Сохраняем ответ {answer}")
+        remember = partial(
+            answer_dedup.remember,
+            answer.student_id,
+            answer.homework_id,
+            answer.submission_key,
+        )
 
-        answer_id = await cls.answers.create(answer, session=session)
+        try:
+            # Точка сохранения: ошибка уникальности не откатывает внешнюю транзакцию
+            async with session.begin_nested():
+                answer_id = await cls.answers.create(answer, session=session)
+        except IntegrityError:
+            answer_id = await cls.answers.get_id_by_submission_key(
+                answer.student_id,
+                answer.homework_id,
+                answer.submission_key,
+                for_update=True,
+                session=session,
+            )
+            if answer_id is None:
+                raise
+            logger.info("Повторная отправка ответа %s отброшена", answer_id)
+            answer_submissions.inc("duplicate_db")
+            after_commit(session, partial(remember, answer_id))
+            return answer_id
 
         if telegram_files:
             logger.info("Сохраняем файлы")
-            for tf in telegram_files:
-                telegram_file_id = await cls.telegram_files.create(tf, session=session)
-                await cls.answer_files.attach_file(
-                    AnswerFileCreateSchema(
-                        answer_id=answer_id, telegram_file_id=telegram_file_id
-                    ),
-                    session=session,
-                )
+            telegram_file_ids = await cls.telegram_files.upsert_many(
+                telegram_files, session=session
+            )
+            await cls.answer_files.attach_files(
+                answer_id, telegram_file_ids, session=session
+            )
 
+        answer_submissions.inc("created")
+        after_commit(session, partial(remember, answer_id))
         return answer_id
 
     # async def update_answer(
@@ -77,26 +135,26 @@ class AssignmentsUseCase:
         teacher_comment: Optional[str] = None,
         status: AnswersStatusEnum = AnswersStatusEnum.REVIEWED,
         checked_at: Optional[datetime] = None,
+        expected_status: Optional[AnswersStatusEnum] = None,
+        expected_checked_at: Optional[datetime] = None,
         session: AsyncSession = None,
-    ) -> bool:
+    ) -> AnswerGradeResultSchema:
         """
         Оценивание ответа с проверкой, что ответ принадлежит заданию этого преподавателя.
         Права доступа вы можете проверять в роутерах, но эту проверку полезно держать
         как “страховку” на уровне use-case.
-        """
-        answer = await cls.answers.get_by_id(answer_id, session=session)
-        if not answer:
-            return False
-
-        homework = await cls.homeworks.get_by_id(answer.homework_id, session=session)
-        if not homework or homework.teacher_id != teacher_id:
-            raise PermissionError("Teacher has no access to this answer/homework")
 
-        return await cls.answers.grade(
-            answer_id=answer_id,
+        Проверка владельца и запись выполняются одним UPDATE (см. AnswersService.grade_by_teacher);
+        expected_status/expected_checked_at включают оптимистичную блокировку.
+        """
+        return await cls.answers.grade_by_teacher(
+            answer_id,
+            teacher_id,
             grade=grade,
             teacher_comment=teacher_comment,
             status=status,
             checked_at=checked_at,
+            expected_status=expected_status,
+            expected_checked_at=expected_checked_at,
             session=session,
         )
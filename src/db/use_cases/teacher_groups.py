@@ -23,7 +23,7 @@ from src.db.models import (
 )
 from src.db.pagination import Page, paginate_select
 from src.db.repositories import AssignedGroupsRepository, GroupsRepository
-from src.db.services import TeachersService
+from src.db.services import TeachersService, UserIdentitiesService
 from src.db.session import with_session
 
 
@@ -261,9 +261,22 @@ class TeacherGroupsUseCase:
                 ok=False, error_code="confirm_name_mismatch"
             )
 
+        # group_id студентов обнулится по FK (ON DELETE SET NULL) — сбрасываем их identity
+        member_user_ids = (
+            (
+                await session.execute(
+                    select(StudentsModel.user_id).where(
+                        StudentsModel.group_id == group_id
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
         await session.execute(
             delete(GroupsModel).where(GroupsModel.group_id == group_id)
         )
+        UserIdentitiesService.invalidate_after_commit(member_user_ids, session)
         return TeacherGroupMutationResultSchema(ok=True)
 
     @classmethod
@@ -308,10 +321,10 @@ class TeacherGroupsUseCase:
                 ok=False, error_code="group_not_found"
             )
 
-        exists_student = (
+        student_user_id = (
             (
                 await session.execute(
-                    select(StudentsModel.student_id)
+                    select(StudentsModel.user_id)
                     .where(StudentsModel.student_id == student_id)
                     .limit(1)
                 )
@@ -319,7 +332,7 @@ class TeacherGroupsUseCase:
             .scalars()
             .first()
         )
-        if not exists_student:
+        if not student_user_id:
             return TeacherGroupStudentMutationResultSchema(
                 ok=False, error_code="student_not_found"
             )
@@ -334,6 +347,7 @@ class TeacherGroupsUseCase:
             return TeacherGroupStudentMutationResultSchema(
                 ok=False, error_code="student_not_in_group"
             )
+        UserIdentitiesService.invalidate_after_commit([student_user_id], session)
         return TeacherGroupStudentMutationResultSchema(ok=True)
 
     @classmethod
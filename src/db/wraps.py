@@ -1,6 +1,7 @@
-from datetime import datetime
+import time
 from functools import wraps
 
+from src.core.metrics import db_latency
 from src.db import database_logger
 
 
@@ -11,33 +12,45 @@ def log_db_performance(func):
     """
     _logger = database_logger.get_logger("db_performance")
 
+    func_name = getattr(func, "__name__", "unknown")
+
+    def _method_name(args) -> str:
+        # Формируем имя метода: ИмяКласса.имя_метода если метод класса.
+        # Для classmethod первым аргументом приходит сам класс, а не экземпляр.
+        if not args:
+            return func_name
+        owner = args[0] if isinstance(args[0], type) else args[0].__class__
+        return f"{owner.__name__}.{func_name}"
+
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        start_time = datetime.now()
+        start_time = time.perf_counter()
+        method_name = _method_name(args)
         try:
             result = await func(*args, **kwargs)
-            elapsed_time = (
-                datetime.now() - start_time
-            ).total_seconds() * 1000  # в миллисекундах
-            # Формируем имя метода: ИмяКласса.имя_метода если метод класса
-            if args and hasattr(args[0], "__class__"):
-                # Получаем имя функции безопасно
-                func_name = getattr(func, "__name__", "unknown")
-                method_name = f"{args[0].__class__.__name__}.{func_name}"
-            else:
-                method_name = getattr(func, "__name__", "unknown")
+            # perf_counter монотонен и не зависит от перевода системных часов
+            elapsed_time = (time.perf_counter() - start_time) * 1000  # в миллисекундах
 
+            # Форматирование откладывается до потока записи логов
             _logger.info(
-                f"DB Operation: {method_name} | Duration: {elapsed_time:.2f}ms | Args: {args[1:]} | Kwargs: {kwargs}"
+                "DB Operation: %s | Duration: %.2fms | Args: %s | Kwargs: %s",
+                method_name,
+                elapsed_time,
+                args[1:],
+                kwargs,
             )
             return result
         except Exception as e:
-            elapsed_time = (datetime.now() - start_time).total_seconds() * 1000
-            func_name = getattr(func, "__name__", "unknown")
+            elapsed_time = (time.perf_counter() - start_time) * 1000
             _logger.error(
-                f"DB Error in {func_name} | Duration: {elapsed_time:.2f}ms | Error: {str(e)}",
+                "DB Error in %s | Duration: %.2fms | Error: %s",
+                method_name,
+                elapsed_time,
+                e,
                 exc_info=True,
             )
             raise
+        finally:
+            db_latency.observe(time.perf_counter() - start_time, method_name)
 
     return wrapper
@@ -0,0 +1,20 @@
+"""
+Фоновые задачи приложения
+"""
+
+from .answer_stats import reconcile_answer_stats, run_answer_stats_reconciler
+from .publication import publish_due_homeworks, publish_homework
+from .publication_sweep import run_publication_sweep
+from .scheduler import run_scheduler
+from .telegram_files_gc import collect_telegram_files, run_telegram_files_gc
+
+__all__ = [
+    "collect_telegram_files",
+    "publish_due_homeworks",
+    "publish_homework",
+    "reconcile_answer_stats",
+    "run_answer_stats_reconciler",
+    "run_publication_sweep",
+    "run_scheduler",
+    "run_telegram_files_gc",
+]
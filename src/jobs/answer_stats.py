@@ -0,0 +1,49 @@
+"""
+Сверка счётчиков homework_answer_stats с таблицей answers.
+
+• В боте: периодическая задача run_answer_stats_reconciler (запускается в src/app.py);
+  сверку выполняет только экземпляр-лидер (аренда лидерства планировщика).
+• Первичный backfill или ручная сверка: python -m src.jobs.answer_stats
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from src.core.logger import get_logger
+from src.db.services import HomeworkAnswerStatsService
+from src.jobs.scheduler import INSTANCE_ID
+from src.services import homework_scheduler
+
+logger = get_logger("jobs")
+
+
+async def reconcile_answer_stats(batch_size: int = 500) -> int:
+    """Один проход сверки по всем заданиям; возвращает число исправленных строк."""
+    start = time.perf_counter()
+    fixed = await HomeworkAnswerStatsService.reconcile(batch_size=batch_size)
+    logger.info(
+        "Сверка счётчиков ответов: исправлено %s за %.2fs",
+        fixed,
+        time.perf_counter() - start,
+    )
+    return fixed
+
+
+async def run_answer_stats_reconciler(interval_s: float) -> None:
+    """
+    Сверяет счётчики сразу и затем каждые interval_s секунд до отмены задачи.
+    Экземпляр без лидерства пропускает проход: сверка нужна одна на все экземпляры.
+    """
+    while True:
+        try:
+            if await homework_scheduler.acquire_leadership(INSTANCE_ID):
+                await reconcile_answer_stats()
+        except Exception as e:
+            logger.error("Сверка счётчиков ответов завершилась ошибкой: %s", e)
+        await asyncio.sleep(interval_s)
+
+
+if __name__ == "__main__":
+    asyncio.run(reconcile_answer_stats())
@@ -0,0 +1,56 @@
+"""
+Напоминания о сроке сдачи студентам, ещё не отправившим ответ.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from aiogram import Bot
+
+from src.bot.lexicon.texts import TextsRU
+from src.core.logger import get_logger
+from src.core.schemas import ScheduledTimerSchema
+from src.db.services import HomeworksService
+from src.jobs.notifications import send_batched
+
+logger = get_logger("jobs")
+
+# Получатели читаются из БД пачками, чтобы не держать весь курс в памяти
+RECIPIENTS_BATCH_SIZE = 500
+
+
+async def send_deadline_reminders(bot: Bot, timer: ScheduledTimerSchema) -> int:
+    """Обработчик таймера DEADLINE_REMINDER; возвращает число отправленных."""
+    homework = await HomeworksService.get_by_id(timer.homework_id)
+    now = datetime.now()
+    if homework is None or homework.end_at <= now:
+        return 0
+    if homework.start_at is not None and homework.start_at > now:
+        # Публикацию перенесли позже напоминания — студенты задания ещё не видят
+        return 0
+
+    text = TextsRU.STUDENT_HOMEWORK_DEADLINE_REMINDER.format(
+        title=homework.title,
+        end_at=homework.end_at.strftime("%d.%m.%Y %H:%M"),
+        hours_left=timer.param,
+    )
+    sent = 0
+    after_student_id = 0
+    while recipients := await HomeworksService.get_pending_recipients(
+        homework.homework_id,
+        after_student_id=after_student_id,
+        limit=RECIPIENTS_BATCH_SIZE,
+    ):
+        sent += await send_batched(
+            bot, timer.kind.value, (user_id for _, user_id in recipients), text
+        )
+        after_student_id = recipients[-1][0]
+
+    logger.info(
+        "Напоминание о сроке задания %s (за %s ч): отправлено %s",
+        homework.homework_id,
+        timer.param,
+        sent,
+    )
+    return sent
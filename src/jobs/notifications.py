@@ -0,0 +1,51 @@
+"""
+Рассылка сообщений студентам пачками с приоритетом BULK.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Iterable
+
+from aiogram import Bot
+
+from src.core.logger import get_logger
+from src.core.metrics import notifications_sent
+from src.core.send_scheduler import SendPriority, send_priority
+
+logger = get_logger("jobs")
+
+# Не больше CHUNK_SIZE отправок одновременно; темп (~30/с) задаёт SendScheduler
+CHUNK_SIZE = 25
+
+
+async def send_batched(bot: Bot, kind: str, user_ids: Iterable[int], text: str) -> int:
+    """
+    Отправляет text пользователям пачками по CHUNK_SIZE.
+    Приоритет BULK: ответы на апдейты и уведомления об оценках уходят
+    вне очереди рассылки (SendScheduler).
+    Ошибки отдельных получателей (бот заблокирован и т.п.) не прерывают рассылку.
+    Возвращает число доставленных сообщений.
+    """
+    user_ids = list(user_ids)
+    delivered = 0
+    for i in range(0, len(user_ids), CHUNK_SIZE):
+        chunk = user_ids[i : i + CHUNK_SIZE]
+        with send_priority(SendPriority.BULK):
+            results = await asyncio.gather(
+                *(bot.send_message(chat_id=user_id, text=text) for user_id in chunk),
+                return_exceptions=True,
+            )
+        for user_id, result in zip(chunk, results):
+            if isinstance(result, Exception):
+                notifications_sent.inc(kind, "error")
+                logger.warning(
+                    "Не удалось отправить уведомление %s пользователю %s: %s",
+                    kind,
+                    user_id,
+                    result,
+                )
+            else:
+                notifications_sent.inc(kind, "ok")
+                delivered += 1
+    return delivered
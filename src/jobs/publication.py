@@ -0,0 +1,75 @@
+"""
+Публикация заданий: рассылка уведомления группам, которым оно ещё не отправлено.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from aiogram import Bot
+
+from src.bot.lexicon.texts import TextsRU
+from src.core.enums import ScheduledTimerKindEnum
+from src.core.logger import get_logger
+from src.core.schemas import ScheduledTimerSchema
+from src.db.services import HomeworkGroupsService, HomeworksService, StudentsService
+from src.jobs.notifications import send_batched
+
+logger = get_logger("jobs")
+
+
+async def publish_homework(bot: Bot, homework_id: int) -> int:
+    """
+    Рассылает уведомление о задании студентам групп с пустым sent_at.
+    Возвращает число отправленных сообщений.
+
+    Таймер PUBLISH, досылка и обработчики преподавателя могут публиковать одно
+    задание одновременно на разных экземплярах: группа перед рассылкой
+    забирается claim_unsent, поэтому рассылает её только один из них.
+    """
+    homework = await HomeworksService.get_by_id(homework_id)
+    if homework is None:
+        return 0
+
+    text = TextsRU.TEACHER_HOMEWORK_NEW_NOTIFICATION.format(
+        title=homework.title,
+        end_at=homework.end_at.strftime("%d.%m.%Y %H:%M"),
+        teacher_full_name=homework.teacher.user.real_full_name,
+        text=homework.text,
+    )
+    sent = 0
+    for group_id in await HomeworkGroupsService.get_unsent_group_ids(homework_id):
+        # Группа отмечается до рассылки: повтор не дублирует уведомления,
+        # но сбой посреди рассылки не досылает её остаток
+        if not await HomeworkGroupsService.claim_unsent(
+            homework_id, group_id, datetime.now()
+        ):
+            continue
+        students = await StudentsService.get_all_by_group_id(group_id)
+        sent += await send_batched(
+            bot,
+            ScheduledTimerKindEnum.PUBLISH.value,
+            (student.user_id for student in students),
+            text,
+        )
+
+    logger.info("Задание %s опубликовано: отправлено %s", homework_id, sent)
+    return sent
+
+
+async def publish_scheduled_homework(bot: Bot, timer: ScheduledTimerSchema) -> int:
+    """Обработчик таймера PUBLISH."""
+    return await publish_homework(bot, timer.homework_id)
+
+
+async def publish_due_homeworks(bot: Bot) -> int:
+    """
+    Досылает задания с наступившим start_at и неотмеченными группами.
+    Возвращает число отправленных сообщений.
+    """
+    sent = 0
+    for homework_id in await HomeworkGroupsService.get_due_unsent_homework_ids(
+        datetime.now()
+    ):
+        sent += await publish_homework(bot, homework_id)
+    return sent
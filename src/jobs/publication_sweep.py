@@ -0,0 +1,32 @@
+"""
+Досылка отложенных публикаций.
+
+Таймер PUBLISH ставится в Redis после коммита и может потеряться (Redis недоступен,
+планировщик выключен). Периодическая задача run_publication_sweep (запускается
+в src/app.py) находит задания с наступившим start_at и неотмеченными группами
+и рассылает их; выполняет только экземпляр-лидер.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from aiogram import Bot
+
+from src.core.logger import get_logger
+from src.jobs.publication import publish_due_homeworks
+from src.jobs.scheduler import INSTANCE_ID
+from src.services import homework_scheduler
+
+logger = get_logger("jobs")
+
+
+async def run_publication_sweep(bot: Bot, interval_s: float) -> None:
+    """Досылает просроченные публикации каждые interval_s секунд до отмены задачи."""
+    while True:
+        try:
+            if await homework_scheduler.acquire_leadership(INSTANCE_ID):
+                await publish_due_homeworks(bot)
+        except Exception as e:
+            logger.error("Досылка публикаций завершилась ошибкой: %s", e)
+        await asyncio.sleep(interval_s)
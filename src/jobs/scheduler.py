@@ -0,0 +1,89 @@
+"""
+Воркер планировщика: экземпляр-лидер забирает сработавшие таймеры из Redis
+и выполняет их обработчики. Остальные экземпляры ждут, пока лидерство освободится.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+from contextlib import suppress
+from typing import Awaitable, Callable
+
+from aiogram import Bot
+
+from src.core.enums import ScheduledTimerKindEnum
+from src.core.logger import get_logger
+from src.core.metrics import scheduler_timers
+from src.core.schemas import ScheduledTimerSchema
+from src.jobs.deadline_reminders import send_deadline_reminders
+from src.jobs.publication import publish_scheduled_homework
+from src.services import homework_scheduler
+
+logger = get_logger("jobs")
+
+TimerHandler = Callable[[Bot, ScheduledTimerSchema], Awaitable[object]]
+
+TIMER_HANDLERS: dict[ScheduledTimerKindEnum, TimerHandler] = {
+    ScheduledTimerKindEnum.PUBLISH: publish_scheduled_homework,
+    ScheduledTimerKindEnum.DEADLINE_REMINDER: send_deadline_reminders,
+}
+
+# Как часто проверять таймеры и продлевать лидерство (сек); меньше LEADER_TTL
+POLL_INTERVAL_S = 1.0
+
+# Идентификатор экземпляра в аренде лидерства (scheduler:leader)
+INSTANCE_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def _run_timer(bot: Bot, timer: ScheduledTimerSchema) -> None:
+    handler = TIMER_HANDLERS.get(timer.kind)
+    if handler is None:
+        logger.warning("Нет обработчика для таймера %s", timer.member)
+        return
+    try:
+        await handler(bot, timer)
+        scheduler_timers.inc(timer.kind.value, "ok")
+    except Exception as e:
+        # Таймер уже забран: повтор мог бы продублировать часть рассылки
+        scheduler_timers.inc(timer.kind.value, "error")
+        logger.error("Таймер %s завершился ошибкой: %s", timer.member, e, exc_info=e)
+
+
+async def run_scheduler(bot: Bot) -> None:
+    """
+    Цикл планировщика; работает до отмены задачи.
+
+    Каждый забранный таймер выполняется отдельной задачей: длинная рассылка
+    не задерживает цикл, и лидерство продлевается каждые POLL_INTERVAL_S.
+    Таймер забирается ZREM (claim_due), поэтому даже при смене лидера
+    не выполняется дважды.
+    """
+    owner = INSTANCE_ID
+    running: set[asyncio.Task] = set()
+    try:
+        while True:
+            delay = POLL_INTERVAL_S
+            try:
+                if await homework_scheduler.acquire_leadership(owner):
+                    timers = await homework_scheduler.claim_due()
+                    for timer in timers:
+                        task = asyncio.create_task(_run_timer(bot, timer))
+                        running.add(task)
+                        task.add_done_callback(running.discard)
+                    if timers:
+                        # Могли остаться сработавшие таймеры сверх лимита пачки
+                        continue
+                    next_in = await homework_scheduler.seconds_until_next()
+                    if next_in is not None:
+                        delay = min(delay, next_in)
+            except Exception as e:
+                logger.error("Ошибка цикла планировщика: %s", e)
+            await asyncio.sleep(delay)
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        with suppress(Exception):
+            await homework_scheduler.release_leadership(owner)
@@ -0,0 +1,42 @@
+"""
+Сборка мусора в telegram_files: файлы без ссылок из homework_files и answer_files.
+
+• В боте: периодическая задача run_telegram_files_gc (запускается в src/app.py).
+• Ручной запуск: python -m src.jobs.telegram_files_gc
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from src.core.logger import get_logger
+from src.db.services import TelegramFilesService
+
+logger = get_logger("jobs")
+
+
+async def collect_telegram_files(batch_size: int = 500) -> int:
+    """Один проход по всем файлам; возвращает число удалённых строк."""
+    start = time.perf_counter()
+    deleted = await TelegramFilesService.collect_garbage(batch_size=batch_size)
+    logger.info(
+        "Сборка мусора telegram_files: удалено %s за %.2fs",
+        deleted,
+        time.perf_counter() - start,
+    )
+    return deleted
+
+
+async def run_telegram_files_gc(interval_s: float) -> None:
+    """Собирает мусор каждые interval_s секунд до отмены задачи."""
+    while True:
+        await asyncio.sleep(interval_s)
+        try:
+            await collect_telegram_files()
+        except Exception as e:
+            logger.error("Сборка мусора telegram_files завершилась ошибкой: %s", e)
+
+
+if __name__ == "__main__":
+    asyncio.run(collect_telegram_files())
@@ -1,15 +1,29 @@
 from .admin_client import RedisAdminClient
+from .answer_dedup_client import RedisAnswerDedupClient
 from .client import RedisClient
+from .homework_client import RedisHomeworkClient
+from .identity_client import RedisIdentityClient
 from .logger import redis_cache_logger
 from .role_client import RedisRoleClient
+from .scheduler_client import RedisSchedulerClient
+from .send_rate_client import RedisSendRateClient
 from .telegram_users_client import RedisTelegramUsersClient
+from .throttle_client import RedisThrottleClient
+from .update_dedup_client import RedisUpdateDedupClient
 from .user_locks_client import RedisUserLocksClient
 
 __all__ = [
     "RedisClient",
     "RedisAdminClient",
+    "RedisAnswerDedupClient",
+    "RedisHomeworkClient",
+    "RedisIdentityClient",
     "RedisRoleClient",
+    "RedisSchedulerClient",
+    "RedisSendRateClient",
     "RedisTelegramUsersClient",
+    "RedisThrottleClient",
+    "RedisUpdateDedupClient",
     "RedisUserLocksClient",
     "redis_cache_logger",
 ]
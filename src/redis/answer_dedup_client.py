@@ -0,0 +1,42 @@
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from src.redis import RedisClient
+
+
+class RedisAnswerDedupClient:
+    """
+    Недавно принятые ответы для подавления повторных отправок.
+
+    Ключи:
+      - answer_submit:{student_id}:{homework_id}:{submission_key} -> answer_id
+    """
+
+    def __init__(self, redis_client: "RedisClient"):
+        self.redis_client = redis_client
+
+    def _prefix(self, student_id: int, homework_id: int, submission_key: str) -> str:
+        return f"answer_submit:{student_id}:{homework_id}:{submission_key}"
+
+    async def get(
+        self, student_id: int, homework_id: int, submission_key: str
+    ) -> Optional[int]:
+        value = await self.redis_client.get(
+            self._prefix(student_id, homework_id, submission_key)
+        )
+        return int(value) if value is not None else None
+
+    async def set(
+        self,
+        student_id: int,
+        homework_id: int,
+        submission_key: str,
+        answer_id: int,
+        *,
+        ttl_seconds: int,
+    ) -> None:
+        await self.redis_client.set(
+            self._prefix(student_id, homework_id, submission_key),
+            str(answer_id),
+            expire=ttl_seconds,
+        )
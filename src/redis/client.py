@@ -1,11 +1,36 @@
+import time
 import traceback
 from pprint import pformat
 from typing import Optional
 
 from redis.asyncio import Redis
+from src.core.metrics import redis_latency
+from src.core.tracing import span
+from src.core.update_stats import count_redis
 from src.redis.logger import redis_cache_logger
 
 
+class InstrumentedRedis(Redis):
+    """
+    redis.asyncio.Redis, который на каждую команду увеличивает счётчик
+    апдейта, пишет длительность в redis_command_duration_seconds и открывает
+    спан трассировки.
+
+    Через этот же экземпляр работает RedisStorage FSM (create_dispatcher),
+    поэтому его команды тоже попадают в счётчики и метрики.
+    """
+
+    async def execute_command(self, *args, **options):
+        command = str(args[0]).upper() if args else "UNKNOWN"
+        count_redis()
+        start = time.perf_counter()
+        try:
+            with span(f"redis:{command}"):
+                return await super().execute_command(*args, **options)
+        finally:
+            redis_latency.observe(time.perf_counter() - start, command)
+
+
 class RedisClient:
     """
     Клиент для работы с Redis.
@@ -17,7 +42,7 @@ class RedisClient:
         self.logger = redis_cache_logger.get_class_logger(self)
 
     async def connect(self):
-        self.redis = Redis.from_url(self.redis_url)
+        self.redis = InstrumentedRedis.from_url(self.redis_url)
         await self.redis.ping()
 
     async def close(self):
@@ -57,6 +82,40 @@ class RedisClient:
             kwargs["ex"] = expire
         await self.redis.set(key, value, **kwargs)
 
+    async def incr(self, key: str) -> int:
+        return await self.redis.incr(key)
+
+    async def set_nx(self, key: str, value: str, expire: int) -> bool:
+        """SET NX EX: True, если ключ создан этим вызовом."""
+        return bool(await self.redis.set(key, value, nx=True, ex=expire))
+
+    async def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        return await self.redis.zadd(key, mapping)
+
+    async def zrem(self, key: str, *members: str) -> int:
+        return await self.redis.zrem(key, *members)
+
+    async def zrangebyscore(
+        self,
+        key: str,
+        min_score: float | str,
+        max_score: float | str,
+        *,
+        limit: Optional[int] = None,
+        withscores: bool = False,
+    ) -> list:
+        """Элементы ZSET по диапазону score (строки; с withscores — пары)."""
+        kwargs = {"start": 0, "num": limit} if limit is not None else {}
+        items = await self.redis.zrangebyscore(
+            key, min_score, max_score, withscores=withscores, **kwargs
+        )
+        if withscores:
+            return [(member.decode(), score) for member, score in items]
+        return [member.decode() for member in items]
+
+    async def eval(self, script: str, keys: list[str], args: list) -> object:
+        return await self.redis.eval(script, len(keys), *keys, *args)
+
     async def scan_keys(self, pattern: str) -> list:
         keys = []
         cursor = b"0"
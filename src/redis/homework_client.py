@@ -0,0 +1,43 @@
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from src.redis import RedisClient
+
+
+class RedisHomeworkClient:
+    """
+    Кэш данных задания (сериализованная схема) с версионированием.
+
+    Ключи (prefix — "homework" для заданий, "homework_card" для карточек):
+      - {prefix}:{homework_id}:version -> номер версии (INCR при каждом изменении)
+      - {prefix}:{homework_id}:v{version} -> JSON схемы этой версии
+
+    Старые версии не удаляются явно — они истекают по TTL.
+    """
+
+    def __init__(self, redis_client: "RedisClient", prefix: str = "homework"):
+        self.redis_client = redis_client
+        self.prefix = prefix
+
+    def _version_key(self, homework_id: int) -> str:
+        return f"{self.prefix}:{homework_id}:version"
+
+    def _prefix(self, homework_id: int, version: int) -> str:
+        return f"{self.prefix}:{homework_id}:v{version}"
+
+    async def get_version(self, homework_id: int) -> int:
+        raw = await self.redis_client.get(self._version_key(homework_id))
+        return int(raw) if raw is not None else 0
+
+    async def bump_version(self, homework_id: int) -> int:
+        return await self.redis_client.incr(self._version_key(homework_id))
+
+    async def get_payload(self, homework_id: int, version: int) -> Optional[str]:
+        return await self.redis_client.get(self._prefix(homework_id, version))
+
+    async def set_payload(
+        self, homework_id: int, version: int, payload: str, *, ttl_seconds: int
+    ) -> None:
+        await self.redis_client.set(
+            self._prefix(homework_id, version), payload, expire=ttl_seconds
+        )
@@ -0,0 +1,44 @@
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from src.redis import RedisClient
+
+
+class RedisIdentityClient:
+    """
+    Кэш соответствия user_id -> (teacher_id, student_id, group_id)
+    с версионированием (как RedisHomeworkClient).
+
+    Ключи:
+      - identity:{user_id}:version -> номер версии (INCR при каждом изменении)
+      - identity:{user_id}:v{version} -> JSON UserIdentitySchema этой версии
+
+    Запись, загруженная до инвалидации, ложится под старую версию и больше
+    не читается; старые версии истекают по TTL.
+    """
+
+    def __init__(self, redis_client: "RedisClient"):
+        self.redis_client = redis_client
+
+    def _version_key(self, user_id: int) -> str:
+        return f"identity:{user_id}:version"
+
+    def _prefix(self, user_id: int, version: int) -> str:
+        return f"identity:{user_id}:v{version}"
+
+    async def get_version(self, user_id: int) -> int:
+        raw = await self.redis_client.get(self._version_key(user_id))
+        return int(raw) if raw is not None else 0
+
+    async def bump_version(self, user_id: int) -> int:
+        return await self.redis_client.incr(self._version_key(user_id))
+
+    async def get_payload(self, user_id: int, version: int) -> Optional[str]:
+        return await self.redis_client.get(self._prefix(user_id, version))
+
+    async def set_payload(
+        self, user_id: int, version: int, payload: str, *, ttl_seconds: int
+    ) -> None:
+        await self.redis_client.set(
+            self._prefix(user_id, version), payload, expire=ttl_seconds
+        )
@@ -0,0 +1,75 @@
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from src.redis import RedisClient
+
+
+# Продлить лидерство, если ключ наш, или захватить свободный ключ
+_ACQUIRE_LEADER_LUA = """
+local current = redis.call('GET', KEYS[1])
+if current == ARGV[1] then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+if not current then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+_RELEASE_LEADER_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisSchedulerClient:
+    """
+    Таймеры отложенных задач и лидерство воркера планировщика.
+
+    Ключи:
+      - scheduler:timers -> ZSET, member — таймер, score — unix-время срабатывания
+      - scheduler:leader -> идентификатор экземпляра-лидера (TTL)
+    """
+
+    TIMERS_KEY = "scheduler:timers"
+    LEADER_KEY = "scheduler:leader"
+
+    def __init__(self, redis_client: "RedisClient"):
+        self.redis_client = redis_client
+
+    async def schedule(self, timers: dict[str, float]) -> None:
+        """Ставит или переносит таймеры (повторный ZADD меняет время)."""
+        if timers:
+            await self.redis_client.zadd(self.TIMERS_KEY, timers)
+
+    async def cancel(self, *members: str) -> None:
+        if members:
+            await self.redis_client.zrem(self.TIMERS_KEY, *members)
+
+    async def due(self, now: float, limit: int) -> list[str]:
+        return await self.redis_client.zrangebyscore(
+            self.TIMERS_KEY, "-inf", now, limit=limit
+        )
+
+    async def claim(self, member: str) -> bool:
+        """Забирает таймер; True получает только один из конкурирующих вызовов."""
+        return await self.redis_client.zrem(self.TIMERS_KEY, member) == 1
+
+    async def next_fire_at(self) -> Optional[float]:
+        items = await self.redis_client.zrangebyscore(
+            self.TIMERS_KEY, "-inf", "+inf", limit=1, withscores=True
+        )
+        return items[0][1] if items else None
+
+    async def acquire_leader(self, owner: str, *, ttl_seconds: int) -> bool:
+        result = await self.redis_client.eval(
+            _ACQUIRE_LEADER_LUA, [self.LEADER_KEY], [owner, ttl_seconds]
+        )
+        return result == 1
+
+    async def release_leader(self, owner: str) -> None:
+        await self.redis_client.eval(_RELEASE_LEADER_LUA, [self.LEADER_KEY], [owner])
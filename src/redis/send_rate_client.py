@@ -0,0 +1,76 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.redis import RedisClient
+
+
+# Token bucket по нескольким ключам: токен списывается из всех вёдер, только
+# если он есть в каждом. ARGV: now_ms, затем (rate в сек, burst) на каждый ключ.
+# Возвращает для каждого ключа, через сколько мс в нём появится токен
+# (все нули — токен списан).
+_TAKE_SEND_TOKEN_LUA = """
+local now = tonumber(ARGV[1])
+local ready = true
+local tokens = {}
+local waits = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2])
+    local burst = tonumber(ARGV[i * 2 + 1])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local value = tonumber(bucket[1]) or burst
+    local ts = tonumber(bucket[2]) or now
+    value = math.min(burst, value + math.max(0, now - ts) * rate / 1000)
+    tokens[i] = value
+    waits[i] = 0
+    if value < 1 then
+        waits[i] = math.ceil((1 - value) * 1000 / rate)
+        ready = false
+    end
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2])
+    local burst = tonumber(ARGV[i * 2 + 1])
+    local value = tokens[i]
+    if ready then
+        value = value - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(value), 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(burst * 1000 / rate) + 1000)
+end
+return waits
+"""
+
+
+class RedisSendRateClient:
+    """
+    Общие для всех экземпляров бота вёдра токенов исходящих сообщений.
+
+    Ключи:
+      - send_rate:global -> HASH tokens, ts (все отправки бота)
+      - send_rate:chat:{chat_id} -> HASH tokens, ts (отправки в чат)
+    Ведро истекает, когда успело бы наполниться целиком.
+    """
+
+    GLOBAL_KEY = "send_rate:global"
+
+    def __init__(self, redis_client: "RedisClient"):
+        self.redis_client = redis_client
+
+    async def take(
+        self,
+        chat_id: int,
+        now: float,
+        buckets: tuple[tuple[float, float], tuple[float, float]],
+    ) -> tuple[float, float]:
+        """
+        Списывает токен из глобального ведра и ведра чата одним EVAL.
+        buckets — (rate, burst) для них же. Возвращает (ожидание глобального,
+        ожидание чата) в секундах; (0, 0) — токен списан.
+        """
+        (global_rate, global_burst), (chat_rate, chat_burst) = buckets
+        global_wait_ms, chat_wait_ms = await self.redis_client.eval(
+            _TAKE_SEND_TOKEN_LUA,
+            [self.GLOBAL_KEY, f"send_rate:chat:{chat_id}"],
+            [int(now * 1000), global_rate, global_burst, chat_rate, chat_burst],
+        )
+        return int(global_wait_ms) / 1000, int(chat_wait_ms) / 1000
@@ -0,0 +1,71 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.redis import RedisClient
+
+
+# Token bucket по нескольким ключам: токен списывается из всех вёдер, только
+# если он есть в каждом. ARGV: now_ms, затем (rate в сек, burst) на каждый ключ.
+# Возвращает 0, если апдейт пропущен, иначе — через сколько мс появится токен.
+_TAKE_TOKEN_LUA = """
+local now = tonumber(ARGV[1])
+local wait = 0
+local tokens = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2])
+    local burst = tonumber(ARGV[i * 2 + 1])
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local value = tonumber(bucket[1]) or burst
+    local ts = tonumber(bucket[2]) or now
+    value = math.min(burst, value + math.max(0, now - ts) * rate / 1000)
+    tokens[i] = value
+    if value < 1 then
+        wait = math.max(wait, math.ceil((1 - value) * 1000 / rate))
+    end
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2])
+    local burst = tonumber(ARGV[i * 2 + 1])
+    local value = tokens[i]
+    if wait == 0 then
+        value = value - 1
+    end
+    redis.call('HSET', key, 'tokens', tostring(value), 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(burst * 1000 / rate) + 1000)
+end
+return wait
+"""
+
+
+class RedisThrottleClient:
+    """
+    Вёдра токенов для ограничения частоты апдейтов пользователя.
+
+    Ключи:
+      - throttle:{user_id} -> HASH tokens, ts (общее ведро пользователя)
+      - throttle:{user_id}:{route} -> HASH tokens, ts (ведро маршрута)
+    Ведро истекает, когда успело бы наполниться целиком.
+    """
+
+    def __init__(self, redis_client: "RedisClient"):
+        self.redis_client = redis_client
+
+    async def take(
+        self,
+        user_id: int,
+        route: str,
+        now: float,
+        buckets: tuple[tuple[float, int], tuple[float, int]],
+    ) -> float:
+        """
+        Списывает токен из общего ведра и ведра маршрута одним EVAL.
+        buckets — (rate, burst) для них же. Возвращает 0, если токен списан,
+        иначе — сколько секунд ждать следующего.
+        """
+        (user_rate, user_burst), (route_rate, route_burst) = buckets
+        wait_ms = await self.redis_client.eval(
+            _TAKE_TOKEN_LUA,
+            [f"throttle:{user_id}", f"throttle:{user_id}:{route}"],
+            [int(now * 1000), user_rate, user_burst, route_rate, route_burst],
+        )
+        return int(wait_ms) / 1000
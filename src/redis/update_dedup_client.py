@@ -0,0 +1,25 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.redis import RedisClient
+
+
+class RedisUpdateDedupClient:
+    """
+    Отметки обработанных апдейтов Telegram.
+
+    Ключи:
+      - update_seen:{bot_id}:{update_id} -> "1" (истекает через окно дедупликации)
+    """
+
+    def __init__(self, redis_client: "RedisClient"):
+        self.redis_client = redis_client
+
+    def _prefix(self, bot_id: int, update_id: int) -> str:
+        return f"update_seen:{bot_id}:{update_id}"
+
+    async def mark_seen(self, bot_id: int, update_id: int, *, ttl_seconds: int) -> bool:
+        """SET NX EX: True, если апдейт встречен впервые."""
+        return await self.redis_client.set_nx(
+            self._prefix(bot_id, update_id), "1", expire=ttl_seconds
+        )
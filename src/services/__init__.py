@@ -1,5 +1,22 @@
 from .admin_storage import AdminStorage
+from .answer_dedup import AnswerDedup, answer_dedup
+from .homework_cache import HomeworkCache, homework_cache, homework_card_cache
+from .identity_cache import IdentityCache, identity_cache
 from .role_storage import RoleStorage
+from .scheduler import HomeworkScheduler, homework_scheduler
 from .user_locks_storage import UserLocksStorage
 
-__all__ = ["AdminStorage", "RoleStorage", "UserLocksStorage"]
+__all__ = [
+    "AdminStorage",
+    "AnswerDedup",
+    "HomeworkCache",
+    "HomeworkScheduler",
+    "IdentityCache",
+    "RoleStorage",
+    "UserLocksStorage",
+    "answer_dedup",
+    "homework_cache",
+    "homework_card_cache",
+    "homework_scheduler",
+    "identity_cache",
+]
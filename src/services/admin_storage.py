@@ -1,3 +1,7 @@
+from functools import partial
+
+from src.core.metrics import cache_requests
+from src.core.singleflight import SingleFlight
 from src.db.repositories import AdminsRepository
 from src.redis import RedisAdminClient, RedisClient
 
@@ -7,16 +11,27 @@ class AdminStorage:
     Проверка admin-привилегии.
 
     - Источник истины: MySQL (таблица admins)
-    - Кэш: Redis
+    - Кэш: Redis (кэшируются только админы)
+    - Промахи по одному user_id при холодном кэше идут в БД одним запросом
+      (SingleFlight общий для всех экземпляров)
     """
 
+    _is_admin_flight: SingleFlight[bool] = SingleFlight("admin")
+
     def __init__(self, redis_client: RedisClient):
         self.redis_admin_client = RedisAdminClient(redis_client)
         self.admins_repo = AdminsRepository()
 
     async def is_admin(self, user_id: int) -> bool:
         if await self.redis_admin_client.is_admin(user_id):
+            cache_requests.inc("admin", "hit")
             return True
+        cache_requests.inc("admin", "miss")
+        return await self._is_admin_flight.do(
+            user_id, partial(self._load_is_admin, user_id)
+        )
+
+    async def _load_is_admin(self, user_id: int) -> bool:
         is_admin = await self.admins_repo.is_admin(user_id)
         if is_admin:
             await self.redis_admin_client.set_admin(user_id, True)
@@ -36,7 +51,9 @@ class AdminStorage:
         cached_ids = await self.redis_admin_client.get_all_cached_admin_ids()
 
         if cached_ids:
+            cache_requests.inc("admin_ids", "hit")
             return cached_ids
+        cache_requests.inc("admin_ids", "miss")
 
         # Если в кеше пусто, запрашиваем из БД
         admin_ids = await self.admins_repo.get_all_admin_ids()
@@ -0,0 +1,63 @@
+import hashlib
+from typing import Iterable, Optional
+
+from src.redis import RedisAnswerDedupClient, RedisClient, redis_cache_logger
+
+
+class AnswerDedup:
+    """
+    Короткоживущие ключи принятых ответов (student_id, homework_id, submission_key).
+
+    - Повтор отправки в течение TTL (двойное нажатие, повторная доставка
+      апдейта) отвечает уже созданным answer_id без обращения к MySQL
+    - Это быстрый путь: гарантию даёт уникальный индекс ux_answers_submission
+      (одновременные повторы, недоступный Redis), см. AssignmentsUseCase
+    - Ключ ставится после коммита ответа
+    """
+
+    # Двойное нажатие и повторная доставка укладываются в минуту
+    TTL = 60
+
+    def __init__(self) -> None:
+        self.dedup_client: Optional[RedisAnswerDedupClient] = None
+        self.logger = redis_cache_logger.get_class_logger(self)
+
+    def bind(self, redis_client: RedisClient) -> None:
+        self.dedup_client = RedisAnswerDedupClient(redis_client)
+
+    @staticmethod
+    def submission_key(
+        student_answer: Optional[str], unique_file_ids: Iterable[str] = ()
+    ) -> str:
+        """
+        Ключ идемпотентности отправки: sha256 текста ответа и unique_file_id
+        файлов (порядок файлов не важен), 64 символа hex.
+        """
+        digest = hashlib.sha256((student_answer or "").strip().encode())
+        for unique_file_id in sorted(unique_file_ids):
+            digest.update(b"\0" + unique_file_id.encode())
+        return digest.hexdigest()
+
+    async def get(
+        self, student_id: int, homework_id: int, submission_key: str
+    ) -> Optional[int]:
+        """answer_id недавно принятого ответа с тем же ключом."""
+        if self.dedup_client is None:
+            return None
+        try:
+            return await self.dedup_client.get(student_id, homework_id, submission_key)
+        except Exception as e:
+            self.logger.warning("Redis недоступен, повтор ответа не проверяется: %s", e)
+            return None
+
+    async def remember(
+        self, student_id: int, homework_id: int, submission_key: str, answer_id: int
+    ) -> None:
+        """Запоминает принятый ответ; вызывать после коммита."""
+        if self.dedup_client is not None:
+            await self.dedup_client.set(
+                student_id, homework_id, submission_key, answer_id, ttl_seconds=self.TTL
+            )
+
+
+answer_dedup = AnswerDedup()
@@ -0,0 +1,131 @@
+import time
+from functools import partial
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from src.core.metrics import cache_requests
+from src.core.schemas import HomeworkCardSchema, HomeworkSchema
+from src.core.singleflight import SingleFlight
+from src.redis import RedisClient, RedisHomeworkClient, redis_cache_logger
+
+T = TypeVar("T", bound=BaseModel)
+
+HomeworkLoader = Callable[[], Awaitable[Optional[T]]]
+
+
+class HomeworkCache(Generic[T]):
+    """
+    Read-through кэш данных задания по его версии.
+
+    - homework_cache: HomeworkSchema с teacher и teacher.user
+    - homework_card_cache: HomeworkCardSchema (карточка задания преподавателя)
+    - Источник истины: MySQL
+    - Кэш: Redis, ключ содержит версию; любое изменение задания
+      (заголовок, текст, файлы, группы, удаление) увеличивает версию,
+      у карточки — ещё и изменения ответов (счётчики)
+    - L1: память процесса на L1_TTL секунд; запись действительна, пока версия
+      в Redis не изменилась, поэтому повторное чтение стоит один GET и ноль SQL
+    - Промах загружается один раз на (задание, версию): одновременные
+      читатели ждут ту же загрузку (SingleFlight), а не идут в MySQL каждый
+    - Пока Redis не привязан (bind) или недоступен, читает из БД
+    """
+
+    REDIS_TTL = 60 * 60
+    L1_TTL = 60
+    L1_MAX_SIZE = 1024
+
+    def __init__(
+        self, schema: type[T] = HomeworkSchema, prefix: str = "homework"
+    ) -> None:
+        self.schema = schema
+        self.prefix = prefix
+        self.homework_client: Optional[RedisHomeworkClient] = None
+        # homework_id -> (версия, момент истечения, значение)
+        self._l1: dict[int, tuple[int, float, T]] = {}
+        self._flight: SingleFlight[Optional[T]] = SingleFlight(prefix)
+        self.logger = redis_cache_logger.get_class_logger(self)
+
+    def bind(self, redis_client: RedisClient) -> None:
+        self.homework_client = RedisHomeworkClient(redis_client, self.prefix)
+        self._l1.clear()
+
+    async def get_version(self, homework_id: int) -> int:
+        """Текущая версия задания (0 — задание ещё не менялось или Redis не привязан)."""
+        if self.homework_client is None:
+            return 0
+        return await self.homework_client.get_version(homework_id)
+
+    async def get(self, homework_id: int, loader: HomeworkLoader) -> Optional[T]:
+        if self.homework_client is None:
+            return await self._flight.do((homework_id, None), loader)
+
+        try:
+            version = await self.homework_client.get_version(homework_id)
+        except Exception as e:
+            self.logger.warning("Redis недоступен, читаем задание из БД: %s", e)
+            return await self._flight.do((homework_id, None), loader)
+
+        cached = self._l1.get(homework_id)
+        if cached and cached[0] == version and cached[1] > time.monotonic():
+            cache_requests.inc(f"{self.prefix}_l1", "hit")
+            return cached[2]
+        cache_requests.inc(f"{self.prefix}_l1", "miss")
+
+        return await self._flight.do(
+            (homework_id, version), partial(self._fill, homework_id, version, loader)
+        )
+
+    async def _fill(
+        self, homework_id: int, version: int, loader: HomeworkLoader
+    ) -> Optional[T]:
+        """Промах L1: Redis, затем БД; результат попадает в оба уровня."""
+        try:
+            payload = await self.homework_client.get_payload(homework_id, version)
+        except Exception as e:
+            self.logger.warning("Redis недоступен, читаем задание из БД: %s", e)
+            return await loader()
+        if payload is not None:
+            cache_requests.inc(self.prefix, "hit")
+            homework = self.schema.model_validate_json(payload)
+            self._remember(homework_id, version, homework)
+            return homework
+        cache_requests.inc(self.prefix, "miss")
+
+        homework = await loader()
+        if homework is not None:
+            try:
+                await self.homework_client.set_payload(
+                    homework_id,
+                    version,
+                    homework.model_dump_json(),
+                    ttl_seconds=self.REDIS_TTL,
+                )
+            except Exception as e:
+                self.logger.warning("Redis недоступен, задание не кэшируется: %s", e)
+                return homework
+            self._remember(homework_id, version, homework)
+        return homework
+
+    async def invalidate(self, homework_id: int) -> None:
+        """Увеличивает версию задания; вызывать после коммита изменений."""
+        self._l1.pop(homework_id, None)
+        if self.homework_client is None:
+            return
+        try:
+            await self.homework_client.bump_version(homework_id)
+        except Exception as e:
+            # Другие экземпляры увидят изменение после истечения кэша
+            self.logger.error(
+                "Redis недоступен, версия задания %s не увеличена: %s", homework_id, e
+            )
+
+    def _remember(self, homework_id: int, version: int, homework: T) -> None:
+        if len(self._l1) >= self.L1_MAX_SIZE and homework_id not in self._l1:
+            # Простая защита от роста: выбрасываем самую старую запись
+            self._l1.pop(next(iter(self._l1)))
+        self._l1[homework_id] = (version, time.monotonic() + self.L1_TTL, homework)
+
+
+homework_cache = HomeworkCache()
+homework_card_cache = HomeworkCache(HomeworkCardSchema, prefix="homework_card")
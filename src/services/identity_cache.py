@@ -0,0 +1,91 @@
+import time
+from typing import Awaitable, Callable, Iterable, Optional
+
+from src.core.metrics import cache_requests
+from src.core.schemas import UserIdentitySchema
+from src.redis import RedisClient, RedisIdentityClient, redis_cache_logger
+
+IdentityLoader = Callable[[], Awaitable[UserIdentitySchema]]
+
+
+class IdentityCache:
+    """
+    Identity map пользователя: user_id -> (teacher_id, student_id, group_id).
+
+    - Источник истины: MySQL (teachers, students)
+    - Кэш: Redis, ключ содержит версию (identity:{user_id}:v{version}), как в
+      HomeworkCache; создание преподавателя/студента, смена группы и удаление
+      группы увеличивают версию (invalidate)
+    - Кэшируется и «пустой» результат: после invalidate он больше не читается,
+      даже если загрузка шла одновременно с изменением
+    - L1: память процесса на L1_TTL секунд; запись действительна, пока версия
+      в Redis не изменилась, поэтому инвалидация видна всем процессам
+    - Пока Redis не привязан (bind), всегда читает из БД
+    """
+
+    REDIS_TTL = 60 * 60
+    L1_TTL = 30
+    L1_MAX_SIZE = 4096
+
+    def __init__(self) -> None:
+        self.identity_client: Optional[RedisIdentityClient] = None
+        # user_id -> (версия, момент истечения, identity)
+        self._l1: dict[int, tuple[int, float, UserIdentitySchema]] = {}
+        self.logger = redis_cache_logger.get_class_logger(self)
+
+    def bind(self, redis_client: RedisClient) -> None:
+        self.identity_client = RedisIdentityClient(redis_client)
+        self._l1.clear()
+
+    async def get(self, user_id: int, loader: IdentityLoader) -> UserIdentitySchema:
+        if self.identity_client is None:
+            return await loader()
+
+        try:
+            version = await self.identity_client.get_version(user_id)
+        except Exception as e:
+            self.logger.warning("Redis недоступен, читаем identity из БД: %s", e)
+            return await loader()
+
+        cached = self._l1.get(user_id)
+        if cached and cached[0] == version and cached[1] > time.monotonic():
+            cache_requests.inc("identity_l1", "hit")
+            return cached[2]
+        cache_requests.inc("identity_l1", "miss")
+
+        payload = await self.identity_client.get_payload(user_id, version)
+        if payload is not None:
+            cache_requests.inc("identity", "hit")
+            identity = UserIdentitySchema.model_validate_json(payload)
+        else:
+            cache_requests.inc("identity", "miss")
+            identity = await loader()
+            # Версия прочитана до загрузки: если запись успели изменить,
+            # значение ляжет под устаревшую версию и читаться не будет
+            await self.identity_client.set_payload(
+                user_id,
+                version,
+                identity.model_dump_json(),
+                ttl_seconds=self.REDIS_TTL,
+            )
+        self._remember(version, identity)
+        return identity
+
+    async def invalidate(self, user_ids: Iterable[int]) -> None:
+        """Увеличивает версии пользователей; вызывать после коммита изменений."""
+        for user_id in user_ids:
+            self._l1.pop(user_id, None)
+            if self.identity_client is not None:
+                await self.identity_client.bump_version(user_id)
+
+    def _remember(self, version: int, identity: UserIdentitySchema) -> None:
+        if len(self._l1) >= self.L1_MAX_SIZE and identity.user_id not in self._l1:
+            self._l1.pop(next(iter(self._l1)))
+        self._l1[identity.user_id] = (
+            version,
+            time.monotonic() + self.L1_TTL,
+            identity,
+        )
+
+
+identity_cache = IdentityCache()
@@ -0,0 +1,122 @@
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from src.core.enums import ScheduledTimerKindEnum
+from src.core.schemas import ScheduledTimerSchema
+from src.core.settings import settings
+from src.redis import RedisClient, RedisSchedulerClient, redis_cache_logger
+
+
+class HomeworkScheduler:
+    """
+    Планировщик таймеров по заданиям (отложенная публикация, напоминания о сроке).
+
+    - Таймеры хранятся в Redis ZSET (score — время срабатывания), MySQL по
+      расписанию не опрашивается: БД читается только при срабатывании таймера
+    - Таймеры ставятся после коммита создания задания и снимаются при удалении
+    - Срабатывания обрабатывает один экземпляр бота — лидер (src/jobs/scheduler.py);
+      таймер забирается ZREM, поэтому не выполняется дважды
+    - Пока Redis не привязан (bind), таймеры не ставятся
+    """
+
+    LEADER_TTL = 15
+
+    def __init__(self) -> None:
+        self.scheduler_client: Optional[RedisSchedulerClient] = None
+        self.logger = redis_cache_logger.get_class_logger(self)
+
+    def bind(self, redis_client: RedisClient) -> None:
+        self.scheduler_client = RedisSchedulerClient(redis_client)
+
+    @staticmethod
+    def homework_timers(
+        homework_id: int,
+        end_at: datetime,
+        start_at: Optional[datetime] = None,
+        now: Optional[datetime] = None,
+    ) -> dict[str, float]:
+        """
+        Таймеры задания: публикация в start_at (если она в будущем) и напоминания
+        за deadline_reminder_offsets_h часов до срока, но не раньше публикации.
+        """
+        now = now or datetime.now()
+        published_at = max(now, start_at) if start_at else now
+        timers = {}
+        if published_at > now:
+            publish = ScheduledTimerSchema(
+                kind=ScheduledTimerKindEnum.PUBLISH, homework_id=homework_id
+            )
+            timers[publish.member] = published_at.timestamp()
+        for hours in settings.deadline_reminder_offsets_h:
+            fire_at = end_at - timedelta(hours=hours)
+            if fire_at > published_at:
+                timer = ScheduledTimerSchema(
+                    kind=ScheduledTimerKindEnum.DEADLINE_REMINDER,
+                    homework_id=homework_id,
+                    param=hours,
+                )
+                timers[timer.member] = fire_at.timestamp()
+        return timers
+
+    async def schedule_homework(
+        self, homework_id: int, end_at: datetime, start_at: Optional[datetime] = None
+    ) -> None:
+        """Ставит (или переносит при смене сроков) таймеры задания."""
+        if self.scheduler_client is None:
+            return
+        await self.cancel_homework(homework_id)
+        await self.scheduler_client.schedule(
+            self.homework_timers(homework_id, end_at, start_at)
+        )
+
+    async def cancel_homework(self, homework_id: int) -> None:
+        if self.scheduler_client is None:
+            return
+        timers = [
+            ScheduledTimerSchema(
+                kind=ScheduledTimerKindEnum.PUBLISH, homework_id=homework_id
+            )
+        ] + [
+            ScheduledTimerSchema(
+                kind=ScheduledTimerKindEnum.DEADLINE_REMINDER,
+                homework_id=homework_id,
+                param=hours,
+            )
+            for hours in settings.deadline_reminder_offsets_h
+        ]
+        await self.scheduler_client.cancel(*(timer.member for timer in timers))
+
+    async def claim_due(self, limit: int = 100) -> list[ScheduledTimerSchema]:
+        """Сработавшие таймеры, забранные этим экземпляром."""
+        if self.scheduler_client is None:
+            return []
+        claimed = []
+        for member in await self.scheduler_client.due(time.time(), limit):
+            if not await self.scheduler_client.claim(member):
+                continue
+            try:
+                claimed.append(ScheduledTimerSchema.from_member(member))
+            except ValueError:
+                self.logger.warning("Некорректный таймер отброшен: %s", member)
+        return claimed
+
+    async def seconds_until_next(self) -> Optional[float]:
+        if self.scheduler_client is None:
+            return None
+        fire_at = await self.scheduler_client.next_fire_at()
+        return None if fire_at is None else max(0.0, fire_at - time.time())
+
+    async def acquire_leadership(self, owner: str) -> bool:
+        if self.scheduler_client is None:
+            return False
+        return await self.scheduler_client.acquire_leader(
+            owner, ttl_seconds=self.LEADER_TTL
+        )
+
+    async def release_leadership(self, owner: str) -> None:
+        if self.scheduler_client is not None:
+            await self.scheduler_client.release_leader(owner)
+
+
+homework_scheduler = HomeworkScheduler()
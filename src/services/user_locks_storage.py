@@ -1,3 +1,4 @@
+from src.core.metrics import cache_requests
 from src.db.repositories import UserLocksRepository
 from src.redis import RedisClient, RedisUserLocksClient
 
@@ -28,7 +29,9 @@ class UserLocksStorage:
         """
         # Проверяем в кеше
         if await self.redis_locks_client.is_banned(user_id):
+            cache_requests.inc("user_locks", "hit")
             return True
+        cache_requests.inc("user_locks", "miss")
 
         # Проверяем в БД
         is_banned = await self.locks_repo.is_banned(user_id)
@@ -52,7 +55,9 @@ class UserLocksStorage:
         # Сначала пытаемся получить из кеша
         reason = await self.redis_locks_client.get_ban_reason(user_id)
         if reason:
+            cache_requests.inc("user_lock_reason", "hit")
             return reason
+        cache_requests.inc("user_lock_reason", "miss")
 
         # Если в кеше нет, проверяем БД
         lock_data = await self.locks_repo.get_by_id(user_id)
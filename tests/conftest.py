@@ -3,12 +3,17 @@
 """
 
 import asyncio
-from typing import AsyncGenerator
+from contextlib import contextmanager
+from typing import Any, AsyncGenerator, Callable, Iterator, Optional
 
 import pytest
 import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from src.core.update_stats import UpdateStats, count_sql_statement, track_update_stats
 from src.db.models import Base
 
 
@@ -52,3 +57,181 @@ async def db_session(db_engine) -> AsyncGenerator[AsyncSession, None]:
 
     async with async_session() as session:
         yield session
+
+
+@pytest.fixture(scope="function")
+def query_budget(db_engine):
+    """
+    Проверка верхней границы обращений к SQL/Redis/Bot API внутри блока:
+
+        with query_budget(sql=3) as stats:
+            await AnswersService.get_answers_page_by_homework_id(...)
+    """
+    event.listen(db_engine.sync_engine, "before_cursor_execute", count_sql_statement)
+
+    @contextmanager
+    def _budget(
+        sql: Optional[int] = None,
+        redis: Optional[int] = None,
+        telegram: Optional[int] = None,
+    ) -> Iterator[UpdateStats]:
+        with track_update_stats() as stats:
+            yield stats
+        for name, limit in (("sql", sql), ("redis", redis), ("telegram", telegram)):
+            value = getattr(stats, name)
+            assert (
+                limit is None or value <= limit
+            ), f"{name}: {value} обращений при бюджете {limit}"
+
+    yield _budget
+
+    event.remove(db_engine.sync_engine, "before_cursor_execute", count_sql_statement)
+
+
+class FakeRedisClient:
+    """
+    In-memory замена RedisClient для модульных тестов кэшей, планировщика,
+    дедупликации и throttling.
+
+    - Строки: get/set/set_nx/incr/delete, сортированные множества: zadd/zrem/
+      zrangebyscore
+    - Lua-скрипты не исполняются: eval вызывает script_handler(script, keys,
+      args), каждый тест эмулирует свой скрипт; вызовы копятся в eval_calls
+    - fail=True — любая команда падает с ConnectionError (Redis недоступен)
+    """
+
+    def __init__(
+        self,
+        script_handler: Optional[Callable[[str, list, list], Any]] = None,
+        *,
+        fail: bool = False,
+    ) -> None:
+        self.data: dict[str, str] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.script_handler = script_handler
+        self.eval_calls: list[tuple[list, list]] = []
+        self.fail = fail
+
+    def _check(self) -> None:
+        if self.fail:
+            raise ConnectionError("redis down")
+
+    async def get(self, key, default=None):
+        self._check()
+        return self.data.get(key, default)
+
+    async def set(self, key, value, expire=None):
+        self._check()
+        self.data[key] = value
+
+    async def set_nx(self, key, value, expire):
+        self._check()
+        if key in self.data:
+            return False
+        self.data[key] = value
+        return True
+
+    async def incr(self, key):
+        self._check()
+        value = int(self.data.get(key, 0)) + 1
+        self.data[key] = str(value)
+        return value
+
+    async def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def zadd(self, key, mapping):
+        self._check()
+        self.zsets.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def zrem(self, key, *members):
+        self._check()
+        zset = self.zsets.get(key, {})
+        return sum(zset.pop(member, None) is not None for member in members)
+
+    async def zrangebyscore(
+        self, key, min_score, max_score, *, limit=None, withscores=False
+    ):
+        self._check()
+        low, high = float(min_score), float(max_score)
+        items = sorted(
+            (
+                (member, score)
+                for member, score in self.zsets.get(key, {}).items()
+                if low <= score <= high
+            ),
+            key=lambda item: item[1],
+        )[:limit]
+        return items if withscores else [member for member, _ in items]
+
+    async def eval(self, script, keys, args):
+        self._check()
+        self.eval_calls.append((keys, args))
+        return self.script_handler(script, keys, args)
+
+
+class CountingLoader:
+    """Загрузчик для read-through кэшей: возвращает value и считает вызовы."""
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self) -> Any:
+        self.calls += 1
+        return self.value
+
+
+@pytest.fixture
+def fake_redis() -> FakeRedisClient:
+    return FakeRedisClient()
+
+
+class FakeBotAPI:
+    """
+    Локальный сервер Bot API: запоминает вызовы (метод, поля формы) и
+    отвечает results[метод] (по умолчанию true; sendMessage — сообщением).
+    delays[метод] — задержка ответа в секундах.
+    """
+
+    def __init__(self) -> None:
+        self.url = ""
+        self.calls: list[tuple[str, dict[str, str]]] = []
+        self.results: dict[str, Any] = {
+            "getMe": {"id": 1, "is_bot": True, "first_name": "bot", "username": "bot"}
+        }
+        self.delays: dict[str, float] = {}
+        self.app = web.Application()
+        self.app.router.add_post("/bot{token}/{method}", self._handle)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        form = {key: str(value) for key, value in (await request.post()).items()}
+        self.calls.append((method, form))
+        await asyncio.sleep(self.delays.get(method, 0))
+        if method in self.results:
+            result = self.results[method]
+        elif method == "sendMessage":
+            result = {
+                "message_id": len(self.calls),
+                "date": 0,
+                "chat": {"id": int(form["chat_id"]), "type": "private"},
+                "text": form.get("text", ""),
+            }
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+
+@pytest_asyncio.fixture(scope="function")
+async def fake_bot_api() -> AsyncGenerator[FakeBotAPI, None]:
+    """Поднимает FakeBotAPI на свободном порту localhost."""
+    api = FakeBotAPI()
+    server = TestServer(api.app)
+    await server.start_server()
+    api.url = str(server.make_url("")).rstrip("/")
+    yield api
+    await server.close()
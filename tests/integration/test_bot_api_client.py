@@ -0,0 +1,69 @@
+"""
+Интеграционные тесты HTTP-клиента Bot API на локальном FakeBotAPI.
+"""
+
+import pytest
+from aiogram.exceptions import TelegramNetworkError
+
+from src.bot.api_client import create_bot_session, telegram_api_server
+from src.bot.bot import create_bot
+from src.core.metrics import telegram_latency
+
+
+def make_bot(fake_bot_api, **overrides):
+    return create_bot(
+        create_bot_session(api=telegram_api_server(fake_bot_api.url), **overrides)
+    )
+
+
+class TestBotAPIClient:
+    """Тесты пула соединений, таймаутов по методам и метрик."""
+
+    @pytest.mark.asyncio
+    async def test_requests_go_to_configured_server(self, fake_bot_api):
+        """Запросы идут на telegram_api_url, время пишется по методам."""
+        bot = make_bot(fake_bot_api)
+        before = telegram_latency.count("sendMessage")
+        try:
+            me = await bot.get_me()
+            message = await bot.send_message(chat_id=5, text="привет")
+        finally:
+            await bot.session.close()
+
+        assert me.username == "bot"
+        assert message.chat.id == 5
+        assert [method for method, _ in fake_bot_api.calls] == ["getMe", "sendMessage"]
+        assert fake_bot_api.calls[1][1]["parse_mode"] == "HTML"
+        assert telegram_latency.count("sendMessage") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_method_timeout(self, fake_bot_api):
+        """Таймаут метода короче общего таймаута сессии."""
+        fake_bot_api.delays["sendMessage"] = 0.5
+        bot = make_bot(fake_bot_api, method_timeouts={"sendMessage": 0.1})
+        try:
+            with pytest.raises(TelegramNetworkError):
+                await bot.send_message(chat_id=5, text="привет")
+            # Явный request_timeout вызова важнее таймаута метода
+            await bot.send_message(chat_id=5, text="привет", request_timeout=5)
+        finally:
+            await bot.session.close()
+
+    @pytest.mark.asyncio
+    async def test_connector_settings(self, fake_bot_api):
+        """Пул, кэш DNS и keep-alive применяются к коннектору aiohttp."""
+        bot = make_bot(fake_bot_api, pool_size=7, dns_ttl_s=60, keepalive_s=15)
+        try:
+            connector = (await bot.session.create_session()).connector
+            assert (connector.limit, connector.limit_per_host) == (7, 7)
+            assert connector.use_dns_cache
+        finally:
+            await bot.session.close()
+
+    def test_api_server(self):
+        """Без URL — api.telegram.org, с URL — собственный сервер."""
+        assert telegram_api_server(None).base.startswith("https://api.telegram.org")
+
+        local = telegram_api_server("http://bot-api:8081/", is_local=True)
+        assert local.api_url("T", "getMe") == "http://bot-api:8081/botT/getMe"
+        assert local.is_local
@@ -6,11 +6,14 @@ from datetime import datetime, timedelta
 
 import pytest
 
+from src.core.enums import AnswersStatusEnum
 from src.core.schemas import (
+    AnswerCreateSchema,
     GroupCreateSchema,
     HomeworkCreateSchema,
     StudentCreateSchema,
     TeacherCreateSchema,
+    TelegramFileCreateSchema,
     TelegramUserCreateSchema,
 )
 from src.db.repositories.answers import AnswersRepository
@@ -19,6 +22,18 @@ from src.db.repositories.homeworks import HomeworksRepository
 from src.db.repositories.students import StudentsRepository
 from src.db.repositories.teachers import TeachersRepository
 from src.db.repositories.telegram_users import TelegramUsersRepository
+from src.db.services.answers import AnswersService
+from src.db.services.homework_answer_stats import HomeworkAnswerStatsService
+from src.db.services.homework_cards import HomeworkCardView
+from src.db.services.homework_files import HomeworkFilesService
+from src.db.services.homework_groups import HomeworkGroupsService
+from src.db.services.homeworks import HomeworksService
+from src.db.services.students import StudentsService
+from src.db.services.telegram_files import TelegramFilesService
+from src.db.services.user_identities import UserIdentitiesService
+from src.db.use_cases.assignments import AssignmentsUseCase
+from src.services.answer_dedup import AnswerDedup
+from tests.conftest import FakeRedisClient
 
 
 class TestHomeworkWorkflow:
@@ -115,3 +130,777 @@ class TestHomeworkWorkflow:
         assert fetched.homework_id == homework_id
         assert fetched.title == "Задание 1"
         assert fetched.teacher_id == teacher_id
+
+
+class TestUserIdentities:
+    """Разрешение user_id в teacher_id / student_id / group_id."""
+
+    @pytest.mark.asyncio
+    async def test_identity_single_query(self, db_session, query_budget):
+        """Роли пользователя читаются одним запросом."""
+        users_repo = TelegramUsersRepository()
+        await users_repo.create(TelegramUserCreateSchema(user_id=1), session=db_session)
+        await users_repo.create(TelegramUserCreateSchema(user_id=2), session=db_session)
+        teacher_id = await TeachersRepository().create(
+            TeacherCreateSchema(user_id=1), session=db_session
+        )
+        group_id = await GroupsRepository().create(
+            GroupCreateSchema(name="Группа"), session=db_session
+        )
+        student_id = await StudentsRepository().create(
+            StudentCreateSchema(user_id=2, group_id=group_id), session=db_session
+        )
+
+        with query_budget(sql=1):
+            teacher = await UserIdentitiesService.get_by_user_id(1, session=db_session)
+        student = await UserIdentitiesService.get_by_user_id(2, session=db_session)
+        unknown = await UserIdentitiesService.get_by_user_id(3, session=db_session)
+
+        assert teacher.teacher_id == teacher_id and teacher.student_id is None
+        assert student.student_id == student_id and student.group_id == group_id
+        assert unknown.teacher_id is None and unknown.student_id is None
+
+    @pytest.mark.asyncio
+    async def test_set_group_registers_invalidation(self, db_session):
+        """Смена группы планирует сброс identity после коммита."""
+        await TelegramUsersRepository().create(
+            TelegramUserCreateSchema(user_id=2), session=db_session
+        )
+        await StudentsRepository().create(
+            StudentCreateSchema(user_id=2), session=db_session
+        )
+
+        await StudentsService.set_group_by_user_id(2, None, session=db_session)
+
+        assert db_session.info.get("after_commit_callbacks")
+
+
+async def _create_answer(db_session) -> tuple[int, int, int]:
+    """Преподаватель (user 1), чужой преподаватель (user 3), студент и его ответ."""
+    users_repo = TelegramUsersRepository()
+    for user_id in (1, 2, 3):
+        await users_repo.create(
+            TelegramUserCreateSchema(user_id=user_id), session=db_session
+        )
+    teacher_id = await TeachersRepository().create(
+        TeacherCreateSchema(user_id=1), session=db_session
+    )
+    await TeachersRepository().create(
+        TeacherCreateSchema(user_id=3), session=db_session
+    )
+    student_id = await StudentsRepository().create(
+        StudentCreateSchema(user_id=2), session=db_session
+    )
+    now = datetime.now()
+    homework_id = await HomeworksRepository().create(
+        HomeworkCreateSchema(
+            teacher_id=teacher_id,
+            title="Задание",
+            text="Текст",
+            end_at=now + timedelta(days=7),
+            created_at=now,
+        ),
+        session=db_session,
+    )
+    answer_id = await AnswersService.create(
+        AnswerCreateSchema(homework_id=homework_id, student_id=student_id, sent_at=now),
+        session=db_session,
+    )
+    return teacher_id, homework_id, answer_id
+
+
+class TestGrading:
+    """Оценивание ответа одним UPDATE с проверкой владельца."""
+
+    @pytest.mark.asyncio
+    async def test_grade_single_statement(self, db_session, query_budget):
+        """Успешное оценивание — UPDATE ответа и UPDATE счётчиков задания."""
+        teacher_id, _, answer_id = await _create_answer(db_session)
+
+        with query_budget(sql=2):
+            result = await AnswersService.grade_by_teacher(
+                answer_id,
+                teacher_id,
+                grade=90,
+                expected_status=AnswersStatusEnum.SENT,
+                session=db_session,
+            )
+
+        assert result.ok
+        answer = await AnswersService.get_by_id(answer_id, session=db_session)
+        assert answer.grade == 90
+        assert answer.status == AnswersStatusEnum.REVIEWED
+
+    @pytest.mark.asyncio
+    async def test_grade_errors(self, db_session):
+        """Чужое задание, несуществующий ответ и устаревшая версия различаются."""
+        teacher_id, _, answer_id = await _create_answer(db_session)
+
+        forbidden = await AnswersService.grade_by_teacher(
+            answer_id, teacher_id + 1, grade=50, session=db_session
+        )
+        not_found = await AnswersService.grade_by_teacher(
+            answer_id + 100, teacher_id, grade=50, session=db_session
+        )
+        first = await AnswersService.grade_by_teacher(
+            answer_id,
+            teacher_id,
+            grade=70,
+            expected_status=AnswersStatusEnum.SENT,
+            session=db_session,
+        )
+        second = await AnswersService.grade_by_teacher(
+            answer_id,
+            teacher_id,
+            grade=80,
+            expected_status=AnswersStatusEnum.SENT,
+            session=db_session,
+        )
+
+        assert forbidden.error_code == "forbidden"
+        assert not_found.error_code == "answer_not_found"
+        assert first.ok
+        assert second.error_code == "conflict"
+        answer = await AnswersService.get_by_id(answer_id, session=db_session)
+        assert answer.grade == 70
+
+
+class TestAnswerSubmission:
+    """Идемпотентная отправка ответов."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_submission_reuses_answer(self, db_session, monkeypatch):
+        """
+        Повтор ответа, ждущего проверки, возвращает уже созданный answer_id
+        по уникальному индексу (Redis недоступен); после оценки — новый ответ.
+        """
+        dedup = AnswerDedup()
+        dedup.bind(FakeRedisClient(fail=True))
+        monkeypatch.setattr("src.db.use_cases.assignments.answer_dedup", dedup)
+        _, homework_id, first_id = await _create_answer(db_session)
+        answer = AnswerCreateSchema(
+            homework_id=homework_id,
+            student_id=1,
+            student_answer="42",
+            sent_at=datetime.now(),
+        )
+
+        created = await AssignmentsUseCase.submit_answer(answer, session=db_session)
+        repeated = await AssignmentsUseCase.submit_answer(
+            answer.model_copy(update={"student_answer": " 42 "}), session=db_session
+        )
+        other = await AssignmentsUseCase.submit_answer(
+            answer.model_copy(update={"student_answer": "43"}), session=db_session
+        )
+        # Оценка снимает ключ: тот же ответ можно отправить снова
+        assert await AnswersService.grade(created, grade=5, session=db_session)
+        resubmitted = await AssignmentsUseCase.submit_answer(answer, session=db_session)
+
+        assert created == repeated
+        assert len({first_id, created, other, resubmitted}) == 4
+        stats = await HomeworkAnswerStatsService.get_by_homework_id(
+            homework_id, session=db_session
+        )
+        assert stats.answers_count == 4
+
+    @pytest.mark.asyncio
+    async def test_recent_duplicate_skips_database(
+        self, db_session, query_budget, monkeypatch
+    ):
+        """Недавний повтор отсекается ключом в Redis без SQL."""
+        dedup = AnswerDedup()
+        dedup.bind(FakeRedisClient())
+        monkeypatch.setattr("src.db.use_cases.assignments.answer_dedup", dedup)
+        key = AnswerDedup.submission_key("42", ["b", "a"])
+        assert key == AnswerDedup.submission_key("42", ["a", "b"])
+        await dedup.remember(1, 7, key, 100)
+
+        with query_budget(sql=0):
+            answer_id = await AssignmentsUseCase.submit_answer(
+                AnswerCreateSchema(
+                    homework_id=7,
+                    student_id=1,
+                    student_answer="42",
+                    sent_at=datetime.now(),
+                ),
+                telegram_files=[_telegram_file("a"), _telegram_file("b")],
+                session=db_session,
+            )
+
+        assert answer_id == 100
+
+
+class TestAnswerStats:
+    """Счётчики ответов меняются вместе с ответами и сверяются с answers."""
+
+    @pytest.mark.asyncio
+    async def test_counters_follow_answers(self, db_session):
+        """Создание, оценивание и удаление ответа двигают счётчики."""
+        teacher_id, homework_id, answer_id = await _create_answer(db_session)
+
+        created = await HomeworkAnswerStatsService.get_by_homework_id(
+            homework_id, session=db_session
+        )
+        await AnswersService.grade_by_teacher(
+            answer_id,
+            teacher_id,
+            grade=100,
+            status=AnswersStatusEnum.ACCEPTED,
+            session=db_session,
+        )
+        graded = await HomeworkAnswerStatsService.get_by_homework_id(
+            homework_id, session=db_session
+        )
+        await AnswersService.delete_by_id(answer_id, session=db_session)
+        deleted = await HomeworkAnswerStatsService.get_by_homework_id(
+            homework_id, session=db_session
+        )
+
+        assert (created.answers_count, created.sent_count) == (1, 1)
+        assert (graded.sent_count, graded.accepted_count) == (0, 1)
+        assert (deleted.answers_count, deleted.accepted_count) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_reconcile_fixes_drift(self, db_session):
+        """reconcile пересчитывает счётчики из answers и не трогает верные."""
+        _, homework_id, _ = await _create_answer(db_session)
+        await HomeworkAnswerStatsService.increment(
+            homework_id, AnswersStatusEnum.REJECTED, session=db_session
+        )
+
+        fixed = await HomeworkAnswerStatsService.reconcile(session=db_session)
+        again = await HomeworkAnswerStatsService.reconcile(session=db_session)
+        stats = await HomeworkAnswerStatsService.get_by_homework_ids(
+            [homework_id, homework_id + 100], session=db_session
+        )
+
+        assert (fixed, again) == (1, 0)
+        assert stats[homework_id].answers_count == 1
+        assert stats[homework_id].rejected_count == 0
+        assert stats[homework_id + 100].answers_count == 0
+
+
+class TestReviewQueue:
+    """Общая очередь проверки: FIFO по sent_at, keyset и аренда ответов."""
+
+    async def _fill_queue(self, db_session) -> tuple[int, int, list[int]]:
+        """Ответы на два задания преподавателя и одно — чужого преподавателя."""
+        teacher_id, homework_id, first_answer = await _create_answer(db_session)
+        now = datetime.now()
+        other_homework = await HomeworksRepository().create(
+            HomeworkCreateSchema(
+                teacher_id=teacher_id,
+                title="Второе",
+                text="Текст",
+                end_at=now + timedelta(days=7),
+                created_at=now,
+            ),
+            session=db_session,
+        )
+        foreign_homework = await HomeworksRepository().create(
+            HomeworkCreateSchema(
+                teacher_id=teacher_id + 1,
+                title="Чужое",
+                text="Текст",
+                end_at=now + timedelta(days=7),
+                created_at=now,
+            ),
+            session=db_session,
+        )
+        answers = []
+        for user_id, homework, minutes in (
+            (4, other_homework, 30),
+            (5, homework_id, 20),
+            (6, foreign_homework, 40),
+        ):
+            await TelegramUsersRepository().create(
+                TelegramUserCreateSchema(user_id=user_id), session=db_session
+            )
+            student_id = await StudentsRepository().create(
+                StudentCreateSchema(user_id=user_id), session=db_session
+            )
+            answers.append(
+                await AnswersService.create(
+                    AnswerCreateSchema(
+                        homework_id=homework,
+                        student_id=student_id,
+                        sent_at=now - timedelta(minutes=minutes),
+                    ),
+                    session=db_session,
+                )
+            )
+        # FIFO: 30 мин назад, 20 мин назад, затем ответ из _create_answer
+        return teacher_id, teacher_id + 1, [answers[0], answers[1], first_answer]
+
+    @pytest.mark.asyncio
+    async def test_fifo_keyset(self, db_session):
+        teacher_id, _, expected = await self._fill_queue(db_session)
+
+        first = await AnswersService.get_review_queue_page(
+            teacher_id, limit=2, session=db_session
+        )
+        rest = await AnswersService.get_review_queue_page(
+            teacher_id,
+            after=(first[-1].sent_at, first[-1].answer_id),
+            session=db_session,
+        )
+
+        assert [a.answer_id for a in first + rest] == expected
+
+    @pytest.mark.asyncio
+    async def test_claims_do_not_collide(self, db_session):
+        """Два проверяющих получают разные ответы; оценка снимает аренду."""
+        teacher_id, co_teacher_id, expected = await self._fill_queue(db_session)
+
+        mine = await AnswersService.claim_next_for_review(
+            teacher_id, session=db_session
+        )
+        theirs = await AnswersService.claim_next_for_review(
+            teacher_id, reviewer_id=co_teacher_id, session=db_session
+        )
+        again = await AnswersService.claim_next_for_review(
+            teacher_id, session=db_session
+        )
+        visible = await AnswersService.get_review_queue_page(
+            teacher_id, reviewer_id=co_teacher_id, session=db_session
+        )
+
+        assert (mine.answer_id, theirs.answer_id) == tuple(expected[:2])
+        assert mine.claimed_by == teacher_id
+        # Повторный claim продлевает свою аренду, а не берёт новый ответ
+        assert again.answer_id == mine.answer_id
+        assert [a.answer_id for a in visible] == expected[1:]
+
+        await AnswersService.grade(
+            theirs.answer_id, grade=90, reviewer_id=co_teacher_id, session=db_session
+        )
+        released = await AnswersService.release_claim(
+            mine.answer_id, teacher_id, session=db_session
+        )
+        visible = await AnswersService.get_review_queue_page(
+            teacher_id, reviewer_id=co_teacher_id, session=db_session
+        )
+
+        assert released
+        assert [a.answer_id for a in visible] == [expected[0], expected[2]]
+
+    @pytest.mark.asyncio
+    async def test_claimed_answer_not_graded_by_others(self, db_session):
+        """Ответ с действующей арендой другого проверяющего не оценивается."""
+        teacher_id, co_teacher_id, expected = await self._fill_queue(db_session)
+        theirs = await AnswersService.claim_next_for_review(
+            teacher_id, reviewer_id=co_teacher_id, session=db_session
+        )
+
+        result = await AnswersService.grade_by_teacher(
+            theirs.answer_id, teacher_id, grade=90, session=db_session
+        )
+        graded = await AnswersService.grade(
+            theirs.answer_id, grade=90, reviewer_id=teacher_id, session=db_session
+        )
+        assert (result.ok, result.error_code) == (False, "claimed")
+        assert not graded
+        answer = await AnswersService.get_by_id(theirs.answer_id, session=db_session)
+        assert answer.status == AnswersStatusEnum.SENT
+
+        # Истёкшая аренда не мешает оцениванию
+        await AnswersService.claim_next_for_review(
+            teacher_id, reviewer_id=co_teacher_id, lease_s=-1, session=db_session
+        )
+        result = await AnswersService.grade_by_teacher(
+            theirs.answer_id, teacher_id, grade=90, session=db_session
+        )
+        assert result.ok
+
+
+class TestDeadlineReminders:
+    """Получатели напоминаний: студенты групп задания без ответа."""
+
+    @pytest.mark.asyncio
+    async def test_pending_recipients(self, db_session):
+        """Ответившие исключаются, пачки читаются по student_id (keyset)."""
+        _, homework_id, _ = await _create_answer(db_session)
+        group_id = await GroupsRepository().create(
+            GroupCreateSchema(name="Группа"), session=db_session
+        )
+        await StudentsService.set_group_by_user_id(2, group_id, session=db_session)
+        for user_id in (4, 5):
+            await TelegramUsersRepository().create(
+                TelegramUserCreateSchema(user_id=user_id), session=db_session
+            )
+            await StudentsRepository().create(
+                StudentCreateSchema(user_id=user_id, group_id=group_id),
+                session=db_session,
+            )
+        await HomeworkGroupsService.set_groups_for_homework(
+            homework_id=homework_id, group_ids=[group_id], session=db_session
+        )
+
+        first = await HomeworksService.get_pending_recipients(
+            homework_id, limit=1, session=db_session
+        )
+        rest = await HomeworksService.get_pending_recipients(
+            homework_id, after_student_id=first[-1][0], session=db_session
+        )
+
+        # user 2 уже ответил (_create_answer)
+        assert [user_id for _, user_id in first + rest] == [4, 5]
+
+
+class TestDeferredPublication:
+    """Задания с будущим start_at не видны студентам до публикации."""
+
+    @pytest.mark.asyncio
+    async def test_student_pages_hide_scheduled(self, db_session):
+        teacher_id, published_id, _ = await _create_answer(db_session)
+        now = datetime.now()
+        scheduled_id = await HomeworksRepository().create(
+            HomeworkCreateSchema(
+                teacher_id=teacher_id,
+                title="Отложенное",
+                text="Текст",
+                start_at=now + timedelta(hours=2),
+                end_at=now + timedelta(days=7),
+                created_at=now,
+            ),
+            session=db_session,
+        )
+        group_id = await GroupsRepository().create(
+            GroupCreateSchema(name="Группа"), session=db_session
+        )
+        student_id = await StudentsRepository().create(
+            StudentCreateSchema(user_id=4, group_id=group_id), session=db_session
+        )
+        for homework_id in (published_id, scheduled_id):
+            await HomeworkGroupsService.set_groups_for_homework(
+                homework_id=homework_id, group_ids=[group_id], session=db_session
+            )
+
+        page = await HomeworksService.get_homeworks_page_by_group_id(
+            group_id, per_page=10, session=db_session
+        )
+        pending = await HomeworksService.get_pending_homeworks_page_for_student(
+            group_id=group_id, student_id=student_id, per_page=10, session=db_session
+        )
+
+        assert [h.homework_id for h in page.items] == [published_id]
+        assert page.total_items == 1
+        assert [h.homework_id for h in pending.items] == [published_id]
+        assert pending.total_items == 1
+
+    @pytest.mark.asyncio
+    async def test_mark_sent(self, db_session):
+        """Отправленные группы не попадают в повторную рассылку."""
+        _, homework_id, _ = await _create_answer(db_session)
+        group_ids = [
+            await GroupsRepository().create(
+                GroupCreateSchema(name=name), session=db_session
+            )
+            for name in ("А", "Б")
+        ]
+        await HomeworkGroupsService.set_groups_for_homework(
+            homework_id=homework_id, group_ids=group_ids, session=db_session
+        )
+
+        await HomeworkGroupsService.mark_sent(
+            homework_id, group_ids[:1], datetime.now(), session=db_session
+        )
+
+        unsent = await HomeworkGroupsService.get_unsent_group_ids(
+            homework_id, session=db_session
+        )
+        assert unsent == group_ids[1:]
+
+    @pytest.mark.asyncio
+    async def test_claim_unsent_once(self, db_session):
+        """Рассылку группе забирает только первый из конкурирующих вызовов."""
+        _, homework_id, _ = await _create_answer(db_session)
+        group_id = await GroupsRepository().create(
+            GroupCreateSchema(name="Группа"), session=db_session
+        )
+        await HomeworkGroupsService.set_groups_for_homework(
+            homework_id=homework_id, group_ids=[group_id], session=db_session
+        )
+
+        claims = [
+            await HomeworkGroupsService.claim_unsent(
+                homework_id, group_id, datetime.now(), session=db_session
+            )
+            for _ in range(2)
+        ]
+
+        assert claims == [True, False]
+        assert (
+            await HomeworkGroupsService.get_unsent_group_ids(
+                homework_id, session=db_session
+            )
+            == []
+        )
+
+    @pytest.mark.asyncio
+    async def test_due_unsent_homeworks(self, db_session):
+        """Досылка находит только задания с наступившим start_at без рассылки."""
+        teacher_id, _, _ = await _create_answer(db_session)
+        now = datetime.now()
+        group_id = await GroupsRepository().create(
+            GroupCreateSchema(name="Группа"), session=db_session
+        )
+        homework_ids = []
+        for start_at in (now - timedelta(minutes=5), now + timedelta(hours=2)):
+            homework_id = await HomeworksRepository().create(
+                HomeworkCreateSchema(
+                    teacher_id=teacher_id,
+                    title="Отложенное",
+                    text="Текст",
+                    start_at=start_at,
+                    end_at=now + timedelta(days=7),
+                    created_at=now,
+                ),
+                session=db_session,
+            )
+            await HomeworkGroupsService.set_groups_for_homework(
+                homework_id=homework_id, group_ids=[group_id], session=db_session
+            )
+            homework_ids.append(homework_id)
+        due_id, scheduled_id = homework_ids
+
+        due = await HomeworkGroupsService.get_due_unsent_homework_ids(
+            now, session=db_session
+        )
+        assert due_id in due
+        assert scheduled_id not in due
+
+        await HomeworkGroupsService.mark_sent(
+            due_id, [group_id], now, session=db_session
+        )
+        assert due_id not in await HomeworkGroupsService.get_due_unsent_homework_ids(
+            now, session=db_session
+        )
+
+    @pytest.mark.asyncio
+    async def test_set_groups_keeps_unchanged_links(self, db_session):
+        """Пересохранение групп меняет только разницу и сохраняет sent_at."""
+        _, homework_id, _ = await _create_answer(db_session)
+        a, b, c = [
+            await GroupsRepository().create(
+                GroupCreateSchema(name=name), session=db_session
+            )
+            for name in ("А", "Б", "В")
+        ]
+        await HomeworkGroupsService.set_groups_for_homework(
+            homework_id=homework_id, group_ids=[a, b], session=db_session
+        )
+        await HomeworkGroupsService.mark_sent(
+            homework_id, [a, b], datetime.now(), session=db_session
+        )
+
+        added = await HomeworkGroupsService.set_groups_for_homework(
+            homework_id=homework_id, group_ids=[c, a, a], session=db_session
+        )
+        unchanged = await HomeworkGroupsService.set_groups_for_homework(
+            homework_id=homework_id, group_ids=[a, c], session=db_session
+        )
+
+        groups = await HomeworkGroupsService.get_groups_by_homework_id(
+            homework_id, session=db_session
+        )
+        unsent = await HomeworkGroupsService.get_unsent_group_ids(
+            homework_id, session=db_session
+        )
+        assert (added, unchanged) == ([c], [])
+        assert [g.group_id for g in groups] == [a, c]
+        assert unsent == [c]
+
+
+def _telegram_file(unique_file_id: str, file_id: str = "f") -> TelegramFileCreateSchema:
+    return TelegramFileCreateSchema(
+        file_id=file_id,
+        unique_file_id=unique_file_id,
+        file_type="document",
+        owner_user_id=1,
+    )
+
+
+class TestTelegramFiles:
+    """Реестр файлов: один файл — одна строка, ссылки считаются в ref_count."""
+
+    @pytest.mark.asyncio
+    async def test_reuse_and_ref_count(self, db_session):
+        """Повторное прикрепление переиспользует строку и обновляет file_id."""
+        teacher_id, first_id, _ = await _create_answer(db_session)
+        second_id = await HomeworksRepository().create(
+            HomeworkCreateSchema(
+                teacher_id=teacher_id,
+                title="Второе",
+                text="Текст",
+                end_at=datetime.now() + timedelta(days=7),
+                created_at=datetime.now(),
+            ),
+            session=db_session,
+        )
+        await HomeworkFilesService.attach_telegram_files(
+            homework_id=first_id,
+            telegram_files=[_telegram_file("pdf", "old")],
+            session=db_session,
+        )
+        await HomeworkFilesService.attach_telegram_files(
+            homework_id=second_id,
+            telegram_files=[_telegram_file("pdf", "new"), _telegram_file("png")],
+            session=db_session,
+        )
+
+        first = await HomeworkFilesService.get_files_by_homework_id(
+            first_id, session=db_session
+        )
+        second = await HomeworkFilesService.get_files_by_homework_id(
+            second_id, session=db_session
+        )
+        shared = first[0].telegram_file
+        assert shared.telegram_file_id == second[0].telegram_file_id
+        assert (shared.file_id, shared.ref_count) == ("new", 2)
+
+        await HomeworkFilesService.delete_by_homework_id(second_id, session=db_session)
+        shared = await TelegramFilesService.get_by_id(
+            shared.telegram_file_id, session=db_session
+        )
+        assert shared.ref_count == 1
+
+    @pytest.mark.asyncio
+    async def test_set_files_applies_delta(self, db_session):
+        """Пересохранение файлов трогает только добавленные и удалённые связи."""
+        _, homework_id, _ = await _create_answer(db_session)
+        await HomeworkFilesService.attach_telegram_files(
+            homework_id=homework_id,
+            telegram_files=[_telegram_file("kept"), _telegram_file("gone")],
+            session=db_session,
+        )
+        before = await HomeworkFilesService.get_files_by_homework_id(
+            homework_id, session=db_session
+        )
+
+        added, removed = await HomeworkFilesService.set_files_for_homework(
+            homework_id=homework_id,
+            telegram_files=[
+                _telegram_file("new"),
+                _telegram_file("kept", "kept-new"),
+                _telegram_file("new"),
+            ],
+            session=db_session,
+        )
+
+        after = await HomeworkFilesService.get_files_by_homework_id(
+            homework_id, session=db_session
+        )
+        kept, new = after
+        assert kept.homeworks_file_id == before[0].homeworks_file_id
+        assert kept.telegram_file.file_id == "kept-new"
+        assert kept.telegram_file.ref_count == 1
+        assert added == [new.telegram_file_id]
+        assert new.telegram_file.ref_count == 1
+        gone = await TelegramFilesService.get_by_id(removed[0], session=db_session)
+        assert gone.ref_count == 0
+
+    @pytest.mark.asyncio
+    async def test_collect_garbage(self, db_session):
+        """Файлы без ссылок удаляются, расхождения ref_count исправляются."""
+        _, homework_id, _ = await _create_answer(db_session)
+        await HomeworkFilesService.attach_telegram_files(
+            homework_id=homework_id,
+            telegram_files=[_telegram_file("kept")],
+            session=db_session,
+        )
+        orphan_id = await TelegramFilesService.upsert(
+            _telegram_file("orphan"), session=db_session
+        )
+        kept_id = await TelegramFilesService.upsert(
+            _telegram_file("kept"), session=db_session
+        )
+        await TelegramFilesService.add_refs([kept_id], 5, session=db_session)
+
+        fresh = await TelegramFilesService.collect_garbage(session=db_session)
+        deleted = await TelegramFilesService.collect_garbage(
+            batch_size=1, grace_s=-60, session=db_session
+        )
+
+        assert (fresh, deleted) == (0, 1)
+        orphan = await TelegramFilesService.get_by_id(orphan_id, session=db_session)
+        assert orphan is None
+        kept = await TelegramFilesService.get_by_id(kept_id, session=db_session)
+        assert kept.ref_count == 1
+
+
+class TestQueryBudgets:
+    """Верхние границы числа SQL-запросов на типовых экранах."""
+
+    @pytest.mark.asyncio
+    async def test_grading_page_render(self, db_session, query_budget):
+        """Страница проверки ответов: не больше 3 запросов."""
+        users_repo = TelegramUsersRepository()
+        teacher_user_id = await users_repo.create(
+            TelegramUserCreateSchema(user_id=1, username="teacher"), session=db_session
+        )
+        teacher_id = await TeachersRepository().create(
+            TeacherCreateSchema(user_id=teacher_user_id), session=db_session
+        )
+        now = datetime.now()
+        homework_id = await HomeworksRepository().create(
+            HomeworkCreateSchema(
+                teacher_id=teacher_id,
+                title="Задание",
+                text="Текст",
+                end_at=now + timedelta(days=7),
+                created_at=now,
+            ),
+            session=db_session,
+        )
+
+        with query_budget(sql=3) as stats:
+            await AnswersService.get_answers_page_by_homework_id(
+                homework_id, status=AnswersStatusEnum.SENT, session=db_session
+            )
+
+        assert stats.sql > 0
+
+    @pytest.mark.asyncio
+    async def test_homework_card_single_statement(self, db_session, query_budget):
+        """Карточка задания (группы и счётчики) и страница карточек — один запрос."""
+        teacher_id, homework_id, _ = await _create_answer(db_session)
+        groups_repo = GroupsRepository()
+        group_ids = [
+            await groups_repo.create(GroupCreateSchema(name=name), session=db_session)
+            for name in ("ИС-22", "ИС-21")
+        ]
+        await HomeworkGroupsService.set_groups_for_homework(
+            homework_id=homework_id, group_ids=group_ids, session=db_session
+        )
+
+        with query_budget(sql=1):
+            card = await HomeworkCardView.get(homework_id, session=db_session)
+        with query_budget(sql=1):
+            page = await HomeworkCardView.get_page_by_teacher_id(
+                teacher_id, page=1, session=db_session
+            )
+
+        assert card.homework.title == "Задание"
+        assert card.group_names == ["ИС-21", "ИС-22"]
+        assert card.stats.answers_count == 1
+        assert card.stats.count(AnswersStatusEnum.SENT) == 1
+        assert page.items == [card]
+        assert (page.page, page.total_pages) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_homework_card_page_out_of_range(self, db_session):
+        """Страница за концом списка сдвигается на последнюю."""
+        teacher_id, homework_id, _ = await _create_answer(db_session)
+
+        page = await HomeworkCardView.get_page_by_teacher_id(
+            teacher_id, page=5, session=db_session
+        )
+        empty = await HomeworkCardView.get_page_by_teacher_id(
+            teacher_id + 1, page=3, session=db_session
+        )
+
+        assert page.page == 1
+        assert [card.homework.homework_id for card in page.items] == [homework_id]
+        assert page.items[0].stats.answers_count == 1
+        assert (empty.page, empty.items, empty.total_items) == (1, [], 0)
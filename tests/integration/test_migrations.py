@@ -0,0 +1,73 @@
+"""
+Интеграционные тесты применения миграций и проверки расхождений схемы.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from src.db.migrations import apply_migrations, check_schema_drift, pending_migrations
+
+
+def write_migration(directory, name: str, sql: str) -> None:
+    (directory / name).write_text(sql, encoding="utf-8")
+
+
+class TestApplyMigrations:
+    """Тесты журнала миграций."""
+
+    @pytest.mark.asyncio
+    async def test_apply_once(self, db_engine, tmp_path):
+        """Миграция применяется один раз и попадает в журнал."""
+        write_migration(
+            tmp_path,
+            "0001_notes.sql",
+            "CREATE TABLE notes (note_id INTEGER PRIMARY KEY, body TEXT);\n"
+            "CREATE INDEX ix_notes_body ON notes (body);\n",
+        )
+
+        first = await apply_migrations(db_engine, tmp_path)
+        second = await apply_migrations(db_engine, tmp_path)
+
+        assert [m.version for m in first] == ["0001"]
+        assert second == []
+        async with db_engine.connect() as conn:
+            checksum = await conn.scalar(
+                text("SELECT checksum FROM schema_migrations WHERE version = '0001'")
+            )
+        assert checksum == first[0].checksum
+
+    @pytest.mark.asyncio
+    async def test_target_and_changed_checksum(self, db_engine, tmp_path):
+        """target ограничивает применение, изменённый файл — ошибка."""
+        write_migration(tmp_path, "0001_a.sql", "CREATE TABLE a (id INTEGER);\n")
+        write_migration(tmp_path, "0002_b.sql", "CREATE TABLE b (id INTEGER);\n")
+
+        applied = await apply_migrations(db_engine, tmp_path, target="0001")
+        pending = await pending_migrations(db_engine, tmp_path)
+        write_migration(tmp_path, "0001_a.sql", "CREATE TABLE a (id BIGINT);\n")
+
+        assert [m.version for m in applied] == ["0001"]
+        assert [m.version for m in pending] == ["0002"]
+        with pytest.raises(RuntimeError):
+            await apply_migrations(db_engine, tmp_path)
+
+
+class TestSchemaDrift:
+    """Тесты сравнения моделей с живой схемой."""
+
+    @pytest.mark.asyncio
+    async def test_no_drift_after_create_all(self, db_engine):
+        """Схема, созданная из моделей, не даёт расхождений."""
+        drift = await check_schema_drift(db_engine)
+
+        assert drift.ok, drift.lines()
+
+    @pytest.mark.asyncio
+    async def test_missing_index_reported(self, db_engine):
+        """Удалённый индекс модели попадает в отчёт."""
+        async with db_engine.begin() as conn:
+            await conn.execute(text("DROP INDEX ix_answers_student_sent"))
+
+        drift = await check_schema_drift(db_engine)
+
+        assert drift.missing_indexes == ["answers(student_id, sent_at, answer_id)"]
@@ -0,0 +1,158 @@
+"""
+Модульные тесты read-through кэша заданий.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.schemas import (
+    HomeworkAnswerStatsSchema,
+    HomeworkCardSchema,
+    HomeworkSchema,
+)
+from src.services.homework_cache import HomeworkCache
+from tests.conftest import CountingLoader, FakeRedisClient
+
+
+def make_homework(title: str = "Задание") -> HomeworkSchema:
+    return HomeworkSchema(
+        homework_id=1,
+        teacher_id=1,
+        title=title,
+        text="Текст",
+        end_at=datetime.now() + timedelta(days=1),
+    )
+
+
+@pytest.fixture
+def cache(fake_redis):
+    cache = HomeworkCache()
+    cache.bind(fake_redis)
+    return cache
+
+
+class TestHomeworkCache:
+    """Тесты чтения, L1 и инвалидации по версии."""
+
+    @pytest.mark.asyncio
+    async def test_read_through(self, cache):
+        """Первое чтение идёт в загрузчик, повторное — из кэша."""
+        loader = CountingLoader(make_homework())
+
+        first = await cache.get(1, loader)
+        second = await cache.get(1, loader)
+
+        assert loader.calls == 1
+        assert first == second
+
+    @pytest.mark.asyncio
+    async def test_redis_payload_used_without_l1(self, cache):
+        """При пустом L1 (другой процесс) задание берётся из Redis."""
+        loader = CountingLoader(make_homework())
+        await cache.get(1, loader)
+
+        cache._l1.clear()
+        homework = await cache.get(1, loader)
+
+        assert loader.calls == 1
+        assert homework.title == "Задание"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_bumps_version(self, cache):
+        """После инвалидации читается новая версия задания."""
+        loader = CountingLoader(make_homework())
+        await cache.get(1, loader)
+
+        loader.value = make_homework("Новое название")
+        await cache.invalidate(1)
+        homework = await cache.get(1, loader)
+
+        assert loader.calls == 2
+        assert homework.title == "Новое название"
+        assert await cache.get_version(1) == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_l1_ignored_after_foreign_bump(self, cache):
+        """Запись L1 не используется, если версию увеличил другой процесс."""
+        loader = CountingLoader(make_homework())
+        await cache.get(1, loader)
+
+        await cache.homework_client.bump_version(1)
+        await cache.get(1, loader)
+
+        assert loader.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_load_once(self, cache):
+        """Одновременные промахи по одному заданию — один вызов загрузчика."""
+        loader = CountingLoader(make_homework())
+
+        results = await asyncio.gather(*(cache.get(1, loader) for _ in range(5)))
+
+        assert loader.calls == 1
+        assert len(set(map(id, results))) == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_homework_not_cached(self, cache):
+        """Отсутствующее задание не кэшируется."""
+        loader = CountingLoader(None)
+
+        assert await cache.get(1, loader) is None
+        assert await cache.get(1, loader) is None
+        assert loader.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_unbound_cache_reads_loader(self):
+        """Без Redis кэш прозрачно читает из загрузчика."""
+        cache = HomeworkCache()
+        loader = CountingLoader(make_homework())
+
+        await cache.get(1, loader)
+        await cache.get(1, loader)
+        await cache.invalidate(1)
+
+        assert loader.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_loader(self, cache, fake_redis):
+        """Ошибка Redis при чтении кэша или инвалидации не доходит до вызывающего."""
+        homework = make_homework()
+        loader = CountingLoader(homework)
+
+        async def broken_payload(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        cache.homework_client.get_payload = broken_payload
+        assert await cache.get(1, loader) == homework
+
+        fake_redis.fail = True
+        await cache.invalidate(1)
+        assert await cache.get(1, loader) == homework
+        assert loader.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_card_cache_has_own_keys(self):
+        """Кэш карточек хранит свою версию рядом с кэшем заданий."""
+        redis = FakeRedisClient()
+        homeworks = HomeworkCache()
+        cards = HomeworkCache(HomeworkCardSchema, prefix="homework_card")
+        homeworks.bind(redis)
+        cards.bind(redis)
+        card = HomeworkCardSchema(
+            homework=make_homework(),
+            group_names=["ИС-21"],
+            stats=HomeworkAnswerStatsSchema(homework_id=1, sent_count=1),
+        )
+        loader = CountingLoader(card)
+
+        await cards.get(1, loader)
+        await cards.invalidate(1)
+        cards._l1.clear()
+        cached = await cards.get(1, loader)
+
+        assert loader.calls == 2
+        assert cached == card
+        assert await homeworks.get_version(1) == 0
+        assert "homework_card:1:version" in redis.data
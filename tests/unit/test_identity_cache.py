@@ -0,0 +1,78 @@
+"""
+Модульные тесты кэша identity пользователя.
+"""
+
+import pytest
+
+from src.core.schemas import UserIdentitySchema
+from src.services.identity_cache import IdentityCache
+from tests.conftest import CountingLoader
+
+
+@pytest.fixture
+def cache(fake_redis):
+    cache = IdentityCache()
+    cache.bind(fake_redis)
+    return cache
+
+
+class TestIdentityCache:
+    """Тесты чтения и инвалидации identity."""
+
+    @pytest.mark.asyncio
+    async def test_read_through(self, cache):
+        """Повторное разрешение не обращается к БД."""
+        loader = CountingLoader(UserIdentitySchema(user_id=1, teacher_id=10))
+
+        first = await cache.get(1, loader)
+        cache._l1.clear()
+        second = await cache.get(1, loader)
+
+        assert loader.calls == 1
+        assert first == second
+
+    @pytest.mark.asyncio
+    async def test_empty_identity_cached_until_invalidated(self, cache):
+        """Отсутствие ролей кэшируется и сбрасывается при создании роли."""
+        loader = CountingLoader(UserIdentitySchema(user_id=1))
+        assert (await cache.get(1, loader)).student_id is None
+
+        loader.value = UserIdentitySchema(user_id=1, student_id=5, group_id=7)
+        assert (await cache.get(1, loader)).student_id is None
+
+        await cache.invalidate([1])
+        identity = await cache.get(1, loader)
+
+        assert identity.student_id == 5
+        assert identity.group_id == 7
+        assert loader.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_load_racing_invalidate_not_served(self, cache):
+        """Загрузка, пересёкшаяся с invalidate, не возвращается позже."""
+        stale = UserIdentitySchema(user_id=1)
+
+        async def racing_loader():
+            # Пользователя регистрируют, пока идёт загрузка старого состояния
+            await cache.invalidate([1])
+            return stale
+
+        assert (await cache.get(1, racing_loader)).student_id is None
+
+        loader = CountingLoader(UserIdentitySchema(user_id=1, student_id=5))
+        assert (await cache.get(1, loader)).student_id == 5
+        assert loader.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_l1_follows_foreign_invalidate(self, cache):
+        """Инвалидация в другом процессе сбрасывает L1 через версию в Redis."""
+        other = IdentityCache()
+        other.bind(cache.identity_client.redis_client)
+        loader = CountingLoader(UserIdentitySchema(user_id=1))
+        await cache.get(1, loader)
+
+        await other.invalidate([1])
+        loader.value = UserIdentitySchema(user_id=1, teacher_id=3)
+
+        assert (await cache.get(1, loader)).teacher_id == 3
+        assert loader.calls == 2
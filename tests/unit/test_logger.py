@@ -0,0 +1,81 @@
+"""
+Модульные тесты неблокирующего логирования.
+"""
+
+import logging
+import queue
+import sys
+
+from src.core.logger import DroppingQueueHandler, SamplingFilter
+
+
+def _make_record(level: int = logging.INFO, name: str = "test") -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, "value=%s", ([1, 2],), None)
+
+
+class TestDroppingQueueHandler:
+    """Тесты хендлера очереди логов."""
+
+    def test_formatting_deferred_to_listener(self):
+        """В очередь уходят msg и args: строку собирает поток записи."""
+        log_queue: queue.Queue = queue.Queue()
+        handler = DroppingQueueHandler(log_queue)
+        record = _make_record()
+
+        handler.handle(record)
+        queued = log_queue.get_nowait()
+
+        assert queued.msg == "value=%s"
+        assert queued.args == ([1, 2],)
+        assert queued.getMessage() == "value=[1, 2]"
+
+    def test_full_queue_drops_records(self):
+        """При переполнении очереди записи отбрасываются и считаются."""
+        log_queue: queue.Queue = queue.Queue(maxsize=1)
+        handler = DroppingQueueHandler(log_queue)
+
+        for _ in range(3):
+            handler.handle(_make_record(name="noisy"))
+
+        assert log_queue.qsize() == 1
+        assert handler.dropped["noisy"] == 2
+
+    def test_exception_rendered_before_enqueue(self):
+        """Трейсбек рендерится сразу, ссылки на кадры не уходят в очередь."""
+        log_queue: queue.Queue = queue.Queue()
+        handler = DroppingQueueHandler(log_queue)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = _make_record(level=logging.ERROR)
+            record.exc_info = sys.exc_info()
+
+        handler.handle(record)
+        queued = log_queue.get_nowait()
+
+        assert queued.exc_info is None
+        assert "ValueError: boom" in queued.exc_text
+        assert "ValueError: boom" in logging.Formatter().format(queued)
+
+
+class TestSamplingFilter:
+    """Тесты семплирования логов."""
+
+    def test_zero_rate_drops_info(self):
+        """При rate=0 информационные записи не проходят."""
+        sampling = SamplingFilter(0.0)
+
+        assert not any(sampling.filter(_make_record()) for _ in range(100))
+
+    def test_warnings_always_pass(self):
+        """Предупреждения и ошибки проходят всегда."""
+        sampling = SamplingFilter(0.0)
+
+        assert sampling.filter(_make_record(level=logging.WARNING))
+        assert sampling.filter(_make_record(level=logging.ERROR))
+
+    def test_full_rate_passes_all(self):
+        """При rate=1 проходят все записи."""
+        sampling = SamplingFilter(1.0)
+
+        assert all(sampling.filter(_make_record()) for _ in range(100))
@@ -0,0 +1,80 @@
+"""
+Модульные тесты реестра метрик и эндпоинта /metrics.
+"""
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.core.metrics import MetricsRegistry
+from src.core.metrics_server import create_metrics_app
+
+
+class TestMetricsRegistry:
+    """Тесты сериализации метрик в формат Prometheus."""
+
+    def test_counter_with_labels(self):
+        """Счётчик выводится с метками и накопленным значением."""
+        registry = MetricsRegistry()
+        requests = registry.counter("cache_total", "Кэш", labels=("cache", "result"))
+
+        requests.inc("admin", "hit")
+        requests.inc("admin", "hit")
+        requests.inc("admin", "miss")
+
+        text = registry.render()
+        assert "# TYPE cache_total counter" in text
+        assert 'cache_total{cache="admin",result="hit"} 2' in text
+        assert 'cache_total{cache="admin",result="miss"} 1' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Бакеты гистограммы кумулятивные, +Inf равен count."""
+        registry = MetricsRegistry()
+        latency = registry.histogram(
+            "latency_seconds", "Задержка", labels=("method",), buckets=(0.1, 1.0)
+        )
+
+        latency.observe(0.05, "get")
+        latency.observe(0.5, "get")
+        latency.observe(5, "get")
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{method="get",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{method="get",le="1"} 2' in text
+        assert 'latency_seconds_bucket{method="get",le="+Inf"} 3' in text
+        assert 'latency_seconds_count{method="get"} 3' in text
+
+    def test_gauge_callback_evaluated_on_collect(self):
+        """Gauge с callback вычисляется только при сборе."""
+        registry = MetricsRegistry()
+        calls = []
+        registry.gauge("pool_checked_out", "Пул", callback=lambda: calls.append(1) or 4)
+
+        assert calls == []
+        assert "pool_checked_out 4" in registry.render()
+        assert calls == [1]
+
+    def test_wrong_labels_rejected(self):
+        """Неверное число меток — ошибка."""
+        registry = MetricsRegistry()
+        requests = registry.counter("c_total", "C", labels=("cache",))
+
+        with pytest.raises(ValueError):
+            requests.inc("admin", "hit")
+
+
+class TestMetricsEndpoint:
+    """Тесты HTTP-эндпоинта."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self):
+        """/metrics отдаёт текущее состояние реестра."""
+        registry = MetricsRegistry()
+        registry.counter("updates_total", "Апдейты").inc()
+
+        async with TestClient(TestServer(create_metrics_app(registry))) as client:
+            response = await client.get("/metrics")
+            body = await response.text()
+
+        assert response.status == 200
+        assert response.headers["Content-Type"].startswith("text/plain")
+        assert "updates_total 1" in body
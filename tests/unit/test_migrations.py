@@ -0,0 +1,71 @@
+"""
+Модульные тесты разбора миграций и онлайн-DDL.
+"""
+
+import re
+from pathlib import Path
+
+from src.db.migrations import load_migrations, online_index_ddl, split_statements
+
+BOT_STRUCTURE = Path(__file__).parents[2] / "src" / "db" / "bot_structure.sql"
+
+
+class TestSplitStatements:
+    """Тесты деления файла миграции на запросы."""
+
+    def test_comments_and_multiline(self):
+        """Комментарии отбрасываются, многострочный запрос остаётся целым."""
+        sql = (
+            "-- комментарий; с точкой с запятой;\n"
+            "ALTER TABLE `answers`\n"
+            "  ADD KEY `a` (`x`,`y`);\n"
+            "\n"
+            "DROP TABLE `t`;\n"
+        )
+
+        assert split_statements(sql) == [
+            "ALTER TABLE `answers`\n  ADD KEY `a` (`x`,`y`)",
+            "DROP TABLE `t`",
+        ]
+
+
+class TestOnlineIndexDdl:
+    """Тесты добавления ALGORITHM=INPLACE, LOCK=NONE."""
+
+    def test_index_only_alter(self):
+        """ALTER TABLE только с индексами строится онлайн."""
+        statement = "ALTER TABLE `answers`\n  ADD KEY `a` (`x`,`y`),\n  DROP KEY `b`"
+
+        assert online_index_ddl(statement).endswith("ALGORITHM=INPLACE, LOCK=NONE")
+
+    def test_create_index(self):
+        """CREATE INDEX получает онлайн-алгоритм без запятых."""
+        statement = "CREATE INDEX `a` ON `answers` (`x`)"
+
+        assert online_index_ddl(statement).endswith("ALGORITHM=INPLACE LOCK=NONE")
+
+    def test_other_statements_untouched(self):
+        """Смена колонки и явный алгоритм не меняются."""
+        modify = "ALTER TABLE `answers` MODIFY `status` text, ADD KEY `a` (`x`)"
+        explicit = "ALTER TABLE `answers` ADD KEY `a` (`x`), ALGORITHM=COPY"
+
+        assert online_index_ddl(modify) == modify
+        assert online_index_ddl(explicit) == explicit
+
+
+class TestMigrationFiles:
+    """Тесты файлов миграций репозитория."""
+
+    def test_versions_sorted(self):
+        """Версии идут по возрастанию, начиная с 0001."""
+        versions = [m.version for m in load_migrations()]
+
+        assert versions == sorted(versions)
+        assert versions[0] == "0001"
+
+    def test_bot_structure_ledger_matches_files(self):
+        """Дамп отмечает применёнными ровно существующие файлы с их sha256."""
+        dump = BOT_STRUCTURE.read_text(encoding="utf-8")
+        rows = re.findall(r"\('(\d{4,})', '(\w+)', '([0-9a-f]{64})'\)", dump)
+
+        assert rows == [(m.version, m.name, m.checksum) for m in load_migrations()]
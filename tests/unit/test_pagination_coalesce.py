@@ -0,0 +1,141 @@
+"""
+Модульные тесты объединения колбэков пагинации (latest wins).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.bot.handlers.student import homeworks as student_homeworks
+from src.bot.middlewares.pagination import PaginationCoalesceMiddleware
+from src.bot.screen import ScreenRenderer
+from src.core.enums import HomeworkMediaTypeEnum
+from src.core.schemas import PaginationCallbackSchema
+
+
+class FakeCallback:
+    def __init__(self):
+        self.answered = 0
+
+    async def answer(self, *args, **kwargs):
+        self.answered += 1
+
+
+class FakeState:
+    def __init__(self):
+        self.data: dict = {}
+
+    async def get_value(self, key, default=None):
+        return self.data.get(key, default)
+
+    async def update_data(self, data):
+        self.data.update(data)
+
+
+class FakeSession:
+    """UserSession: отправка файла №2 «зависает», пока рендер не отменят."""
+
+    def __init__(self):
+        self.sent: list[int] = []
+        self.deleted: list[int] = []
+        self.message = SimpleNamespace(answer_photo=self._answer_photo)
+
+    def screen(self, state, name):
+        return ScreenRenderer(self, state, name)
+
+    async def _answer_photo(self, photo):
+        if self.sent:
+            await asyncio.Event().wait()
+        self.sent.append(len(self.sent) + 1)
+        return SimpleNamespace(message_id=self.sent[-1])
+
+    async def delete_message(self, message_id):
+        self.deleted.append(message_id)
+
+
+def make_data(key: str, page: int) -> dict:
+    return {
+        "event_from_user": SimpleNamespace(id=1),
+        "callback_data": PaginationCallbackSchema(key=key, page=page),
+    }
+
+
+class TestPaginationCoalesce:
+    """Тесты отмены устаревших рендеров страниц."""
+
+    @pytest.mark.asyncio
+    async def test_only_latest_page_renders(self):
+        """Рендеры, начатые раньше последнего колбэка, отменяются."""
+        middleware = PaginationCoalesceMiddleware()
+        rendered: list[int] = []
+
+        async def handler(event, data):
+            await asyncio.sleep(0.01)
+            rendered.append(data["callback_data"].page)
+            return data["callback_data"].page
+
+        events = [FakeCallback() for _ in range(3)]
+        tasks = []
+        for page, event in enumerate(events, start=2):
+            tasks.append(
+                asyncio.create_task(middleware(handler, event, make_data("k", page)))
+            )
+            await asyncio.sleep(0)
+        results = await asyncio.gather(*tasks)
+
+        assert results == [None, None, 4]
+        assert rendered == [4]
+        assert [event.answered for event in events] == [1, 1, 0]
+        assert middleware._renders == {}
+
+    @pytest.mark.asyncio
+    async def test_different_keys_do_not_cancel(self):
+        """Пагинации с разными ключами рендерятся независимо."""
+        middleware = PaginationCoalesceMiddleware()
+
+        async def handler(event, data):
+            await asyncio.sleep(0.01)
+            return data["callback_data"].key
+
+        results = await asyncio.gather(
+            middleware(handler, FakeCallback(), make_data("a", 2)),
+            middleware(handler, FakeCallback(), make_data("b", 2)),
+        )
+
+        assert results == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_render_keeps_sent_media(self, monkeypatch):
+        """Отменённый посреди отправки рендер сохраняет отправленные файлы в FSM."""
+        photo = SimpleNamespace(
+            telegram_file=SimpleNamespace(
+                file_type=HomeworkMediaTypeEnum.PHOTO.value, file_id="f"
+            )
+        )
+
+        async def get_files(homework_id):
+            return [photo, photo]
+
+        monkeypatch.setattr(
+            student_homeworks.HomeworkFilesService,
+            "get_files_by_homework_id",
+            get_files,
+        )
+        session, state = FakeSession(), FakeState()
+
+        render = asyncio.create_task(
+            student_homeworks._send_homework_photos(
+                state=state, session=session, homework_id=1
+            )
+        )
+        while not session.sent:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        render.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await render
+
+        [screen] = state.data.values()
+        assert [message_id for message_id, _ in screen["media"]] == [1]
+        assert session.deleted == []
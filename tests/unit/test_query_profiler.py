@@ -0,0 +1,90 @@
+"""
+Модульные тесты профилировщика SQL-запросов.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from src.db.profiler import QueryProfiler, fingerprint
+
+
+class TestFingerprint:
+    """Тесты нормализации SQL."""
+
+    def test_literals_and_placeholders_replaced(self):
+        """Литералы и плейсхолдеры заменяются на «?»."""
+        sql = "SELECT * FROM answers WHERE answer_id = %s AND status = 'sent' LIMIT 10"
+
+        assert (
+            fingerprint(sql)
+            == "SELECT * FROM answers WHERE answer_id = ? AND status = ? LIMIT ?"
+        )
+
+    def test_in_list_collapsed(self):
+        """Списки IN разной длины дают один отпечаток."""
+        short = fingerprint("SELECT 1 FROM groups WHERE group_id IN (?, ?)")
+        long = fingerprint("SELECT 1 FROM groups WHERE group_id IN (?, ?, ?, ?)")
+
+        assert short == long
+
+
+class TestQueryProfiler:
+    """Тесты сбора статистики и журнала медленных запросов."""
+
+    @pytest.mark.asyncio
+    async def test_aggregates_per_fingerprint(self, db_engine):
+        """Одинаковые запросы с разными параметрами попадают в один отпечаток."""
+        profiler = QueryProfiler(slow_threshold_ms=None)
+        profiler.install(db_engine)
+        try:
+            async with db_engine.connect() as conn:
+                for user_id in range(5):
+                    await conn.execute(
+                        text("SELECT * FROM telegram_users WHERE user_id = :user_id"),
+                        {"user_id": user_id},
+                    )
+        finally:
+            profiler.uninstall()
+
+        snapshot = profiler.snapshot()
+        row = snapshot["SELECT * FROM telegram_users WHERE user_id = ?"]
+        assert row["count"] == 5
+        assert row["p50_ms"] <= row["p95_ms"] <= row["max_ms"]
+
+    @pytest.mark.asyncio
+    async def test_slow_query_captures_plan(self, db_engine, monkeypatch):
+        """Медленный запрос пишется в журнал вместе с планом EXPLAIN."""
+        profiler = QueryProfiler(slow_threshold_ms=0)
+        logged = []
+        monkeypatch.setattr(profiler, "_log_slow", lambda *args: logged.append(args))
+        profiler.install(db_engine)
+        try:
+            async with db_engine.connect() as conn:
+                await conn.execute(
+                    text("SELECT * FROM answers WHERE homework_id = :homework_id"),
+                    {"homework_id": 1},
+                )
+        finally:
+            profiler.uninstall()
+
+        assert logged
+        plan = logged[-1][-1]
+        assert plan
+
+    @pytest.mark.asyncio
+    async def test_failed_query_does_not_skew_durations(self, db_engine):
+        """Упавший запрос не оставляет своё время начала следующему."""
+        profiler = QueryProfiler(slow_threshold_ms=None)
+        profiler.install(db_engine)
+        try:
+            async with db_engine.connect() as conn:
+                with pytest.raises(Exception):
+                    await conn.execute(text("SELECT * FROM no_such_table"))
+                await conn.rollback()
+                await conn.execute(text("SELECT 1"))
+        finally:
+            profiler.uninstall()
+
+        snapshot = profiler.snapshot()
+        assert "SELECT * FROM no_such_table" not in snapshot
+        assert snapshot["SELECT ?"]["count"] == 1
@@ -0,0 +1,224 @@
+"""
+Модульные тесты планировщика таймеров по заданиям.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.enums import ScheduledTimerKindEnum
+from src.core.schemas import ScheduledTimerSchema
+from src.jobs import answer_stats, publication_sweep
+from src.jobs import scheduler as scheduler_worker
+from src.services.scheduler import HomeworkScheduler
+
+
+def leader_lease_script(data: dict[str, str]):
+    """Эмуляция Lua-скриптов лидерства (захват/продление и освобождение)."""
+
+    def handler(script, keys, args):
+        key, owner = keys[0], args[0]
+        current = data.get(key)
+        if "DEL" in script:
+            if current == owner:
+                del data[key]
+                return 1
+            return 0
+        if current in (None, owner):
+            data[key] = owner
+            return 1
+        return 0
+
+    return handler
+
+
+@pytest.fixture
+def redis(fake_redis):
+    fake_redis.script_handler = leader_lease_script(fake_redis.data)
+    return fake_redis
+
+
+@pytest.fixture
+def scheduler(redis):
+    scheduler = HomeworkScheduler()
+    scheduler.bind(redis)
+    return scheduler
+
+
+def reminder(homework_id: int, hours: int) -> ScheduledTimerSchema:
+    return ScheduledTimerSchema(
+        kind=ScheduledTimerKindEnum.DEADLINE_REMINDER,
+        homework_id=homework_id,
+        param=hours,
+    )
+
+
+class TestHomeworkScheduler:
+    """Тесты постановки, снятия и забора таймеров."""
+
+    def test_member_roundtrip(self):
+        timer = reminder(7, 24)
+
+        assert ScheduledTimerSchema.from_member(timer.member) == timer
+
+    def test_only_future_reminders(self):
+        """Напоминания, время которых уже прошло, не ставятся."""
+        now = datetime.now()
+        timers = HomeworkScheduler.homework_timers(1, now + timedelta(hours=5), now=now)
+
+        assert list(timers) == [reminder(1, 1).member]
+
+    def test_deferred_publication(self):
+        """Публикация в будущем ставит таймер; напоминания — только после неё."""
+        now = datetime.now()
+        start_at = now + timedelta(hours=10)
+        timers = HomeworkScheduler.homework_timers(
+            1, now + timedelta(hours=30), start_at, now=now
+        )
+        publish = ScheduledTimerSchema(
+            kind=ScheduledTimerKindEnum.PUBLISH, homework_id=1
+        )
+
+        assert timers == {
+            publish.member: start_at.timestamp(),
+            reminder(1, 1).member: (now + timedelta(hours=29)).timestamp(),
+        }
+
+    @pytest.mark.asyncio
+    async def test_reschedule_and_cancel(self, scheduler, redis):
+        """Перенос срока заменяет таймеры, удаление задания их снимает."""
+        await scheduler.schedule_homework(1, datetime.now() + timedelta(hours=5))
+        await scheduler.schedule_homework(1, datetime.now() + timedelta(days=3))
+        scheduled = set(redis.zsets["scheduler:timers"])
+        await scheduler.cancel_homework(1)
+
+        assert scheduled == {reminder(1, 24).member, reminder(1, 1).member}
+        assert redis.zsets["scheduler:timers"] == {}
+
+    @pytest.mark.asyncio
+    async def test_due_timer_claimed_once(self, scheduler, redis):
+        """Сработавший таймер забирает только один экземпляр."""
+        other = HomeworkScheduler()
+        other.bind(redis)
+        redis.zsets["scheduler:timers"] = {
+            reminder(1, 1).member: 0.0,
+            reminder(2, 1).member: 4_000_000_000.0,
+        }
+
+        first = await scheduler.claim_due()
+        second = await other.claim_due()
+
+        assert first == [reminder(1, 1)]
+        assert second == []
+        assert await scheduler.seconds_until_next() > 0
+
+    @pytest.mark.asyncio
+    async def test_single_leader(self, scheduler, redis):
+        """Лидер один; после освобождения лидерство может взять другой."""
+        assert await scheduler.acquire_leadership("a")
+        assert await scheduler.acquire_leadership("a")
+        assert not await scheduler.acquire_leadership("b")
+
+        await scheduler.release_leadership("a")
+
+        assert await scheduler.acquire_leadership("b")
+
+    @pytest.mark.asyncio
+    async def test_unbound_is_noop(self):
+        """Без Redis таймеры не ставятся и не забираются."""
+        scheduler = HomeworkScheduler()
+
+        await scheduler.schedule_homework(1, datetime.now() + timedelta(days=1))
+
+        assert await scheduler.claim_due() == []
+        assert not await scheduler.acquire_leadership("a")
+
+    @pytest.mark.asyncio
+    async def test_answer_stats_reconciler_only_on_leader(self, scheduler, monkeypatch):
+        """Сверку счётчиков выполняет только экземпляр-лидер."""
+        runs = []
+
+        async def reconcile():
+            runs.append(1)
+
+        monkeypatch.setattr(answer_stats, "homework_scheduler", scheduler)
+        monkeypatch.setattr(answer_stats, "reconcile_answer_stats", reconcile)
+
+        async def run_briefly():
+            task = asyncio.create_task(answer_stats.run_answer_stats_reconciler(0.01))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert await scheduler.acquire_leadership("other-instance")
+        await run_briefly()
+        assert runs == []
+
+        await scheduler.release_leadership("other-instance")
+        await run_briefly()
+        assert runs
+
+    @pytest.mark.asyncio
+    async def test_publication_sweep_only_on_leader(self, scheduler, monkeypatch):
+        """Досылку публикаций выполняет только экземпляр-лидер."""
+        runs = []
+
+        async def publish_due(bot):
+            runs.append(bot)
+
+        monkeypatch.setattr(publication_sweep, "homework_scheduler", scheduler)
+        monkeypatch.setattr(publication_sweep, "publish_due_homeworks", publish_due)
+
+        async def run_briefly():
+            task = asyncio.create_task(
+                publication_sweep.run_publication_sweep("bot", 0.01)
+            )
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert await scheduler.acquire_leadership("other-instance")
+        await run_briefly()
+        assert runs == []
+
+        await scheduler.release_leadership("other-instance")
+        await run_briefly()
+        assert runs and set(runs) == {"bot"}
+
+    @pytest.mark.asyncio
+    async def test_long_timer_keeps_leadership(self, scheduler, redis, monkeypatch):
+        """Пока выполняется длинный таймер, цикл продолжает продлевать лидерство."""
+        redis.zsets["scheduler:timers"] = {reminder(1, 1).member: 0.0}
+        finished = asyncio.Event()
+        renewals = []
+
+        async def slow_reminder(bot, timer):
+            await asyncio.sleep(0.1)
+            finished.set()
+
+        acquire = scheduler.acquire_leadership
+
+        async def counting_acquire(owner):
+            renewals.append(finished.is_set())
+            return await acquire(owner)
+
+        monkeypatch.setattr(scheduler, "acquire_leadership", counting_acquire)
+        monkeypatch.setattr(scheduler_worker, "homework_scheduler", scheduler)
+        monkeypatch.setattr(scheduler_worker, "POLL_INTERVAL_S", 0.01)
+        monkeypatch.setitem(
+            scheduler_worker.TIMER_HANDLERS,
+            ScheduledTimerKindEnum.DEADLINE_REMINDER,
+            slow_reminder,
+        )
+
+        task = asyncio.create_task(scheduler_worker.run_scheduler("bot"))
+        await asyncio.wait_for(finished.wait(), 1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # Продления шли, пока рассылка таймера ещё не закончилась
+        assert renewals.count(False) > 2
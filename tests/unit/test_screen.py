@@ -0,0 +1,183 @@
+"""
+Модульные тесты перерисовки экранов на месте (ScreenRenderer).
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import EditMessageText
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from src.bot.screen import ScreenMedia, ScreenRenderer
+from src.bot.session import UserSession
+from src.core.enums import HomeworkMediaTypeEnum
+
+
+class FakeState:
+    def __init__(self):
+        self.data: dict = {}
+
+    async def get_value(self, key, default=None):
+        return self.data.get(key, default)
+
+    async def update_data(self, data):
+        self.data.update(data)
+
+
+class FakeSession:
+    """UserSession, записывающий вызовы Bot API."""
+
+    build_reply_markup = staticmethod(UserSession.build_reply_markup)
+
+    def __init__(self, not_modified: bool = False):
+        self.chat_id = 1
+        self.calls: list[tuple] = []
+        self.not_modified = not_modified
+        self.next_message_id = 100
+        self.bot = SimpleNamespace(
+            edit_message_reply_markup=self._edit_markup,
+            edit_message_media=self._edit_media,
+        )
+        self.message = SimpleNamespace(
+            answer_photo=self._answer_photo, answer_document=self._answer_document
+        )
+
+    async def edit_message(self, text, message_id, reply_markup=None):
+        self.calls.append(("text", message_id, text))
+        if self.not_modified:
+            raise TelegramBadRequest(
+                method=EditMessageText(text=text),
+                message="Bad Request: message is not modified",
+            )
+
+    async def _edit_markup(self, chat_id, message_id, reply_markup):
+        self.calls.append(("markup", message_id))
+
+    async def _edit_media(self, chat_id, message_id, media):
+        self.calls.append(("media", message_id, media.media))
+
+    async def _send(self, kind, file_id):
+        self.next_message_id += 1
+        self.calls.append((kind, self.next_message_id, file_id))
+        return SimpleNamespace(message_id=self.next_message_id)
+
+    async def _answer_photo(self, photo):
+        return await self._send("send_photo", photo)
+
+    async def _answer_document(self, document, caption=None):
+        return await self._send("send_document", document)
+
+    async def delete_message(self, message_id):
+        self.calls.append(("delete", message_id))
+
+
+def markup(text: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[[InlineKeyboardButton(text=text, callback_data="x")]]
+    )
+
+
+def photo(file_id: str) -> ScreenMedia:
+    return ScreenMedia(HomeworkMediaTypeEnum.PHOTO, file_id)
+
+
+class TestScreenRender:
+    """Тесты выбора одного вызова editMessage* по отпечаткам."""
+
+    @pytest.mark.asyncio
+    async def test_edit_kind_by_diff(self):
+        """Изменился текст — editMessageText, только клавиатура — ReplyMarkup."""
+        session, state = FakeSession(), FakeState()
+        screen = ScreenRenderer(session, state, "test")
+
+        await screen.render("page 1", message_id=7, reply_markup=markup("1"))
+        await screen.render("page 1", message_id=7, reply_markup=markup("1"))
+        await screen.render("page 1", message_id=7, reply_markup=markup("2"))
+        await screen.render("page 2", message_id=7, reply_markup=markup("2"))
+
+        assert session.calls == [
+            ("text", 7, "page 1"),
+            ("markup", 7),
+            ("text", 7, "page 2"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_other_message_or_force_edits_text(self):
+        """Другое сообщение или force=True — отпечаткам не верим."""
+        session, state = FakeSession(), FakeState()
+        screen = ScreenRenderer(session, state, "test")
+
+        await screen.render("page", message_id=7)
+        await screen.render("page", message_id=8)
+        await screen.render("page", message_id=8, force=True)
+
+        assert [call[:2] for call in session.calls] == [
+            ("text", 7),
+            ("text", 8),
+            ("text", 8),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_not_modified_is_ignored(self):
+        """«message is not modified» не считается ошибкой."""
+        session, state = FakeSession(not_modified=True), FakeState()
+
+        await ScreenRenderer(session, state, "test").render("page", message_id=7)
+
+        assert state.data["screen:test"]["message_id"] == 7
+
+
+class TestScreenMedia:
+    """Тесты синхронизации файлов под экраном."""
+
+    @pytest.mark.asyncio
+    async def test_media_edited_in_place(self):
+        """Файлы заменяются editMessageMedia, лишние удаляются, новые отправляются."""
+        session, state = FakeSession(), FakeState()
+        screen = ScreenRenderer(session, state, "test")
+
+        await screen.sync_media([photo("a"), photo("b")])
+        session.calls.clear()
+        await screen.sync_media([photo("a"), photo("c"), photo("d")])
+        await screen.sync_media([photo("e")])
+
+        assert session.calls == [
+            ("media", 102, "c"),
+            ("send_photo", 103, "d"),
+            ("media", 101, "e"),
+            ("delete", 102),
+            ("delete", 103),
+        ]
+        assert [slot[0] for slot in state.data["screen:test"]["media"]] == [101]
+
+    @pytest.mark.asyncio
+    async def test_reopen_sends_fresh_media(self):
+        """reuse=False — старые файлы удаляются, новые отправляются заново."""
+        session, state = FakeSession(), FakeState()
+        screen = ScreenRenderer(session, state, "test")
+
+        await screen.sync_media([photo("a")])
+        await screen.sync_media([photo("a")], reuse=False)
+
+        assert session.calls == [
+            ("send_photo", 101, "a"),
+            ("delete", 101),
+            ("send_photo", 102, "a"),
+        ]
+
+    def test_from_files_skips_unknown(self):
+        """В экран попадают только фото, документы и видео; у фото нет подписи."""
+        files = [
+            SimpleNamespace(
+                telegram_file=SimpleNamespace(
+                    file_type=file_type, file_id=file_type, caption="c"
+                )
+            )
+            for file_type in ("photo", "document", "sticker")
+        ] + [SimpleNamespace(telegram_file=None)]
+
+        assert ScreenMedia.from_files(files) == [
+            ScreenMedia("photo", "photo", None),
+            ScreenMedia("document", "document", "c"),
+        ]
@@ -0,0 +1,196 @@
+"""
+Модульные тесты планировщика исходящих сообщений (SendScheduler).
+"""
+
+import asyncio
+import math
+import time
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import EditMessageText, SendMessage
+
+from src.bot.middlewares.send_scheduler import SendSchedulerMiddleware
+from src.core.send_scheduler import (
+    SendPriority,
+    SendScheduler,
+    TokenBucket,
+    send_priority,
+)
+from tests.conftest import FakeRedisClient
+
+
+async def acquire_all(scheduler: SendScheduler, requests) -> list:
+    """Ставит запросы (метка, chat_id, приоритет) в очередь по порядку."""
+    order: list = []
+
+    async def one(label, chat_id, priority):
+        await scheduler.acquire(chat_id, priority)
+        order.append(label)
+
+    tasks = []
+    for request in requests:
+        tasks.append(asyncio.create_task(one(*request)))
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    return order
+
+
+def send_rate_script():
+    """Эмуляция Lua-скрипта RedisSendRateClient на TokenBucket."""
+    buckets: dict[str, TokenBucket] = {}
+
+    def handler(script, keys, args):
+        now = args[0] / 1000
+        keyed = [
+            buckets.setdefault(key, TokenBucket(args[i * 2 + 1], args[i * 2 + 2]))
+            for i, key in enumerate(keys)
+        ]
+        waits = [bucket.wait_time(now) for bucket in keyed]
+        if not any(waits):
+            for bucket in keyed:
+                bucket.take(now)
+        return [math.ceil(wait * 1000) for wait in waits]
+
+    return handler
+
+
+class TestSendScheduler:
+    """Тесты порядка выдачи разрешений."""
+
+    @pytest.mark.asyncio
+    async def test_interactive_before_bulk(self):
+        """Из готовых чатов первым получает разрешение высший приоритет."""
+        scheduler = SendScheduler()
+        scheduler.pause(0.05)
+
+        order = await acquire_all(
+            scheduler,
+            [
+                ("bulk", 1, SendPriority.BULK),
+                ("transactional", 2, SendPriority.TRANSACTIONAL),
+                ("interactive", 3, SendPriority.INTERACTIVE),
+            ],
+        )
+
+        assert order == ["interactive", "transactional", "bulk"]
+        assert scheduler.depth == 0
+
+    @pytest.mark.asyncio
+    async def test_chat_fifo_and_rate(self):
+        """Сообщения одного чата — по порядку и не чаще chat_rate."""
+        scheduler = SendScheduler(chat_rate=20, chat_burst=1)
+
+        started = time.monotonic()
+        order = await acquire_all(
+            scheduler,
+            [
+                ("part 1", 1, SendPriority.BULK),
+                ("part 2", 1, SendPriority.INTERACTIVE),
+                ("part 3", 1, SendPriority.INTERACTIVE),
+            ],
+        )
+
+        assert order == ["part 1", "part 2", "part 3"]
+        assert time.monotonic() - started >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Отменённая отправка не получает разрешения и уходит из очереди."""
+        scheduler = SendScheduler()
+        scheduler.pause(0.05)
+
+        task = asyncio.create_task(scheduler.acquire(1))
+        await asyncio.sleep(0)
+        assert scheduler.depth == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert scheduler.depth == 0
+        with send_priority(SendPriority.BULK):
+            await scheduler.acquire(1)
+
+    @pytest.mark.asyncio
+    async def test_retry_goes_to_chat_head(self):
+        """Повтор после 429 обгоняет сообщения, ждущие в очереди чата."""
+        scheduler = SendScheduler(chat_rate=20, chat_burst=1)
+        await scheduler.acquire(1)
+        order: list = []
+
+        async def one(label, retry=False):
+            await scheduler.acquire(1, retry=retry)
+            order.append(label)
+
+        tasks = []
+        for label, retry in [("part 2", False), ("part 3", False), ("retry", True)]:
+            tasks.append(asyncio.create_task(one(label, retry)))
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+
+        assert order == ["retry", "part 2", "part 3"]
+
+    @pytest.mark.asyncio
+    async def test_redis_buckets_shared_between_instances(self):
+        """Глобальный лимит в Redis общий для всех экземпляров бота."""
+        redis = FakeRedisClient(send_rate_script())
+        schedulers = [
+            SendScheduler(global_rate=20, redis_client=redis) for _ in range(2)
+        ]
+
+        started = time.monotonic()
+        await asyncio.gather(
+            *(schedulers[chat_id % 2].acquire(chat_id) for chat_id in range(24))
+        )
+
+        # 20 токенов запаса на оба экземпляра, ещё 4 — по 50 мс
+        assert time.monotonic() - started >= 0.15
+        assert {keys[0] for keys, _ in redis.eval_calls} == {"send_rate:global"}
+
+    @pytest.mark.asyncio
+    async def test_redis_down_falls_back_to_local_buckets(self):
+        """Без Redis лимиты считаются в памяти процесса."""
+        scheduler = SendScheduler(redis_client=FakeRedisClient(fail=True))
+
+        await asyncio.wait_for(scheduler.acquire(1), 1)
+
+        assert scheduler.depth == 0
+
+
+class TestSendSchedulerMiddleware:
+    """Тесты request-middleware сессии бота."""
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_and_retries(self):
+        """429 приостанавливает отправки, запрос повторяется один раз."""
+        scheduler = SendScheduler()
+        middleware = SendSchedulerMiddleware(scheduler)
+        method = SendMessage(chat_id=1, text="hi")
+        calls = []
+
+        async def make_request(bot, method):
+            calls.append(method.__api_method__)
+            if len(calls) == 1:
+                raise TelegramRetryAfter(
+                    method=method, message="Too Many Requests", retry_after=0
+                )
+            return "ok"
+
+        assert await middleware(make_request, None, method) == "ok"
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_edits_are_not_scheduled(self):
+        """Редактирование сообщений не ждёт очереди отправки."""
+        scheduler = SendScheduler()
+        scheduler.pause(60)
+        middleware = SendSchedulerMiddleware(scheduler)
+
+        async def make_request(bot, method):
+            return "ok"
+
+        method = EditMessageText(chat_id=1, message_id=1, text="x")
+        result = await asyncio.wait_for(middleware(make_request, None, method), 1)
+
+        assert result == "ok"
+        assert scheduler.depth == 0
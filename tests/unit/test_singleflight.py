@@ -0,0 +1,91 @@
+"""
+Модульные тесты объединения одновременных загрузок (SingleFlight).
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.metrics import singleflight_calls
+from src.core.singleflight import SingleFlight
+
+
+class SlowLoader:
+    """Загрузчик, который ждёт release и считает вызовы."""
+
+    def __init__(self, result="value", error: Exception | None = None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class TestSingleFlight:
+    """Тесты общей загрузки по ключу."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_loader(self):
+        """Одновременные вызовы с одним ключом ждут одну загрузку."""
+        flight = SingleFlight("test_share")
+        loader = SlowLoader()
+
+        calls = [asyncio.create_task(flight.do(1, loader)) for _ in range(3)]
+        await asyncio.sleep(0)
+        loader.release.set()
+
+        assert await asyncio.gather(*calls) == ["value"] * 3
+        assert loader.calls == 1
+        assert len(flight) == 0
+        assert singleflight_calls.value("test_share", "leader") == 1
+        assert singleflight_calls.value("test_share", "shared") == 2
+
+    @pytest.mark.asyncio
+    async def test_keys_and_sequential_calls_not_shared(self):
+        """Разные ключи и вызовы после завершения загрузки идут в loader."""
+        flight = SingleFlight("test_keys")
+        loader = SlowLoader()
+        loader.release.set()
+
+        await asyncio.gather(flight.do(1, loader), flight.do(2, loader))
+        await flight.do(1, loader)
+
+        assert loader.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_error_delivered_to_all(self):
+        """Исключение загрузчика получают все ждущие."""
+        flight = SingleFlight("test_error")
+        loader = SlowLoader(error=ConnectionError("db down"))
+
+        calls = [asyncio.create_task(flight.do(1, loader)) for _ in range(2)]
+        await asyncio.sleep(0)
+        loader.release.set()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        assert [type(result) for result in results] == [ConnectionError] * 2
+        assert loader.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_load(self):
+        """Отмена первого вызывающего не прерывает загрузку для остальных."""
+        flight = SingleFlight("test_cancel")
+        loader = SlowLoader()
+
+        leader = asyncio.create_task(flight.do(1, loader))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do(1, loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        loader.release.set()
+
+        assert await follower == "value"
+        assert leader.cancelled()
+        assert loader.calls == 1
@@ -0,0 +1,141 @@
+"""
+Модульные тесты ограничения частоты апдейтов (ThrottlingMiddleware).
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import CallbackQuery
+
+from src.bot.lexicon.texts import TextsRU
+from src.bot.middlewares.throttling import ThrottlingMiddleware
+from src.core.metrics import updates_throttled
+from src.core.throttling import DEFAULT_THROTTLE, get_handler_throttle, throttle
+from tests.conftest import FakeRedisClient
+
+
+def throttle_redis(waits_ms: list[int], fail: bool = False) -> FakeRedisClient:
+    """Redis, где скрипт ведра возвращает заранее заданные ожидания (мс)."""
+    waits_ms = list(waits_ms)
+    return FakeRedisClient(
+        lambda script, keys, args: waits_ms.pop(0) if waits_ms else 0, fail=fail
+    )
+
+
+class FakeCallback(CallbackQuery):
+    """CallbackQuery, записывающий ответы вместо вызова Bot API."""
+
+    answers: list = []
+
+    async def answer(self, text=None, **kwargs):
+        FakeCallback.answers.append(text)
+
+
+@throttle(rate=1, burst=3, coalesce=True)
+async def pagination_handler(event, data):
+    data["pages"].append(event.data)
+    return event.data
+
+
+async def plain_handler(event, data):
+    return "handled"
+
+
+def make_callback(data: str) -> FakeCallback:
+    return FakeCallback.model_validate(
+        {
+            "id": data,
+            "from": {"id": 1, "is_bot": False, "first_name": "Студент"},
+            "chat_instance": "1",
+            "data": data,
+        }
+    )
+
+
+def make_data(callback, **extra) -> dict:
+    return {
+        "event_from_user": SimpleNamespace(id=1),
+        "handler": HandlerObject(callback=callback),
+        **extra,
+    }
+
+
+class TestThrottling:
+    """Тесты token bucket'ов и объединения колбэков пагинации."""
+
+    def setup_method(self):
+        FakeCallback.answers = []
+
+    def test_handler_budget(self):
+        """Бюджет маршрута берётся из @throttle, иначе — по умолчанию."""
+        budget = get_handler_throttle(pagination_handler)
+
+        assert (budget.rate, budget.burst, budget.coalesce) == (1, 3, True)
+        assert get_handler_throttle(plain_handler) == DEFAULT_THROTTLE
+
+    @pytest.mark.asyncio
+    async def test_within_budget_passes(self):
+        """Токен есть — один EVAL на оба ведра, хендлер вызывается сразу."""
+        redis = throttle_redis([])
+        middleware = ThrottlingMiddleware(redis)
+
+        result = await middleware(
+            plain_handler, make_callback("x"), make_data(plain_handler)
+        )
+
+        assert result == "handled"
+        [(keys, _)] = redis.eval_calls
+        assert keys == [
+            "throttle:1",
+            f"throttle:1:{plain_handler.__module__}:plain_handler",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_pagination_latest_wins(self):
+        """Из серии колбэков сверх бюджета рендерится только последняя страница."""
+        middleware = ThrottlingMiddleware(throttle_redis([20, 20, 20]))
+        route = f"{pagination_handler.__module__}:pagination_handler"
+        before = updates_throttled.value(route, "superseded")
+        pages: list[str] = []
+
+        results = await asyncio.gather(
+            *(
+                middleware(
+                    pagination_handler,
+                    make_callback(page),
+                    make_data(pagination_handler, pages=pages),
+                )
+                for page in ("2", "3", "4")
+            )
+        )
+
+        assert results == [None, None, "4"]
+        assert pages == ["4"]
+        assert FakeCallback.answers == [None, None]
+        assert updates_throttled.value(route, "superseded") == before + 2
+        assert middleware._latest == {}
+
+    @pytest.mark.asyncio
+    async def test_over_budget_dropped(self):
+        """Ожидание дольше MAX_WAIT_S — апдейт отбрасывается с уведомлением."""
+        middleware = ThrottlingMiddleware(throttle_redis([60_000]))
+
+        result = await middleware(
+            plain_handler, make_callback("x"), make_data(plain_handler)
+        )
+
+        assert result is None
+        assert FakeCallback.answers == [TextsRU.THROTTLED]
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_fails_open(self):
+        """Без Redis апдейты не ограничиваются."""
+        middleware = ThrottlingMiddleware(throttle_redis([], fail=True))
+
+        result = await middleware(
+            plain_handler, make_callback("x"), make_data(plain_handler)
+        )
+
+        assert result == "handled"
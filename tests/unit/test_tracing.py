@@ -0,0 +1,161 @@
+"""
+Модульные тесты трассировки апдейтов.
+"""
+
+import asyncio
+import inspect
+import json
+from datetime import datetime
+
+import pytest
+from aiogram import Router
+from aiogram.filters import BaseFilter
+from aiogram.types import Chat, Message, User
+
+from src.core.tracing import (
+    JsonlSpanExporter,
+    OtlpHttpSpanExporter,
+    Tracer,
+    span,
+    traced,
+)
+
+
+class _MemoryExporter:
+    def __init__(self):
+        self.traces = []
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+    async def close(self):
+        pass
+
+
+class TestTracer:
+    """Тесты создания спанов и tail sampling."""
+
+    def test_span_outside_trace_is_noop(self):
+        """Вне трассы span() ничего не создаёт."""
+        with span("redis:GET") as sp:
+            assert sp is None
+
+    @pytest.mark.asyncio
+    async def test_nested_spans_and_slow_trace_exported(self):
+        """Медленная трасса экспортируется, вложенные спаны связаны с родителями."""
+        exporter = _MemoryExporter()
+        tracer = Tracer(slow_ms=0, exporter=exporter)
+
+        @traced("handler")
+        async def handler():
+            with span("redis:GET"):
+                await asyncio.sleep(0)
+
+        with tracer.trace("update", update_id=1):
+            await handler()
+
+        assert len(exporter.traces) == 1
+        trace = exporter.traces[0]
+        handler_span, redis_span = trace.spans
+        assert handler_span.parent_id == trace.root.span_id
+        assert redis_span.parent_id == handler_span.span_id
+        assert all(sp.duration_ms is not None for sp in trace.spans)
+
+    def test_fast_trace_dropped(self):
+        """Быстрая трасса без ошибок не экспортируется."""
+        exporter = _MemoryExporter()
+        tracer = Tracer(slow_ms=10_000, exporter=exporter)
+
+        with tracer.trace("update"):
+            with span("fsm:get_data"):
+                pass
+
+        assert exporter.traces == []
+
+    def test_error_trace_always_exported(self):
+        """Трасса с ошибкой экспортируется независимо от длительности."""
+        exporter = _MemoryExporter()
+        tracer = Tracer(slow_ms=10_000, exporter=exporter)
+
+        with pytest.raises(RuntimeError):
+            with tracer.trace("update"):
+                raise RuntimeError("boom")
+
+        assert exporter.traces[0].root.status == "error"
+
+
+class _TracedFilter(BaseFilter):
+    @traced("filter:_TracedFilter")
+    async def __call__(self, event: Message, allowed: bool) -> bool:
+        return allowed
+
+
+class TestTracedFilter:
+    """Регрессия: @traced на фильтре не ломает передачу данных aiogram."""
+
+    def test_signature_preserved(self):
+        """Обёртка не превращается в (*args, **kwargs) для getfullargspec."""
+        spec = inspect.getfullargspec(_TracedFilter())
+
+        assert spec.varkw is None
+        assert spec.args == ["self", "event", "allowed"]
+
+    @pytest.mark.asyncio
+    async def test_router_passes_only_declared_data(self):
+        """Роутер с фильтром вызывает хендлер, лишние ключи data не мешают."""
+        router = Router()
+        handled = []
+
+        @router.message(_TracedFilter())
+        async def handler(message: Message):
+            handled.append(message.text)
+
+        message = Message(
+            message_id=1,
+            date=datetime.now(),
+            chat=Chat(id=1, type="private"),
+            from_user=User(id=1, is_bot=False, first_name="Test"),
+            text="hi",
+        )
+        await router.propagate_event(
+            "message", message, allowed=True, bot=object(), event_update=None
+        )
+
+        assert handled == ["hi"]
+
+
+class TestExporters:
+    """Тесты форматов экспорта."""
+
+    @pytest.mark.asyncio
+    async def test_jsonl_exporter_writes_spans(self, tmp_path):
+        """JSONL-экспортер пишет по строке на спан."""
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlSpanExporter(path)
+        tracer = Tracer(slow_ms=0, exporter=exporter)
+
+        with tracer.trace("update"):
+            with span("telegram:sendMessage"):
+                pass
+        await exporter.close()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["name"] for line in lines] == ["update", "telegram:sendMessage"]
+        assert lines[0]["trace_id"] == lines[1]["trace_id"]
+
+    def test_otlp_payload(self):
+        """Полезная нагрузка OTLP содержит спаны с родительскими ссылками."""
+        exporter = _MemoryExporter()
+        tracer = Tracer(slow_ms=0, exporter=exporter)
+        with tracer.trace("update"):
+            with span("db.session:AnswersService.grade"):
+                pass
+
+        payload = OtlpHttpSpanExporter("http://collector").to_payload(
+            exporter.traces[0]
+        )
+        spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert len(spans) == 2
+        assert "parentSpanId" not in spans[0]
+        assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+        assert len(spans[0]["traceId"]) == 32
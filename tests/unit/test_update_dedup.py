@@ -0,0 +1,67 @@
+"""
+Модульные тесты дедупликации повторно доставленных апдейтов.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from aiogram.types import Update
+
+from src.bot.middlewares.update_dedup import UpdateDedupMiddleware
+from src.core.metrics import updates_duplicate
+from tests.conftest import FakeRedisClient
+
+
+class CountingHandler:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, event, data):
+        self.calls += 1
+        return "handled"
+
+
+def make_update(update_id: int) -> Update:
+    return Update.model_validate(
+        {
+            "update_id": update_id,
+            "callback_query": {
+                "id": "1",
+                "from": {"id": 1, "is_bot": False, "first_name": "Студент"},
+                "chat_instance": "1",
+                "data": "page",
+            },
+        }
+    )
+
+
+class TestUpdateDedup:
+    """Тесты отбрасывания повторных update_id."""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_is_suppressed(self):
+        """Повтор update_id не доходит до хендлера и попадает в счётчик."""
+        middleware = UpdateDedupMiddleware(FakeRedisClient(), ttl_seconds=60)
+        handler = CountingHandler()
+        data = {"bot": SimpleNamespace(id=42)}
+        before = updates_duplicate.value("callback_query")
+
+        first = await middleware(handler, make_update(7), data)
+        repeated = await middleware(handler, make_update(7), data)
+        other = await middleware(handler, make_update(8), data)
+
+        assert (first, repeated, other) == ("handled", None, "handled")
+        assert handler.calls == 2
+        assert updates_duplicate.value("callback_query") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_fails_open(self):
+        """Без Redis апдейты обрабатываются как обычно."""
+        middleware = UpdateDedupMiddleware(FakeRedisClient(fail=True), ttl_seconds=60)
+        handler = CountingHandler()
+        data = {"bot": SimpleNamespace(id=42)}
+
+        await middleware(handler, make_update(7), data)
+        await middleware(handler, make_update(7), data)
+
+        assert handler.calls == 2
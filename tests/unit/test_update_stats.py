@@ -0,0 +1,83 @@
+"""
+Модульные тесты счётчиков обращений на апдейт.
+"""
+
+import asyncio
+
+import pytest
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+from redis.asyncio import Redis
+
+from src.core.update_stats import (
+    DEFAULT_BUDGET,
+    count_redis,
+    count_sql,
+    current_update_stats,
+    get_handler_budget,
+    query_budget,
+    track_update_stats,
+)
+from src.redis.client import InstrumentedRedis
+
+
+class TestUpdateStats:
+    """Тесты подсчёта обращений в контексте апдейта."""
+
+    def test_counters_outside_update_are_ignored(self):
+        """Вне апдейта счётчики не ведутся."""
+        count_sql()
+
+        assert current_update_stats() is None
+
+    def test_exceeded_reports_only_overflow(self):
+        """exceeded возвращает только превышенные счётчики."""
+        with track_update_stats() as stats:
+            for _ in range(4):
+                count_sql()
+            count_redis()
+
+        exceeded = stats.exceeded(get_handler_budget(_graded_handler))
+        assert exceeded == {"sql": (4, 3)}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_updates_are_isolated(self):
+        """Параллельные апдейты считаются независимо."""
+
+        async def _update(queries: int) -> int:
+            with track_update_stats() as stats:
+                for _ in range(queries):
+                    await asyncio.sleep(0)
+                    count_sql()
+            return stats.sql
+
+        assert await asyncio.gather(_update(2), _update(5)) == [2, 5]
+
+    @pytest.mark.asyncio
+    async def test_fsm_storage_redis_commands_counted(self, monkeypatch):
+        """Команды RedisStorage FSM через общий клиент тоже считаются."""
+        commands = []
+
+        async def execute_command(self, *args, **options):
+            commands.append(args[0])
+            return None
+
+        monkeypatch.setattr(Redis, "execute_command", execute_command)
+        storage = RedisStorage(redis=InstrumentedRedis())
+        key = StorageKey(bot_id=1, chat_id=1, user_id=1)
+
+        with track_update_stats() as stats:
+            await storage.get_state(key)
+            await storage.get_data(key)
+
+        assert commands == ["GET", "GET"]
+        assert stats.redis == 2
+
+    def test_default_budget(self):
+        """Хендлер без декоратора получает бюджет по умолчанию."""
+        assert get_handler_budget(lambda: None) == DEFAULT_BUDGET
+
+
+@query_budget(sql=3)
+async def _graded_handler():
+    pass